@@ -0,0 +1,352 @@
+"""
+Servicio HTTP sin interfaz para Analizador Poético Pro
+
+Aplicación ASGI mínima (sin dependencias de framework) que expone el
+análisis a otros servicios. El trabajo de CPU se ejecuta en un pool de
+procesos para no bloquear el bucle de eventos.
+
+Endpoints (POST, cuerpo JSON {"texto": "..."}):
+    /analyze    Análisis métrico completo + esquema de rimas
+    /rhymes     Análisis detallado de rimas
+    /syllabify  Sílabas por verso y división silábica
+    /syllabify/line  Un verso suelto ({"verso": "..."}); las peticiones
+                concurrentes se agrupan en micro-lotes y tienen su propio
+                límite de tasa (max_line_requests_per_minute)
+    /export     Exportación (campos extra: formato, titulo, metadatos)
+
+Endpoints (GET):
+    /health     Estado del servicio
+    /metrics    Métricas de perfilado (si DEBUG_CONFIG['profiling']), incluidas las
+                de las tareas ejecutadas en el pool de procesos
+
+Uso:
+    python api.py
+    uvicorn api:aplicacion --port 8600
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from config_py import SECURITY_CONFIG, SERVICE_CONFIG, EXPORT_CONFIG, METRIC_ANALYSIS_CONFIG
+from utils import perfilado
+from utils.lotes import AgrupadorLotes
+from utils.poema import analizar_poema
+from utils.tareas import (tarea_analizar, tarea_analizar_estrofa, tarea_rimas, tarea_silabear,
+                          tarea_silabear_lote, tarea_exportar)
+
+logger = logging.getLogger(__name__)
+
+
+class LimitadorTasa:
+    """Ventana deslizante de peticiones por cliente"""
+
+    def __init__(self, max_por_minuto=None, ventana=60.0, purgar_cada=1000):
+        """
+        Args:
+            purgar_cada: cada cuántas peticiones se olvidan los clientes
+                inactivos (si no, el servicio acumularía una cola por IP)
+        """
+        limites = SECURITY_CONFIG['rate_limiting']
+        self.max_por_minuto = max_por_minuto or limites['max_requests_per_minute']
+        self.ventana = ventana
+        self.purgar_cada = max(1, purgar_cada)
+        self._peticiones = defaultdict(deque)
+        self._desde_purga = 0
+
+    def permitir(self, cliente, ahora=None):
+        """
+        Registra una petición del cliente
+
+        Returns:
+            tuple: (permitida, segundos hasta que vuelva a haber cupo)
+        """
+        ahora = ahora if ahora is not None else time.monotonic()
+        self._desde_purga += 1
+        if self._desde_purga >= self.purgar_cada:
+            self.purgar(ahora)
+        marcas = self._peticiones[cliente]
+
+        while marcas and ahora - marcas[0] >= self.ventana:
+            marcas.popleft()
+
+        if len(marcas) >= self.max_por_minuto:
+            return False, self.ventana - (ahora - marcas[0])
+
+        marcas.append(ahora)
+        return True, 0.0
+
+    def purgar(self, ahora=None):
+        """Elimina clientes sin peticiones recientes"""
+        ahora = ahora if ahora is not None else time.monotonic()
+        self._desde_purga = 0
+        for cliente in list(self._peticiones):
+            marcas = self._peticiones[cliente]
+            if not marcas or ahora - marcas[-1] >= self.ventana:
+                del self._peticiones[cliente]
+
+
+class ErrorPeticion(Exception):
+    """Error atribuible al cliente (se responde con su código HTTP)"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+class ServicioAnalisis:
+    """Aplicación ASGI con los endpoints de análisis"""
+
+    def __init__(self, procesos=None, limitador=None, limitador_lineas=None):
+        self.procesos = procesos or SERVICE_CONFIG.get('workers') or os.cpu_count()
+        self.limitador = limitador or LimitadorTasa()
+        self.limitador_lineas = limitador_lineas or LimitadorTasa(
+            SECURITY_CONFIG['rate_limiting'].get('max_line_requests_per_minute', 1200))
+        self.max_texto = SECURITY_CONFIG['rate_limiting']['max_text_length']
+        self.max_cuerpo = SERVICE_CONFIG.get('max_body_bytes', 4 * self.max_texto + 4096)
+        self.executor = None
+        self.lotes_versos = AgrupadorLotes(
+            self._procesar_lote_versos,
+            max_lote=SERVICE_CONFIG.get('batch_max_size', 64),
+            max_espera_ms=SERVICE_CONFIG.get('batch_max_wait_ms', 5.0)
+        )
+        self.min_estrofas_paralelo = METRIC_ANALYSIS_CONFIG.get('stanzas', {}).get(
+            'parallel_min_stanzas', 8)
+        self.inicio = time.time()
+        self.peticiones_atendidas = 0
+
+        self.rutas = {
+            ('POST', '/analyze'): self._analizar,
+            ('POST', '/rhymes'): self._rimas,
+            ('POST', '/syllabify'): self._silabear,
+            ('POST', '/syllabify/line'): self._silabear_linea,
+            ('POST', '/export'): self._exportar,
+            ('GET', '/health'): self._salud,
+            ('GET', '/metrics'): self._metricas,
+        }
+
+    # --- Ciclo de vida -------------------------------------------------
+
+    def iniciar(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.procesos)
+            logger.info(f"Pool de análisis iniciado con {self.procesos} procesos")
+
+    def detener(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    async def _ciclo_vida(self, receive, send):
+        while True:
+            mensaje = await receive()
+            if mensaje['type'] == 'lifespan.startup':
+                self.iniciar()
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensaje['type'] == 'lifespan.shutdown':
+                # Los lotes en curso necesitan el pool: se terminan antes de cerrarlo
+                await self.lotes_versos.cerrar()
+                self.detener()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # --- ASGI ----------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._ciclo_vida(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        inicio = time.perf_counter()
+        ruta = scope['path'].rstrip('/') or '/'
+        metodo = scope['method']
+        cliente = (scope.get('client') or ('desconocido', 0))[0]
+
+        try:
+            manejador = self.rutas.get((metodo, ruta))
+            if manejador is None:
+                if any(r == ruta for _, r in self.rutas):
+                    raise ErrorPeticion(405, f"Método {metodo} no permitido en {ruta}")
+                raise ErrorPeticion(404, f"Ruta no encontrada: {ruta}")
+
+            if metodo == 'POST':
+                limitador = self.limitador_lineas if ruta == '/syllabify/line' else self.limitador
+                permitida, espera = limitador.permitir(cliente)
+                if not permitida:
+                    await self._responder_json(send, 429, {'error': 'Demasiadas peticiones'},
+                                               [(b'retry-after', str(int(espera) + 1).encode())])
+                    return
+                datos = await self._leer_json(receive)
+            else:
+                datos = {}
+
+            estado, cuerpo, tipo = await manejador(datos)
+            await self._responder(send, estado, cuerpo, tipo)
+
+        except ErrorPeticion as e:
+            await self._responder_json(send, e.estado, {'error': e.mensaje})
+        except Exception as e:
+            logger.exception("Error atendiendo petición")
+            await self._responder_json(send, 500, {'error': f"Error interno: {e}"})
+        finally:
+            self.peticiones_atendidas += 1
+            if perfilado.esta_activo():
+                perfilado.registrar(f"api:{metodo} {ruta}", time.perf_counter() - inicio)
+
+    async def _leer_json(self, receive):
+        partes = []
+        tamano = 0
+        while True:
+            mensaje = await receive()
+            parte = mensaje.get('body', b'')
+            tamano += len(parte)
+            if tamano > self.max_cuerpo:
+                raise ErrorPeticion(413, "Cuerpo de la petición demasiado grande")
+            partes.append(parte)
+            if not mensaje.get('more_body', False):
+                break
+
+        try:
+            datos = json.loads(b''.join(partes) or b'{}')
+        except (ValueError, UnicodeDecodeError):
+            raise ErrorPeticion(400, "El cuerpo debe ser JSON válido")
+        if not isinstance(datos, dict):
+            raise ErrorPeticion(400, "El cuerpo debe ser un objeto JSON")
+        return datos
+
+    def _texto(self, datos):
+        texto = datos.get('texto')
+        if not isinstance(texto, str) or not texto.strip():
+            raise ErrorPeticion(400, "Falta el campo 'texto'")
+        if len(texto) > self.max_texto:
+            raise ErrorPeticion(413, f"El texto supera {self.max_texto} caracteres")
+        return texto
+
+    async def _responder(self, send, estado, cuerpo, tipo, cabeceras_extra=()):
+        if isinstance(cuerpo, str):
+            cuerpo = cuerpo.encode('utf-8')
+        cabeceras = [
+            (b'content-type', tipo.encode()),
+            (b'content-length', str(len(cuerpo)).encode()),
+            *cabeceras_extra,
+        ]
+        await send({'type': 'http.response.start', 'status': estado, 'headers': cabeceras})
+        await send({'type': 'http.response.body', 'body': cuerpo})
+
+    async def _responder_json(self, send, estado, datos, cabeceras_extra=()):
+        cuerpo = json.dumps(datos, ensure_ascii=False, default=str)
+        await self._responder(send, estado, cuerpo, 'application/json; charset=utf-8', cabeceras_extra)
+
+    async def _ejecutar(self, funcion, *args):
+        """
+        Ejecuta una tarea de CPU en el pool de procesos
+
+        Con el perfilado activo, la tarea devuelve también lo que registró
+        el trabajador, que se suma a las métricas de /metrics.
+        """
+        self.iniciar()
+        bucle = asyncio.get_running_loop()
+        if not perfilado.esta_activo():
+            return await bucle.run_in_executor(self.executor, funcion, *args)
+        resultado, metricas = await bucle.run_in_executor(
+            self.executor, perfilado.ejecutar_medida, funcion, *args)
+        perfilado.fusionar(metricas)
+        return resultado
+
+    def _json(self, datos):
+        return 200, json.dumps(datos, ensure_ascii=False, default=str), 'application/json; charset=utf-8'
+
+    # --- Endpoints -----------------------------------------------------
+
+    async def _analizar(self, datos):
+        texto = self._texto(datos)
+        estrofas = None
+
+        # Poemas largos: cada estrofa distinta va a un proceso y el último
+        # solo compone el resultado con los análisis ya calculados
+        poema = analizar_poema(texto)
+        if self.procesos > 1 and len(poema.estrofas) >= self.min_estrofas_paralelo:
+            distintas = list(dict.fromkeys(e.textos for e in poema.estrofas))
+            estrofas = await asyncio.gather(
+                *(self._ejecutar(tarea_analizar_estrofa, versos) for versos in distintas))
+
+        resultado = await self._ejecutar(tarea_analizar, texto, estrofas)
+        if 'error' in resultado:
+            raise ErrorPeticion(422, resultado['error'])
+        return self._json(resultado)
+
+    async def _rimas(self, datos):
+        resultado = await self._ejecutar(tarea_rimas, self._texto(datos))
+        if 'error' in resultado:
+            raise ErrorPeticion(422, resultado['error'])
+        return self._json(resultado)
+
+    async def _silabear(self, datos):
+        return self._json(await self._ejecutar(tarea_silabear, self._texto(datos)))
+
+    async def _silabear_linea(self, datos):
+        verso = datos.get('verso')
+        if not isinstance(verso, str):
+            raise ErrorPeticion(400, "Falta el campo 'verso'")
+        if len(verso) > self.max_texto:
+            raise ErrorPeticion(413, f"El verso supera {self.max_texto} caracteres")
+        if '\n' in verso.strip():
+            raise ErrorPeticion(400, "'verso' debe ser una sola línea")
+        return self._json(await self.lotes_versos.enviar(verso.strip()))
+
+    async def _procesar_lote_versos(self, versos):
+        """Un viaje al pool de procesos para todo el lote"""
+        return await self._ejecutar(tarea_silabear_lote, versos)
+
+    async def _exportar(self, datos):
+        texto = self._texto(datos)
+        formato = str(datos.get('formato', 'txt')).lower()
+        formatos = EXPORT_CONFIG['formats']
+        if formato not in formatos:
+            raise ErrorPeticion(400, f"Formato no soportado: {formato}. Opciones: {', '.join(formatos)}")
+
+        metadatos = datos.get('metadatos')
+        if metadatos is not None and not isinstance(metadatos, dict):
+            raise ErrorPeticion(400, "'metadatos' debe ser un objeto JSON")
+
+        contenido = await self._ejecutar(tarea_exportar, texto, formato,
+                                         str(datos.get('titulo', 'Mi Poema')), metadatos)
+        if contenido is None:
+            raise ErrorPeticion(500, f"No se pudo generar el formato {formato}")
+
+        tipo = formatos[formato]['mime_type']
+        if isinstance(contenido, str):
+            tipo += '; charset=utf-8'
+        return 200, contenido, tipo
+
+    async def _salud(self, datos):
+        return self._json({
+            'estado': 'ok',
+            'procesos': self.procesos,
+            'pool_activo': self.executor is not None,
+            'peticiones_atendidas': self.peticiones_atendidas,
+            'segundos_activo': round(time.time() - self.inicio, 1),
+        })
+
+    async def _metricas(self, datos):
+        return self._json({
+            'perfilado_activo': perfilado.esta_activo(),
+            'operaciones': perfilado.obtener_metricas(),
+            'lotes_versos': self.lotes_versos.estadisticas(),
+        })
+
+
+aplicacion = ServicioAnalisis()
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run('api:aplicacion', host=SERVICE_CONFIG['host'], port=SERVICE_CONFIG['port'])
@@ -1,7 +1,10 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import threading
 import time
 import json
+import html
+import uuid
 import pandas as pd
 from datetime import datetime
 import plotly.graph_objects as go
@@ -11,8 +14,25 @@ from utils.silabas import ContadorSilabas
 from utils.rimas import DetectorRimas
 from utils.voz import crear_sistema_voz  # Usar el sistema original por ahora
 from utils.exportar import ExportadorPoesia
+from utils import perfilado
+from utils.historial import HistorialAnalisis
+from utils.poema import analizar_poema
+from utils.formas import reconocer_forma
+from utils.resultados import columnas_versos, pagina_columnas
+from utils.indicador import IndicadorSilabas
+from utils.color import ETIQUETA_EDITOR, crear_script_silabas
+from utils.trie_rimas import RimasAlmacen
+from utils.almacen import AlmacenPoemas, TituloExistente
+from utils.importar import importar
+from utils.ingesta import ArchivoMemoria
+from utils.intertextualidad import BuscadorIntertextual
 import requests
 
+try:
+    from config_py import UI_CONFIG
+except ImportError:
+    UI_CONFIG = {}
+
 # Configuración de la página
 st.set_page_config(
     page_title="Analizador Poético Pro",
@@ -163,6 +183,24 @@ def cargar_css_mejorado():
 </style>
 """
 
+@st.cache_resource
+def obtener_almacen():
+    """Almacén de poemas del proceso: una sola conexión compartida por las sesiones"""
+    return AlmacenPoemas()
+
+@st.cache_resource
+def obtener_rimas():
+    """Índice de rimas de los poemas guardados; el almacén lo avisa de cada cambio"""
+    return RimasAlmacen(obtener_almacen())
+
+def clave_usuario():
+    """Clave de los poemas guardados de este usuario (se conserva en la URL)"""
+    clave = st.query_params.get('usuario')
+    if not clave:
+        clave = uuid.uuid4().hex
+        st.query_params['usuario'] = clave
+    return clave
+
 class AppPoetryAnalyzer:
     def __init__(self):
         self.inicializar_componentes()
@@ -173,15 +211,16 @@ class AppPoetryAnalyzer:
         if 'analizador' not in st.session_state:
             st.session_state.analizador = AnalizadorMetrico()
             st.session_state.contador = ContadorSilabas()
+            st.session_state.indicador_silabas = IndicadorSilabas(st.session_state.contador)
             st.session_state.detector_rimas = DetectorRimas()
             st.session_state.sistema_voz = crear_sistema_voz()
             st.session_state.exportador = ExportadorPoesia()
-            st.session_state.historial_analisis = []
+            st.session_state.historial_analisis = HistorialAnalisis()
+            # Cada sesión ve solo los poemas de su clave de usuario
+            st.session_state.almacen_poemas = obtener_almacen().para(clave_usuario())
     
     def cargar_datos_sesion(self):
         """Carga datos persistentes de la sesión"""
-        if 'poemas_guardados' not in st.session_state:
-            st.session_state.poemas_guardados = {}
         if 'configuracion_voz' not in st.session_state:
             st.session_state.configuracion_voz = {
                 'velocidad': 150,
@@ -200,46 +239,18 @@ def mostrar_indicador_silabas(app, texto_actual):
     if not texto_actual.strip():
         return
     
-    # Obtener la línea actual (última línea no vacía)
-    lineas = texto_actual.split('\n')
-    linea_actual = ""
-    
-    for linea in reversed(lineas):
-        if linea.strip():
-            linea_actual = linea.strip()
-            break
-    
-    if not linea_actual:
-        return
-    
-    # Contar sílabas de la línea actual
     try:
-        silabas = st.session_state.contador.contar_silabas_verso(linea_actual)
-        
-        # Determinar color y mensaje
-        color = "#6c757d"
-        emoji = "📝"
-        mensaje = f"{silabas} sílabas"
-        tipo_verso = ""
-        
-        if silabas == 8:
-            color = "#28a745"
-            emoji = "✅"
-            tipo_verso = "(Octosílabo)"
-        elif silabas == 11:
-            color = "#fd7e14"
-            emoji = "🔥"
-            tipo_verso = "(Endecasílabo)"
-        elif silabas == 14:
-            color = "#ffc107"
-            emoji = "⭐"
-            tipo_verso = "(Alejandrino)"
-        elif silabas > 14:
-            color = "#dc3545"
-            emoji = "⚠️"
-            tipo_verso = "(Exceso)"
-        
-        # Mostrar indicador
+        # Una sola pasada sobre todas las líneas; solo se cuentan las nuevas
+        lineas = st.session_state.indicador_silabas.anotar(texto_actual)
+        if not lineas:
+            return
+        
+        # Indicador de la línea actual (última línea no vacía)
+        actual = lineas[-1]
+        color, emoji, etiqueta = actual.estilo
+        mensaje = f"{actual.silabas} sílabas"
+        tipo_verso = f"({etiqueta})" if etiqueta else ""
+        
         st.markdown(f"""
         <div style="background: {color}; color: white; padding: 8px 16px; 
                     border-radius: 20px; display: inline-block; margin: 5px 0;
@@ -248,23 +259,28 @@ def mostrar_indicador_silabas(app, texto_actual):
         </div>
         """, unsafe_allow_html=True)
         
-        # Mostrar división silábica si es interesante
-        if silabas in [8, 11, 14]:
-            try:
-                palabras = linea_actual.split()
-                if len(palabras) <= 3:  # Solo para líneas cortas
-                    division_palabras = []
-                    for palabra in palabras:
-                        div = st.session_state.contador.dividir_en_silabas(palabra)
-                        division_palabras.append(' - '.join(div))
-                    
-                    st.markdown(f"""
-                    <small style="color: #6c757d; font-style: italic;">
-                        División: {' | '.join(division_palabras)}
-                    </small>
-                    """, unsafe_allow_html=True)
-            except:
-                pass
+        # Mostrar división silábica si es interesante (se guarda en la caché)
+        if actual.silabas in [8, 11, 14] and len(actual.texto.split()) <= 3:
+            division_palabras = st.session_state.indicador_silabas.division(actual.texto)
+            st.markdown(f"""
+            <small style="color: #6c757d; font-style: italic;">
+                División: {' | '.join(division_palabras)}
+            </small>
+            """, unsafe_allow_html=True)
+        
+        # Recuento de todas las líneas en un único bloque
+        if len(lineas) > 1:
+            with st.expander(f"Sílabas por línea ({len(lineas)} versos)"):
+                filas = []
+                for linea in lineas:
+                    color, _, etiqueta = linea.estilo
+                    filas.append(
+                        f'<div><span style="display: inline-block; min-width: 2.5em; '
+                        f'color: {color}; font-weight: bold;">{linea.silabas}</span>'
+                        f'{html.escape(linea.texto)}'
+                        f'{f" <small>({etiqueta})</small>" if etiqueta else ""}</div>'
+                    )
+                st.markdown(''.join(filas), unsafe_allow_html=True)
                 
     except Exception as e:
         st.error(f"Error analizando sílabas: {e}")
@@ -437,7 +453,7 @@ el viento mueve, esparce y desordena."""
         
         # Área de texto mejorada
         texto_poesia = st.text_area(
-            "Introduce tu poema aquí:",
+            ETIQUETA_EDITOR,
             value=texto_inicial,
             height=350,
             placeholder="""Verde que te quiero verde.
@@ -451,6 +467,8 @@ con ojos de fría plata...""",
             help="Escribe o pega tu poema. El analizador detectará automáticamente el metro.",
             key="textarea_poesia"
         )
+        # Recuento mientras se escribe, en el navegador (st.markdown no ejecuta <script>)
+        components.html(crear_script_silabas(), height=0)
         
         # Mostrar indicador de sílabas en tiempo real
         if texto_poesia.strip():
@@ -469,7 +487,10 @@ con ojos de fría plata...""",
         with col_btn2:
             if st.button("📈 Analizar", use_container_width=True):
                 if texto_poesia.strip():
-                    realizar_analisis_completo(app, texto_poesia)
+                    resultado = realizar_analisis_completo(app, texto_poesia)
+                    if resultado is not None:
+                        # La vista de resultados muestra este análisis en vez de repetirlo
+                        st.session_state.analisis_mostrado = (texto_poesia, resultado)
         
         with col_btn3:
             if st.button("💾 Guardar", use_container_width=True):
@@ -505,6 +526,12 @@ def mostrar_control_voz(app):
         with col4:
             st.metric("Estado", stats['estado'])
         
+        cola = stats.get('cola_sintesis')
+        if cola:
+            st.caption(f"Cola de síntesis: {cola['en_curso']}/{cola['max_concurrentes']} en curso, "
+                       f"{cola['en_cola']} en espera · espera media {cola['espera_media_s']:.1f} s "
+                       f"(p95 {cola['espera_p95_s']:.1f} s, máx. {cola['espera_max_s']:.1f} s)")
+        
         if not stats.get('engine_disponible', True):
             st.info("🔧 Usando sistema de voz básico. Instala pyttsx3 para funcionalidad completa.")
             
@@ -615,8 +642,14 @@ def mostrar_resultados_analisis(app, texto):
     st.header("📊 Análisis Poético Completo")
     
     try:
-        # Realizar análisis
-        resultado = st.session_state.analizador.analisis_completo(texto)
+        # Análisis recién hecho o reutilizado del historial con el botón
+        # "Analizar"; si no, se analiza (el modelo del poema se construye una vez)
+        poema = analizar_poema(texto)
+        mostrado = st.session_state.get('analisis_mostrado')
+        if mostrado is not None and mostrado[0] == texto:
+            resultado = mostrado[1]
+        else:
+            resultado = st.session_state.analizador.analisis_completo(poema)
         
         if "error" in resultado:
             st.error(resultado["error"])
@@ -632,35 +665,25 @@ def mostrar_resultados_analisis(app, texto):
         with col3:
             st.metric("Promedio sílabas", f"{resultado['estadisticas']['promedio_silabas']:.1f}")
         with col4:
-            palabras_total = sum(len(v['texto'].split()) for v in resultado['versos_analizados'])
+            palabras_total = sum(len(v.tokens) for v in poema.versos)
             st.metric("Palabras", palabras_total)
         with col5:
-            estrofas = len([e for e in texto.split('\n\n') if e.strip()])
-            st.metric("Estrofas", estrofas)
+            st.metric("Estrofas", resultado['estadisticas']['total_estrofas'])
         
         # Análisis detallado por secciones
         col_left, col_right = st.columns(2)
         
         with col_left:
-            # Análisis métrico por verso
-            st.subheader("🎵 Análisis Métrico Detallado")
+            esquema_rimas = st.session_state.detector_rimas.detectar_esquema(poema.textos_versos)
+            tipo_rima = st.session_state.detector_rimas.clasificar_rima(esquema_rimas)
+            forma = reconocer_forma(resultado, esquema_rimas)
             
-            for verso_data in resultado['versos_analizados']:
-                with st.expander(f"Verso {verso_data['numero']}: {verso_data['silabas']} sílabas"):
-                    st.markdown(f"""
-                    <div class="verse-analysis">
-                        <p><strong>Texto:</strong> "{verso_data['texto']}"</p>
-                        <p><strong>Sílabas:</strong> {verso_data['silabas']}</p>
-                        <p><strong>Metro:</strong> {verso_data['metro']}</p>
-                        <p><strong>Acentos:</strong> {', '.join(map(str, verso_data['acentos'])) if verso_data['acentos'] else 'No detectados'}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+            # Análisis métrico por verso: una sola tabla paginada
+            st.subheader("🎵 Análisis Métrico Detallado")
+            mostrar_tabla_versos(resultado['versos_analizados'], esquema_rimas)
             
-            # Análisis de rimas
+            # Análisis de rimas (la letra de cada verso va en la columna "Rima")
             st.subheader("🎼 Análisis de Rimas")
-            versos = [v.strip() for v in texto.split('\n') if v.strip()]
-            esquema_rimas = st.session_state.detector_rimas.detectar_esquema(versos)
-            tipo_rima = st.session_state.detector_rimas.clasificar_rima(esquema_rimas)
             
             st.markdown(f"""
             <div class="metric-card">
@@ -668,12 +691,24 @@ def mostrar_resultados_analisis(app, texto):
                 <div class="rhyme-pattern">
                     Patrón: {''.join(esquema_rimas)}
                 </div>
+                <p><strong>Forma estrófica:</strong> {forma or 'No reconocida'}</p>
             </div>
             """, unsafe_allow_html=True)
             
-            # Detalle de rimas
-            for i, (verso, letra) in enumerate(zip(versos, esquema_rimas), 1):
-                st.text(f"Verso {i} ({letra}): {verso}")
+            # Metro y rima de cada estrofa por separado
+            if len(resultado['estrofas']) > 1:
+                with st.expander(f"🧱 Análisis por estrofa ({len(resultado['estrofas'])})"):
+                    st.dataframe(pd.DataFrame({
+                        'Estrofa': [e['numero'] for e in resultado['estrofas']],
+                        'Versos': [f"{e['primer_verso']}-{e['primer_verso'] + e['total_versos'] - 1}"
+                                   for e in resultado['estrofas']],
+                        'Metro': [e['metro_dominante'] for e in resultado['estrofas']],
+                        'Esquema': [e['esquema_rimas'] for e in resultado['estrofas']],
+                        'Rima': [e['tipo_rima'] for e in resultado['estrofas']],
+                    }), use_container_width=True, hide_index=True)
+            
+            # Versos y hemistiquios que ya aparecen en poemas guardados
+            mostrar_intertextualidad(texto)
         
         with col_right:
             # Resumen métrico
@@ -687,6 +722,18 @@ def mostrar_resultados_analisis(app, texto):
             </div>
             """, unsafe_allow_html=True)
             
+            # Versos que alcanzan el metro dominante con licencias métricas
+            escansion = resultado.get('escansion')
+            if escansion and (escansion['ajustables'] or escansion['irregulares']):
+                with st.expander(f"🎚️ Licencias métricas ({escansion['objetivo']} sílabas)"):
+                    for ajuste in escansion['ajustables']:
+                        licencias = '; '.join(f"{tipo} ({palabras})" for tipo, palabras in ajuste['licencias'])
+                        st.markdown(f"**Verso {ajuste['numero']}** ({ajuste['silabas']} → "
+                                    f"{escansion['objetivo']}): {licencias or 'h muda / conjunción y'}")
+                    if escansion['irregulares']:
+                        st.markdown("**No se ajustan:** versos " +
+                                    ', '.join(map(str, escansion['irregulares'])))
+            
             # Gráfico de distribución silábica
             st.subheader("📊 Distribución de Sílabas")
             silabas_por_verso = [v['silabas'] for v in resultado['versos_analizados']]
@@ -705,6 +752,41 @@ def mostrar_resultados_analisis(app, texto):
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+def mostrar_intertextualidad(texto):
+    """Versos del texto que reutilizan versos de los poemas guardados"""
+    coincidencias = BuscadorIntertextual(st.session_state.almacen_poemas).buscar(texto)
+    if not coincidencias:
+        return
+    with st.expander(f"🔎 Versos conocidos ({len(coincidencias)})"):
+        st.dataframe(pd.DataFrame([
+            {
+                'Verso': c['verso'],
+                'Poema': m['titulo'],
+                'Verso original': f"{m['verso']}. {m['texto']}",
+                'Tipo': m['tipo'].capitalize(),
+                'Similitud': f"{m['similitud']:.0%}",
+                'Rima': '✓' if m['misma_rima'] else '',
+                'Sílabas': '✓' if m['mismas_silabas'] else '',
+            }
+            for c in coincidencias for m in c['coincidencias']
+        ]), use_container_width=True, hide_index=True)
+
+def mostrar_tabla_versos(versos_analizados, esquema_rimas):
+    """Tabla del análisis por verso; solo se envía la página visible"""
+    por_pagina = UI_CONFIG.get('verses_per_page', 50)
+    columnas = columnas_versos(versos_analizados, esquema_rimas)
+    paginas = max(1, (len(versos_analizados) + por_pagina - 1) // por_pagina)
+    
+    pagina = 1
+    if paginas > 1:
+        if st.session_state.get("pagina_versos", 1) > paginas:
+            st.session_state.pagina_versos = paginas
+        pagina = st.number_input(f"Página de versos (de {paginas}):", min_value=1,
+                                 max_value=paginas, value=1, key="pagina_versos")
+    
+    st.dataframe(pd.DataFrame(pagina_columnas(columnas, pagina, por_pagina)),
+                 use_container_width=True, hide_index=True)
+
 def mostrar_estadisticas(app):
     """Pestaña de estadísticas"""
     st.header("📊 Estadísticas y Análisis Avanzado")
@@ -716,55 +798,165 @@ def mostrar_estadisticas(app):
     # Estadísticas generales
     st.subheader("📈 Resumen General")
     
-    total_analisis = len(st.session_state.historial_analisis)
-    total_versos = sum(a['estadisticas']['total_versos'] for a in st.session_state.historial_analisis)
-    total_palabras = sum(a['estadisticas'].get('total_palabras', 0) for a in st.session_state.historial_analisis)
+    agregados = st.session_state.historial_analisis.agregados()
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Poemas analizados", total_analisis)
+        st.metric("Poemas analizados", agregados['total_poemas'])
     with col2:
-        st.metric("Versos totales", total_versos)
+        st.metric("Versos totales", agregados['total_versos'])
     with col3:
-        st.metric("Palabras totales", total_palabras)
+        st.metric("Palabras totales", agregados['total_palabras'])
     with col4:
-        avg_versos = total_versos / total_analisis if total_analisis > 0 else 0
-        st.metric("Promedio versos/poema", f"{avg_versos:.1f}")
+        st.metric("Promedio versos/poema", f"{agregados['promedio_versos']:.1f}")
+    
+    # Distribuciones del corpus analizado (agregados incrementales del historial)
+    resumen = st.session_state.historial_analisis.estadisticas.resumen()
+    
+    col_metros, col_acentos = st.columns(2)
+    with col_metros:
+        st.subheader("🎵 Distribución de Metros")
+        if resumen['metros']:
+            metros, versos = zip(*resumen['metros'])
+            fig = px.bar(x=list(metros), y=list(versos), labels={'x': 'Metro', 'y': 'Versos'})
+            fig.update_layout(showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+    with col_acentos:
+        st.subheader("🎯 Posiciones Acentuales")
+        if resumen['acentos']:
+            posiciones, acentos = zip(*resumen['acentos'])
+            fig = px.bar(x=list(posiciones), y=list(acentos),
+                         labels={'x': 'Sílaba', 'y': 'Acentos'})
+            fig.update_layout(showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+    
+    col_rimas, col_vocabulario = st.columns(2)
+    with col_rimas:
+        st.subheader("🎼 Tipos de Rima por Estrofa")
+        if resumen['tipos_rima_estrofa']:
+            st.dataframe(pd.DataFrame(resumen['tipos_rima_estrofa'], columns=['Tipo', 'Estrofas']),
+                         use_container_width=True, hide_index=True)
+    with col_vocabulario:
+        st.subheader(f"📚 Vocabulario ({resumen['palabras_distintas']} palabras distintas)")
+        if resumen['vocabulario']:
+            st.dataframe(pd.DataFrame(resumen['vocabulario'], columns=['Palabra', 'Apariciones']),
+                         use_container_width=True, hide_index=True)
 
 def mostrar_mis_poemas(app):
     """Pestaña para gestionar poemas guardados"""
     st.header("💾 Mis Poemas Guardados")
     
-    if st.session_state.poemas_guardados:
-        for titulo, datos in st.session_state.poemas_guardados.items():
-            with st.expander(f"📄 {titulo}"):
-                st.markdown(f"**Fecha:** {datos['fecha']}")
-                st.markdown(f"**Versos:** {datos['estadisticas']['versos']}")
-                st.markdown(f"**Palabras:** {datos['estadisticas']['palabras']}")
-                
-                st.markdown("**Contenido:**")
-                st.text_area("", value=datos['contenido'], height=200, disabled=True, key=f"view_{titulo}")
-                
-                col_btn1, col_btn2, col_btn3 = st.columns(3)
-                
-                with col_btn1:
-                    if st.button("🔊 Recitar", key=f"recitar_{titulo}"):
-                        recitar_poema_seguro(app, datos['contenido'])
-                
-                with col_btn2:
-                    if st.button("📝 Editar", key=f"editar_{titulo}"):
-                        st.session_state.texto_ejemplo_cargado = datos['contenido']
-                        st.session_state.cargar_ejemplo = True
-                        st.success("Poema cargado en el editor")
-                
-                with col_btn3:
-                    if st.button("🗑️ Eliminar", key=f"eliminar_{titulo}"):
-                        del st.session_state.poemas_guardados[titulo]
-                        st.success("Poema eliminado")
-                        st.rerun()
-    else:
+    almacen = st.session_state.almacen_poemas
+    st.caption("Tus poemas se guardan con la clave de usuario de esta dirección; "
+               "guárdala en marcadores para volver a ellos.")
+    mostrar_importacion(almacen)
+    if not almacen:
         st.info("No tienes poemas guardados. Guarda algunos desde la pestaña de análisis.")
+        return
+    
+    mostrar_busqueda_rimas()
+    
+    # Filtros: se resuelven con los índices del almacén
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        texto = st.text_input("Contiene las palabras:", key="filtro_palabras",
+                              help="Todas deben aparecer; 'mar*' busca por prefijo")
+    with col2:
+        metro = st.selectbox("Metro dominante:", ["Todos"] + almacen.metros(), key="filtro_metro")
+    with col3:
+        esquema = st.text_input("Esquema de rima:", key="filtro_esquema",
+                                help="Prefijo del esquema, p. ej. ABBA")
+    
+    col4, col5, col6 = st.columns(3)
+    with col4:
+        versos_min, versos_max = st.slider("Número de versos:", 1, 200, (1, 200), key="filtro_versos")
+    with col5:
+        fechas = st.date_input("Fecha:", value=(), key="filtro_fechas")
+    with col6:
+        por_pagina = st.selectbox("Por página:", [10, 20, 50], key="filtro_por_pagina")
+    
+    desde = hasta = None
+    if isinstance(fechas, (list, tuple)) and fechas:
+        desde, hasta = fechas[0], fechas[-1]
+    
+    filtros = dict(
+        texto=texto or None,
+        metro=None if metro == "Todos" else metro,
+        esquema=esquema or None,
+        versos_min=versos_min if versos_min > 1 else None,
+        versos_max=versos_max if versos_max < 200 else None,
+        desde=desde,
+        hasta=hasta,
+    )
+    _, total = almacen.buscar(**filtros, por_pagina=1)
+    if total == 0:
+        st.info("Ningún poema coincide con los filtros.")
+        return
+    
+    paginas = (total + por_pagina - 1) // por_pagina
+    # Si los filtros reducen el número de páginas, volver a una válida
+    if st.session_state.get("filtro_pagina", 1) > paginas:
+        st.session_state.filtro_pagina = paginas
+    pagina = st.number_input(f"Página (de {paginas}):", min_value=1, max_value=paginas,
+                             value=1, key="filtro_pagina") if paginas > 1 else 1
+    poemas, total = almacen.buscar(**filtros, pagina=pagina, por_pagina=por_pagina)
+    st.caption(f"{total} poemas encontrados · página {pagina} de {paginas}")
+    
+    # Solo se renderizan los poemas de la página actual
+    for datos in poemas:
+        titulo = datos['titulo']
+        with st.expander(f"📄 {titulo} · {datos['metro_dominante']} · {datos['esquema'][:16] or '-'}"):
+            st.markdown(f"**Fecha:** {datos['fecha']}")
+            st.markdown(f"**Versos:** {datos['versos']}")
+            st.markdown(f"**Palabras:** {datos['palabras']}")
+            st.markdown(f"**Rima:** {datos['tipo_rima']}")
+            
+            contenido = almacen.obtener(titulo)['contenido']
+            
+            st.markdown("**Contenido:**")
+            st.text_area("", value=contenido, height=200, disabled=True, key=f"view_{titulo}")
+            
+            col_btn1, col_btn2, col_btn3 = st.columns(3)
+            
+            with col_btn1:
+                if st.button("🔊 Recitar", key=f"recitar_{titulo}"):
+                    recitar_poema_seguro(app, contenido)
+            
+            with col_btn2:
+                if st.button("📝 Editar", key=f"editar_{titulo}"):
+                    st.session_state.texto_ejemplo_cargado = contenido
+                    st.session_state.cargar_ejemplo = True
+                    st.success("Poema cargado en el editor")
+            
+            with col_btn3:
+                if st.button("🗑️ Eliminar", key=f"eliminar_{titulo}"):
+                    almacen.eliminar(titulo)
+                    st.success("Poema eliminado")
+                    st.rerun()
+
+def mostrar_busqueda_rimas():
+    """Busca en los poemas guardados los versos que riman con uno dado"""
+    with st.expander("🔎 Buscar versos que riman"):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            consulta = st.text_input("Verso o palabra:", key="consulta_rima_guardados")
+        with col2:
+            tipo = st.selectbox("Tipo de rima:", ["consonante", "asonante"],
+                                key="tipo_rima_guardados")
+
+        if not consulta.strip():
+            return
+
+        versos = obtener_rimas().buscar(st.session_state.almacen_poemas.propietario,
+                                        consulta, tipo)
+        if versos:
+            st.markdown(f"**{len(versos)} versos riman con «{consulta.strip()}»**")
+            st.dataframe(pd.DataFrame([{
+                'Poema': v.poema, 'Verso': v.numero, 'Texto': v.texto, 'Terminación': v.terminacion
+            } for v in versos]), use_container_width=True, hide_index=True)
+        else:
+            st.info("Ningún verso guardado rima con esa terminación.")
 
 def mostrar_configuracion(app):
     """Pestaña de configuración avanzada"""
@@ -802,8 +994,8 @@ def mostrar_configuracion(app):
         if st.button("📤 Exportar Configuración"):
             config_data = {
                 'configuracion_voz': st.session_state.configuracion_voz,
-                'poemas_guardados': st.session_state.poemas_guardados,
-                'historial_analisis': st.session_state.historial_analisis
+                'poemas_guardados': st.session_state.almacen_poemas.exportar(),
+                'historial_analisis': st.session_state.historial_analisis.exportar(incluir_completos=True)
             }
             
             st.download_button(
@@ -812,6 +1004,48 @@ def mostrar_configuracion(app):
                 file_name=f"poetry_analyzer_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
+    
+    mostrar_diagnostico_rendimiento()
+
+def mostrar_diagnostico_rendimiento():
+    """Panel de diagnóstico con las métricas de perfilado"""
+    st.subheader("⏱️ Diagnóstico de Rendimiento")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        activo = st.checkbox("Perfilado activo", value=perfilado.esta_activo(),
+                             help="Registra llamadas y latencias de las operaciones críticas")
+    with col2:
+        volcar = st.checkbox("Volcar perfil cProfile por petición",
+                             value=perfilado.DEBUG_CONFIG.get('profiling_dump_pstats', False),
+                             help="Guarda un fichero .prof por cada ejecución en logs/perfiles")
+    with col3:
+        if st.button("🧹 Reiniciar métricas"):
+            perfilado.reiniciar()
+    
+    if activo != perfilado.esta_activo() or volcar != perfilado.DEBUG_CONFIG.get('profiling_dump_pstats', False):
+        perfilado.activar(activo, volcar)
+    
+    metricas = perfilado.obtener_metricas()
+    
+    if not metricas:
+        st.info("Sin métricas todavía. Activa el perfilado y realiza algunos análisis.")
+        return
+    
+    tabla = pd.DataFrame([
+        {
+            'Operación': nombre,
+            'Llamadas': datos['llamadas'],
+            'Total (s)': round(datos['total_s'], 3),
+            'Media (ms)': round(datos['media_ms'], 3),
+            'p50 (ms)': round(datos['p50_ms'], 3),
+            'p95 (ms)': round(datos['p95_ms'], 3),
+            'p99 (ms)': round(datos['p99_ms'], 3),
+        }
+        for nombre, datos in metricas.items()
+    ])
+    st.dataframe(tabla, use_container_width=True, hide_index=True)
 
 # Funciones auxiliares para manejo de voz y análisis
 
@@ -875,42 +1109,88 @@ def detener_voz_segura():
         st.error(f"Error deteniendo voz: {e}")
 
 def realizar_analisis_completo(app, texto):
-    """Realiza un análisis completo y lo guarda en el historial"""
+    """
+    Realiza un análisis completo y lo guarda en el historial
+
+    Returns:
+        el resultado (reutilizado del historial si el poema ya estaba), o
+        None si hubo un error
+    """
     try:
+        historial = st.session_state.historial_analisis
+        # Mismo poema (aunque cambien puntuación o mayúsculas): no se reanaliza
+        resultado = historial.reutilizar(texto)
+        if resultado is not None:
+            st.info("Este poema ya está en el historial; se muestra su análisis guardado")
+            return resultado
+        
         resultado = st.session_state.analizador.analisis_completo(texto)
         
         if "error" not in resultado:
-            # Agregar al historial
+            # Agregar al historial (acotado y comprimido)
             resultado['fecha'] = datetime.now()
-            resultado['texto_original'] = texto
-            st.session_state.historial_analisis.append(resultado)
+            historial.agregar(resultado, texto_original=texto)
             
             st.success("✅ Análisis completado y guardado en historial")
-        else:
-            st.error(resultado["error"])
+            return resultado
+        st.error(resultado["error"])
     except Exception as e:
         st.error(f"Error en análisis: {e}")
+    return None
+
+def mostrar_importacion(almacen):
+    """Importación masiva de poemas desde archivos .txt, .md, .json o .zip"""
+    with st.expander("📥 Importar poemas"):
+        st.caption("Un archivo puede contener varios poemas separados por títulos "
+                   "('# Título', '=== Título ===' o 'Título: ...'). "
+                   "Los poemas repetidos se importan una sola vez.")
+        archivos = st.file_uploader("Archivos:", type=['txt', 'md', 'json', 'zip'],
+                                    accept_multiple_files=True, key="archivos_importar")
+        if archivos and st.button("📥 Importar", key="confirmar_importar"):
+            try:
+                with st.spinner("Importando poemas..."):
+                    informe = importar([ArchivoMemoria(a.name, a.getvalue()) for a in archivos],
+                                       almacen)
+                st.success(f"{informe['guardados']} poemas importados en {informe['segundos']:.1f} s "
+                           f"({informe['poemas_por_segundo']:.0f} poemas/s); "
+                           f"{informe['duplicados']} repetidos, {informe['omitidos']} archivos omitidos")
+                if informe['excedentes']:
+                    st.warning(f"Se alcanzó el máximo de {almacen.max_poemas} poemas: "
+                               f"{informe['excedentes']} no se importaron")
+            except ValueError as e:
+                st.error(f"Error importando poemas: {e}")
 
 def guardar_poema(app, texto):
     """Guarda un poema en la colección personal"""
     titulo = st.text_input("Título del poema:", key="titulo_guardar")
     
-    if titulo and st.button("💾 Confirmar Guardado"):
+    almacen = st.session_state.almacen_poemas
+    duplicado = almacen.duplicado_de(texto, excluir=titulo.strip()) if texto.strip() else None
+    if duplicado:
+        st.warning(f"Este poema ya está guardado como '{duplicado}'")
+        return
+    similares = almacen.similares(texto, limite=3, excluir=titulo.strip()) if texto.strip() else []
+    if similares:
+        st.info("Poemas guardados muy parecidos: " +
+                ", ".join(f"'{t}' ({s:.0%})" for t, s in similares))
+    
+    reemplazar = False
+    if titulo and st.session_state.get('reemplazar_titulo') == titulo.strip():
+        # Guardar sobre un título existente solo tras confirmarlo
+        st.warning(f"Ya tienes un poema titulado '{titulo.strip()}'")
+        reemplazar = st.button("♻️ Reemplazarlo", key="confirmar_reemplazo")
+        if not reemplazar:
+            return
+    
+    if titulo and (reemplazar or st.button("💾 Confirmar Guardado")):
         try:
-            versos = [v.strip() for v in texto.split('\n') if v.strip()]
-            palabras = sum(len(v.split()) for v in versos)
-            
-            st.session_state.poemas_guardados[titulo] = {
-                'contenido': texto,
-                'fecha': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                'estadisticas': {
-                    'versos': len(versos),
-                    'palabras': palabras,
-                    'caracteres': len(texto)
-                }
-            }
-            
+            almacen.guardar(titulo, texto, reemplazar=reemplazar)
+            st.session_state.pop('reemplazar_titulo', None)
+
             st.success(f"Poema '{titulo}' guardado exitosamente")
+        except TituloExistente:
+            st.session_state.reemplazar_titulo = titulo.strip()
+            st.rerun()
         except Exception as e:
             st.error(f"Error guardando poema: {e}")
 
@@ -934,4 +1214,5 @@ def exportar_poema(app, texto):
             st.error(f"Error en exportación: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with perfilado.perfilar_peticion('streamlit'):
+        main()
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""
+Suite de benchmarks para Analizador Poético Pro
+
+Mide los caminos críticos del análisis (sílabas, escansión, rimas y
+exportación) sobre un corpus sintético reproducible y guarda los
+resultados en JSON para compararlos entre commits.
+
+Uso:
+    python -m benchmarks                      # Ejecuta todas las suites
+    python -m benchmarks --filtro silabas     # Solo suites que coincidan
+    python -m benchmarks --comparar A.json B.json
+
+Módulos:
+- corpus: Generador de sonetos, romances y verso libre sintéticos
+- suites: Definición de los benchmarks (estilo asv: setup + time_*)
+- ejecutar: Descubrimiento, ejecución y registro de resultados
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from .ejecutar import main
+
+sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Prueba de carga del servicio HTTP (api.py)
+
+Lanza peticiones concurrentes contra un endpoint usando solo asyncio y
+reporta peticiones por segundo y latencias p50/p95/p99. Los textos se
+toman del corpus sintético para que la carga sea reproducible.
+
+Uso:
+    python -m benchmarks.carga_api --url http://127.0.0.1:8600 \\
+        --endpoint /analyze --peticiones 500 --concurrencia 16
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from utils.perfilado import percentil
+
+from .corpus import generar_corpus
+
+
+async def _peticion(host, puerto, ruta, cuerpo):
+    """Envía un POST HTTP/1.1 y devuelve (estado, latencia en segundos)"""
+    inicio = time.perf_counter()
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        cabecera = (
+            f"POST {ruta} HTTP/1.1\r\n"
+            f"Host: {host}:{puerto}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        escritor.write(cabecera + cuerpo)
+        await escritor.drain()
+
+        linea_estado = await lector.readline()
+        estado = int(linea_estado.split()[1]) if linea_estado else 0
+
+        # Leer hasta Content-Length: el servidor puede no cerrar la conexión
+        # (p. ej. en un 429 sin haber consumido el cuerpo)
+        longitud = None
+        while True:
+            linea = await lector.readline()
+            if linea in (b'\r\n', b'\n', b''):
+                break
+            nombre, _, valor = linea.decode('latin-1').partition(':')
+            if nombre.strip().lower() == 'content-length':
+                longitud = int(valor.strip())
+        if longitud is None:
+            await lector.read()
+        else:
+            await lector.readexactly(longitud)
+    finally:
+        escritor.close()
+        try:
+            await escritor.wait_closed()
+        except Exception:
+            pass
+    return estado, time.perf_counter() - inicio
+
+
+async def ejecutar_carga(url, endpoint='/analyze', peticiones=200, concurrencia=8,
+                         formato='txt', poemas=20):
+    """Ejecuta la prueba de carga y devuelve un diccionario con el resumen"""
+    partes = urlsplit(url)
+    host = partes.hostname or '127.0.0.1'
+    puerto = partes.port or 80
+
+    cuerpos = []
+    for poema in generar_corpus(poemas):
+        if endpoint == '/syllabify/line':
+            # Simula un editor que envía línea a línea
+            for verso in (v.strip() for v in poema.split('\n') if v.strip()):
+                cuerpos.append(json.dumps({'verso': verso}, ensure_ascii=False).encode('utf-8'))
+            continue
+        datos = {'texto': poema}
+        if endpoint == '/export':
+            datos['formato'] = formato
+        cuerpos.append(json.dumps(datos, ensure_ascii=False).encode('utf-8'))
+
+    cola = asyncio.Queue()
+    for i in range(peticiones):
+        cola.put_nowait(cuerpos[i % len(cuerpos)])
+
+    latencias = []
+    estados = Counter()
+
+    async def trabajador():
+        while True:
+            try:
+                cuerpo = cola.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                estado, latencia = await _peticion(host, puerto, endpoint, cuerpo)
+            except OSError:
+                estado, latencia = 0, 0.0
+            estados[estado] += 1
+            if estado == 200:
+                latencias.append(latencia)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+
+    ordenadas = sorted(latencias)
+    return {
+        'endpoint': endpoint,
+        'peticiones': peticiones,
+        'concurrencia': concurrencia,
+        'duracion_s': duracion,
+        'peticiones_por_segundo': peticiones / duracion if duracion else 0.0,
+        'estados': dict(estados),
+        'latencia_ms': {
+            'media': statistics.mean(ordenadas) * 1000 if ordenadas else 0.0,
+            'p50': percentil(ordenadas, 50) * 1000,
+            'p95': percentil(ordenadas, 95) * 1000,
+            'p99': percentil(ordenadas, 99) * 1000,
+            'max': ordenadas[-1] * 1000 if ordenadas else 0.0,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prueba de carga del servicio de análisis')
+    parser.add_argument('--url', default='http://127.0.0.1:8600')
+    parser.add_argument('--endpoint', default='/analyze',
+                        choices=['/analyze', '/rhymes', '/syllabify', '/syllabify/line', '/export'])
+    parser.add_argument('--peticiones', type=int, default=200)
+    parser.add_argument('--concurrencia', type=int, default=8)
+    parser.add_argument('--formato', default='txt', help='Formato para /export')
+    parser.add_argument('--json', action='store_true', help='Imprime el resumen en JSON')
+    args = parser.parse_args(argv)
+
+    resumen = asyncio.run(ejecutar_carga(args.url, args.endpoint, args.peticiones,
+                                         args.concurrencia, args.formato))
+
+    if args.json:
+        print(json.dumps(resumen, indent=2))
+    else:
+        lat = resumen['latencia_ms']
+        print(f"{resumen['endpoint']}: {resumen['peticiones']} peticiones, "
+              f"concurrencia {resumen['concurrencia']}")
+        print(f"  {resumen['peticiones_por_segundo']:.1f} peticiones/s en {resumen['duracion_s']:.2f} s")
+        print(f"  latencia ms  media {lat['media']:.1f}  p50 {lat['p50']:.1f}  "
+              f"p95 {lat['p95']:.1f}  p99 {lat['p99']:.1f}  max {lat['max']:.1f}")
+        print(f"  estados: {resumen['estados']}")
+
+    return 0 if set(resumen['estados']) == {200} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
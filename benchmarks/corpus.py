@@ -0,0 +1,161 @@
+"""
+Generador de corpus sintético para los benchmarks
+
+Produce sonetos, romances y poemas en verso libre de longitud variable a
+partir de bancos de palabras fijos. Con la misma semilla el corpus es
+idéntico en cualquier máquina, de modo que los resultados son comparables
+entre commits.
+"""
+
+import random
+
+from utils.silabas import ContadorSilabas
+
+# Banco de palabras de relleno para el cuerpo del verso
+PALABRAS_RELLENO = [
+    'el', 'la', 'los', 'las', 'un', 'una', 'mi', 'tu', 'su', 'que', 'y', 'en',
+    'de', 'por', 'con', 'sin', 'sobre', 'bajo', 'entre', 'hacia', 'como',
+    'sombra', 'viento', 'llama', 'noche', 'agua', 'fuego', 'tierra', 'rosa',
+    'verde', 'blanco', 'oscuro', 'dulce', 'triste', 'alto', 'hondo', 'lento',
+    'canta', 'llora', 'mira', 'busca', 'guarda', 'sueña', 'muere', 'vuelve',
+    'olvido', 'memoria', 'silencio', 'ribera', 'cabello', 'frente', 'ojos',
+    'campo', 'trigo', 'calandria', 'ruiseñor', 'montaña', 'barco', 'caballo',
+    'espejo', 'lirio', 'azucena', 'gesto', 'deseo', 'tiempo', 'piedra',
+    'ceniza', 'aurora', 'ocaso', 'río', 'jardín', 'ciprés', 'herida', 'pecho',
+]
+
+# Grupos de palabras que riman entre sí (consonante)
+GRUPOS_RIMA = [
+    ['amor', 'dolor', 'flor', 'calor', 'temor', 'fulgor', 'clamor', 'rumor'],
+    ['vida', 'herida', 'partida', 'querida', 'medida', 'perdida', 'dormida'],
+    ['cielo', 'vuelo', 'suelo', 'anhelo', 'desvelo', 'consuelo', 'velo'],
+    ['mar', 'lugar', 'hogar', 'pesar', 'cantar', 'soñar', 'olvidar'],
+    ['luna', 'fortuna', 'laguna', 'cuna', 'ninguna', 'alguna'],
+    ['alma', 'calma', 'palma', 'salma'],
+    ['corazón', 'canción', 'razón', 'pasión', 'emoción', 'ilusión'],
+    ['verdad', 'libertad', 'soledad', 'eternidad', 'ciudad', 'bondad'],
+    ['belleza', 'tristeza', 'pureza', 'grandeza', 'certeza', 'firmeza'],
+    ['postrera', 'ribera', 'severa', 'lisonjera', 'primavera', 'espera'],
+    ['día', 'mía', 'fría', 'ardía', 'poesía', 'melodía', 'alegría'],
+    ['mayo', 'rayo', 'desmayo', 'ensayo'],
+]
+
+# Grupos de palabras con la misma rima asonante (é-a) para romances
+ASONANTES_ROMANCE = [
+    'tierra', 'ciega', 'vela', 'pena', 'sierra', 'guerra', 'seca', 'fresca',
+    'espera', 'bandera', 'estrella', 'doncella', 'cadena', 'arena', 'llena',
+]
+
+ESQUEMAS_SONETO = [
+    'ABBA ABBA CDC DCD',
+    'ABBA ABBA CDE CDE',
+    'ABAB ABAB CDC DCD',
+]
+
+
+class GeneradorCorpus:
+    """Genera poemas sintéticos deterministas a partir de una semilla"""
+
+    def __init__(self, semilla=1234):
+        self.rng = random.Random(semilla)
+        self.contador = ContadorSilabas()
+
+    def _verso(self, silabas_objetivo, palabra_final, intentos=12):
+        """Construye un verso terminado en palabra_final cerca del metro pedido"""
+        mejor = None
+        mejor_diferencia = None
+
+        for _ in range(intentos):
+            palabras = []
+            verso = palabra_final
+            while True:
+                palabras.append(self.rng.choice(PALABRAS_RELLENO))
+                verso = ' '.join(palabras + [palabra_final])
+                silabas = self.contador.contar_silabas_verso(verso)
+                if silabas >= silabas_objetivo:
+                    break
+
+            diferencia = abs(silabas - silabas_objetivo)
+            if mejor is None or diferencia < mejor_diferencia:
+                mejor = verso
+                mejor_diferencia = diferencia
+            if diferencia == 0:
+                break
+
+        return mejor[0].upper() + mejor[1:]
+
+    def _estrofas_por_esquema(self, esquema, silabas):
+        """Genera estrofas siguiendo un esquema tipo 'ABBA ABBA CDC DCD'"""
+        grupos = self.rng.sample(GRUPOS_RIMA, len(set(esquema.replace(' ', ''))))
+        asignacion = {}
+        usados = {}
+        estrofas = []
+
+        for bloque in esquema.split():
+            versos = []
+            for letra in bloque:
+                if letra not in asignacion:
+                    asignacion[letra] = grupos[len(asignacion)]
+                    usados[letra] = 0
+                grupo = asignacion[letra]
+                palabra = grupo[usados[letra] % len(grupo)]
+                usados[letra] += 1
+                versos.append(self._verso(silabas, palabra))
+            estrofas.append('\n'.join(versos))
+
+        return '\n\n'.join(estrofas)
+
+    def soneto(self):
+        """Soneto de 14 endecasílabos con un esquema clásico"""
+        esquema = self.rng.choice(ESQUEMAS_SONETO)
+        return self._estrofas_por_esquema(esquema, 11)
+
+    def romance(self, versos=None):
+        """Romance octosílabo con rima asonante en los pares"""
+        total = versos or self.rng.randrange(8, 41, 2)
+        lineas = []
+        for i in range(total):
+            if i % 2:
+                final = self.rng.choice(ASONANTES_ROMANCE)
+            else:
+                final = self.rng.choice(PALABRAS_RELLENO[20:])
+            lineas.append(self._verso(8, final))
+        return '\n'.join(lineas)
+
+    def verso_libre(self, versos=None):
+        """Verso libre con longitudes y finales irregulares"""
+        total = versos or self.rng.randint(5, 30)
+        estrofas = []
+        actual = []
+        for _ in range(total):
+            final = self.rng.choice(PALABRAS_RELLENO[20:])
+            actual.append(self._verso(self.rng.randint(5, 16), final))
+            if len(actual) >= self.rng.randint(3, 6):
+                estrofas.append('\n'.join(actual))
+                actual = []
+        if actual:
+            estrofas.append('\n'.join(actual))
+        return '\n\n'.join(estrofas)
+
+    def poema_largo(self, versos):
+        """Poema de un número exacto de versos (para medir escalado)"""
+        lineas = []
+        while len(lineas) < versos:
+            lineas.extend(self.soneto().replace('\n\n', '\n').split('\n'))
+        return '\n'.join(lineas[:versos])
+
+    def corpus(self, poemas=30):
+        """Mezcla de sonetos, romances y verso libre en proporciones fijas"""
+        generadores = [self.soneto, self.romance, self.verso_libre]
+        return [generadores[i % 3]() for i in range(poemas)]
+
+
+def generar_corpus(poemas=30, semilla=1234):
+    """Atajo para obtener un corpus reproducible"""
+    return GeneradorCorpus(semilla).corpus(poemas)
+
+
+if __name__ == '__main__':
+    for poema in generar_corpus(3):
+        print(poema)
+        print('-' * 40)
@@ -0,0 +1,221 @@
+"""
+Ejecutor de la suite de benchmarks
+
+Descubre los métodos ``time_*`` de las suites, los cronometra con varias
+repeticiones y guarda un JSON con la mediana, el mínimo y el rendimiento
+(unidades por segundo) de cada caso junto con el commit y la máquina. Los
+métodos ``track_*`` devuelven un valor (por ejemplo bytes) que se registra
+tal cual, con su sentido: al comparar, un aumento es una regresión salvo
+en los que la suite declara en ``mayor_es_mejor``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .suites import SUITES
+
+DIRECTORIO_RESULTADOS = Path(__file__).parent / 'resultados'
+
+# Variación relativa a partir de la cual se marca una regresión
+UMBRAL_REGRESION = 0.10
+
+
+def obtener_commit():
+    """Devuelve el hash corto del commit actual (o 'desconocido')"""
+    try:
+        salida = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=10,
+            cwd=Path(__file__).parent.parent
+        )
+        return salida.stdout.strip() or 'desconocido'
+    except Exception:
+        return 'desconocido'
+
+
+def informacion_maquina():
+    """Datos de la máquina necesarios para interpretar los tiempos"""
+    return {
+        'python': platform.python_version(),
+        'implementacion': platform.python_implementation(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _cronometrar(funcion, argumentos, repeticiones, minimo_segundos):
+    """Mide una función; repite cada muestra hasta superar minimo_segundos"""
+    # Calentamiento y cálculo del número de iteraciones por muestra
+    inicio = time.perf_counter()
+    funcion(*argumentos)
+    duracion = time.perf_counter() - inicio
+    iteraciones = max(1, int(minimo_segundos / duracion) if duracion > 0 else 1)
+
+    muestras = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            funcion(*argumentos)
+        muestras.append((time.perf_counter() - inicio) / iteraciones)
+
+    return muestras
+
+
+def ejecutar_suite(clase, repeticiones=5, minimo_segundos=0.05, filtro=None):
+    """Ejecuta todos los casos de una suite y devuelve {nombre: resultado}"""
+    resultados = {}
+    parametros = getattr(clase, 'params', [None])
+    metodos = sorted(m for m in dir(clase) if m.startswith(('time_', 'track_')))
+
+    for parametro in parametros:
+        argumentos = () if parametro is None else (parametro,)
+        instancia = clase()
+
+        try:
+            if hasattr(instancia, 'setup'):
+                instancia.setup(*argumentos)
+        except NotImplementedError as e:
+            print(f"  [omitido] {clase.__name__}({parametro}): {e}")
+            continue
+
+        for metodo in metodos:
+            nombre = f"{clase.__name__}.{metodo}"
+            if parametro is not None:
+                nombre += f"[{parametro}]"
+            if filtro and filtro.lower() not in nombre.lower():
+                continue
+
+            if metodo.startswith('track_'):
+                # Los track_* devuelven directamente el valor a registrar
+                valor = getattr(instancia, metodo)(*argumentos)
+                unidad = getattr(instancia, 'unidades', {}).get(metodo, (1, ''))[1]
+                resultados[nombre] = {'valor': valor, 'unidad': unidad,
+                                      'mayor_es_mejor': metodo in getattr(clase, 'mayor_es_mejor', ())}
+                print(f"  {nombre:<55} {valor:14.1f} {unidad}")
+                continue
+
+            muestras = _cronometrar(getattr(instancia, metodo), argumentos,
+                                    repeticiones, minimo_segundos)
+            mediana = statistics.median(muestras)
+            cantidad, unidad = getattr(instancia, 'unidades', {}).get(metodo, (1, 'llamadas'))
+
+            resultados[nombre] = {
+                'mediana_s': mediana,
+                'minimo_s': min(muestras),
+                'repeticiones': repeticiones,
+                'unidades': cantidad,
+                'unidad': unidad,
+                'por_segundo': cantidad / mediana if mediana > 0 else None,
+            }
+            print(f"  {nombre:<55} {mediana * 1000:10.3f} ms  "
+                  f"{resultados[nombre]['por_segundo'] or 0:12.1f} {unidad}/s")
+
+    return resultados
+
+
+def ejecutar_todo(repeticiones=5, minimo_segundos=0.05, filtro=None):
+    """Ejecuta todas las suites registradas"""
+    resultados = {}
+    for clase in SUITES:
+        print(f"{clase.__name__}: {clase.__doc__}")
+        resultados.update(ejecutar_suite(clase, repeticiones, minimo_segundos, filtro))
+    return {
+        'fecha': datetime.now().isoformat(),
+        'commit': obtener_commit(),
+        'maquina': informacion_maquina(),
+        'resultados': resultados,
+    }
+
+
+def guardar_resultados(datos, destino=None):
+    """Guarda los resultados en benchmarks/resultados/<fecha>_<commit>.json"""
+    if destino is None:
+        DIRECTORIO_RESULTADOS.mkdir(exist_ok=True)
+        marca = datetime.now().strftime('%Y%m%d_%H%M%S')
+        destino = DIRECTORIO_RESULTADOS / f"{marca}_{datos['commit']}.json"
+
+    destino = Path(destino)
+    destino.write_text(json.dumps(datos, indent=2, ensure_ascii=False), encoding='utf-8')
+    return destino
+
+
+def _mayor_es_mejor(nombre, resultado):
+    """Sentido de un resultado; los ficheros antiguos no lo guardan y se mira la suite"""
+    if 'mayor_es_mejor' in resultado:
+        return resultado['mayor_es_mejor']
+    clase, _, metodo = nombre.split('[')[0].partition('.')
+    return any(s.__name__ == clase and metodo in getattr(s, 'mayor_es_mejor', ())
+               for s in SUITES)
+
+
+def comparar(archivo_base, archivo_nuevo, umbral=UMBRAL_REGRESION):
+    """Compara dos ficheros de resultados y devuelve las regresiones"""
+    base = json.loads(Path(archivo_base).read_text(encoding='utf-8'))
+    nuevo = json.loads(Path(archivo_nuevo).read_text(encoding='utf-8'))
+
+    print(f"Base:  {base['commit']} ({base['fecha']})")
+    print(f"Nuevo: {nuevo['commit']} ({nuevo['fecha']})")
+    print()
+
+    regresiones = []
+    for nombre in sorted(set(base['resultados']) & set(nuevo['resultados'])):
+        clave = 'mediana_s' if 'mediana_s' in base['resultados'][nombre] else 'valor'
+        antes = base['resultados'][nombre][clave]
+        despues = nuevo['resultados'][nombre][clave]
+        if antes > 0:
+            ratio = despues / antes
+        else:
+            ratio = 1.0 if despues == antes else float('inf')
+
+        # Tiempos y costes: más es peor; coincidencias, formas reconocidas...: más es mejor
+        mayor_es_mejor = _mayor_es_mejor(nombre, nuevo['resultados'][nombre])
+        peor = ratio < 1 - umbral if mayor_es_mejor else ratio > 1 + umbral
+        mejor = ratio > 1 + umbral if mayor_es_mejor else ratio < 1 - umbral
+
+        marca = ''
+        if peor:
+            marca = '  <-- regresión'
+            regresiones.append(nombre)
+        elif mejor:
+            marca = '  mejora'
+
+        if clave == 'valor':
+            print(f"{nombre:<55} {antes:13.1f} -> {despues:13.1f}  x{ratio:5.2f}{marca}")
+        else:
+            print(f"{nombre:<55} {antes * 1000:10.3f} ms -> {despues * 1000:10.3f} ms  x{ratio:5.2f}{marca}")
+
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks de Analizador Poético Pro')
+    parser.add_argument('--filtro', help='Ejecuta solo los casos cuyo nombre contenga este texto')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--minimo', type=float, default=0.05,
+                        help='Duración mínima en segundos de cada muestra')
+    parser.add_argument('--salida', help='Fichero JSON de salida')
+    parser.add_argument('--comparar', nargs=2, metavar=('BASE', 'NUEVO'),
+                        help='Compara dos ficheros de resultados')
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        regresiones = comparar(*args.comparar)
+        return 1 if regresiones else 0
+
+    datos = ejecutar_todo(args.repeticiones, args.minimo, args.filtro)
+    destino = guardar_resultados(datos, args.salida)
+    print(f"\nResultados guardados en {destino}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,606 @@
+"""
+Definición de benchmarks al estilo asv
+
+Cada suite es una clase con un método ``setup`` opcional, métodos
+``time_*`` que se cronometran y métodos ``track_*`` que devuelven un valor
+a registrar (por ejemplo, memoria). Si la suite define ``params`` cada método
+recibe el parámetro, y ``unidades`` indica cuántos elementos procesa cada
+llamada para reportar el rendimiento (palabras/s, versos/s...). Un
+``track_*`` se compara como un coste (más es peor) salvo que esté en
+``mayor_es_mejor`` (coincidencias encontradas, poemas reconocidos...).
+"""
+
+import gc
+import tracemalloc
+
+from utils.silabas import ContadorSilabas
+from utils.metrica import AnalizadorMetrico
+from utils.rimas import DetectorRimas
+from utils.poema import Poema
+from utils.formas import ReconocedorFormas, reconocer_forma
+from utils.estadisticas import EstadisticasCorpus
+from utils.bocetos import HyperLogLog, CountMin, TDigest
+
+from .corpus import GeneradorCorpus, generar_corpus
+
+
+def _versos(texto):
+    return [v.strip() for v in texto.split('\n') if v.strip()]
+
+
+class SilabasSuite:
+    """Silabeo palabra a palabra y verso a verso con ContadorSilabas"""
+
+    def setup(self):
+        self.contador = ContadorSilabas()
+        self.contador_reglas = ContadorSilabas(usar_lexico=False)
+        corpus = generar_corpus(30)
+        self.versos = [v for poema in corpus for v in _versos(poema)]
+        self.palabras = [p for v in self.versos for p in v.split()]
+        self.unidades = {
+            'time_contar_silabas_palabras': (len(self.palabras), 'palabras'),
+            'time_contar_silabas_palabras_reglas': (len(self.palabras), 'palabras'),
+            'time_dividir_en_silabas': (len(self.palabras), 'palabras'),
+            'time_contar_silabas_verso': (len(self.versos), 'versos'),
+        }
+
+    def time_contar_silabas_palabras(self):
+        for palabra in self.palabras:
+            self.contador.contar_silabas(palabra)
+
+    def time_contar_silabas_palabras_reglas(self):
+        # Solo reglas, sin el léxico precompilado (referencia)
+        for palabra in self.palabras:
+            self.contador_reglas.contar_silabas(palabra)
+
+    def time_dividir_en_silabas(self):
+        for palabra in self.palabras:
+            self.contador.dividir_en_silabas(palabra)
+
+    def time_contar_silabas_verso(self):
+        for verso in self.versos:
+            self.contador.contar_silabas_verso(verso)
+
+
+class EscansionSuite:
+    """Escansión completa (AnalizadorMetrico.analisis_completo) por poema"""
+
+    def setup(self):
+        self.analizador = AnalizadorMetrico()
+        self.analizador.max_cache_estrofas = 0  # cada llamada analiza desde cero
+        self.corpus = generar_corpus(30)
+        total_versos = sum(len(_versos(p)) for p in self.corpus)
+        self.versos = [v for poema in self.corpus for v in _versos(poema)]
+        self.motor = self.analizador.motor_escansion
+        self.unidades = {
+            'time_analisis_completo': (total_versos, 'versos'),
+            'time_licencias_endecasilabo': (total_versos, 'versos'),
+            'time_alternativas_sin_objetivo': (total_versos, 'versos'),
+        }
+
+    def time_analisis_completo(self):
+        for poema in self.corpus:
+            self.analizador.analisis_completo(poema)
+
+    def time_licencias_endecasilabo(self):
+        # ¿Puede medirse cada verso como endecasílabo? (con poda al objetivo)
+        for verso in self.versos:
+            self.motor.alternativas(verso, 11)
+
+    def time_alternativas_sin_objetivo(self):
+        for verso in self.versos:
+            self.motor.alternativas(verso)
+
+
+class EstrofasSuite:
+    """Modelo de poema y reanálisis por estrofas con caché"""
+
+    params = [10, 100]
+    param_names = ['poemas']
+
+    def setup(self, poemas):
+        # Un solo texto largo con todas las estrofas de varios poemas
+        self.texto = '\n\n'.join(generar_corpus(poemas))
+        self.poema = Poema.desde_texto(self.texto)
+        self.lineas = self.texto.split('\n')
+        self.edicion = self.poema.versos[len(self.poema.versos) // 2].linea - 1
+        self.ediciones = 0
+
+        self.sin_cache = AnalizadorMetrico()
+        self.sin_cache.max_cache_estrofas = 0
+        self.con_cache = AnalizadorMetrico()
+        self.con_cache.analisis_completo(self.poema)
+
+        versos = len(self.poema.versos)
+        self.unidades = {
+            'time_construir_poema': (versos, 'versos'),
+            'time_analisis_sin_cache': (versos, 'versos'),
+            'time_reanalisis_tras_edicion': (versos, 'versos'),
+        }
+
+    def time_construir_poema(self, poemas):
+        Poema.desde_texto(self.texto)
+
+    def time_analisis_sin_cache(self, poemas):
+        self.sin_cache.analisis_completo(self.poema)
+
+    def time_reanalisis_tras_edicion(self, poemas):
+        # Cambia un verso: solo su estrofa se vuelve a analizar
+        self.ediciones += 1
+        lineas = list(self.lineas)
+        lineas[self.edicion] += f" {self.ediciones}"
+        self.con_cache.analisis_completo('\n'.join(lineas))
+
+    def track_estrofas(self, poemas):
+        return len(self.poema.estrofas)
+
+
+class FormasSuite:
+    """Reconocimiento de formas estróficas con el autómata precompilado"""
+
+    mayor_es_mejor = ('track_poemas_reconocidos',)
+
+    def setup(self):
+        analizador = AnalizadorMetrico()
+        detector = DetectorRimas()
+        self.analisis = []
+        for poema in generar_corpus(60):
+            resultado = analizador.analisis_completo(poema)
+            esquema = detector.detectar_esquema(_versos(poema))
+            self.analisis.append((resultado, esquema))
+        self.reconocedor = ReconocedorFormas()
+        self.unidades = {
+            'time_reconocer_corpus': (len(self.analisis), 'poemas'),
+        }
+
+    def time_compilar_automata(self):
+        ReconocedorFormas()
+
+    def time_reconocer_corpus(self):
+        for resultado, esquema in self.analisis:
+            reconocer_forma(resultado, esquema, self.reconocedor)
+
+    def track_estados_automata(self):
+        return self.reconocedor.estados
+
+    def track_poemas_reconocidos(self):
+        return sum(1 for resultado, esquema in self.analisis
+                   if reconocer_forma(resultado, esquema, self.reconocedor))
+
+
+class EstadisticasSuite:
+    """Agregación de estadísticas de corpus y combinación de parciales"""
+
+    def setup(self):
+        analizador = AnalizadorMetrico()
+        self.resultados = [analizador.analisis_completo(p) for p in generar_corpus(100)]
+        # Diez parciales, como los que devolverían diez procesos trabajadores
+        self.parciales = [EstadisticasCorpus() for _ in range(10)]
+        for i, resultado in enumerate(self.resultados):
+            self.parciales[i % 10].agregar(resultado)
+        self.total = EstadisticasCorpus.combinar(self.parciales)
+        versos = sum(len(r['versos_analizados']) for r in self.resultados)
+        self.unidades = {
+            'time_agregar_corpus': (versos, 'versos'),
+            'time_combinar_parciales': (len(self.parciales), 'parciales'),
+        }
+
+    def time_agregar_corpus(self):
+        estadisticas = EstadisticasCorpus()
+        for resultado in self.resultados:
+            estadisticas.agregar(resultado)
+
+    def time_combinar_parciales(self):
+        EstadisticasCorpus.combinar(self.parciales)
+
+    def time_agregar_un_poema(self):
+        # Actualización incremental: no depende del tamaño acumulado
+        EstadisticasCorpus().fusionar(self.total).agregar(self.resultados[0])
+
+    def time_resumen(self):
+        self.total.resumen()
+
+
+class BocetosSuite:
+    """Bocetos de memoria fija frente a los contadores exactos"""
+
+    mayor_es_mejor = ('track_top10_coincidentes',)
+
+    def setup(self):
+        from collections import Counter
+
+        self.palabras = [p for poema in generar_corpus(500) for p in poema.lower().split()]
+        self.silabas = [i % 17 + 3 for i in range(len(self.palabras))]
+        self.exacto = Counter(self.palabras)
+        self.hll = HyperLogLog()
+        self.cms = CountMin()
+        self.digest = TDigest()
+        for palabra, silabas in zip(self.palabras, self.silabas):
+            self.hll.agregar(palabra)
+            self.cms.agregar(palabra)
+            self.digest.agregar(silabas)
+        self.unidades = {
+            'time_hyperloglog': (len(self.palabras), 'palabras'),
+            'time_count_min': (len(self.palabras), 'palabras'),
+            'time_tdigest': (len(self.silabas), 'valores'),
+        }
+
+    def time_hyperloglog(self):
+        hll = HyperLogLog()
+        for palabra in self.palabras:
+            hll.agregar(palabra)
+
+    def time_count_min(self):
+        cms = CountMin()
+        for palabra in self.palabras:
+            cms.agregar(palabra)
+
+    def time_tdigest(self):
+        digest = TDigest()
+        for valor in self.silabas:
+            digest.agregar(valor)
+        digest.cuantil(0.5)
+
+    def track_error_distintas_pct(self):
+        return 100 * abs(self.hll.estimar() - len(self.exacto)) / len(self.exacto)
+
+    def track_top10_coincidentes(self):
+        exactas = {p for p, _ in self.exacto.most_common(10)}
+        return len(exactas & {p for p, _ in self.cms.mas_frecuentes(10)})
+
+    def track_bytes_bocetos(self):
+        return self.hll.bytes + self.cms.bytes + self.digest.bytes
+
+
+class VistaAnalisisSuite:
+    """Preparación de la vista por verso: tabla paginada frente a un widget por verso"""
+
+    params = [14, 1000]
+    param_names = ['versos']
+
+    def setup(self, versos):
+        from utils.resultados import columnas_versos, pagina_columnas
+
+        self.columnas_versos = columnas_versos
+        self.pagina_columnas = pagina_columnas
+        self.por_pagina = 50
+        texto = GeneradorCorpus().poema_largo(versos)
+        self.resultado = AnalizadorMetrico().analisis_completo(texto)
+        self.esquema = DetectorRimas().detectar_esquema(_versos(texto))
+        self.unidades = {
+            'time_tabla_paginada': (versos, 'versos'),
+            'time_html_por_verso': (versos, 'versos'),
+            'track_elementos_tabla': (1, 'elementos'),
+            'track_elementos_por_verso': (1, 'elementos'),
+        }
+
+    def time_tabla_paginada(self, versos):
+        columnas = self.columnas_versos(self.resultado['versos_analizados'], self.esquema)
+        self.pagina_columnas(columnas, 1, self.por_pagina)
+
+    def time_html_por_verso(self, versos):
+        # Referencia: lo que se generaba antes (expander + HTML + línea de rima por verso)
+        elementos = []
+        for v, letra in zip(self.resultado['versos_analizados'], self.esquema):
+            elementos.append(f"Verso {v['numero']}: {v['silabas']} sílabas")
+            elementos.append(f"<p>{v['texto']}</p><p>{v['silabas']}</p><p>{v['metro']}</p>"
+                             f"<p>{', '.join(map(str, v['acentos']))}</p>")
+            elementos.append(f"Verso {v['numero']} ({letra}): {v['texto']}")
+        return elementos
+
+    def track_elementos_tabla(self, versos):
+        # Una tabla con la página visible (más el selector de página)
+        return 1 + (versos > self.por_pagina)
+
+    def track_elementos_por_verso(self, versos):
+        return 3 * versos
+
+
+class IndicadorSuite:
+    """Indicador en vivo: anotar todas las líneas tras editar una sola"""
+
+    params = [14, 200]
+    param_names = ['versos']
+
+    def setup(self, versos):
+        from utils.indicador import IndicadorSilabas
+
+        self.contador = ContadorSilabas()
+        self.indicador = IndicadorSilabas(self.contador)
+        self.texto = GeneradorCorpus().poema_largo(versos)
+        self.indicador.anotar(self.texto)
+        self.ediciones = [self.texto + f"\ny el mar{'a' * i}" for i in range(20)]
+        self.unidades = {
+            'time_anotar_tras_edicion': (len(self.ediciones), 'pasadas'),
+            'time_recontar_todo': (len(self.ediciones), 'pasadas'),
+        }
+
+    def time_anotar_tras_edicion(self, versos):
+        for texto in self.ediciones:
+            self.indicador.anotar(texto)
+
+    def time_recontar_todo(self, versos):
+        # Referencia: contar todas las líneas en cada pasada, sin caché
+        for texto in self.ediciones:
+            [self.contador.contar_silabas_verso(v) for v in _versos(texto)]
+
+
+class RimasSuite:
+    """Escalado de la detección de rimas con el número de versos"""
+
+    params = [14, 56, 224, 896]
+    param_names = ['versos']
+
+    def setup(self, versos):
+        self.detector = DetectorRimas()
+        self.versos = _versos(GeneradorCorpus().poema_largo(versos))
+        self.unidades = {
+            'time_detectar_esquema': (len(self.versos), 'versos'),
+            'time_analizar_rimas_detallado': (len(self.versos), 'versos'),
+        }
+
+    def time_detectar_esquema(self, versos):
+        self.detector.detectar_esquema(self.versos)
+
+    def time_analizar_rimas_detallado(self, versos):
+        self.detector.analizar_rimas_detallado(self.versos)
+
+
+class DiccionarioRimasSuite:
+    """Carga del índice de rimas y consultas con y sin filtros"""
+
+    def setup(self):
+        from utils.diccionario_rimas import DiccionarioRimas, RUTA_LISTA
+
+        if not RUTA_LISTA.exists():
+            raise NotImplementedError("Lista de palabras no disponible")
+        # La primera apertura construye el índice si falta; no se cronometra
+        self.diccionario = DiccionarioRimas()
+        self.clase = DiccionarioRimas
+        corpus = generar_corpus(10)
+        self.palabras = [v.split()[-1] for poema in corpus for v in _versos(poema)]
+        self.unidades = {
+            'time_cargar_indice': (1, 'cargas'),
+            'time_buscar_consonante': (len(self.palabras), 'consultas'),
+            'time_buscar_asonante_filtrada': (len(self.palabras), 'consultas'),
+            'track_palabras_indexadas': (1, 'palabras'),
+        }
+
+    def time_cargar_indice(self):
+        self.clase(reconstruir=False).cerrar()
+
+    def time_buscar_consonante(self):
+        for palabra in self.palabras:
+            self.diccionario.buscar(palabra)
+
+    def time_buscar_asonante_filtrada(self):
+        for palabra in self.palabras:
+            self.diccionario.buscar(palabra, 'asonante', silabas=3, acentuacion='llana')
+
+    def track_palabras_indexadas(self):
+        return len(self.diccionario)
+
+
+class TrieRimasSuite:
+    """Búsqueda de versos que riman en un corpus frente al recorrido lineal"""
+
+    params = [50, 200, 800]
+    param_names = ['poemas']
+
+    def setup(self, poemas):
+        from utils.trie_rimas import TrieRimas
+
+        self.detector = DetectorRimas()
+        self.clase = TrieRimas
+        self.corpus = generar_corpus(poemas)
+        self.trie = TrieRimas(self.detector)
+        for i, poema in enumerate(self.corpus):
+            self.trie.agregar_poema(i, poema)
+        self.terminaciones = [self.detector.extraer_terminacion_rima(v)
+                              for poema in self.corpus for v in _versos(poema)]
+        self.consultas = [v for v in _versos(self.corpus[0])]
+        self.unidades = {
+            'time_indexar_corpus': (len(self.terminaciones), 'versos'),
+            'time_buscar_trie': (len(self.consultas), 'consultas'),
+            'time_buscar_lineal': (len(self.consultas), 'consultas'),
+        }
+
+    def time_indexar_corpus(self, poemas):
+        trie = self.clase(self.detector)
+        for i, poema in enumerate(self.corpus):
+            trie.agregar_poema(i, poema)
+
+    def time_buscar_trie(self, poemas):
+        for verso in self.consultas:
+            self.trie.buscar(verso)
+
+    def time_buscar_lineal(self, poemas):
+        # Referencia: comparar contra cada terminación guardada
+        for verso in self.consultas:
+            terminacion = self.detector.extraer_terminacion_rima(verso)
+            [t for t in self.terminaciones if self.detector.son_rimas_consonantes(terminacion, t)]
+
+
+class AlmacenSuite:
+    """Búsqueda indexada en el almacén de poemas guardados"""
+
+    params = [100, 1000]
+    param_names = ['poemas']
+
+    def setup(self, poemas):
+        from utils.almacen import AlmacenPoemas
+
+        self.almacen = AlmacenPoemas(':memory:')
+        self.almacen.max_poemas = poemas
+        for i, poema in enumerate(generar_corpus(poemas)):
+            self.almacen.guardar(f"poema {i}", poema)
+        self.metro = self.almacen.metros()[0]
+        self.unidades = {
+            'time_buscar_palabra': (1, 'consultas'),
+            'time_buscar_combinada': (1, 'consultas'),
+            'time_buscar_prefijo_paginada': (1, 'consultas'),
+        }
+
+    def time_buscar_palabra(self, poemas):
+        self.almacen.buscar(texto='mar')
+
+    def time_buscar_combinada(self, poemas):
+        self.almacen.buscar(texto='mar', metro=self.metro, esquema='AB', versos_min=8)
+
+    def time_buscar_prefijo_paginada(self, poemas):
+        self.almacen.buscar(texto='cora*', pagina=3, por_pagina=20)
+
+
+class HuellasSuite:
+    """Duplicados y casi duplicados: LSH frente a comparar con todas las firmas"""
+
+    mayor_es_mejor = ('track_encontrados_lsh',)
+
+    params = [1000, 5000]
+    param_names = ['poemas']
+
+    def setup(self, poemas):
+        from utils.huellas import HuellaPoema, IndiceHuellas
+
+        corpus = generar_corpus(poemas)
+        self.indice = IndiceHuellas()
+        self.huellas = {}
+        for i, poema in enumerate(corpus):
+            self.huellas[i] = self.indice.agregar(i, poema)
+        # Consulta: un poema del corpus con un verso cambiado
+        versos = corpus[poemas // 2].split('\n')
+        versos[1] += ' otra vez'
+        self.consulta = HuellaPoema.desde_texto('\n'.join(versos))
+        self.poema = corpus[0]
+        self.unidades = {
+            'time_huella_poema': (1, 'poemas'),
+            'time_similares_lsh': (1, 'consultas'),
+            'time_similares_lineal': (1, 'consultas'),
+        }
+
+    def time_huella_poema(self, poemas):
+        from utils.huellas import HuellaPoema
+        HuellaPoema.desde_texto(self.poema)
+
+    def time_similares_lsh(self, poemas):
+        self.indice.similares(self.consulta)
+
+    def time_similares_lineal(self, poemas):
+        [c for c, h in self.huellas.items() if self.consulta.similitud(h) >= 0.8]
+
+    def track_encontrados_lsh(self, poemas):
+        return len(self.indice.similares(self.consulta))
+
+
+class IntertextualidadSuite:
+    """Versos reutilizados: consulta de un soneto contra el índice de versos"""
+
+    mayor_es_mejor = ('track_versos_con_coincidencias',)
+
+    params = [1000, 5000]
+    param_names = ['poemas']
+
+    def setup(self, poemas):
+        from utils.almacen import AlmacenPoemas
+        from utils.intertextualidad import BuscadorIntertextual
+        from utils.tareas import tarea_describir
+
+        self.almacen = AlmacenPoemas(':memory:')
+        self.almacen.max_poemas = poemas
+        self.almacen.guardar_lote(tarea_describir(
+            [(f"poema {i}", poema) for i, poema in enumerate(generar_corpus(poemas))]))
+        self.buscador = BuscadorIntertextual(self.almacen)
+        # Consulta: soneto nuevo con dos versos de un poema guardado
+        versos = GeneradorCorpus(semilla=7).soneto().split('\n')
+        guardados = self.almacen.obtener(f"poema {poemas // 2}")['contenido'].split('\n')
+        versos[0], versos[5] = guardados[0], 'y dijo ' + guardados[1]
+        self.consulta = '\n'.join(versos)
+        self.unidades = {
+            'time_buscar_soneto': (1, 'consultas'),
+        }
+
+    def time_buscar_soneto(self, poemas):
+        self.buscador.buscar(self.consulta)
+
+    def track_versos_con_coincidencias(self, poemas):
+        return len(self.buscador.buscar(self.consulta))
+
+
+class ExportacionSuite:
+    """Latencia de exportación de un soneto analizado por formato"""
+
+    params = ['txt', 'html', 'json', 'markdown', 'pdf']
+    param_names = ['formato']
+
+    def setup(self, formato):
+        try:
+            from utils.exportar import ExportadorPoesia
+        except ImportError as e:
+            raise NotImplementedError(f"Exportador no disponible: {e}")
+
+        self.exportador = ExportadorPoesia()
+        self.texto = GeneradorCorpus().soneto()
+        analisis = AnalizadorMetrico().analisis_completo(self.texto)
+        self.metadatos = {
+            'autor': 'Benchmark',
+            'fecha': '2000-01-01',
+            'analisis': {
+                'metro_dominante': analisis['metro_dominante'],
+                'total_versos': analisis['estadisticas']['total_versos'],
+            }
+        }
+        self.unidades = {'time_exportar': (1, 'documentos')}
+
+    def time_exportar(self, formato):
+        if formato == 'json':
+            self.exportador.exportar_json(self.texto, 'Soneto', self.metadatos)
+        elif formato == 'html':
+            self.exportador.exportar_html(self.texto, 'Soneto', self.metadatos, incluir_analisis=True)
+        elif formato == 'pdf':
+            self.exportador.exportar_pdf(self.texto, 'Soneto', self.metadatos, incluir_analisis=True)
+        elif formato == 'markdown':
+            self.exportador.exportar_markdown(self.texto, 'Soneto', self.metadatos)
+        else:
+            self.exportador.exportar_txt(self.texto, 'Soneto', self.metadatos)
+
+
+class MemoriaSuite:
+    """Memoria retenida por los resultados de análisis"""
+
+    def setup(self):
+        self.corpus = generar_corpus(60)
+        self.unidades = {
+            'track_bytes_por_verso': (1, 'bytes/verso'),
+            'track_bytes_por_palabra': (1, 'bytes/palabra'),
+        }
+
+    def _medir(self, producir):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            retenido = producir()
+            gc.collect()
+            actual, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return actual, retenido
+
+    def track_bytes_por_verso(self):
+        analizador = AnalizadorMetrico()
+        memoria, resultados = self._medir(
+            lambda: [analizador.analisis_completo(p) for p in self.corpus])
+        versos = sum(len(r['versos_analizados']) for r in resultados)
+        return memoria / versos
+
+    def track_bytes_por_palabra(self):
+        contador = ContadorSilabas()
+        palabras = [p for poema in self.corpus for p in poema.split()]
+        memoria, _ = self._medir(
+            lambda: [contador.analizar_palabra_detallado(p) for p in palabras])
+        return memoria / len(palabras)
+
+
+SUITES = [SilabasSuite, EscansionSuite, EstrofasSuite, FormasSuite, EstadisticasSuite,
+          BocetosSuite, VistaAnalisisSuite, IndicadorSuite, RimasSuite, DiccionarioRimasSuite,
+          TrieRimasSuite, AlmacenSuite, HuellasSuite, IntertextualidadSuite, ExportacionSuite,
+          MemoriaSuite]
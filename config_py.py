@@ -28,6 +28,26 @@ SERVER_CONFIG = {
     }
 }
 
+# Configuración del servicio HTTP sin interfaz (api.py)
+SERVICE_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8600,
+    'workers': None,  # Procesos de análisis (None = número de CPUs)
+    'max_body_bytes': 256 * 1024,
+    'batch_max_size': 64,  # Versos por micro-lote en /syllabify/line
+    'batch_max_wait_ms': 5.0  # Espera máxima para completar un micro-lote
+}
+
+# Ingesta de corpus por etapas (python -m utils.ingesta)
+INGEST_CONFIG = {
+    'workers': None,  # Procesos de análisis (None = los del servicio o número de CPUs)
+    'readers': 8,  # Lecturas de archivo simultáneas
+    'queue_size': 64,  # Capacidad de cada cola entre etapas
+    'analysis_batch': 32,  # Poemas por tarea enviada al pool de procesos
+    'write_batch': 1000,  # Poemas por transacción en el almacén
+    'report_interval_s': 5.0  # Cada cuánto se registra el progreso (0 = nunca)
+}
+
 # Directorios de la aplicación
 BASE_DIR = Path(__file__).parent
 UTILS_DIR = BASE_DIR / 'utils'
@@ -123,6 +143,11 @@ VOICE_CONFIG = {
         'prefer_female': True,  # Para poesía tradicionalmente más expresiva
         'prefer_quality': ['enhanced', 'premium', 'neural', 'hd'],
         'fallback_rate': 150
+    },
+    'pipeline': {
+        'enabled': True,  # Sintetizar versos por adelantado y reproducirlos en orden
+        'lookahead': 3,  # Versos sintetizados por delante del que suena
+        'render_workers': 1  # Hilos de síntesis (pyttsx3 usa un único motor)
     }
 }
 
@@ -131,7 +156,9 @@ METRIC_ANALYSIS_CONFIG = {
     'syllable_counting': {
         'apply_sinalefa': True,
         'apply_final_accent_rule': True,
-        'strict_hiatus_detection': False
+        'strict_hiatus_detection': False,
+        'use_lexicon': True,  # Consultar el léxico precompilado antes de las reglas
+        'lexicon_file': 'data/lexico.idx'
     },
     'meter_classification': {
         'arte_menor_max': 8,
@@ -147,12 +174,34 @@ METRIC_ANALYSIS_CONFIG = {
             11: 'Endecasílabo',
             12: 'Dodecasílabo',
             14: 'Alejandrino'
-        }
+        },
+        'max_table_syllables': 32,  # Metros precalculados de 0 a N sílabas
+        'stress_cache_max': 50000  # Palabras memoizadas en la detección de acentos
+    },
+    'scansion': {
+        'enabled': True,  # Buscar licencias para los versos fuera del metro dominante
+        'max_licenses': 3,  # Licencias (sinalefa, dialefa, sinéresis...) por verso
+        'word_cache_max': 50000
+    },
+    'intertextuality': {
+        'shingle_words': 2,  # Palabras por teja del índice de versos
+        'verse_threshold': 0.5,  # Similitud (Jaccard de tejas) de un verso reutilizado
+        'hemistich_containment': 0.8,  # Tramo común más largo frente a medio verso
+        'hemistich_max_coverage': 0.75,  # Fracción del verso que puede cubrir un hemistiquio
+        'min_shared_shingles': 2  # Tejas compartidas para considerar un candidato
+    },
+    'stanzas': {
+        'parse_cache_size': 64,  # Textos cuyo modelo de poema se conserva
+        'cache_max': 1024,  # Estrofas analizadas que se recuerdan
+        'parallel_min_stanzas': 8  # A partir de aquí /analyze reparte las estrofas
     },
     'rhyme_detection': {
         'minimum_match_length': 2,
         'vowel_normalization': True,
-        'accent_normalization': True
+        'accent_normalization': True,
+        'word_list': 'utils/datos/palabras.txt',  # Lista de palabras incluida
+        'rhyme_index_file': 'data/rimas.idx',  # Índice binario (se regenera si cambia la lista)
+        'max_suggestions': 20
     }
 }
 
@@ -209,6 +258,8 @@ UI_CONFIG = {
     'layout': 'wide',
     'sidebar_state': 'expanded',
     'max_textarea_height': 400,
+    'verses_per_page': 50,  # Filas visibles de la tabla de análisis por verso
+    'syllable_cache_size': 2000,  # Líneas distintas recordadas por el indicador en vivo
     'default_examples': [
         {
             'title': 'Romance de Góngora',
@@ -252,7 +303,14 @@ DATABASE_CONFIG = {
     'db_file': str(DATA_DIR / 'poems.db'),
     'backup_interval_hours': 24,
     'max_poems_per_user': 1000,
-    'auto_backup': True
+    'auto_backup': True,
+    'fingerprints': {
+        # Huellas de contenido para detectar poemas duplicados y casi duplicados
+        'num_perm': 128,  # Permutaciones de la firma MinHash
+        'bands': 16,  # Bandas LSH (num_perm / bands filas por banda)
+        'shingle_words': 3,  # Palabras por teja dentro de cada verso
+        'near_duplicate_threshold': 0.8  # Similitud mínima para considerar casi duplicado
+    }
 }
 
 # Configuración de APIs externas (opcional)
@@ -280,6 +338,19 @@ ANALYTICS_CONFIG = {
     'track_usage': False,  # Solo métricas locales
     'save_analysis_history': True,
     'max_history_entries': 500,
+    'history_compression_level': 6,  # Nivel zlib de los resultados completos
+    'history_spill_dir': None,  # Directorio para volcar resultados a disco (None = RAM comprimida)
+    'corpus_stats_batch': 50,  # Poemas por tarea al calcular estadísticas de un corpus
+    'top_vocabulary': 20,  # Palabras más frecuentes en el resumen de estadísticas
+    'sketches': {
+        # Bocetos de memoria fija para corpus enormes (estadísticas aproximadas)
+        'enabled': False,
+        'hll_precision': 14,  # 2^14 registros (16 KB), error ~0.8% en palabras distintas
+        'cms_width': 4096,  # Contadores por fila de Count-Min
+        'cms_depth': 4,  # Filas de Count-Min (4096 x 4 x 8 bytes = 128 KB)
+        'tdigest_compression': 100,  # Centroides aproximados del t-digest de sílabas
+        'top_k': 100  # Claves más frecuentes que recuerda cada Count-Min
+    },
     'export_analytics': True
 }
 
@@ -287,8 +358,11 @@ ANALYTICS_CONFIG = {
 SECURITY_CONFIG = {
     'max_file_size_mb': 10,
     'allowed_file_types': ['.txt', '.md', '.json'],
+    'allowed_archive_types': ['.zip'],  # Contenedores cuyos miembros se importan
     'rate_limiting': {
         'max_requests_per_minute': 60,
+        # /syllabify/line: un editor envía una petición por línea tecleada
+        'max_line_requests_per_minute': 1200,
         'max_text_length': 50000  # caracteres
     },
     'sanitize_input': True
@@ -298,7 +372,10 @@ SECURITY_CONFIG = {
 PERFORMANCE_CONFIG = {
     'cache_enabled': True,
     'cache_ttl_seconds': 3600,
-    'max_concurrent_voice_synthesis': 1,
+    'max_concurrent_voice_synthesis': 1,  # Síntesis simultáneas en todo el proceso
+    'voice_queue_timeout_s': 30,  # Espera máxima en cola antes de descartar un recitado
+    'voice_synthesis_timeout_s': 300,  # Duración máxima de un recitado
+    'voice_queue_max': 64,  # Recitados en cola entre todas las sesiones
     'chunk_large_texts': True,
     'chunk_size_chars': 10000
 }
@@ -332,6 +409,8 @@ DEBUG_CONFIG = {
     'show_raw_data': False,
     'log_level': 'DEBUG' if os.getenv('DEBUG') else 'INFO',
     'profiling': False,
+    'profiling_dump_pstats': False,  # Vuelca un perfil cProfile por petición
+    'profiling_samples': 2048,  # Muestras recientes para percentiles
     'mock_voice_synthesis': False  # Para testing sin audio
 }
 
@@ -351,6 +430,8 @@ def get_config(section=None):
     return {
         'app': APP_INFO,
         'server': SERVER_CONFIG,
+        'service': SERVICE_CONFIG,
+        'ingest': INGEST_CONFIG,
         'voice': VOICE_CONFIG,
         'metrics': METRIC_ANALYSIS_CONFIG,
         'export': EXPORT_CONFIG,
@@ -0,0 +1,55 @@
+"""
+Búsqueda intertextual de versos y hemistiquios reutilizados
+
+Uso:
+    python -m pytest tests/test_intertextualidad.py
+"""
+
+import pytest
+
+from utils.almacen import AlmacenPoemas
+from utils.intertextualidad import BuscadorIntertextual
+
+_SONETO_X = """¡Oh dulces prendas, por mi mal halladas,
+dulces y alegres cuando Dios quería,
+juntas estáis en la memoria mía
+y con ella en mi muerte conjuradas!"""
+
+_SONETO_XXIII = """En tanto que de rosa y azucena
+se muestra la color en vuestro gesto,
+y que vuestro mirar ardiente, honesto,
+con clara luz la tempestad serena;"""
+
+
+@pytest.fixture(scope='module')
+def buscador():
+    almacen = AlmacenPoemas(':memory:')
+    almacen.guardar('Soneto X', _SONETO_X)
+    almacen.guardar('Soneto XXIII', _SONETO_XXIII)
+    yield BuscadorIntertextual(almacen)
+    almacen.cerrar()
+
+
+def _coincidencias(buscador, verso):
+    return [(c['titulo'], c['verso'], c['tipo'])
+            for v in buscador.buscar(verso) for c in v['coincidencias']]
+
+
+@pytest.mark.parametrize('verso, esperado', [
+    # Medio verso reutilizado dentro de un verso nuevo
+    ('que de rosa y azucena la doncella', ('Soneto XXIII', 1, 'hemistiquio')),
+    ('oh dulces prendas dijo el caballero', ('Soneto X', 1, 'hemistiquio')),
+    ('la tempestad serena del ocaso', ('Soneto XXIII', 4, 'hemistiquio')),
+    # Medio verso suelto: hemistiquio aunque su Jaccard pase el umbral
+    ('dulces prendas por mi mal', ('Soneto X', 1, 'hemistiquio')),
+    # Verso entero, copiado o retocado
+    ('Oh dulces prendas, por mi mal halladas', ('Soneto X', 1, 'verso')),
+    ('juntas estáis en la memoria nuestra', ('Soneto X', 3, 'verso')),
+    ('con clara luz y la tempestad serena', ('Soneto XXIII', 4, 'verso')),
+])
+def test_verso_reutilizado(buscador, verso, esperado):
+    assert _coincidencias(buscador, verso) == [esperado]
+
+
+def test_sin_coincidencias(buscador):
+    assert _coincidencias(buscador, 'el viento de la tarde sobre el trigo') == []
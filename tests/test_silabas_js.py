@@ -0,0 +1,109 @@
+"""
+Conformidad del contador de sílabas JavaScript con ContadorSilabas
+
+Genera el módulo de utils/silabas_js.py, lo ejecuta con node sobre las
+palabras del léxico, variantes que no están en él (derivadas, con
+mayúsculas y puntuación) y los versos del corpus sintético, y compara
+sílabas, acentuación y sílabas métricas con el motor de Python.
+
+Uso:
+    python -m pytest tests/test_silabas_js.py
+"""
+
+import json
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks.corpus import generar_corpus
+from utils.color import crear_script_silabas
+from utils.silabas import ContadorSilabas
+from utils.silabas_js import generar_modulo
+
+NODE = shutil.which('node')
+
+_SCRIPT_NODE = """
+const fs = require('fs');
+const silabas = require(process.argv[2]);
+const casos = JSON.parse(fs.readFileSync(process.argv[3], 'utf8'));
+const resultado = {
+  palabras: casos.palabras.map(p => [silabas.contarSilabas(p), silabas.detectarAcentuacion(p)]),
+  versos: casos.versos.map(v => silabas.contarSilabasVerso(v)),
+};
+fs.writeFileSync(process.argv[4], JSON.stringify(resultado));
+"""
+
+_SUFIJOS = ('ito', 'ísimo', 'mente', 'es', 'ción', 'aba', 'ía')
+
+
+def _casos(contador):
+    palabras = set()
+    if contador.lexico is not None:
+        palabras.update(contador.lexico)
+    else:
+        from utils.lexico import RUTA_LISTA
+        if RUTA_LISTA.exists():
+            palabras.update(RUTA_LISTA.read_text(encoding='utf-8').split())
+
+    # Palabras fuera del léxico: derivadas, mayúsculas y signos de puntuación
+    base = sorted(palabras)[::50]
+    variantes = {p + sufijo for p in base for sufijo in _SUFIJOS}
+    variantes.update(p.capitalize() + ',' for p in base)
+    variantes.update(f"¡{p.upper()}!" for p in base[::5])
+
+    versos = [v.strip() for poema in generar_corpus(100) for v in poema.split('\n') if v.strip()]
+    for poema in generar_corpus(20, semilla=7):
+        versos.extend(v.strip().lower() for v in poema.split('\n') if v.strip())
+    return sorted(palabras | variantes), versos
+
+
+def comprobar(node='node', usar_lexico=None):
+    """Devuelve (total de casos, lista de diferencias)"""
+    contador = ContadorSilabas(usar_lexico=usar_lexico)
+    palabras, versos = _casos(contador)
+
+    esperado_palabras = [[contador.contar_silabas(p), contador.detectar_acentuacion(p)]
+                         for p in palabras]
+    esperado_versos = [contador.contar_silabas_verso(v) for v in versos]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        directorio = Path(directorio)
+        modulo = directorio / 'silabas.js'
+        modulo.write_text(generar_modulo(incluir_lexico=contador.lexico is not None),
+                          encoding='utf-8')
+        script = directorio / 'conformidad.js'
+        script.write_text(_SCRIPT_NODE, encoding='utf-8')
+        entrada = directorio / 'casos.json'
+        entrada.write_text(json.dumps({'palabras': palabras, 'versos': versos},
+                                      ensure_ascii=False), encoding='utf-8')
+        salida = directorio / 'resultado.json'
+
+        subprocess.run([node, str(script), str(modulo), str(entrada), str(salida)], check=True)
+        obtenido = json.loads(salida.read_text(encoding='utf-8'))
+
+    diferencias = []
+    for palabra, esperado, js in zip(palabras, esperado_palabras, obtenido['palabras']):
+        if esperado != js:
+            diferencias.append(('palabra', palabra, esperado, js))
+    for verso, esperado, js in zip(versos, esperado_versos, obtenido['versos']):
+        if esperado != js:
+            diferencias.append(('verso', verso, esperado, js))
+    return len(palabras) + len(versos), diferencias
+
+
+@pytest.mark.skipif(NODE is None, reason='requiere node')
+@pytest.mark.parametrize('usar_lexico', [None, False], ids=['lexico', 'reglas'])
+def test_modulo_coincide_con_contador(usar_lexico):
+    total, diferencias = comprobar(NODE, usar_lexico=usar_lexico)
+    detalle = '\n'.join(f"{tipo} {caso!r}: python={esperado} js={js}"
+                        for tipo, caso, esperado, js in diferencias[:20])
+    assert not diferencias, f"{len(diferencias)} de {total} casos difieren:\n{detalle}"
+
+
+def test_script_editor_incluye_modulo():
+    script = crear_script_silabas()
+    assert 'SilabasPoeticas' in script
+    assert 'window.parent.document' in script
@@ -5,11 +5,29 @@ Este paquete contiene todas las herramientas especializadas para el análisis
 métrico de poesía en español, síntesis de voz y exportación de documentos.
 
 Módulos:
-- metrica: Análisis métrico avanzado (sílabas, metros, ritmo)
+- poema: Modelo del poema (estrofas, versos y tokens con sus posiciones)
+- metrica: Análisis métrico avanzado (sílabas, metros, ritmo), por estrofa
 - silabas: Contador especializado de sílabas con reglas métricas
+- escansion: Medidas alternativas de un verso con licencias métricas
+- lexico: Léxico silábico precompilado y mapeado en memoria
+- silabas_js: Genera el contador de sílabas en JavaScript para el editor
+- indicador: Recuento de sílabas en vivo por línea, con caché
 - rimas: Detector de rimas consonantes y asonantes
+- formas: Reconocedor de formas estróficas con un autómata precompilado
+- diccionario_rimas: Índice de rimas sobre la lista de palabras incluida
+- trie_rimas: Trie de terminaciones para buscar versos que riman
+- almacen: Poemas guardados en SQLite con búsqueda indexada
+- estadisticas: Estadísticas de corpus con agregados parciales combinables
+- bocetos: Bocetos de memoria fija (HyperLogLog, Count-Min, t-digest)
+- ingesta: Ingesta de archivos de poemas por etapas con colas acotadas
+- importar: Importación masiva de poemas desde TXT, Markdown, JSON y ZIP
+- huellas: Huellas de contenido para detectar duplicados y casi duplicados
+- intertextualidad: Búsqueda de versos y hemistiquios reutilizados de poemas guardados
 - voz: Sistema de síntesis de voz optimizado para poesía
+- recitado: Recitado encadenado con síntesis adelantada y reproducción en orden
+- planificador_voz: Planificador de síntesis con concurrencia limitada y cola justa por sesión
 - exportar: Exportación a múltiples formatos (PDF, HTML, JSON, etc.)
+- perfilado: Instrumentación de tiempos y perfiles de las operaciones críticas
 """
 
 __version__ = '1.0.0'
@@ -0,0 +1,705 @@
+"""
+Almacén de poemas guardados con búsqueda indexada
+
+Los poemas se guardan en SQLite (DATABASE_CONFIG['db_file']) junto con los
+datos que se consultan al buscar, calculados una sola vez al guardar: metro
+dominante, esquema de rima, número de versos y fecha, cada uno con su
+índice secundario. Las palabras de cada poema van a un índice invertido
+(palabra normalizada -> poema), así que una consulta como "endecasílabos
+con ABBA que contengan 'mar'" se resuelve con búsquedas por índice en vez
+de recorrer y reanalizar todos los poemas.
+
+Cada poema guarda también su huella de contenido (utils/huellas.py): la
+huella exacta, indexada, detecta el mismo poema guardado con otro título
+o con otra puntuación, y las claves LSH de su firma MinHash (tabla
+bandas_lsh) encuentran los casi duplicados consultando solo los poemas
+que comparten alguna banda. Si se guarda un poema cuyo contenido ya está
+en el almacén, se reutilizan sus datos de análisis en vez de recalcularlos.
+
+Los versos de cada poema se guardan con sus sílabas, su terminación de
+rima y sus tejas de palabras (tablas versos_poema y tejas_verso), que
+usa BuscadorIntertextual (utils/intertextualidad.py) para encontrar
+versos y hemistiquios reutilizados.
+
+Cada poema pertenece a un propietario (la clave de usuario de la sesión
+en la aplicación; '' para el corpus compartido que se ingiere por línea
+de órdenes). Los títulos son únicos por propietario y todas las
+consultas y el límite max_poems_per_user se aplican a los poemas del
+propietario del almacén; para() da la vista de otro propietario sobre la
+misma conexión. La búsqueda intertextual consulta además el corpus
+compartido.
+
+Otros índices en memoria (p. ej. trie_rimas.RimasAlmacen) se mantienen al
+día suscribiéndose a los cambios con suscribir().
+"""
+
+import copy
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+from datetime import datetime
+
+from .intertextualidad import indice_versos
+from .huellas import (HuellaPoema, NUM_PERMUTACIONES, BANDAS, UMBRAL_SIMILITUD,
+                      VERSION_NORMALIZACION, huella_exacta)
+from .poema import analizar_poema
+
+try:
+    from config_py import DATABASE_CONFIG
+except ImportError:
+    DATABASE_CONFIG = {'use_sqlite': False, 'max_poems_per_user': 1000}
+
+FORMATO_FECHA = '%Y-%m-%d %H:%M'
+
+_PALABRA = re.compile(r"[^\W\d_]+")
+
+_TABLA_POEMAS = """
+CREATE TABLE IF NOT EXISTS {} (
+    id INTEGER PRIMARY KEY,
+    propietario TEXT NOT NULL DEFAULT '',
+    titulo TEXT NOT NULL,
+    contenido TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    versos INTEGER NOT NULL,
+    palabras INTEGER NOT NULL,
+    caracteres INTEGER NOT NULL,
+    metro TEXT NOT NULL,
+    metro_dominante TEXT NOT NULL,
+    esquema TEXT NOT NULL,
+    tipo_rima TEXT NOT NULL,
+    UNIQUE (propietario, titulo)
+);
+"""
+
+_ESQUEMA_SQL = _TABLA_POEMAS.format('poemas') + """
+CREATE INDEX IF NOT EXISTS idx_poemas_metro ON poemas (metro);
+CREATE INDEX IF NOT EXISTS idx_poemas_esquema ON poemas (esquema);
+CREATE INDEX IF NOT EXISTS idx_poemas_versos ON poemas (versos);
+CREATE INDEX IF NOT EXISTS idx_poemas_fecha ON poemas (fecha);
+
+CREATE TABLE IF NOT EXISTS palabras_poema (
+    palabra TEXT NOT NULL,
+    poema_id INTEGER NOT NULL REFERENCES poemas (id) ON DELETE CASCADE,
+    frecuencia INTEGER NOT NULL,
+    PRIMARY KEY (palabra, poema_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_palabras_poema ON palabras_poema (poema_id);
+
+CREATE TABLE IF NOT EXISTS huellas (
+    poema_id INTEGER PRIMARY KEY REFERENCES poemas (id) ON DELETE CASCADE,
+    exacta TEXT NOT NULL,
+    firma BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_huellas_exacta ON huellas (exacta);
+
+CREATE TABLE IF NOT EXISTS bandas_lsh (
+    banda INTEGER NOT NULL,
+    clave INTEGER NOT NULL,
+    poema_id INTEGER NOT NULL REFERENCES poemas (id) ON DELETE CASCADE,
+    PRIMARY KEY (banda, clave, poema_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_bandas_poema ON bandas_lsh (poema_id);
+
+CREATE TABLE IF NOT EXISTS versos_poema (
+    id INTEGER PRIMARY KEY,
+    poema_id INTEGER NOT NULL REFERENCES poemas (id) ON DELETE CASCADE,
+    numero INTEGER NOT NULL,
+    texto TEXT NOT NULL,
+    silabas INTEGER NOT NULL,
+    terminacion TEXT NOT NULL,
+    tejas INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_versos_poema ON versos_poema (poema_id);
+
+CREATE TABLE IF NOT EXISTS tejas_verso (
+    teja INTEGER NOT NULL,
+    verso_id INTEGER NOT NULL REFERENCES versos_poema (id) ON DELETE CASCADE,
+    PRIMARY KEY (teja, verso_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tejas_verso ON tejas_verso (verso_id);
+
+CREATE TABLE IF NOT EXISTS parametros (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+_COLUMNAS = ('titulo', 'contenido', 'fecha', 'versos', 'palabras', 'caracteres',
+             'metro', 'metro_dominante', 'esquema', 'tipo_rima')
+
+# Columnas que solo dependen del contenido normalizado (iguales si la huella exacta coincide)
+_COLUMNAS_ANALISIS = ('versos', 'metro', 'metro_dominante', 'esquema', 'tipo_rima')
+
+# Propietario del corpus compartido (ingesta por línea de órdenes)
+CORPUS_COMPARTIDO = ''
+
+# Si cambian, las huellas guardadas dejan de ser comparables y se recalculan
+_PARAMETROS_HUELLAS = f"{NUM_PERMUTACIONES}/{BANDAS}/v{VERSION_NORMALIZACION}"
+
+
+class TituloExistente(ValueError):
+    """Ya hay un poema con ese título (se reemplaza con reemplazar=True)"""
+
+
+def normalizar_palabra(palabra):
+    """Minúsculas y sin tildes (la ñ se conserva)"""
+    resultado = []
+    for letra in unicodedata.normalize('NFD', palabra.lower()):
+        if unicodedata.combining(letra):
+            # La virgulilla de la ñ sí distingue palabras
+            if letra == '\u0303' and resultado and resultado[-1] == 'n':
+                resultado[-1] = 'ñ'
+            continue
+        resultado.append(letra)
+    return ''.join(resultado)
+
+
+def palabras_texto(texto):
+    """Palabras normalizadas de un texto, con su frecuencia"""
+    return Counter(normalizar_palabra(p) for p in _PALABRA.findall(texto))
+
+
+def _rango_prefijo(prefijo):
+    """Límites [desde, hasta) de las cadenas que empiezan por prefijo"""
+    return prefijo, prefijo[:-1] + chr(ord(prefijo[-1]) + 1)
+
+
+def describir_poema(contenido, analizador, detector):
+    """
+    Datos indexables de un poema: lo que AlmacenPoemas guarda en sus columnas
+
+    Es una función de módulo para poder calcularla en procesos trabajadores
+    (tareas.tarea_describir) y guardar después con guardar_lote().
+    'versos_indice' son las filas del índice de versos (intertextualidad).
+    """
+    poema = analizar_poema(contenido)
+    versos = poema.textos_versos
+    silabas = [analizador.contador_silabas.contar_silabas_verso(v) for v in versos]
+    esquema = detector.detectar_esquema(versos)
+    metro = (analizador.clasificar_metro(Counter(silabas).most_common(1)[0][0])
+             if silabas else 'Indeterminado')
+    return {
+        'versos': len(versos),
+        'palabras': sum(len(v.tokens) for v in poema.versos),
+        'caracteres': len(contenido),
+        'metro': metro,
+        'metro_dominante': analizador.detectar_metro_dominante(silabas),
+        'esquema': ''.join(esquema),
+        'tipo_rima': detector.clasificar_rima(esquema),
+        'versos_indice': indice_versos(versos, silabas, analizador.contador_silabas, detector),
+    }
+
+
+def _formatear_fecha(fecha):
+    fecha = fecha or datetime.now()
+    return fecha.strftime(FORMATO_FECHA) if isinstance(fecha, datetime) else str(fecha)
+
+
+class AlmacenPoemas:
+    """Poemas guardados en SQLite con índices de búsqueda"""
+
+    def __init__(self, ruta=None, analizador=None, detector=None,
+                 propietario=CORPUS_COMPARTIDO):
+        if ruta is None:
+            ruta = DATABASE_CONFIG['db_file'] if DATABASE_CONFIG.get('use_sqlite') else ':memory:'
+        self.ruta = str(ruta)
+        self.propietario = propietario
+        self.max_poemas = DATABASE_CONFIG.get('max_poems_per_user', 1000)
+        self._analizador = analizador
+        self._detector = detector
+        self._oyentes = []
+
+        # Streamlit ejecuta cada rerun en un hilo distinto
+        self._bloqueo = threading.Lock()
+        self._conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        self._conexion.execute('PRAGMA foreign_keys = ON')
+        if self.ruta != ':memory:':
+            self._conexion.execute('PRAGMA journal_mode = WAL')
+        self._conexion.executescript(_ESQUEMA_SQL)
+        self._migrar()
+        self._renombrar_tipos_rima()
+        self._completar_huellas()
+
+    def para(self, propietario):
+        """
+        Vista del almacén con los poemas de otro propietario
+
+        Comparte la conexión, el bloqueo y los analizadores: la aplicación
+        abre un solo almacén por proceso y da a cada sesión su vista.
+        """
+        vista = copy.copy(self)
+        vista.propietario = propietario
+        return vista
+
+    def suscribir(self, oyente):
+        """
+        Registra oyente(evento, propietario, titulo, contenido), que se llama
+        tras cada cambio confirmado de cualquier propietario: evento es
+        'guardar' o 'eliminar' (con contenido None)
+        """
+        self._oyentes.append(oyente)
+
+    def _avisar(self, evento, titulo, contenido=None):
+        for oyente in self._oyentes:
+            oyente(evento, self.propietario, titulo, contenido)
+
+    def _migrar(self):
+        """Almacenes anteriores, sin propietario y con el título único en todo el almacén"""
+        columnas = [f[1] for f in self._conexion.execute('PRAGMA table_info(poemas)')]
+        if 'propietario' in columnas:
+            return
+        # La restricción UNIQUE no se puede cambiar: se rehace la tabla
+        self._conexion.execute('PRAGMA foreign_keys = OFF')
+        try:
+            with self._conexion:
+                self._conexion.execute(_TABLA_POEMAS.format('poemas_nueva'))
+                self._conexion.execute(
+                    f"INSERT INTO poemas_nueva (id, {', '.join(_COLUMNAS)}) "
+                    f"SELECT id, {', '.join(_COLUMNAS)} FROM poemas")
+                self._conexion.execute('DROP TABLE poemas')
+                self._conexion.execute('ALTER TABLE poemas_nueva RENAME TO poemas')
+        finally:
+            self._conexion.execute('PRAGMA foreign_keys = ON')
+        self._conexion.executescript(_ESQUEMA_SQL)
+
+    def _renombrar_tipos_rima(self):
+        """Almacenes anteriores guardaban como tipo de rima el nombre de la forma"""
+        from .formas import FORMAS
+        from .rimas import nombre_esquema
+        with self._bloqueo, self._conexion:
+            self._conexion.executemany(
+                'UPDATE poemas SET tipo_rima = ? WHERE tipo_rima = ?',
+                [(nombre_esquema(f.nombre), f.nombre) for f in FORMAS if f.solo_esquema])
+
+    @property
+    def analizador(self):
+        if self._analizador is None:
+            from .metrica import AnalizadorMetrico
+            self._analizador = AnalizadorMetrico()
+        return self._analizador
+
+    @property
+    def detector(self):
+        if self._detector is None:
+            from .rimas import DetectorRimas
+            self._detector = DetectorRimas()
+        return self._detector
+
+    def __len__(self):
+        with self._bloqueo:
+            return self._total()
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __contains__(self, titulo):
+        with self._bloqueo:
+            return self._conexion.execute(
+                'SELECT 1 FROM poemas WHERE propietario = ? AND titulo = ?',
+                (self.propietario, titulo)).fetchone() is not None
+
+    def _describir(self, contenido, huella=None):
+        """
+        Datos indexables de un poema (se calculan una vez, al guardar)
+
+        Si ya hay un poema con la misma huella exacta se copian sus datos
+        de análisis y solo se recuentan palabras y caracteres.
+        """
+        if huella is not None:
+            with self._bloqueo:
+                fila = self._conexion.execute(
+                    f"SELECT {', '.join(_COLUMNAS_ANALISIS)} FROM poemas "
+                    f"JOIN huellas ON huellas.poema_id = poemas.id WHERE exacta = ? LIMIT 1",
+                    (huella.exacta,)).fetchone()
+                silabas = [f[0] for f in self._conexion.execute(
+                    'SELECT silabas FROM versos_poema WHERE poema_id = '
+                    '(SELECT poema_id FROM huellas WHERE exacta = ? LIMIT 1) ORDER BY numero',
+                    (huella.exacta,))] if fila is not None else []
+            poema = analizar_poema(contenido)
+            if fila is not None and len(silabas) == len(poema.versos):
+                datos = dict(fila)
+                datos['palabras'] = sum(len(v.tokens) for v in poema.versos)
+                datos['caracteres'] = len(contenido)
+                datos['versos_indice'] = indice_versos(
+                    poema.textos_versos, silabas, self.analizador.contador_silabas, self.detector)
+                return datos
+        return describir_poema(contenido, self.analizador, self.detector)
+
+    def _indice_versos(self, contenido):
+        versos = analizar_poema(contenido).textos_versos
+        contador = self.analizador.contador_silabas
+        return indice_versos(versos, [contador.contar_silabas_verso(v) for v in versos],
+                             contador, self.detector)
+
+    def _completar_huellas(self):
+        """Calcula las huellas que falten (almacenes anteriores o parámetros nuevos)"""
+        with self._bloqueo, self._conexion:
+            fila = self._conexion.execute(
+                "SELECT valor FROM parametros WHERE clave = 'huellas'").fetchone()
+            if fila is None or fila[0] != _PARAMETROS_HUELLAS:
+                self._conexion.execute('DELETE FROM huellas')
+                self._conexion.execute('DELETE FROM bandas_lsh')
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO parametros (clave, valor) VALUES ('huellas', ?)",
+                    (_PARAMETROS_HUELLAS,))
+            pendientes = self._conexion.execute(
+                'SELECT id, contenido FROM poemas '
+                'WHERE id NOT IN (SELECT poema_id FROM huellas)').fetchall()
+            for poema_id, contenido in pendientes:
+                self._insertar_huella(poema_id, HuellaPoema.desde_texto(contenido))
+
+            sin_versos = self._conexion.execute(
+                'SELECT id, contenido FROM poemas '
+                'WHERE id NOT IN (SELECT poema_id FROM versos_poema)').fetchall()
+            for poema_id, contenido in sin_versos:
+                self._insertar_versos(poema_id, self._indice_versos(contenido))
+
+    def guardar(self, titulo, contenido, fecha=None, reemplazar=False):
+        """
+        Guarda un poema y actualiza sus índices
+
+        Args:
+            reemplazar: sustituir el poema del propietario con el mismo título
+
+        Raises:
+            TituloExistente: si el título ya existe y no se pide reemplazar
+            ValueError: si el título está vacío o se supera max_poems_per_user
+        """
+        titulo = titulo.strip()
+        if not titulo:
+            raise ValueError("El poema necesita un título")
+
+        huella = HuellaPoema.desde_texto(contenido)
+        datos = self._describir(contenido, huella)
+        datos['titulo'] = titulo
+        datos['contenido'] = contenido
+        datos['fecha'] = _formatear_fecha(fecha)
+        versos = datos.pop('versos_indice')
+
+        with self._bloqueo, self._conexion:
+            self._insertar(datos, palabras_texto(contenido), self._total(), huella, versos,
+                           reemplazar)
+        self._avisar('guardar', titulo, contenido)
+        return datos
+
+    def guardar_lote(self, poemas, fecha=None, reemplazar=True, parar_en_limite=False):
+        """
+        Guarda muchos poemas ya descritos en una sola transacción
+
+        Args:
+            poemas: iterable de diccionarios con 'titulo', 'contenido' y los
+                datos de describir_poema(); 'palabras_indice' (palabra ->
+                frecuencia), 'huella' (HuellaPoema) y 'versos_indice' son
+                opcionales y se calculan si faltan
+            fecha: fecha común para los que no traen 'fecha'
+            reemplazar: sustituir los poemas del propietario con el mismo título
+            parar_en_limite: al llegar a max_poems_per_user, guardar los
+                anteriores y omitir el resto del lote en vez de fallar
+
+        Returns:
+            int: poemas guardados (los primeros del lote)
+
+        Raises:
+            TituloExistente: si un título ya existe y no se pide reemplazar
+            ValueError: si alguno no tiene título o se supera max_poems_per_user
+                (en ambos casos no se guarda ninguno del lote)
+        """
+        fecha_lote = _formatear_fecha(fecha)
+        guardados = []
+        with self._bloqueo, self._conexion:
+            total = self._total()
+            for poema in poemas:
+                if parar_en_limite and total >= self.max_poemas:
+                    break
+                datos = dict(poema)
+                datos['titulo'] = datos['titulo'].strip()
+                if not datos['titulo']:
+                    raise ValueError("El poema necesita un título")
+                datos.setdefault('fecha', fecha_lote)
+                palabras = datos.pop('palabras_indice', None)
+                if palabras is None:
+                    palabras = palabras_texto(datos['contenido'])
+                huella = datos.pop('huella', None) or HuellaPoema.desde_texto(datos['contenido'])
+                versos = datos.pop('versos_indice', None)
+                if versos is None:
+                    versos = self._indice_versos(datos['contenido'])
+                total = self._insertar(datos, palabras, total, huella, versos, reemplazar)
+                guardados.append((datos['titulo'], datos['contenido']))
+        for titulo, contenido in guardados:
+            self._avisar('guardar', titulo, contenido)
+        return len(guardados)
+
+    def _total(self):
+        return self._conexion.execute(
+            'SELECT COUNT(*) FROM poemas WHERE propietario = ?', (self.propietario,)).fetchone()[0]
+
+    def _insertar(self, datos, palabras, total, huella, versos, reemplazar):
+        """
+        Inserta o reemplaza un poema (dentro de una transacción abierta)
+
+        total: poemas del propietario antes de insertar; devuelve el nuevo total
+        """
+        fila = self._conexion.execute(
+            'SELECT id FROM poemas WHERE propietario = ? AND titulo = ?',
+            (self.propietario, datos['titulo'])).fetchone()
+        if fila is None:
+            if total >= self.max_poemas:
+                raise ValueError(f"Se alcanzó el máximo de {self.max_poemas} poemas guardados")
+        elif not reemplazar:
+            raise TituloExistente(f"Ya hay un poema titulado '{datos['titulo']}'")
+        else:
+            self._conexion.execute('DELETE FROM poemas WHERE id = ?', (fila['id'],))
+
+        cursor = self._conexion.execute(
+            f"INSERT INTO poemas (propietario, {', '.join(_COLUMNAS)}) "
+            f"VALUES (?, {', '.join('?' * len(_COLUMNAS))})",
+            [self.propietario] + [datos[c] for c in _COLUMNAS])
+        poema_id = cursor.lastrowid
+        self._conexion.executemany(
+            'INSERT INTO palabras_poema (palabra, poema_id, frecuencia) VALUES (?, ?, ?)',
+            [(palabra, poema_id, n) for palabra, n in palabras.items()])
+        self._insertar_huella(poema_id, huella)
+        self._insertar_versos(poema_id, versos)
+        return total + (fila is None)
+
+    def _insertar_versos(self, poema_id, versos):
+        for numero, texto, silabas, terminacion, tejas in versos:
+            verso_id = self._conexion.execute(
+                'INSERT INTO versos_poema (poema_id, numero, texto, silabas, terminacion, tejas) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (poema_id, numero, texto, silabas, terminacion, len(tejas))).lastrowid
+            self._conexion.executemany(
+                'INSERT OR IGNORE INTO tejas_verso (teja, verso_id) VALUES (?, ?)',
+                [(teja, verso_id) for teja in tejas])
+
+    def _insertar_huella(self, poema_id, huella):
+        self._conexion.execute(
+            'INSERT INTO huellas (poema_id, exacta, firma) VALUES (?, ?, ?)',
+            (poema_id, huella.exacta, huella.firma_bytes()))
+        self._conexion.executemany(
+            'INSERT OR IGNORE INTO bandas_lsh (banda, clave, poema_id) VALUES (?, ?, ?)',
+            [(banda, clave, poema_id) for banda, clave in enumerate(huella.bandas)])
+
+    def eliminar(self, titulo):
+        """Elimina un poema (sus entradas del índice invertido se borran en cascada)"""
+        with self._bloqueo, self._conexion:
+            eliminado = self._conexion.execute(
+                'DELETE FROM poemas WHERE propietario = ? AND titulo = ?',
+                (self.propietario, titulo)).rowcount > 0
+        if eliminado:
+            self._avisar('eliminar', titulo)
+        return eliminado
+
+    def obtener(self, titulo):
+        with self._bloqueo:
+            fila = self._conexion.execute(
+                f"SELECT {', '.join(_COLUMNAS)} FROM poemas WHERE propietario = ? AND titulo = ?",
+                (self.propietario, titulo)).fetchone()
+        return dict(fila) if fila else None
+
+    def todos(self):
+        """(título, contenido) de todos los poemas, por fecha"""
+        with self._bloqueo:
+            return [tuple(f) for f in self._conexion.execute(
+                'SELECT titulo, contenido FROM poemas WHERE propietario = ? ORDER BY fecha, id',
+                (self.propietario,))]
+
+    def titulos(self):
+        """Títulos de los poemas del propietario"""
+        with self._bloqueo:
+            return {f[0] for f in self._conexion.execute(
+                'SELECT titulo FROM poemas WHERE propietario = ?', (self.propietario,))}
+
+    def duplicado_de(self, contenido, excluir=None):
+        """Título de un poema guardado con el mismo contenido normalizado, o None"""
+        with self._bloqueo:
+            fila = self._conexion.execute(
+                'SELECT titulo FROM poemas JOIN huellas ON huellas.poema_id = poemas.id '
+                'WHERE exacta = ? AND propietario = ? AND titulo != ? ORDER BY poemas.id LIMIT 1',
+                (huella_exacta(contenido), self.propietario, excluir or '')).fetchone()
+        return fila[0] if fila else None
+
+    def similares(self, contenido, umbral=None, limite=10, excluir=None):
+        """
+        Poemas guardados parecidos al contenido (casi duplicados)
+
+        Solo se comparan las firmas de los poemas que comparten alguna
+        banda LSH con el contenido, no todo el almacén.
+
+        Returns:
+            [(titulo, similitud)] de más a menos parecido (1.0 = duplicado)
+        """
+        umbral = UMBRAL_SIMILITUD if umbral is None else umbral
+        huella = HuellaPoema.desde_texto(contenido)
+        bandas = list(enumerate(huella.bandas))
+        condicion = ' OR '.join(['(banda = ? AND clave = ?)'] * len(bandas))
+        with self._bloqueo:
+            filas = self._conexion.execute(
+                f"SELECT titulo, exacta, firma FROM poemas "
+                f"JOIN huellas ON huellas.poema_id = poemas.id "
+                f"WHERE propietario = ? AND (exacta = ? OR poemas.id IN "
+                f"(SELECT poema_id FROM bandas_lsh WHERE {condicion}))",
+                [self.propietario, huella.exacta] + [v for par in bandas for v in par]).fetchall()
+
+        resultado = []
+        for titulo, exacta, firma in filas:
+            if titulo == excluir:
+                continue
+            valor = huella.similitud(HuellaPoema.desde_bytes(exacta, firma))
+            if valor >= umbral:
+                resultado.append((titulo, valor))
+        resultado.sort(key=lambda par: (-par[1], par[0]))
+        return resultado[:limite] if limite else resultado
+
+    def versos_con_tejas(self, tejas):
+        """
+        Índice de versos: teja -> [id de verso] para las tejas dadas
+
+        Incluye los versos del propietario y los del corpus compartido.
+        """
+        publicaciones = {}
+        tejas = list(tejas)
+        with self._bloqueo:
+            for i in range(0, len(tejas), 500):
+                bloque = tejas[i:i + 500]
+                for teja, verso_id in self._conexion.execute(
+                        f"SELECT teja, verso_id FROM tejas_verso "
+                        f"JOIN versos_poema ON versos_poema.id = verso_id "
+                        f"JOIN poemas ON poemas.id = versos_poema.poema_id "
+                        f"WHERE teja IN ({', '.join('?' * len(bloque))}) "
+                        f"AND propietario IN (?, ?)",
+                        bloque + [self.propietario, CORPUS_COMPARTIDO]):
+                    publicaciones.setdefault(teja, []).append(verso_id)
+        return publicaciones
+
+    def datos_versos(self, ids):
+        """Datos de los versos indicados (id -> dict con título del poema)"""
+        ids = list(ids)
+        datos = {}
+        with self._bloqueo:
+            for i in range(0, len(ids), 500):
+                bloque = ids[i:i + 500]
+                for fila in self._conexion.execute(
+                        f"SELECT versos_poema.id, titulo, numero, versos_poema.texto, silabas, "
+                        f"terminacion, tejas FROM versos_poema "
+                        f"JOIN poemas ON poemas.id = versos_poema.poema_id "
+                        f"WHERE versos_poema.id IN ({', '.join('?' * len(bloque))}) "
+                        f"AND propietario IN (?, ?)",
+                        bloque + [self.propietario, CORPUS_COMPARTIDO]):
+                    datos[fila[0]] = dict(fila)
+        return datos
+
+    def huellas_exactas(self):
+        """Huellas exactas de los poemas guardados del propietario"""
+        with self._bloqueo:
+            return {f[0] for f in self._conexion.execute(
+                'SELECT exacta FROM huellas JOIN poemas ON poemas.id = huellas.poema_id '
+                'WHERE propietario = ?', (self.propietario,))}
+
+    def metros(self):
+        """Metros presentes en el almacén, de más a menos frecuente"""
+        with self._bloqueo:
+            return [f[0] for f in self._conexion.execute(
+                'SELECT metro FROM poemas WHERE propietario = ? '
+                'GROUP BY metro ORDER BY COUNT(*) DESC, metro', (self.propietario,))]
+
+    def buscar(self, texto=None, metro=None, esquema=None, versos_min=None, versos_max=None,
+               desde=None, hasta=None, pagina=1, por_pagina=20):
+        """
+        Busca poemas combinando (con Y lógico) los criterios indicados
+
+        Args:
+            texto: palabras que deben aparecer todas (se ignora la puntuación;
+                un término sin letras no casa con nada); 'mar*' busca por prefijo
+            metro: nombre del metro dominante ('Endecasílabo', ...)
+            esquema: prefijo del esquema de rima ('ABBA' casa con 'ABBAABBA...')
+            versos_min, versos_max: número de versos
+            desde, hasta: fechas (date/datetime o 'AAAA-MM-DD'), inclusivas
+            pagina, por_pagina: paginación (la primera página es 1)
+
+        Returns:
+            (lista de dicts sin el contenido, total de coincidencias)
+        """
+        condiciones = ['propietario = ?']
+        parametros = [self.propietario]
+
+        for termino in (texto or '').split():
+            prefijo = termino.endswith('*')
+            # Se indexan las palabras como en palabras_texto: 'mar,' busca
+            # 'mar' y '¿rosa?' busca 'rosa'. Un término sin palabras ('2024',
+            # '¡!') no casa con ningún poema
+            palabras = [normalizar_palabra(p) for p in _PALABRA.findall(termino.rstrip('*'))]
+            if not palabras:
+                condiciones.append('0')
+                continue
+            for i, palabra in enumerate(palabras, 1):
+                if prefijo and i == len(palabras):
+                    condiciones.append('id IN (SELECT poema_id FROM palabras_poema '
+                                       'WHERE palabra >= ? AND palabra < ?)')
+                    parametros.extend(_rango_prefijo(palabra))
+                else:
+                    condiciones.append(
+                        'id IN (SELECT poema_id FROM palabras_poema WHERE palabra = ?)')
+                    parametros.append(palabra)
+
+        if metro:
+            condiciones.append('metro = ?')
+            parametros.append(metro)
+        if esquema:
+            condiciones.append('esquema >= ? AND esquema < ?')
+            parametros.extend(_rango_prefijo(esquema.replace(' ', '').upper()))
+        if versos_min is not None:
+            condiciones.append('versos >= ?')
+            parametros.append(versos_min)
+        if versos_max is not None:
+            condiciones.append('versos <= ?')
+            parametros.append(versos_max)
+        if desde is not None:
+            condiciones.append('fecha >= ?')
+            parametros.append(str(desde)[:10])
+        if hasta is not None:
+            # Inclusivo: cualquier hora del último día
+            condiciones.append('fecha < ?')
+            parametros.append(str(hasta)[:10] + '\uffff')
+
+        donde = f"WHERE {' AND '.join(condiciones)}"
+        pagina = max(1, int(pagina))
+        columnas = ', '.join(c for c in _COLUMNAS if c != 'contenido')
+
+        with self._bloqueo:
+            total = self._conexion.execute(
+                f'SELECT COUNT(*) FROM poemas {donde}', parametros).fetchone()[0]
+            filas = self._conexion.execute(
+                f'SELECT {columnas} FROM poemas {donde} ORDER BY fecha DESC, id DESC '
+                f'LIMIT ? OFFSET ?',
+                parametros + [por_pagina, (pagina - 1) * por_pagina]).fetchall()
+        return [dict(f) for f in filas], total
+
+    def exportar(self):
+        """Poemas en el formato de la copia de seguridad (título -> datos)"""
+        with self._bloqueo:
+            filas = self._conexion.execute(
+                f"SELECT {', '.join(_COLUMNAS)} FROM poemas WHERE propietario = ? "
+                f"ORDER BY fecha, id", (self.propietario,)).fetchall()
+        return {
+            f['titulo']: {
+                'contenido': f['contenido'],
+                'fecha': f['fecha'],
+                'metro': f['metro_dominante'],
+                'esquema': f['esquema'],
+                'estadisticas': {
+                    'versos': f['versos'],
+                    'palabras': f['palabras'],
+                    'caracteres': f['caracteres'],
+                },
+            }
+            for f in filas
+        }
+
+    def cerrar(self):
+        """Cierra la conexión (la de todas las vistas creadas con para())"""
+        with self._bloqueo:
+            self._conexion.close()
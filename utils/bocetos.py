@@ -0,0 +1,371 @@
+"""
+Bocetos probabilísticos para estadísticas de corpus muy grandes
+
+Sustituyen a los Counter exactos cuando el vocabulario o las terminaciones
+de un corpus no caben en memoria. Los tres ocupan una memoria fija que no
+crece con el corpus, y dos bocetos con los mismos parámetros se combinan
+(fusionar) igual que los parciales exactos de EstadisticasCorpus:
+
+- HyperLogLog: número de elementos distintos (palabras del vocabulario),
+  2^precision registros de un byte, error relativo ~1.04 / sqrt(2^precision).
+- CountMin: frecuencia aproximada de cada clave (terminaciones de rima,
+  palabras), ancho x profundidad contadores; nunca subestima y sobrestima
+  como mucho e/ancho del total con probabilidad 1 - e^-profundidad. Guarda
+  además las `top_k` claves más frecuentes para poder listarlas.
+- TDigest: cuantiles de una distribución numérica (sílabas por verso) con
+  unos pocos cientos de centroides.
+
+Los hashes se calculan con blake2b, estables entre procesos (hash() de
+Python cambia en cada ejecución).
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from hashlib import blake2b
+
+try:
+    from config_py import ANALYTICS_CONFIG
+    _CONFIG = ANALYTICS_CONFIG.get('sketches', {})
+except ImportError:
+    _CONFIG = {}
+
+_MASCARA_64 = (1 << 64) - 1
+
+
+def hash64(clave):
+    """Hash de 64 bits estable de una cadena"""
+    return int.from_bytes(blake2b(clave.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _comprobar_compatibles(a, b, campos):
+    for campo in campos:
+        if getattr(a, campo) != getattr(b, campo):
+            raise ValueError(f"No se pueden fusionar bocetos con distinto {campo}: "
+                             f"{getattr(a, campo)} != {getattr(b, campo)}")
+
+
+class HyperLogLog:
+    """Estimación del número de elementos distintos"""
+
+    __slots__ = ('precision', 'registros')
+
+    def __init__(self, precision=None):
+        self.precision = precision or _CONFIG.get('hll_precision', 14)
+        if not 4 <= self.precision <= 18:
+            raise ValueError("La precisión de HyperLogLog debe estar entre 4 y 18")
+        self.registros = bytearray(1 << self.precision)
+
+    def agregar(self, clave):
+        h = hash64(clave)
+        indice = h >> (64 - self.precision)
+        resto = (h << self.precision) & _MASCARA_64
+        # Posición del primer 1 en los bits restantes (1 = el primero)
+        rango = 64 - self.precision + 1 if resto == 0 else 65 - resto.bit_length()
+        if rango > self.registros[indice]:
+            self.registros[indice] = rango
+
+    def estimar(self):
+        m = len(self.registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimacion = alfa * m * m / sum(2.0 ** -r for r in self.registros)
+        vacios = self.registros.count(0)
+        if estimacion <= 2.5 * m and vacios:
+            # Corrección para cardinalidades pequeñas (conteo lineal)
+            estimacion = m * math.log(m / vacios)
+        return int(round(estimacion))
+
+    def __len__(self):
+        return self.estimar()
+
+    def fusionar(self, otro):
+        _comprobar_compatibles(self, otro, ('precision',))
+        self.registros = bytearray(map(max, self.registros, otro.registros))
+        return self
+
+    @property
+    def bytes(self):
+        return len(self.registros)
+
+    def to_dict(self):
+        return {'precision': self.precision, 'registros': self.registros.hex()}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        boceto = cls(datos['precision'])
+        boceto.registros = bytearray.fromhex(datos['registros'])
+        return boceto
+
+    def __getstate__(self):
+        return (self.precision, bytes(self.registros))
+
+    def __setstate__(self, estado):
+        self.precision, registros = estado
+        self.registros = bytearray(registros)
+
+
+class CountMin:
+    """Frecuencias aproximadas con memoria fija y las claves más frecuentes"""
+
+    __slots__ = ('ancho', 'profundidad', 'top_k', 'tabla', 'total', 'candidatos', '_umbral')
+
+    def __init__(self, ancho=None, profundidad=None, top_k=None):
+        self.ancho = ancho or _CONFIG.get('cms_width', 4096)
+        self.profundidad = profundidad or _CONFIG.get('cms_depth', 4)
+        self.top_k = top_k if top_k is not None else _CONFIG.get('top_k', 100)
+        self.tabla = array('q', bytes(8 * self.ancho * self.profundidad))
+        self.total = 0
+        # Clave -> frecuencia estimada de las top_k más frecuentes vistas
+        self.candidatos = {}
+        # Cota inferior de la menor estimación entre los candidatos: las
+        # estimaciones solo crecen, así que basta recalcularla al sustituir
+        self._umbral = 0
+
+    def _posiciones(self, clave):
+        # Doble hash: h1 + i·h2 da `profundidad` funciones independientes
+        h = hash64(clave)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [fila * self.ancho + (h1 + fila * h2) % self.ancho
+                for fila in range(self.profundidad)]
+
+    def agregar(self, clave, cantidad=1):
+        posiciones = self._posiciones(clave)
+        tabla = self.tabla
+        for posicion in posiciones:
+            tabla[posicion] += cantidad
+        self.total += cantidad
+        if self.top_k:
+            self._candidato(clave, min(tabla[p] for p in posiciones))
+
+    def _candidato(self, clave, estimacion):
+        candidatos = self.candidatos
+        if clave in candidatos or len(candidatos) < self.top_k:
+            candidatos[clave] = estimacion
+            return
+        if estimacion <= self._umbral:
+            return
+        minima = min(candidatos, key=candidatos.get)
+        self._umbral = candidatos[minima]
+        if estimacion > self._umbral:
+            del candidatos[minima]
+            candidatos[clave] = estimacion
+
+    def estimar(self, clave):
+        """Frecuencia estimada (nunca menor que la real)"""
+        return min(self.tabla[p] for p in self._posiciones(clave))
+
+    def __getitem__(self, clave):
+        return self.estimar(clave)
+
+    def mas_frecuentes(self, n=None):
+        """[(clave, frecuencia estimada)] de las claves más frecuentes vistas"""
+        pares = sorted(self.candidatos.items(), key=lambda par: (-par[1], par[0]))
+        return pares[:n] if n else pares
+
+    def fusionar(self, otro):
+        _comprobar_compatibles(self, otro, ('ancho', 'profundidad'))
+        tabla = self.tabla
+        for i, valor in enumerate(otro.tabla):
+            if valor:
+                tabla[i] += valor
+        self.total += otro.total
+
+        # Los candidatos de ambos se reevalúan con la tabla combinada
+        claves = set(self.candidatos) | set(otro.candidatos)
+        self.candidatos = {}
+        self._umbral = 0
+        for clave in claves:
+            self._candidato(clave, self.estimar(clave))
+        return self
+
+    @property
+    def bytes(self):
+        return self.tabla.itemsize * len(self.tabla)
+
+    def to_dict(self):
+        return {'ancho': self.ancho, 'profundidad': self.profundidad, 'top_k': self.top_k,
+                'tabla': self.tabla.tolist(), 'total': self.total,
+                'candidatos': self.candidatos}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        boceto = cls(datos['ancho'], datos['profundidad'], datos['top_k'])
+        boceto.tabla = array('q', datos['tabla'])
+        boceto.total = datos['total']
+        boceto.candidatos = dict(datos['candidatos'])
+        return boceto
+
+    def __getstate__(self):
+        return (self.ancho, self.profundidad, self.top_k, self.tabla.tobytes(), self.total,
+                self.candidatos)
+
+    def __setstate__(self, estado):
+        self.ancho, self.profundidad, self.top_k, tabla, self.total, self.candidatos = estado
+        self._umbral = 0
+        self.tabla = array('q')
+        self.tabla.frombytes(tabla)
+
+
+class TDigest:
+    """Cuantiles aproximados con centroides (variante "merging" de t-digest)"""
+
+    __slots__ = ('compresion', 'medias', 'pesos', 'total', 'minimo', 'maximo', '_pendientes')
+
+    def __init__(self, compresion=None):
+        self.compresion = compresion or _CONFIG.get('tdigest_compression', 100)
+        self.medias = []
+        self.pesos = []
+        self.total = 0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self._pendientes = []
+
+    def agregar(self, valor, peso=1):
+        self._pendientes.append((valor, peso))
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+        if len(self._pendientes) >= 5 * self.compresion:
+            self._comprimir()
+
+    def _k(self, q):
+        """Función de escala k1: centroides pequeños cerca de los extremos"""
+        return self.compresion / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _comprimir(self):
+        if not self._pendientes:
+            return
+        puntos = sorted(list(zip(self.medias, self.pesos)) + self._pendientes)
+        self._pendientes = []
+        total = sum(p for _, p in puntos)
+
+        medias = []
+        pesos = []
+        acumulado = 0
+        media, peso = puntos[0]
+        limite = self._k(0) + 1
+        for valor, p in puntos[1:]:
+            q = (acumulado + peso + p) / total
+            if self._k(min(q, 1.0)) <= limite:
+                media += (valor - media) * p / (peso + p)
+                peso += p
+            else:
+                medias.append(media)
+                pesos.append(peso)
+                acumulado += peso
+                limite = self._k(acumulado / total) + 1
+                media, peso = valor, p
+        medias.append(media)
+        pesos.append(peso)
+
+        self.medias, self.pesos, self.total = medias, pesos, total
+
+    def cuantil(self, q):
+        """Valor aproximado del cuantil q (0..1), o None si no hay datos"""
+        self._comprimir()
+        if not self.pesos:
+            return None
+        if len(self.medias) == 1 or q <= 0:
+            return self.minimo if q <= 0 else self.medias[0]
+        if q >= 1:
+            return self.maximo
+
+        # Cada centroide se sitúa en el centro de su masa acumulada
+        objetivo = q * self.total
+        centros = []
+        acumulado = 0
+        for peso in self.pesos:
+            centros.append(acumulado + peso / 2)
+            acumulado += peso
+        i = bisect_right(centros, objetivo)
+        if i == 0:
+            return self.minimo + (self.medias[0] - self.minimo) * objetivo / centros[0]
+        if i == len(centros):
+            resto = self.total - centros[-1]
+            return self.medias[-1] + (self.maximo - self.medias[-1]) * (
+                (objetivo - centros[-1]) / resto if resto else 0)
+        fraccion = (objetivo - centros[i - 1]) / (centros[i] - centros[i - 1])
+        return self.medias[i - 1] + (self.medias[i] - self.medias[i - 1]) * fraccion
+
+    def cuantiles(self, qs=(0.1, 0.5, 0.9, 0.99)):
+        return {q: self.cuantil(q) for q in qs}
+
+    def fusionar(self, otro):
+        otro._comprimir()
+        self._pendientes.extend(zip(otro.medias, otro.pesos))
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self._comprimir()
+        return self
+
+    @property
+    def centroides(self):
+        self._comprimir()
+        return len(self.medias)
+
+    @property
+    def bytes(self):
+        # Dos floats por centroide más los puntos pendientes
+        return 16 * (len(self.medias) + len(self._pendientes))
+
+    def to_dict(self):
+        self._comprimir()
+        return {'compresion': self.compresion, 'medias': self.medias, 'pesos': self.pesos,
+                'minimo': self.minimo, 'maximo': self.maximo}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        boceto = cls(datos['compresion'])
+        boceto.medias = list(datos['medias'])
+        boceto.pesos = list(datos['pesos'])
+        boceto.total = sum(boceto.pesos)
+        boceto.minimo, boceto.maximo = datos['minimo'], datos['maximo']
+        return boceto
+
+    def __getstate__(self):
+        self._comprimir()
+        return (self.compresion, self.medias, self.pesos, self.total, self.minimo, self.maximo)
+
+    def __setstate__(self, estado):
+        (self.compresion, self.medias, self.pesos, self.total,
+         self.minimo, self.maximo) = estado
+        self._pendientes = []
+
+
+class BocetosCorpus:
+    """Los bocetos que usa EstadisticasCorpus en modo aproximado"""
+
+    __slots__ = ('palabras_distintas', 'palabras', 'terminaciones', 'silabas')
+
+    def __init__(self):
+        self.palabras_distintas = HyperLogLog()
+        self.palabras = CountMin()
+        self.terminaciones = CountMin()
+        self.silabas = TDigest()
+
+    def fusionar(self, otros):
+        for campo in self.__slots__:
+            getattr(self, campo).fusionar(getattr(otros, campo))
+        return self
+
+    @property
+    def bytes(self):
+        return sum(getattr(self, campo).bytes for campo in self.__slots__)
+
+    def to_dict(self):
+        return {campo: getattr(self, campo).to_dict() for campo in self.__slots__}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        bocetos = cls.__new__(cls)
+        bocetos.palabras_distintas = HyperLogLog.desde_dict(datos['palabras_distintas'])
+        bocetos.palabras = CountMin.desde_dict(datos['palabras'])
+        bocetos.terminaciones = CountMin.desde_dict(datos['terminaciones'])
+        bocetos.silabas = TDigest.desde_dict(datos['silabas'])
+        return bocetos
+
+    def __getstate__(self):
+        return tuple(getattr(self, campo) for campo in self.__slots__)
+
+    def __setstate__(self, estado):
+        for campo, valor in zip(self.__slots__, estado):
+            setattr(self, campo, valor)
@@ -1,5 +1,7 @@
 # Añadir esta función en app.py después de la función main()
 
+from .silabas_js import obtener_modulo
+
 def crear_css_dinamico():
     """CSS mejorado con colores dinámicos para el textarea"""
     return """
@@ -134,116 +136,99 @@ def crear_css_dinamico():
         margin: 1rem 0;
     }
 </style>
+"""
+
+
+# Etiqueta del área de texto del editor (aria-label en la página)
+ETIQUETA_EDITOR = "Introduce tu poema aquí:"
 
+_SCRIPT_EDITOR = """
 <script>
-function actualizarColorTexto() {
-    const textarea = document.querySelector('.stTextArea textarea');
-    if (!textarea) return;
-    
-    const texto = textarea.value;
-    const lineas = texto.split('\\n');
-    const lineaActual = lineas[textarea.value.substr(0, textarea.selectionStart).split('\\n').length - 1];
-    
-    if (!lineaActual || lineaActual.trim() === '') {
-        textarea.className = textarea.className.replace(/silabas-\\w+/g, '') + ' silabas-normal';
-        return;
-    }
-    
-    // Aquí deberías calcular las sílabas (simplificado)
-    const palabras = lineaActual.trim().split(/\\s+/);
-    const silabas = contarSilabasAproximado(palabras);
-    
-    // Remover clases anteriores
-    textarea.className = textarea.className.replace(/silabas-\\w+/g, '');
-    
-    // Añadir nueva clase según sílabas
-    if (silabas === 8) {
-        textarea.className += ' silabas-8';
-    } else if (silabas === 11) {
-        textarea.className += ' silabas-11';
-    } else if (silabas === 14) {
-        textarea.className += ' silabas-14';
-    } else if (silabas > 14) {
-        textarea.className += ' silabas-exceso';
-    } else {
-        textarea.className += ' silabas-normal';
+__MODULO_SILABAS__
+</script>
+
+<script>
+// Se ejecuta en el iframe de components.html: el editor está en la página padre
+(function () {
+    const doc = window.parent.document;
+    const SELECTOR = 'textarea[aria-label="__ETIQUETA__"]';
+
+    function claseSilabas(silabas) {
+        if (silabas === 8 || silabas === 11 || silabas === 14) return 'silabas-' + silabas;
+        if (silabas > 14) return 'silabas-exceso';
+        return 'silabas-normal';
     }
-    
-    // Actualizar indicador
-    actualizarIndicadorSilabas(silabas);
-}
 
-function contarSilabasAproximado(palabras) {
-    let total = 0;
-    for (let palabra of palabras) {
-        total += contarSilabasPalabra(palabra);
+    function actualizarColorTexto(evento) {
+        const textarea = evento.target;
+        const lineas = textarea.value.split('\\n');
+        const lineaActual = lineas[textarea.value.substr(0, textarea.selectionStart).split('\\n').length - 1];
+
+        // Mismo recuento que ContadorSilabas (módulo generado por utils/silabas_js.py)
+        const silabas = lineaActual && lineaActual.trim()
+            ? SilabasPoeticas.contarSilabasVerso(lineaActual) : null;
+
+        textarea.className = textarea.className.replace(/\\s*silabas-\\w+/g, '') + ' ' + claseSilabas(silabas);
+        if (silabas !== null) actualizarIndicadorSilabas(textarea, silabas);
     }
-    return total;
-}
 
-function contarSilabasPalabra(palabra) {
-    // Conteo simplificado - en producción usar el contador Python
-    const vocales = 'aeiouáéíóúü';
-    let silabas = 0;
-    let anteriorEsVocal = false;
-    
-    for (let i = 0; i < palabra.length; i++) {
-        const letra = palabra[i].toLowerCase();
-        const esVocal = vocales.includes(letra);
-        
-        if (esVocal && !anteriorEsVocal) {
-            silabas++;
+    function actualizarIndicadorSilabas(textarea, silabas) {
+        const contenedor = textarea.closest('.stTextArea') || textarea.parentNode;
+        let indicador = contenedor.querySelector('.silabas-indicator');
+        if (!indicador) {
+            indicador = doc.createElement('div');
+            indicador.className = 'silabas-indicator';
+            contenedor.insertBefore(indicador, contenedor.firstChild);
         }
-        anteriorEsVocal = esVocal;
-    }
-    
-    return Math.max(1, silabas);
-}
 
-function actualizarIndicadorSilabas(silabas) {
-    let indicador = document.querySelector('.silabas-indicator');
-    if (!indicador) {
-        indicador = document.createElement('div');
-        indicador.className = 'silabas-indicator';
-        const container = document.querySelector('.stTextArea').parentNode;
-        container.insertBefore(indicador, container.firstChild);
-    }
-    
-    let color = '#667eea';
-    let texto = `${silabas} sílabas`;
-    
-    if (silabas === 8) {
-        color = '#4caf50';
-        texto += ' (Octosílabo) ✓';
-    } else if (silabas === 11) {
-        color = '#ff9800';
-        texto += ' (Endecasílabo) ✓';
-    } else if (silabas === 14) {
-        color = '#ffeb3b';
-        texto += ' (Alejandrino) ✓';
-    } else if (silabas > 14) {
-        color = '#f44336';
-        texto += ' (Exceso)';
+        let color = '#667eea';
+        let texto = `${silabas} sílabas`;
+        if (silabas === 8) {
+            color = '#4caf50';
+            texto += ' (Octosílabo) ✓';
+        } else if (silabas === 11) {
+            color = '#ff9800';
+            texto += ' (Endecasílabo) ✓';
+        } else if (silabas === 14) {
+            color = '#ffeb3b';
+            texto += ' (Alejandrino) ✓';
+        } else if (silabas > 14) {
+            color = '#f44336';
+            texto += ' (Exceso)';
+        }
+        indicador.style.background = color;
+        indicador.textContent = texto;
     }
-    
-    indicador.style.background = color;
-    indicador.textContent = texto;
-}
 
-// Activar el listener cuando se carga la página
-document.addEventListener('DOMContentLoaded', function() {
-    setTimeout(() => {
-        const textarea = document.querySelector('.stTextArea textarea');
-        if (textarea) {
-            textarea.addEventListener('input', actualizarColorTexto);
-            textarea.addEventListener('keyup', actualizarColorTexto);
-            textarea.addEventListener('click', actualizarColorTexto);
-        }
-    }, 1000);
-});
+    // Streamlit puede sustituir el área de texto al redibujar: se enlaza cada
+    // área nueva una sola vez
+    function enlazar() {
+        doc.querySelectorAll(SELECTOR).forEach(function (textarea) {
+            if (textarea.dataset.silabas) return;
+            textarea.dataset.silabas = '1';
+            ['input', 'keyup', 'click'].forEach(function (tipo) {
+                textarea.addEventListener(tipo, actualizarColorTexto);
+            });
+        });
+    }
+    enlazar();
+    setInterval(enlazar, 1000);
+})();
 </script>
 """
 
+
+def crear_script_silabas(etiqueta=ETIQUETA_EDITOR):
+    """
+    Contador de sílabas en el navegador para el editor
+
+    Hay que insertarlo con streamlit.components.v1.html (st.markdown no
+    ejecuta <script>). Colorea el área de texto con la etiqueta dada y
+    muestra las sílabas de la línea del cursor mientras se escribe.
+    """
+    return (_SCRIPT_EDITOR.replace('__MODULO_SILABAS__', obtener_modulo())
+            .replace('__ETIQUETA__', etiqueta))
+
 # Función para mostrar análisis en tiempo real
 def mostrar_analisis_tiempo_real(app, texto_actual):
     """Muestra análisis de sílabas en tiempo real"""
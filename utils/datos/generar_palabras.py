@@ -0,0 +1,825 @@
+"""
+Generador de la lista de palabras incluida (utils/datos/palabras.txt)
+
+Parte de un léxico semilla de lemas (verbos regulares, verbos con cambio
+vocálico, sustantivos, adjetivos y palabras invariables) y aplica la
+morfología regular del español: conjugación de tiempos simples, infinitivo
+con un enclítico, plurales, género y adverbios en -mente. Las palabras
+gramaticales y las formas de los verbos irregulares más frecuentes se
+listan tal cual.
+
+No es un léxico completo del español: cubre el vocabulario semilla y su
+flexión regular (unas 68.000 formas). Para mejorar las sugerencias de rima
+hay que ampliar las listas de lemas, no la morfología.
+
+La lista resultante se distribuye con el paquete; este script solo hace
+falta para regenerarla tras ampliar el léxico semilla:
+
+    python -m utils.datos.generar_palabras
+"""
+
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+RUTA_SALIDA = Path(__file__).with_name('palabras.txt')
+
+# --- Léxico semilla ---------------------------------------------------------
+
+VERBOS_AR = """
+abandonar abanicar abonar abordar abrazar abrigar abrochar abultar
+abusar acabar acampar acaparar acarrear acatar acelerar aceptar acercar
+aclamar aclarar acomodar acompañar aconsejar acortar acosar acostumbrar
+acreditar activar acumular acusar adaptar adelantar adivinar admirar
+adoptar adorar adornar afectar afeitar afirmar aflojar afrontar agachar
+agarrar agitar agotar agradar agrandar agravar agregar agrupar aguantar
+aguardar ahorrar ajustar alabar alargar alarmar alcanzar alegrar alejar
+alentar aliviar alimentar alistar alojar alquilar alterar alumbrar alzar
+amar amargar amarrar amenazar amontonar amparar analizar anclar animar
+anotar anticipar anudar anular apagar aparcar apartar apelar aplastar
+aplazar aplicar apoyar apreciar apresurar apretar aprobar aprovechar
+apuntar apurar arañar arrancar arrastrar arreglar arrebatar arrojar
+arropar arrullar asaltar asar asear asegurar asesinar asfixiar asignar
+asomar asustar atacar atajar atar atesorar atrapar atrasar augurar
+aumentar autorizar avanzar aventurar avisar ayudar ayunar bailar bajar
+balancear bañar barajar bastar batallar besar bordar borrar bostezar
+brillar brincar brindar bromear brotar bucear burlar buscar cabalgar
+cabecear cautivar cavar cazar celebrar cenar censurar cepillar cercar
+cerrar charlar chocar chupar circular citar clamar clasificar clavar
+cobrar cocinar colaborar colgar colocar colorear combinar comentar
+comenzar comparar compensar completar complicar comprar comprobar
+comunicar concentrar condenar confesar confirmar conformar conjugar
+conquistar consagrar conservar considerar consolar conspirar constatar
+consultar contaminar contemplar contestar contratar controlar conversar
+convocar copiar coronar cortar cosechar crear cruzar cuidar culpar
+cultivar curar danzar dañar decorar dedicar dejar delatar delegar
+demostrar denunciar depositar derramar derribar derrotar desarmar
+desayunar descansar descargar descifrar desear desechar desembarcar
+desenredar desesperar desfilar desgarrar deshojar designar desmayar
+desnudar despegar desplazar destacar destapar destinar destrozar
+detallar detectar determinar dibujar dictar disfrazar disfrutar
+disgustar disimular disparar disputar doblar domar dominar donar dorar
+dudar durar echar editar educar ejecutar elaborar elevar eliminar
+embarcar emborrachar empapar empeñar emplear empujar enamorar encantar
+encarcelar encerrar enfadar enfocar engañar engordar enlazar enmarcar
+enojar enredar enseñar ensuciar entrar entregar entrenar entusiasmar
+envenenar equivocar escalar escapar escuchar esperar esquivar estimar
+estirar estorbar estrellar estudiar evitar exagerar examinar excavar
+exclamar explicar explorar explotar expresar facilitar fallar falsificar
+faltar fascinar fechar felicitar festejar filmar firmar flotar fomentar
+formar forrar fracasar frenar frotar fumar funcionar ganar gastar girar
+golpear gotear grabar gritar guardar gustar habitar hablar halagar
+hallar hechizar heredar hospedar hurtar ignorar iluminar ilustrar
+imaginar imitar implorar importar impulsar inaugurar inclinar incorporar
+indicar informar ingresar inspirar instalar intentar intercambiar
+interesar interpretar interrogar inundar inventar invitar irritar jalar
+juntar jurar juzgar ladrar lanzar lastimar lavar levantar liberar
+limitar limpiar llamar llegar llenar llevar llorar lograr luchar
+madrugar mandar manejar manifestar marcar marchar masticar matar meditar
+mejorar mencionar mezclar mirar modelar modificar mojar molestar montar
+marear mudar nadar narrar navegar necesitar negociar nombrar notar
+observar obligar ocupar odiar olvidar opinar optar ordenar organizar
+orientar pactar pagar palpitar parar participar pasar pasear patinar
+pecar peinar pelear penetrar perdonar perdurar perforar perturbar pesar
+pescar picar pintar pisar plantar platicar pronunciar preguntar preparar
+presentar preservar prestar privar proclamar procurar programar
+progresar proyectar publicar pulsar quebrar quedar quemar quitar rascar
+rastrear rayar realizar rebajar rebelar recalcar reclamar recompensar
+rectificar recuperar regalar regar registrar regresar rechazar relatar
+relajar rellenar remar rematar remolcar rentar reparar repasar reposar
+representar rescatar reservar resignar respetar respirar restar resultar
+retirar retrasar revelar revisar rezar rimar robar rodar rondar rozar
+saborear sacar saludar salvar sanar secar sellar señalar separar serenar
+silbar simular sobrar sollozar soltar soñar soplar soportar sospechar
+sumar superar suplicar suspirar susurrar tallar tapar tardar temblar
+terminar tirar titubear tocar tomar torear trabajar tragar transformar
+trasladar tratar trazar triunfar trepar usar vagar velar vendar ventilar
+viajar vibrar vigilar visitar volar votar anhelar arrasar callar cantar
+caminar cambiar cargar casar causar cesar contar cuestionar desplegar
+despertar empezar encontrar mostrar pensar probar recordar sembrar sonar
+tronar acostar almorzar forzar renovar volcar negar nevar helar plegar
+fregar tropezar calentar confortar enterrar gobernar acertar atravesar
+despeñar sosegar abrasar acariciar acechar acuñar adular afanar afinar
+agasajar aguijonear ahogar ahuyentar airear ajar alborotar alertar
+alisar alternar amansar amasar amortajar anegar angustiar apedrear
+apiadar aplacar apostar arar arrimar arrodillar arrugar asombrar aspirar
+atisbar atormentar atropellar avivar azotar balbucear bautizar blindar
+bordear borronear brear calcular calmar cansar capturar castigar cegar
+cercenar chispear cicatrizar clausurar cobijar codiciar coleccionar
+colmar comulgar congelar conjurar conmemorar consumar contagiar
+contrastar cortejar cotizar crispar cuajar deleitar deletrear denotar
+deplorar derrochar desafinar desamparar desatar desbordar descalzar
+descolgar descorchar desdeñar desembocar desempolvar desenterrar
+desgastar deshonrar desmontar desnucar desollar despachar despejar
+desperdiciar despojar desterrar destellar desvelar detonar devorar
+diagnosticar difamar dilatar disculpar diseñar disipar divagar divisar
+dotar embarrar embriagar emigrar empañar empapelar empinar encadenar
+encarnar enclavar encorvar endulzar engalanar engendrar enjaular enlutar
+enmendar ensalzar ensayar entonar entrelazar envidiar equilibrar
+escarbar escoltar esculcar esfumar esmaltar espantar espolear esquilar
+estallar estampar estancar estrangular estrechar evaporar evocar exaltar
+expirar extrañar fatigar flamear florear forjar fracturar frecuentar
+fulminar galopar germinar glorificar gozar graznar guisar hilar hojear
+honrar hornear hostigar humillar idolatrar implantar incendiar increpar
+inmolar inmortalizar insultar inquietar invocar jadear jubilar labrar
+lacrar ladear lamentar lapidar lidiar lijar lloviznar machacar maltratar
+manchar maniatar mimar moldear murmurar naufragar obsequiar olfatear
+ondear orar orillar otear palmear parpadear pasmar patear pavonear pegar
+pellizcar pernoctar pestañear pincelar pisotear plagar planear plasmar
+podar posar pregonar profanar prolongar propagar quebrantar rasgar
+rasguñar rastrillar recatar recrear redoblar reflejar refrescar
+regocijar relampaguear relinchar remendar remojar rememorar resbalar
+resguardar resonar restaurar retumbar revolotear rodear saciar salpicar
+saltar sangrar saquear segar sepultar serpentear sitiar sofocar solazar
+sombrear sortear sujetar surcar tantear tararear templar tentar
+tintinear tiritar titilar tornar torturar trastornar trenzar trinar
+tutear ultrajar untar vadear vaticinar vedar vendimiar ventear veranear
+vislumbrar zarpar zozobrar zumbar
+""".split()
+
+# Verbos -ar con diptongación en la raíz tónica (e→ie, o→ue)
+DIPTONGAN_AR = set("""
+cerrar pensar comenzar empezar despertar sembrar temblar manifestar
+apretar confesar encerrar negar nevar helar plegar fregar tropezar
+calentar enterrar gobernar acertar atravesar sosegar alentar quebrar
+desplegar regar contar mostrar probar recordar sonar soñar tronar acostar
+almorzar forzar renovar volcar volar rodar soltar colgar consolar
+aprobar comprobar demostrar encontrar cegar tentar descolgar desollar
+desterrar desenterrar enmendar remendar apostar resonar segar
+""".split())
+
+VERBOS_ER = """
+aprender barrer beber comer comprender correr coser creer deber
+depender esconder meter ofender prender responder romper socorrer
+sorprender suspender temer toser vender acceder pretender recorrer
+tejer ceder conceder proceder exceder anteceder interceder corresponder emprender
+desprender sorber arremeter cometer someter prometer comprometer
+entrometer remeter acometer leer poseer proveer
+""".split()
+
+VERBOS_ER_ZCO = """
+agradecer amanecer anochecer aparecer desaparecer carecer conocer
+reconocer crecer enriquecer envejecer establecer fortalecer merecer
+nacer obedecer ofrecer oscurecer padecer parecer permanecer pertenecer
+resplandecer florecer estremecer entristecer enternecer enloquecer
+adormecer atardecer embellecer enmudecer palidecer favorecer
+desfallecer desvanecer enaltecer ensombrecer
+""".split()
+
+DIPTONGAN_ER = """
+defender encender entender perder tender atender extender verter
+morder mover llover doler soler volver devolver envolver resolver
+disolver absolver remover conmover promover torcer
+""".split()
+
+VERBOS_IR = """
+abrir admitir aplaudir asistir batir cubrir cumplir decidir definir
+describir descubrir discutir dividir escribir existir imprimir
+insistir interrumpir invadir partir permitir persuadir recibir combatir
+debatir residir resistir subir sufrir unir vivir omitir emitir transmitir
+compartir confundir difundir fundir sacudir acudir añadir aludir eludir
+esculpir evadir exhibir inscribir suscribir presumir resumir asumir
+crujir latir aturdir urgir
+consumir urdir zurcir surgir fingir dirigir exigir erigir afligir
+""".split()
+
+# Verbos -ir con cambio e→ie/i, e→i, o→ue/u
+DIPTONGAN_IR = {
+    'sentir': 'ie', 'mentir': 'ie', 'preferir': 'ie', 'sugerir': 'ie',
+    'herir': 'ie', 'convertir': 'ie', 'divertir': 'ie', 'advertir': 'ie',
+    'consentir': 'ie', 'hervir': 'ie', 'referir': 'ie', 'requerir': 'ie',
+    'pedir': 'i', 'servir': 'i', 'repetir': 'i', 'medir': 'i', 'vestir': 'i',
+    'competir': 'i', 'gemir': 'i', 'rendir': 'i', 'despedir': 'i',
+    'impedir': 'i', 'expedir': 'i', 'derretir': 'i',
+    'dormir': 'ue', 'morir': 'ue',
+}
+
+SUSTANTIVOS = """
+abismo abrazo abrigo abril abuelo acento acero agosto agua águila aguja
+aire ala alba alcoba aldea alegría alfombra aliento alma almendra altar
+altura amanecer amante amigo amor ancla angustia anhelo anillo ánimo
+año aroma arena arma armonía arroyo arte astro aurora ausencia
+aventura avión azúcar azucena bahía balcón bandera banco barca barco
+barro batalla belleza beso biblioteca bosque brazo brisa broma bruma
+caballo cabello cabeza cadena cadera calle calma calor cama camino
+campana campo canción candado cansancio canto capa capricho cara
+carbón cárcel caricia carta casa castillo catedral causa caverna
+cebolla ceniza cereza cielo ciervo cima cintura ciudad clavel cofre
+colina color columna comedia corazón cordero corona cuchillo cuello
+cuento cuerda cuerpo cueva culpa cumbre cuna daga danza deber
+delirio deseo desierto destino día diamante diente dios dolor domingo
+duelo dueño dulzura edad eco encanto enemigo engaño espada espalda
+espejo esperanza espina espíritu esposa estrella eternidad fantasma
+farol fe fiebre fiesta figura filo flauta flecha flor fortuna fuego
+fuente fuerza fulgor futuro gaviota gloria golondrina golpe gota
+gracia grito guerra guitarra hada herida hermano héroe hielo hierba
+hija hijo hilo historia hoguera hoja hombre hombro hora horizonte
+huella hueso humo idioma iglesia imagen infancia infierno instante
+invierno isla jardín jazmín joya juego juventud labio lago lágrima
+lámpara lanza latido laurel leche lecho lengua león letra libertad
+libro llama llanto llave lluvia lobo locura lucero lugar luna luz
+madera madre madrugada maestro mañana mano manzana mapa mar marea
+mariposa mármol martes máscara medianoche melodía memoria mentira
+mesa miedo miel milagro minuto mirada misterio montaña monte muerte
+mujer mundo muralla música nación naranja naturaleza nave navío niebla
+nieve niña niño noche nombre norte nostalgia nube nudo ola olivo
+olvido orgullo oro otoño pájaro palabra palacio paloma pan pañuelo
+papel paraíso pasión paso patria paz pecado pecho pena pensamiento
+perfume perla perro piedra piel pino placer planeta plata playa plaza
+pluma poema poesía poeta polvo pozo pradera primavera princesa
+promesa pueblo puente puerta puerto rayo razón recuerdo red regalo
+reina reino reloj remo rey río risa roca rocío rosa rostro rueda
+ruido ruiseñor sabor sal salud sangre secreto sed selva semana
+semilla sendero sentido señal serpiente silencio silla sirena sol
+soldado soledad sombra sombrero sonido sonrisa sueño suelo suerte
+suspiro tarde techo tela templo tempestad tiempo tierra tigre
+tinieblas torre trigo tristeza trueno tumba universo vaso vela
+veneno ventana verano verdad verso viaje victoria vida viento vientre
+villa vino violeta virtud voz vuelo zapato abeja alambre almohada
+amapola ángel anochecer antorcha arco ardor arpa asombro atardecer
+ave azahar balada bálsamo bandido barranco bautismo bendición
+blasfemia bondad borde bóveda bronce brújula buitre búho caída
+cáliz camarada cántaro caos capitán carmín carroza cascada cenit
+cerebro cerro cicatriz ciprés cisne clamor claridad cobre cometa
+compás condena consuelo copla coral cordillera cosecha costa crepúsculo
+cristal cruz cuaderno cúpula delfín desdén desengaño desvelo diluvio
+doncella dragón duende efímero embrujo emoción encina enigma
+escarcha esclavo escudo esmeralda espuma estación estío estrofa
+éxtasis fábula falda fama fantasía fénix fiera firmamento fragancia
+frontera fruto fulgor galope gemido gigante girasol granada granito
+grieta gruta guirnalda halcón harapo herencia hiedra himno hogar
+hondura horror huerto huracán ilusión incendio inocencia ira jaula
+jornada júbilo juramento laberinto lamento lecho leyenda lirio
+llanura lodo lucha lumbre luto madreselva manantial mansión marfil
+marinero martirio melancolía mendigo mirlo molino momento morada
+murmullo naufragio néctar nido nostalgia oasis ocaso océano ofrenda
+orilla oración orquídea pálpito pantano pasado pastor paisaje peregrino
+pétalo piano pirata plegaria pobreza presagio prisión profeta pupila
+quimera raíz rama ramo refugio relámpago remanso reposo resplandor
+retrato rincón ritmo rubí ruina sacrificio sauce sepulcro serenata
+silueta sinfonía sollozo susurro tambor tejado telar ternura tesoro
+tormenta tormento torrente tragedia trama travesía tregua tribu
+trinchera trono tulipán umbral valle vapor vejez vendaval ventisca
+vergel vértigo vestido viajero vidrio viña vino violín visión viuda
+volcán yunque zafiro ojo oreja nariz boca frente mejilla barbilla
+garganta rodilla pie dedo uña codo pierna tobillo ceja pestaña párpado
+enero febrero marzo mayo junio julio septiembre octubre noviembre
+diciembre lunes miércoles jueves viernes sábado sierra ribera laguna
+palma gesto pureza grandeza firmeza dureza riqueza nobleza rudeza
+torpeza certeza alteza tibieza fiereza llaneza cabaña choza aldeano
+labrador pastora calandria alondra jilguero gorrión paloma tórtola
+cigüeña golondrina grulla águila milano cuervo corneja lechuza abeto
+roble encina álamo chopo olmo haya fresno nogal castaño almendro
+manzano naranjo limonero higuera parra hiedra musgo helecho junco
+caña espiga amapola lirio nardo clavel azucena violeta margarita
+retama tomillo romero laurel mirto arrayán ciprés cedro pinar
+bosquecillo arboleda alameda pradera vega llano loma ladera barranco
+quebrada cañada arroyo riachuelo manantial fontana estanque charca
+acequia molino aceña puente vado orilla ribazo peñasco risco roquedal
+arenal playa cala bahía ensenada cabo istmo península archipiélago
+mañanita tardecita nochecita amanecida alborada crepúsculo anochecida
+hermosura blancura ternura amargura dulzura locura cordura frescura
+altura anchura espesura llanura hondura negrura tristura
+acción admiración adoración afición aflicción agitación alucinación
+ambición animación aparición aplicación atención atracción audición
+aviación bendición canción capitulación celebración circulación
+colección combinación comparación compasión composición comprensión
+comunicación concepción conclusión condición confesión confusión
+conmoción consolación constelación construcción contemplación
+contradicción conversación convicción corrupción creación decisión
+declaración dedicación definición depresión descripción desesperación
+destrucción devoción dimensión dirección discusión disposición
+distracción división duración educación elección elevación emoción
+encarnación ensoñación erupción estación evasión evocación excepción
+exclamación expansión explicación explosión expresión extensión
+fascinación fundación generación gestación habitación ilusión
+imaginación impresión inclinación indignación infección inquietud
+inspiración intención invasión invitación lección liberación locución
+maldición meditación mención misión nación narración negación
+obligación observación obsesión ocasión opinión oposición oración
+ovación pasión percepción perdición persuasión petición población
+porción posesión posición precisión predicción presión prisión
+procesión producción profesión promoción proporción protección
+provisión rebelión recepción redención reflexión región relación
+religión rendición repetición reputación resignación resolución
+respiración revelación revolución rotación salvación sanción
+sensación separación situación solución sumisión superstición
+tensión tentación tradición traición transición unión vacación
+variación vegetación versión visión vocación
+acordeón aguijón alción algodón almidón arpón atracón azadón
+bastón blasón bombón botón buzón cajón callejón camaleón camión
+cañón capón carretón cartón centurión cicerón colchón corazón 
+crespón  dragón edredón empujón escalón escorpión eslabón
+espolón  faetón fogón galeón galón girón glotón halcón
+jabón jamón jergón lechón limón listón llorón melón millón mojón
+montón mesón nubarrón orejón pabellón pantalón peatón pendón
+peñón perdón pezón pichón pilón pinzón piñón plumón portón rincón
+renglón riñón  salón sermón sillón  sol tazón telón
+terrón tiburón timón tirón torreón tostón turrón varón vellón
+ventarrón pregón aluvión bribón  ratón ladrón patrón
+anochecer atardecer placer poder saber deber querer ser  mujer
+alfiler taller cantar altar hogar lagar manjar mar muladar olivar
+palomar pinar telar azar collar lugar pesar pajar solar avatar
+amor calor candor clamor color dolor favor fervor fulgor furor
+honor humor labor licor olor pavor primor rencor rigor rubor
+sabor sudor temor terror tumor valor vapor vigor ardor esplendor
+resplandor señor pastor cantor ruiseñor trovador soñador pescador
+labrador cazador corredor mirador jugador traidor amador
+animal arrabal cardenal caudal cristal cereal fanal final ideal
+manantial metal nogal panal pedernal portal puñal rosal sal señal
+sitial  umbral vendaval ventanal zarzal arenal trigal
+clavel cordel cuartel doncel laurel lebrel mantel miel nivel
+papel pastel pincel tonel vergel cincel batel corcel bajel cascabel
+abril añil atril barril candil carril fusil marfil perfil pretil
+redil reptil toril
+noche coche broche derroche reproche trasnoche fantoche
+leche lecho techo trecho helecho barbecho despecho derecho
+pecho provecho acecho estrecho hecho dicho trecho
+bondad ciudad claridad crueldad eternidad felicidad humanidad
+humildad lealtad libertad maldad mitad navidad necesidad oscuridad
+piedad realidad serenidad sociedad soledad tempestad variedad
+verdad voluntad vanidad virginidad juventud inquietud plenitud
+quietud salud senectud virtud multitud gratitud lentitud esclavitud
+alegría armonía cobardía compañía cortesía energía fantasía
+geografía hidalguía lejanía letanía melodía osadía poesía rebeldía
+sabiduría sinfonía travesía valentía agonía porfía
+momento aliento argumento cemento cimiento cuento firmamento
+fundamento juramento lamento monumento movimiento nacimiento
+pensamiento sacramento sentimiento sufrimiento talento testamento
+tormento viento elemento instrumento tratamiento
+""".split()
+
+
+ADJETIVOS = """
+alto amargo amado ancho antiguo ardiente áspero atento bello blanco
+blando bravo breve brillante bueno cálido callado cansado cercano
+ciego claro cobarde cruel débil delgado desnudo dichoso divino dorado
+dulce duro encantado enfermo eterno extraño feliz feo fiel fino firme
+frágil fresco frío fuerte grande grave hermoso helado hondo
+humilde inmenso joven largo lejano lento leve libre limpio lindo
+lleno loco lejano maduro malo manso menudo mísero muerto mudo negro
+noble nuevo oculto oscuro pálido pequeño perdido perfecto pobre
+preciso profundo pronto puro querido quieto rápido raro rico rojo
+roto sagrado santo sereno serio sincero solo sombrío suave
+sublime sutil tardío terrible tibio tierno torpe tranquilo triste
+único vacío valiente vano veloz verde viejo vivo azul gris
+plateado morado rosado amarillo celeste ardiente errante radiante
+fugaz tenaz audaz voraz feroz atroz sagaz locuaz mordaz
+""".split()
+
+INVARIABLES = """
+jamás nunca siempre también tampoco todavía aún ahora entonces después
+antes luego mañana ayer hoy aquí allí allá acá cerca lejos dentro
+fuera arriba abajo delante detrás encima debajo quizás acaso además
+sin con por para según hacia hasta desde entre contra sobre tras
+ante bajo mediante durante aunque porque pues mientras cuando donde
+como cual quien cuanto más menos muy tan bien mal así sí no
+""".split()
+
+# Palabras gramaticales (artículos, pronombres, determinantes, nexos)
+FUNCIONALES = """
+el la lo los las un una unos unas al del yo tú él ella ello ellos ellas
+usted ustedes nosotros nosotras vosotros vosotras me te se nos os le les
+mí ti sí conmigo contigo consigo mi mis tu tus su sus nuestro nuestra
+nuestros nuestras vuestro vuestra vuestros vuestras mío mía míos mías
+tuyo tuya tuyos tuyas suyo suya suyos suyas este esta esto estos estas
+ese esa eso esos esas aquel aquella aquello aquellos aquellas que qué
+quien quién quienes quiénes cual cuál cuales cuáles cuyo cuya cuyos
+cuyas cuanto cuánto cuanta cuánta cuantos cuántos cuantas cuántas
+donde dónde adonde adónde cuando cuándo como cómo todo toda todos todas
+otro otra otros otras mismo misma mismos mismas tanto tanta tantos
+tantas mucho mucha muchos muchas poco poca pocos pocas alguno alguna
+algunos algunas algún ninguno ninguna ningún nadie nada alguien algo
+cada cualquier cualquiera varios varias ambos ambas demás y e o u ni
+pero mas sino si a de en
+""".split()
+
+# Formas de los verbos irregulares más frecuentes
+IRREGULARES = """
+ser soy eres es somos sois son fui fuiste fue fuimos fuisteis fueron era
+eras éramos erais eran seré serás será seremos seréis serán sería serías
+seríamos seríais serían sea seas seamos seáis sean fuera fueras fuéramos
+fuerais fueran fuese fueses fuésemos fueseis fuesen sido siendo sé sed
+estar estoy estás está estamos estáis están estuve estuviste estuvo
+estuvimos estuvisteis estuvieron estaba estabas estábamos estabais
+estaban estaré estarás estará estaremos estaréis estarán estaría
+estarías estaríamos estaríais estarían esté estés estemos estéis estén
+estuviera estuvieras estuviéramos estuvierais estuvieran estado estando
+haber he has ha hemos habéis han hube hubiste hubo hubimos hubisteis
+hubieron había habías habíamos habíais habían habré habrás habrá habremos
+habréis habrán habría habrías habríamos habríais habrían haya hayas
+hayamos hayáis hayan hubiera hubieras hubiéramos hubierais hubieran
+hubiese hubiesen habido habiendo hay
+tener tengo tienes tiene tenemos tenéis tienen tuve tuviste tuvo tuvimos
+tuvisteis tuvieron tenía tenías teníamos teníais tenían tendré tendrás
+tendrá tendremos tendréis tendrán tendría tendrías tendríamos tendríais
+tendrían tenga tengas tengamos tengáis tengan tuviera tuvieras
+tuviéramos tuvierais tuvieran tenido teniendo ten tened
+ir voy vas va vamos vais van iba ibas íbamos ibais iban iré irás irá
+iremos iréis irán iría irías iríamos iríais irían vaya vayas vayamos
+vayáis vayan ido yendo ve id
+hacer hago haces hace hacemos hacéis hacen hice hiciste hizo hicimos
+hicisteis hicieron hacía hacías hacíamos hacíais hacían haré harás hará
+haremos haréis harán haría harías haríamos haríais harían haga hagas
+hagamos hagáis hagan hiciera hicieras hiciéramos hicierais hicieran
+hecho hecha hechos hechas haciendo haz haced
+decir digo dices dice decimos decís dicen dije dijiste dijo dijimos
+dijisteis dijeron decía decías decíamos decíais decían diré dirás dirá
+diremos diréis dirán diría dirías diríamos diríais dirían diga digas
+digamos digáis digan dijera dijeras dijéramos dijerais dijeran dicho
+dicha dichos dichas diciendo di decid
+poder puedo puedes puede podemos podéis pueden pude pudiste pudo
+pudimos pudisteis pudieron podía podías podíamos podíais podían podré
+podrás podrá podremos podréis podrán podría podrías podríamos podríais
+podrían pueda puedas podamos podáis puedan pudiera pudieras pudiéramos
+pudierais pudieran podido pudiendo
+querer quiero quieres quiere queremos queréis quieren quise quisiste
+quiso quisimos quisisteis quisieron quería querías queríamos queríais
+querían querré querrás querrá querremos querréis querrán querría
+querrías querríamos querríais querrían quiera quieras queramos queráis
+quieran quisiera quisieras quisiéramos quisierais quisieran querido
+querida queridos queridas queriendo
+saber sé sabes sabe sabemos sabéis saben supe supiste supo supimos
+supisteis supieron sabía sabías sabíamos sabíais sabían sabré sabrás
+sabrá sabremos sabréis sabrán sabría sabrías sabríamos sabríais sabrían
+sepa sepas sepamos sepáis sepan supiera supieras supiéramos supierais
+supieran sabido sabiendo
+venir vengo vienes viene venimos venís vienen vine viniste vino vinimos
+vinisteis vinieron venía venías veníamos veníais venían vendré vendrás
+vendrá vendremos vendréis vendrán vendría vendrías vendríamos vendríais
+vendrían venga vengas vengamos vengáis vengan viniera vinieras
+viniéramos vinierais vinieran venido viniendo ven venid
+ver veo ves ve vemos veis ven vi viste vio vimos visteis vieron veía
+veías veíamos veíais veían veré verás verá veremos veréis verán vería
+verías veríamos veríais verían vea veas veamos veáis vean viera vieras
+viéramos vierais vieran visto vista vistos vistas viendo
+dar doy das da damos dais dan di diste dio dimos disteis dieron daba
+dabas dábamos dabais daban daré darás dará daremos daréis darán daría
+darías daríamos daríais darían dé des demos deis den diera dieras
+diéramos dierais dieran dado dando
+poner pongo pones pone ponemos ponéis ponen puse pusiste puso pusimos
+pusisteis pusieron ponía ponías poníamos poníais ponían pondré pondrás
+pondrá pondremos pondréis pondrán pondría pondrías pondríamos pondríais
+pondrían ponga pongas pongamos pongáis pongan pusiera pusieras
+pusiéramos pusierais pusieran puesto puesta puestos puestas poniendo pon
+salir salgo sales sale salimos salís salen salí saliste salió salieron
+salía salías salíamos salíais salían saldré saldrás saldrá saldremos
+saldréis saldrán saldría saldrías saldrían salga salgas salgamos salgan
+saliera salieras salieran salido saliendo sal salid
+traer traigo traes trae traemos traéis traen traje trajiste trajo
+trajimos trajeron traía traías traían traeré traerá traerán traería
+traiga traigas traigan trajera trajeran traído trayendo
+caer caigo caes cae caemos caen caí caíste cayó caímos cayeron caía
+caías caían caeré caerá caería caiga caigas caigan cayera cayeran caído
+cayendo
+oír oigo oyes oye oímos oís oyen oí oíste oyó oyeron oía oías oían oiré
+oirá oiría oiga oigas oigan oyera oyeran oído oyendo
+reír río ríes ríe reímos reís ríen reí reíste rio rieron reía reían reiré
+reirá reiría ría rías rían riera rieran reído riendo
+huir huyo huyes huye huimos huyen huí huiste huyó huyeron huía huían
+huiré huirá huiría huya huyas huyan huyera huyeran huido huyendo
+jugar juego juegas juega jugamos jugáis juegan jugué jugaste jugó
+jugaron jugaba jugaban jugaré jugará jugaría juegue juegues jueguen
+jugara jugaran jugado jugando
+oler huelo hueles huele olemos olen olía olían huela huelan olido
+oliendo
+errar yerro yerras yerra erramos yerran erraba errado errando
+morir muero mueres muere morimos mueren murió murieron moría morían
+moriré morirá moriría muera mueras mueran muriera murieran muerto
+muerta muertos muertas muriendo
+nacer nazco naces nace nacemos nacen nací naciste nació nacieron nacía
+nacían naceré nacerá nacería nazca nazcas nazcan naciera nacieran nacido
+naciendo
+andar ando andas anda andamos andan anduve anduviste anduvo anduvieron
+andaba andaban andaré andará andaría ande andes anden anduviera
+anduvieran andado andando
+caber quepo cabes cabe cupe cupo cabía cabré cabrá cabría quepa quepan
+cupiera cabido
+valer valgo vales vale valemos valen valía valían valdré valdrá valdría
+valga valgan valido valiendo
+leer leo lees lee leemos leen leí leíste leyó leyeron leía leían leeré
+leerá leería lea leas lean leyera leyeran leído leyendo
+conducir conduzco conduces conduce conducimos conducen conduje condujo
+condujeron conducía conduciré conduzca conduzcan condujera conducido
+conduciendo
+traducir traduzco traduce traducen traduje tradujo traduzca traducido
+""".split()
+
+# --- Utilidades de acentuación ----------------------------------------------
+
+_TILDE = {'a': 'á', 'e': 'é', 'i': 'í', 'o': 'ó', 'u': 'ú'}
+_SIN_TILDE = {v: k for k, v in _TILDE.items()}
+
+
+def _quitar_tilde(palabra):
+    return ''.join(_SIN_TILDE.get(c, c) for c in palabra)
+
+
+def _tiene_tilde(palabra):
+    return any(c in _SIN_TILDE for c in palabra)
+
+
+def _acentuar_ultima_vocal_desde(palabra, desde_final):
+    """Pone tilde en la vocal núcleo situada antes de `desde_final` caracteres del final"""
+    limite = len(palabra) - desde_final
+    for i in range(limite - 1, -1, -1):
+        if palabra[i] in 'aeo':
+            return palabra[:i] + _TILDE[palabra[i]] + palabra[i + 1:]
+        if palabra[i] in 'iu':
+            # i/u átonas en diptongo con vocal abierta previa: acentuar la abierta
+            if i > 0 and palabra[i - 1] in 'aeo':
+                continue
+            return palabra[:i] + _TILDE[palabra[i]] + palabra[i + 1:]
+    return palabra
+
+
+# --- Verbos -----------------------------------------------------------------
+
+_CLITICOS = ('me', 'te', 'se', 'lo', 'la', 'le', 'nos', 'los', 'las', 'les')
+
+
+def _raiz_ortografica(raiz, terminacion, infinitivo):
+    """Ajustes ortográficos ante e (c→qu, g→gu, z→c) y ante a/o (g→j, c→z)"""
+    if terminacion[:1] in ('e', 'é'):
+        if infinitivo.endswith('car'):
+            return raiz[:-1] + 'qu'
+        if infinitivo.endswith('gar'):
+            return raiz + 'u'
+        if infinitivo.endswith('zar'):
+            return raiz[:-1] + 'c'
+    if terminacion[:1] in ('a', 'á', 'o', 'ó') and infinitivo.endswith(('er', 'ir')):
+        if raiz.endswith('g') and infinitivo.endswith(('ger', 'gir')):
+            return raiz[:-1] + 'j'
+        if raiz.endswith('rc') or raiz.endswith('zurc'):
+            return raiz[:-1] + 'z'
+    return raiz
+
+
+def _diptongar(raiz, cambio):
+    """Aplica el cambio vocálico a la última vocal de la raíz"""
+    for i in range(len(raiz) - 1, -1, -1):
+        if raiz[i] in 'eo':
+            vocal = raiz[i]
+            if cambio == 'ue' and vocal == 'o':
+                nuevo = 'ue'
+            elif cambio == 'ie' and vocal == 'e':
+                nuevo = 'ie'
+            elif cambio == 'i' and vocal == 'e':
+                nuevo = 'i'
+            elif cambio == 'u' and vocal == 'o':
+                nuevo = 'u'
+            else:
+                return raiz
+            if nuevo == 'ie' and i == 0:
+                nuevo = 'ye'  # errar → yerro
+            if nuevo == 'ue' and i == 0:
+                nuevo = 'hue'  # oler → huelo
+            return raiz[:i] + nuevo + raiz[i + 1:]
+    return raiz
+
+
+_DESINENCIAS = {
+    'ar': {
+        'presente': ['o', 'as', 'a', 'amos', 'áis', 'an'],
+        'preterito': ['é', 'aste', 'ó', 'amos', 'asteis', 'aron'],
+        'imperfecto': ['aba', 'abas', 'aba', 'ábamos', 'abais', 'aban'],
+        'subjuntivo': ['e', 'es', 'e', 'emos', 'éis', 'en'],
+        'subj_ra': ['ara', 'aras', 'ara', 'áramos', 'arais', 'aran'],
+        'subj_se': ['ase', 'ases', 'ase', 'ásemos', 'aseis', 'asen'],
+        'gerundio': 'ando', 'participio': 'ad', 'imperativo_pl': 'ad',
+    },
+    'er': {
+        'presente': ['o', 'es', 'e', 'emos', 'éis', 'en'],
+        'preterito': ['í', 'iste', 'ió', 'imos', 'isteis', 'ieron'],
+        'imperfecto': ['ía', 'ías', 'ía', 'íamos', 'íais', 'ían'],
+        'subjuntivo': ['a', 'as', 'a', 'amos', 'áis', 'an'],
+        'subj_ra': ['iera', 'ieras', 'iera', 'iéramos', 'ierais', 'ieran'],
+        'subj_se': ['iese', 'ieses', 'iese', 'iésemos', 'ieseis', 'iesen'],
+        'gerundio': 'iendo', 'participio': 'id', 'imperativo_pl': 'ed',
+    },
+    'ir': {
+        'presente': ['o', 'es', 'e', 'imos', 'ís', 'en'],
+        'preterito': ['í', 'iste', 'ió', 'imos', 'isteis', 'ieron'],
+        'imperfecto': ['ía', 'ías', 'ía', 'íamos', 'íais', 'ían'],
+        'subjuntivo': ['a', 'as', 'a', 'amos', 'áis', 'an'],
+        'subj_ra': ['iera', 'ieras', 'iera', 'iéramos', 'ierais', 'ieran'],
+        'subj_se': ['iese', 'ieses', 'iese', 'iésemos', 'ieseis', 'iesen'],
+        'gerundio': 'iendo', 'participio': 'id', 'imperativo_pl': 'id',
+    },
+}
+
+# Participios irregulares (raíz sin la vocal final de género)
+PARTICIPIOS_IRREGULARES = {
+    'abrir': 'abiert', 'cubrir': 'cubiert', 'descubrir': 'descubiert',
+    'escribir': 'escrit', 'describir': 'descrit', 'inscribir': 'inscrit',
+    'suscribir': 'suscrit', 'romper': 'rot', 'volver': 'vuelt',
+    'devolver': 'devuelt', 'envolver': 'envuelt', 'resolver': 'resuelt',
+    'disolver': 'disuelt', 'absolver': 'absuelt', 'morir': 'muert',
+    'imprimir': 'impres',
+}
+
+# Personas con raíz tónica en presente (yo, tú, él, ellos)
+_TONICAS = (0, 1, 2, 5)
+
+
+def conjugar(infinitivo, cambio=None, cambio_debil=None, zco=False):
+    """
+    Formas simples de un verbo regular (o con cambio vocálico)
+
+    Args:
+        cambio: diptongación en la raíz tónica ('ie', 'ue', 'i')
+        cambio_debil: cambio en la raíz átona de -ir ('i', 'u') en
+            3.ª persona del pretérito, subjuntivo y gerundio
+        zco: verbos en -cer/-cir con primera persona en -zco
+    """
+    grupo = infinitivo[-2:]
+    raiz = infinitivo[:-2]
+    d = _DESINENCIAS[grupo]
+    formas = {infinitivo}
+
+    # Verbos con raíz terminada en vocal (leer, creer): y en lugar de i átona
+    raiz_vocalica = grupo in ('er', 'ir') and raiz[-1:] in 'aeo'
+
+    def forma(r, t):
+        r = _raiz_ortografica(r, t, infinitivo)
+        if raiz_vocalica and t.startswith(('ie', 'ió')):
+            return r + 'y' + t[1:]
+        if raiz_vocalica and t[:1] == 'i' and t != 'i':
+            return r + 'í' + t[1:]
+        return r + t
+
+    tonica = _diptongar(raiz, cambio) if cambio else raiz
+    debil = _diptongar(raiz, cambio_debil) if cambio_debil else raiz
+
+    for persona, t in enumerate(d['presente']):
+        if persona == 0 and zco:
+            formas.add(raiz[:-1] + 'zco')
+            continue
+        r = tonica if persona in _TONICAS else raiz
+        if grupo == 'ir' and cambio == 'i' and persona in _TONICAS:
+            r = _diptongar(raiz, 'i')
+        formas.add(forma(r, t))
+
+    for persona, t in enumerate(d['preterito']):
+        r = debil if grupo == 'ir' and persona in (2, 5) else raiz
+        if raiz_vocalica and persona == 1:
+            formas.add(raiz + 'íste')
+            continue
+        if raiz_vocalica and persona in (3, 4):
+            formas.add(raiz + 'í' + t[1:])
+            continue
+        formas.add(forma(r, t))
+
+    for t in d['imperfecto']:
+        formas.add(forma(raiz, t))
+
+    for persona, t in enumerate(d['subjuntivo']):
+        if zco:
+            formas.add(raiz[:-1] + 'zc' + t)
+            continue
+        if persona in _TONICAS:
+            r = tonica
+            if grupo == 'ir' and cambio == 'i':
+                r = _diptongar(raiz, 'i')
+        else:
+            r = debil if grupo == 'ir' else raiz
+        formas.add(forma(r, t))
+
+    for clave in ('subj_ra', 'subj_se'):
+        for t in d[clave]:
+            formas.add(forma(debil if grupo == 'ir' else raiz, t))
+
+    for t in ('é', 'ás', 'á', 'emos', 'éis', 'án'):
+        formas.add(infinitivo + t)
+    for t in ('ía', 'ías', 'íamos', 'íais', 'ían'):
+        formas.add(infinitivo + t)
+
+    gerundio = forma(debil if grupo == 'ir' else raiz, d['gerundio'])
+    participio = forma(raiz, d['participio'])
+    if raiz_vocalica:
+        participio = raiz + 'íd'
+    participio = PARTICIPIOS_IRREGULARES.get(infinitivo, participio)
+    formas.add(gerundio)
+    formas.update(participio + s for s in ('o', 'a', 'os', 'as'))
+    formas.add(raiz + d['imperativo_pl'])
+    formas.add(_imperativo_tu(tonica, grupo, infinitivo, cambio))
+
+    # Enclíticos: solo infinitivo + un clítico (quererte, mirarla), frecuentes
+    # en verso; las combinaciones de gerundio y dos clíticos (diciéndoselo)
+    # multiplicaban la lista con formas que casi nunca se buscan como rima
+    for cl in _CLITICOS:
+        formas.add(infinitivo + cl)
+
+    return formas
+
+
+def _imperativo_tu(tonica, grupo, infinitivo, cambio):
+    if grupo == 'ir' and cambio == 'i':
+        tonica = _diptongar(infinitivo[:-2], 'i')
+    return tonica + ('a' if grupo == 'ar' else 'e')
+
+
+# --- Sustantivos y adjetivos ------------------------------------------------
+
+def plural(palabra):
+    """Plural regular"""
+    if palabra[-1] in 'aeiouáéó':
+        return palabra + 's'
+    if palabra[-1] in 'íú':
+        return palabra + 'es'
+    if palabra.endswith('z'):
+        return palabra[:-1] + 'ces'
+    if palabra.endswith(('s', 'x')) and not _es_aguda_con_tilde(palabra):
+        if _grupos_vocalicos(palabra) == 1:
+            return palabra + 'es'  # dios → dioses
+        return palabra  # crisis, éxtasis, oasis
+    if _es_aguda_con_tilde(palabra):
+        # canción → canciones, compás → compases
+        return _quitar_tilde(palabra) + 'es'
+    if palabra.endswith('n') and not _tiene_tilde(palabra):
+        # Llana en -n: el plural es esdrújulo (joven → jóvenes)
+        return _acentuar_ultima_vocal_desde(palabra, 2) + 'es'
+    return palabra + 'es'
+
+
+def _es_aguda_con_tilde(palabra):
+    for c in reversed(palabra):
+        if c in 'aeiou':
+            return False
+        if c in _SIN_TILDE:
+            return True
+    return False
+
+
+def _grupos_vocalicos(palabra):
+    return len(re.findall(r'[aeiouáéíóúü]+', palabra))
+
+
+def formas_adjetivo(adjetivo):
+    formas = {adjetivo, plural(adjetivo)}
+    if adjetivo.endswith('o'):
+        femenino = adjetivo[:-1] + 'a'
+        formas.update({femenino, femenino + 's'})
+        formas.add(femenino + 'mente')
+    elif adjetivo[-1] in 'ezl' and adjetivo != 'verde':
+        formas.add(adjetivo + 'mente')
+    return formas
+
+
+def formas_sustantivo(sustantivo):
+    formas = {sustantivo, plural(sustantivo)}
+    if sustantivo.endswith('o') and sustantivo in ('abuelo', 'hermano', 'hijo', 'niño',
+                                                    'amigo', 'maestro', 'dueño', 'esclavo',
+                                                    'pastor', 'mendigo', 'marinero', 'viajero',
+                                                    'peregrino', 'soldado', 'cordero'):
+        femenino = sustantivo[:-1] + 'a'
+        formas.update({femenino, femenino + 's'})
+    return formas
+
+
+def generar():
+    palabras = set()
+
+    for verbo in VERBOS_AR:
+        palabras |= conjugar(verbo, cambio=('ue' if _ultima_vocal_raiz(verbo) == 'o' else 'ie')
+                             if verbo in DIPTONGAN_AR else None)
+    for verbo in VERBOS_ER:
+        palabras |= conjugar(verbo)
+    for verbo in VERBOS_ER_ZCO:
+        palabras |= conjugar(verbo, zco=True)
+    for verbo in DIPTONGAN_ER:
+        palabras |= conjugar(verbo, cambio='ue' if _ultima_vocal_raiz(verbo) == 'o' else 'ie')
+    for verbo in VERBOS_IR:
+        palabras |= conjugar(verbo)
+    for verbo, cambio in DIPTONGAN_IR.items():
+        debil = 'u' if cambio == 'ue' else 'i'
+        palabras |= conjugar(verbo, cambio=cambio, cambio_debil=debil)
+
+    for sustantivo in SUSTANTIVOS:
+        palabras |= formas_sustantivo(sustantivo)
+    for adjetivo in ADJETIVOS:
+        palabras |= formas_adjetivo(adjetivo)
+    palabras.update(INVARIABLES)
+    palabras.update(FUNCIONALES)
+    palabras.update(IRREGULARES)
+
+    return sorted(unicodedata.normalize('NFC', p) for p in palabras if p.isalpha())
+
+
+def _ultima_vocal_raiz(verbo):
+    for c in reversed(verbo[:-2]):
+        if c in 'aeiou':
+            return c
+    return ''
+
+
+def main(argv=None):
+    palabras = generar()
+    RUTA_SALIDA.write_text('\n'.join(palabras) + '\n', encoding='utf-8')
+    print(f"{len(palabras)} palabras escritas en {RUTA_SALIDA}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
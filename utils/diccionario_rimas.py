@@ -0,0 +1,321 @@
+"""
+Diccionario de rimas indexado
+
+Construye, a partir de la lista de palabras incluida
+(utils/datos/palabras.txt), un índice por terminación consonante y por
+firma vocálica asonante, con las mismas reglas que DetectorRimas. El índice
+se guarda como tabla binaria mapeada en memoria (utils/tabla_binaria.py):
+arrays ordenados de identificadores agrupados por clave, más el número de
+sílabas y la acentuación de cada palabra para poder filtrar.
+
+Dentro de cada grupo las palabras están ordenadas por (sílabas,
+acentuación, longitud, palabra), de modo que un filtro por sílabas y
+acentuación es una búsqueda binaria y no un recorrido.
+
+Uso:
+    python -m utils.diccionario_rimas --construir
+    python -m utils.diccionario_rimas corazón --silabas 3
+"""
+
+import argparse
+import hashlib
+import logging
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from .tabla_binaria import TablaBinaria, escribir_tabla, bloque_textos, leer_textos
+
+try:
+    from config_py import METRIC_ANALYSIS_CONFIG
+    _CONFIG = METRIC_ANALYSIS_CONFIG.get('rhyme_detection', {})
+except ImportError:
+    _CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+_RAIZ = Path(__file__).resolve().parent.parent
+RUTA_LISTA = _RAIZ / _CONFIG.get('word_list', 'utils/datos/palabras.txt')
+RUTA_INDICE = _RAIZ / _CONFIG.get('rhyme_index_file', 'data/rimas.idx')
+
+VERSION_INDICE = 2
+ACENTUACIONES = ('aguda', 'llana', 'esdrujula')
+_CODIGO_ACENTUACION = {nombre: i for i, nombre in enumerate(ACENTUACIONES)}
+TIPOS = ('consonante', 'asonante')
+
+
+def _huella(ruta):
+    return hashlib.sha1(Path(ruta).read_bytes()).hexdigest()
+
+
+def claves_rima(detector, palabra):
+    """(clave consonante, clave asonante) de una palabra, o ('', '') si no rima"""
+    terminacion = detector.extraer_terminacion_rima(palabra)
+    if not terminacion:
+        return '', ''
+    consonante = detector._normalizar_terminacion(terminacion)
+    asonante = detector._normalizar_vocales(''.join(c for c in terminacion if c in detector.vocales))
+    return consonante, asonante
+
+
+def construir_indice(ruta_lista=RUTA_LISTA, ruta_indice=RUTA_INDICE):
+    """Lee la lista de palabras, calcula claves y atributos y escribe el índice"""
+    from .rimas import DetectorRimas
+    from .silabas import ContadorSilabas
+
+    inicio = time.perf_counter()
+    detector = DetectorRimas()
+    contador = ContadorSilabas()
+
+    texto = Path(ruta_lista).read_text(encoding='utf-8')
+    palabras = sorted({p.strip().lower() for p in texto.split() if p.strip()})
+
+    silabas = array('B')
+    acentuacion = array('B')
+    grupos = {tipo: {} for tipo in TIPOS}
+
+    for id_palabra, palabra in enumerate(palabras):
+        silabas.append(min(contador.contar_silabas(palabra), 255))
+        acentuacion.append(_CODIGO_ACENTUACION.get(contador.detectar_acentuacion(palabra), 1))
+        consonante, asonante = claves_rima(detector, palabra)
+        # Consonante: mismo umbral que son_rimas_consonantes. Asonante: las
+        # agudas asuenan solo con la vocal tónica (amor - sol), así que basta una
+        if len(consonante) >= 2:
+            grupos['consonante'].setdefault(consonante, []).append(id_palabra)
+        if asonante:
+            grupos['asonante'].setdefault(asonante, []).append(id_palabra)
+
+    def orden(id_palabra):
+        return (silabas[id_palabra], acentuacion[id_palabra],
+                len(palabras[id_palabra]), palabras[id_palabra])
+
+    bloque_palabras, desplazamientos = bloque_textos(palabras)
+    secciones = {
+        'palabras': bloque_palabras,
+        'desplazamientos': desplazamientos,
+        'silabas': silabas,
+        'acentuacion': acentuacion,
+    }
+    for tipo in TIPOS:
+        claves = sorted(grupos[tipo])
+        inicios = array('I', [0])
+        ids = array('I')
+        for clave in claves:
+            ids.extend(sorted(grupos[tipo][clave], key=orden))
+            inicios.append(len(ids))
+        bloque_claves, desplazamientos_claves = bloque_textos(claves)
+        secciones[f'{tipo}_claves'] = bloque_claves
+        secciones[f'{tipo}_desplazamientos'] = desplazamientos_claves
+        secciones[f'{tipo}_inicios'] = inicios
+        secciones[f'{tipo}_ids'] = ids
+
+    lista = Path(ruta_lista).stat()
+    escribir_tabla(ruta_indice, secciones, meta={
+        'version': VERSION_INDICE,
+        'palabras': len(palabras),
+        'lista_bytes': lista.st_size,
+        'lista_mtime_ns': lista.st_mtime_ns,
+        'lista_sha1': _huella(ruta_lista),
+    })
+    logger.info(f"Índice de rimas: {len(palabras)} palabras en "
+                f"{time.perf_counter() - inicio:.1f} s -> {ruta_indice}")
+    return ruta_indice
+
+
+class DiccionarioRimas:
+    """Consultas de rimas sobre el índice mapeado en memoria"""
+
+    def __init__(self, ruta_indice=RUTA_INDICE, ruta_lista=RUTA_LISTA, reconstruir=True):
+        """
+        Args:
+            ruta_indice: archivo del índice binario
+            ruta_lista: lista de palabras de origen
+            reconstruir (bool): regenerar el índice si falta o si la
+                lista cambió desde que se construyó
+        """
+        from .rimas import DetectorRimas
+
+        self.ruta_indice = Path(ruta_indice)
+        self.ruta_lista = Path(ruta_lista)
+        if reconstruir and self._necesita_construir():
+            construir_indice(self.ruta_lista, self.ruta_indice)
+
+        self.tabla = TablaBinaria(self.ruta_indice)
+        self.total_palabras = self.tabla.meta['palabras']
+        self._detector = DetectorRimas()
+
+        self._palabras = self.tabla.seccion('palabras')
+        self._desplazamientos = self.tabla.seccion('desplazamientos')
+        self._silabas = self.tabla.seccion('silabas')
+        self._acentuacion = self.tabla.seccion('acentuacion')
+
+        # Las claves son pocas (miles): se decodifican una vez en un dict
+        self._grupos = {}
+        for tipo in TIPOS:
+            claves = leer_textos(self.tabla.seccion(f'{tipo}_claves'),
+                                 self.tabla.seccion(f'{tipo}_desplazamientos'))
+            self._grupos[tipo] = (
+                {clave: i for i, clave in enumerate(claves)},
+                self.tabla.seccion(f'{tipo}_inicios'),
+                self.tabla.seccion(f'{tipo}_ids'),
+            )
+
+    def _necesita_construir(self):
+        if not self.ruta_indice.exists():
+            return self.ruta_lista.exists()
+        if not self.ruta_lista.exists():
+            return False
+        try:
+            tabla = TablaBinaria(self.ruta_indice)
+            meta = tabla.meta
+            tabla.cerrar()
+        except (ValueError, OSError, KeyError):
+            return True
+        if meta.get('version') != VERSION_INDICE:
+            return True
+        lista = self.ruta_lista.stat()
+        if (lista.st_size, lista.st_mtime_ns) == (meta.get('lista_bytes'), meta.get('lista_mtime_ns')):
+            return False
+        # Fecha distinta (p. ej. tras un checkout): comprobar el contenido
+        return _huella(self.ruta_lista) != meta.get('lista_sha1')
+
+    def __len__(self):
+        return self.total_palabras
+
+    def palabra(self, id_palabra):
+        inicio = self._desplazamientos[id_palabra]
+        fin = self._desplazamientos[id_palabra + 1]
+        return bytes(self._palabras[inicio:fin]).decode('utf-8')
+
+    def atributos(self, id_palabra):
+        """(sílabas, acentuación) de una palabra del índice"""
+        return self._silabas[id_palabra], ACENTUACIONES[self._acentuacion[id_palabra]]
+
+    def _rango(self, tipo, clave):
+        indice, inicios, _ = self._grupos[tipo]
+        posicion = indice.get(clave)
+        if posicion is None:
+            return 0, 0
+        return inicios[posicion], inicios[posicion + 1]
+
+    def buscar(self, palabra, tipo='consonante', silabas=None, acentuacion=None,
+               limite=20, excluir_misma=True):
+        """
+        Palabras que riman con `palabra`
+
+        Args:
+            tipo: 'consonante' o 'asonante'
+            silabas (int): solo palabras con ese número de sílabas
+            acentuacion (str): 'aguda', 'llana' o 'esdrujula'
+            limite (int): máximo de resultados (None para todos)
+            excluir_misma (bool): omitir la propia palabra
+
+        Returns:
+            list: palabras ordenadas por sílabas y longitud
+        """
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de rima no válido: {tipo}")
+        consonante, asonante = claves_rima(self._detector, palabra)
+        clave = consonante if tipo == 'consonante' else asonante
+
+        inicio, fin = self._rango(tipo, clave)
+        if inicio == fin:
+            return []
+        ids = self._grupos[tipo][2]
+
+        codigo = None
+        if acentuacion is not None:
+            codigo = _CODIGO_ACENTUACION.get(acentuacion.replace('ú', 'u'))
+            if codigo is None:
+                raise ValueError(f"Acentuación no válida: {acentuacion}")
+
+        # El grupo está ordenado por (sílabas, acentuación): acotar con bisect
+        if silabas is not None:
+            def orden(i):
+                id_palabra = ids[i]
+                return self._silabas[id_palabra] * 4 + self._acentuacion[id_palabra]
+
+            inferior = silabas * 4 + (codigo if codigo is not None else 0)
+            superior = silabas * 4 + (codigo if codigo is not None else 3)
+            inicio, fin = (bisect_left(range(fin), inferior, lo=inicio, key=orden),
+                           bisect_right(range(fin), superior, lo=inicio, key=orden))
+            codigo = None
+
+        propia = self._detector._normalizar_terminacion(palabra.strip().lower())
+        resultados = []
+        for i in range(inicio, fin):
+            id_palabra = ids[i]
+            if codigo is not None and self._acentuacion[id_palabra] != codigo:
+                continue
+            candidata = self.palabra(id_palabra)
+            if excluir_misma and self._detector._normalizar_terminacion(candidata) == propia:
+                continue
+            resultados.append(candidata)
+            if limite is not None and len(resultados) >= limite:
+                break
+        return resultados
+
+    def contar(self, palabra, tipo='consonante'):
+        """Número de palabras del índice que comparten la clave de rima"""
+        consonante, asonante = claves_rima(self._detector, palabra)
+        inicio, fin = self._rango(tipo, consonante if tipo == 'consonante' else asonante)
+        return fin - inicio
+
+    def cerrar(self):
+        self._palabras = self._desplazamientos = self._silabas = self._acentuacion = None
+        self._grupos = {}
+        self.tabla.cerrar()
+
+
+_diccionario = None
+
+
+def obtener_diccionario():
+    """Diccionario compartido del proceso (None si no hay lista de palabras)"""
+    global _diccionario
+    if _diccionario is None:
+        if not RUTA_INDICE.exists() and not RUTA_LISTA.exists():
+            return None
+        try:
+            _diccionario = DiccionarioRimas()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Diccionario de rimas no disponible: {e}")
+            return None
+    return _diccionario
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diccionario de rimas')
+    parser.add_argument('palabra', nargs='?')
+    parser.add_argument('--construir', action='store_true', help='Regenera el índice')
+    parser.add_argument('--tipo', choices=TIPOS, default='consonante')
+    parser.add_argument('--silabas', type=int)
+    parser.add_argument('--acentuacion', choices=ACENTUACIONES)
+    parser.add_argument('--limite', type=int, default=30)
+    args = parser.parse_args(argv)
+
+    if args.construir:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        construir_indice()
+
+    if args.palabra:
+        inicio = time.perf_counter()
+        diccionario = DiccionarioRimas()
+        carga = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        rimas = diccionario.buscar(args.palabra, args.tipo, args.silabas,
+                                   args.acentuacion, args.limite)
+        consulta = time.perf_counter() - inicio
+
+        print(', '.join(rimas) or '(sin rimas)')
+        print(f"{diccionario.contar(args.palabra, args.tipo)} candidatas de "
+              f"{len(diccionario)} palabras; carga {carga * 1000:.1f} ms, "
+              f"consulta {consulta * 1000:.3f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Escansión con licencias métricas
+
+aplicar_sinalefa toma una sola decisión en cada encuentro de vocales y
+devuelve un único recuento. Aquí cada verso se ve como una secuencia de
+elecciones: en cada palabra, sinéresis (unir un hiato) o diéresis (romper
+un diptongo); en cada unión entre palabras, sinalefa o
+dialefa. Una programación dinámica sobre esas elecciones da, para cada
+número de sílabas alcanzable, la escansión con menos licencias.
+
+Sin licencias se obtiene el mismo recuento que
+ContadorSilabas.contar_silabas_verso: cada unión sigue su decisión
+(hay_sinalefa), de modo que la tabla de sílabas y las licencias que se
+proponen parten de la misma medida. La sinalefa que el contador no hace
+(a través de la h muda, con la conjunción "y", vocal tónica seguida de
+vocal abierta o entre palabras separadas por un signo suelto) es una
+licencia, y romper una sinalefa del contador es una dialefa. Con un
+metro objetivo se podan los estados que ya no pueden alcanzarlo, de modo
+que comprobar si un verso "puede ser endecasílabo" cuesta unas decenas de
+operaciones por palabra.
+"""
+
+from collections import Counter
+
+from .resultados import ResultadoCompacto
+from .silabas import ContadorSilabas
+
+try:
+    from config_py import METRIC_ANALYSIS_CONFIG
+    _CONFIG = METRIC_ANALYSIS_CONFIG.get('scansion', {})
+except ImportError:
+    _CONFIG = {}
+
+LICENCIAS = ('sinalefa', 'dialefa', 'sinéresis', 'diéresis')
+
+
+class Alternativa(ResultadoCompacto):
+    """Una forma de medir el verso: sílabas y licencias empleadas"""
+
+    __slots__ = ('silabas', 'licencias')
+    _campos = __slots__
+
+    def __init__(self, silabas, licencias):
+        self.silabas = silabas
+        # Cada licencia es (tipo, palabras afectadas)
+        self.licencias = tuple(tuple(l) for l in licencias)
+
+
+class _Palabra:
+    """Datos de una palabra para la escansión (se cachean por palabra)"""
+
+    __slots__ = ('texto', 'silabas', 'hiatos', 'diptongos', 'inicio', 'final_vocal')
+
+    def __init__(self, texto, silabas, hiatos, diptongos, inicio, final_vocal):
+        self.texto = texto
+        self.silabas = silabas
+        self.hiatos = hiatos
+        self.diptongos = diptongos
+        self.inicio = inicio            # 'vocal', 'h' (h muda + vocal) o None
+        self.final_vocal = final_vocal
+
+
+class MotorEscansion:
+    """Enumera las medidas posibles de un verso con licencias métricas"""
+
+    def __init__(self, contador=None, max_licencias=None):
+        self.contador = contador or ContadorSilabas()
+        self.max_licencias = (max_licencias if max_licencias is not None
+                              else _CONFIG.get('max_licenses', 3))
+        self.max_cache = _CONFIG.get('word_cache_max', 50000)
+        self._cache = {}
+        self._cache_escansion = {}
+
+    # --- Palabras -----------------------------------------------------------
+
+    def _palabra(self, palabra):
+        datos = self._cache.get(palabra)
+        if datos is None:
+            datos = self._analizar_palabra(palabra)
+            if len(self._cache) < self.max_cache:
+                self._cache[palabra] = datos
+        return datos
+
+    def _analizar_palabra(self, palabra):
+        c = self.contador
+        division = c.dividir_en_silabas(palabra)
+
+        # Sinéresis: sílabas contiguas que se tocan por vocales (hiato)
+        hiatos = sum(1 for a, b in zip(division, division[1:])
+                     if a and b and c.es_vocal(a[-1]) and c.es_vocal(b[0]))
+
+        # Diéresis: vocales contiguas dentro de una sílaba (diptongo),
+        # sin contar la u muda de que/qui/gue/gui
+        diptongos = 0
+        for silaba in division:
+            for i in range(len(silaba) - 1):
+                if c.es_vocal(silaba[i]) and c.es_vocal(silaba[i + 1]):
+                    muda = (silaba[i] == 'u' and i > 0 and silaba[i - 1] in 'qg'
+                            and silaba[i + 1] in 'eiéí')
+                    if not muda:
+                        diptongos += 1
+
+        conjuncion = palabra == 'y'
+        inicio = None
+        if conjuncion or c.es_vocal(palabra[0]):
+            inicio = 'vocal'
+        elif palabra[0] == 'h' and len(palabra) > 1 and c.es_vocal(palabra[1]):
+            # hie-, hue-, hui-... suenan con consonante inicial (hielo, huerto)
+            semiconsonante = (palabra[1] in 'iu' and len(palabra) > 2
+                              and c.es_vocal(palabra[2]))
+            if not semiconsonante:
+                inicio = 'h'
+
+        return _Palabra(
+            texto=palabra,
+            silabas=c.contar_silabas(palabra),
+            hiatos=hiatos,
+            diptongos=diptongos,
+            inicio=inicio,
+            final_vocal=conjuncion or c.es_vocal(palabra[-1]),
+        )
+
+    # --- Elecciones ---------------------------------------------------------
+
+    def _opciones_palabra(self, p):
+        """(delta de sílabas, licencias) posibles dentro de una palabra"""
+        opciones = [(0, ())]
+        for n in range(1, min(p.hiatos, self.max_licencias) + 1):
+            opciones.append((-n, (('sinéresis', p.texto),) * n))
+        for n in range(1, min(p.diptongos, self.max_licencias) + 1):
+            opciones.append((n, (('diéresis', p.texto),) * n))
+        return opciones
+
+    def _opciones_union(self, a, b, contiguas=True):
+        """
+        (delta de sílabas, licencias) posibles entre dos palabras
+
+        Sin licencia, la decisión de ContadorSilabas (que solo une palabras
+        contiguas); la contraria, si las vocales se tocan, es la licencia.
+        """
+        union = f"{a.texto} {b.texto}"
+        if contiguas and self.contador.hay_sinalefa(a.texto, b.texto):
+            return [(-1, ()), (0, (('dialefa', union),))]
+        if a.final_vocal and b.inicio is not None:
+            return [(0, ()), (-1, (('sinalefa', union),))]
+        return [(0, ())]
+
+    def _ajuste_final(self, palabra):
+        acentuacion = self.contador.detectar_acentuacion(palabra)
+        if acentuacion == 'aguda':
+            return 1
+        if acentuacion == 'esdrujula':
+            return -1
+        return 0
+
+    def _pasos(self, verso):
+        """Lista de opciones por paso (palabras y uniones) y ajuste final"""
+        # Como contar_silabas_verso: los signos sueltos separan palabras y el
+        # ajuste final solo se aplica si el último elemento es una palabra
+        limpias = [self.contador.limpiar_palabra(p) for p in verso.split()]
+        palabras = [(i, self._palabra(p)) for i, p in enumerate(limpias) if p]
+        if not palabras:
+            return [], 0
+
+        pasos = []
+        for k, (i, palabra) in enumerate(palabras):
+            pasos.append([(palabra.silabas + d, l) for d, l in self._opciones_palabra(palabra)])
+            if k + 1 < len(palabras):
+                j, siguiente = palabras[k + 1]
+                pasos.append(self._opciones_union(palabra, siguiente, contiguas=j == i + 1))
+        return pasos, self._ajuste_final(limpias[-1]) if limpias[-1] else 0
+
+    # --- Programación dinámica ---------------------------------------------
+
+    def alternativas(self, verso, objetivo=None):
+        """
+        Medidas posibles del verso
+
+        Args:
+            verso: texto del verso
+            objetivo: si se indica, solo se conserva esa medida (con poda)
+
+        Returns:
+            list[Alternativa] ordenada por número de licencias y sílabas;
+            para cada número de sílabas, la escansión con menos licencias
+        """
+        pasos, final = self._pasos(verso)
+        if not pasos:
+            return []
+
+        # Mínimo y máximo que aún pueden sumar los pasos restantes (para podar)
+        minimos = [0] * (len(pasos) + 1)
+        maximos = [0] * (len(pasos) + 1)
+        for i in range(len(pasos) - 1, -1, -1):
+            deltas = [d for d, _ in pasos[i]]
+            minimos[i] = minimos[i + 1] + min(deltas)
+            maximos[i] = maximos[i + 1] + max(deltas)
+
+        estados = {final: ()}
+        for i, opciones in enumerate(pasos):
+            nuevos = {}
+            for silabas, licencias in estados.items():
+                for delta, extra in opciones:
+                    total = silabas + delta
+                    if objetivo is not None and not (
+                            total + minimos[i + 1] <= objetivo <= total + maximos[i + 1]):
+                        continue
+                    usadas = licencias + extra if extra else licencias
+                    if len(usadas) > self.max_licencias:
+                        continue
+                    previa = nuevos.get(total)
+                    if previa is None or len(usadas) < len(previa):
+                        nuevos[total] = usadas
+            estados = nuevos
+            if not estados:
+                return []
+
+        resultado = [Alternativa(max(1, s), l) for s, l in estados.items()]
+        resultado.sort(key=lambda a: (len(a.licencias), a.silabas))
+        return resultado
+
+    def medida_natural(self, verso):
+        """Sílabas sin licencias"""
+        for alternativa in self.alternativas(verso):
+            if not alternativa.licencias:
+                return alternativa.silabas
+        return 0
+
+    def escandir(self, verso, objetivo):
+        """Escansión con menos licencias que da `objetivo` sílabas, o None"""
+        clave = (verso, objetivo)
+        if clave in self._cache_escansion:
+            return self._cache_escansion[clave]
+        alternativas = self.alternativas(verso, objetivo)
+        resultado = alternativas[0] if alternativas else None
+        if len(self._cache_escansion) < self.max_cache:
+            self._cache_escansion[clave] = resultado
+        return resultado
+
+    def escandir_poema(self, versos, objetivo=None):
+        """
+        Ajusta cada verso al metro objetivo
+
+        Si no se indica objetivo se usa la medida natural más frecuente.
+
+        Returns:
+            (objetivo, lista con la Alternativa de cada verso o None)
+        """
+        if objetivo is None:
+            medidas = [self.medida_natural(v) for v in versos]
+            objetivo = Counter(medidas).most_common(1)[0][0] if medidas else 0
+        return objetivo, [self.escandir(v, objetivo) for v in versos]
@@ -0,0 +1,316 @@
+"""
+Estadísticas de corpus con agregados parciales combinables
+
+EstadisticasCorpus acumula, a partir de resultados de analisis_completo,
+la distribución de metros, la frecuencia de tipos de rima y de formas, el
+histograma de posiciones acentuales, el vocabulario y las terminaciones de
+rima. Todos los agregados son contadores o sumas, así que dos parciales se
+combinan con fusionar() sin volver a analizar nada:
+
+- en la aplicación, el historial actualiza sus estadísticas con cada
+  análisis nuevo (coste proporcional al poema, no al historial);
+- para un corpus grande, cada proceso trabajador analiza un lote y
+  devuelve su parcial (tarea_estadisticas) y el proceso principal los
+  combina al estilo map-reduce (estadisticas_corpus).
+
+El resultado no depende del orden ni del reparto en lotes.
+
+Con bocetos=True (o ANALYTICS_CONFIG['sketches']['enabled']) el vocabulario
+y las terminaciones no se cuentan con Counter sino con bocetos de memoria
+fija (utils/bocetos.py): HyperLogLog para las palabras distintas, Count-Min
+para las frecuencias y t-digest para los cuantiles de sílabas. El resumen
+pasa a ser aproximado, pero la memoria ya no crece con el corpus.
+"""
+
+from collections import Counter
+
+from .almacen import palabras_texto
+from .bocetos import BocetosCorpus
+
+try:
+    from config_py import ANALYTICS_CONFIG
+except ImportError:
+    ANALYTICS_CONFIG = {}
+
+# Campos Counter y campos numéricos (se suman al fusionar)
+_CONTADORES = ('metros', 'silabas', 'metros_dominantes', 'tipos_rima', 'tipos_rima_estrofa',
+               'formas', 'acentos', 'vocabulario', 'terminaciones')
+_SUMAS = ('poemas', 'estrofas', 'versos', 'palabras', 'total_silabas', 'cuadrados_silabas')
+
+_detector = None
+
+
+def _terminacion(verso):
+    """Terminación de rima normalizada (sin tildes) de un verso"""
+    global _detector
+    if _detector is None:
+        from .rimas import DetectorRimas
+        _detector = DetectorRimas()
+    return _detector._normalizar_terminacion(_detector.extraer_terminacion_rima(verso))
+
+
+def _cuantil_contador(contador, q):
+    """Cuantil exacto de un Counter {valor: frecuencia}"""
+    total = sum(contador.values())
+    if not total:
+        return None
+    objetivo = q * total
+    acumulado = 0
+    for valor, n in sorted(contador.items()):
+        acumulado += n
+        if acumulado >= objetivo:
+            return valor
+    return valor
+
+
+class EstadisticasCorpus:
+    """Agregados de un conjunto de análisis, combinables entre sí"""
+
+    __slots__ = _CONTADORES + _SUMAS + ('bocetos',)
+
+    def __init__(self, bocetos=None):
+        for campo in _CONTADORES:
+            setattr(self, campo, Counter())
+        for campo in _SUMAS:
+            setattr(self, campo, 0)
+        if bocetos is None:
+            bocetos = ANALYTICS_CONFIG.get('sketches', {}).get('enabled', False)
+        self.bocetos = BocetosCorpus() if bocetos else None
+
+    @property
+    def aproximado(self):
+        return self.bocetos is not None
+
+    def __len__(self):
+        return self.poemas
+
+    def __bool__(self):
+        return self.poemas > 0
+
+    def agregar(self, resultado):
+        """
+        Incorpora un resultado de analisis_completo (o de tarea_analizar)
+
+        Usa tipo_rima y forma si el resultado los trae (API), y siempre el
+        tipo de rima de cada estrofa. Los resultados con error se ignoran.
+        """
+        versos = resultado.get('versos_analizados') or []
+        if 'error' in resultado or not versos:
+            return self
+
+        self.poemas += 1
+        for verso in versos:
+            silabas = verso['silabas']
+            self.versos += 1
+            self.total_silabas += silabas
+            self.cuadrados_silabas += silabas * silabas
+            self.silabas[silabas] += 1
+            self.metros[verso['metro']] += 1
+            self.acentos.update(verso['acentos'])
+
+            palabras = palabras_texto(verso['texto'])
+            self.palabras += sum(palabras.values())
+            terminacion = _terminacion(verso['texto'])
+            if self.bocetos is None:
+                self.vocabulario.update(palabras)
+                if terminacion:
+                    self.terminaciones[terminacion] += 1
+            else:
+                bocetos = self.bocetos
+                bocetos.silabas.agregar(silabas)
+                for palabra, n in palabras.items():
+                    bocetos.palabras_distintas.agregar(palabra)
+                    bocetos.palabras.agregar(palabra, n)
+                if terminacion:
+                    bocetos.terminaciones.agregar(terminacion)
+
+        for estrofa in resultado.get('estrofas') or ():
+            self.estrofas += 1
+            self.tipos_rima_estrofa[estrofa['tipo_rima']] += 1
+
+        self.metros_dominantes[resultado.get('metro_dominante', 'Indeterminado')] += 1
+        if resultado.get('tipo_rima'):
+            self.tipos_rima[resultado['tipo_rima']] += 1
+        if 'forma' in resultado:
+            self.formas[resultado['forma'] or 'Sin forma fija'] += 1
+        return self
+
+    def fusionar(self, otra):
+        """
+        Suma en esta instancia los agregados de otra (devuelve self)
+
+        Un parcial exacto y uno aproximado no se pueden fusionar (ValueError).
+        """
+        if (self.bocetos is None) != (otra.bocetos is None):
+            raise ValueError("No se pueden fusionar estadísticas exactas y aproximadas")
+        for campo in _CONTADORES:
+            getattr(self, campo).update(getattr(otra, campo))
+        for campo in _SUMAS:
+            setattr(self, campo, getattr(self, campo) + getattr(otra, campo))
+        if self.bocetos is not None:
+            self.bocetos.fusionar(otra.bocetos)
+        return self
+
+    def __iadd__(self, otra):
+        return self.fusionar(otra)
+
+    def __add__(self, otra):
+        return EstadisticasCorpus(self.aproximado).fusionar(self).fusionar(otra)
+
+    @classmethod
+    def combinar(cls, parciales, bocetos=None):
+        """Combina una secuencia de parciales (instancias o diccionarios)"""
+        total = None
+        for parcial in parciales:
+            if isinstance(parcial, dict):
+                parcial = cls.desde_dict(parcial)
+            if total is None:
+                total = cls(parcial.aproximado)
+            total.fusionar(parcial)
+        return total if total is not None else cls(bocetos)
+
+    def to_dict(self):
+        """Forma serializable (JSON); las claves numéricas pasan a texto"""
+        datos = {campo: getattr(self, campo) for campo in _SUMAS}
+        for campo in _CONTADORES:
+            datos[campo] = {str(k): v for k, v in getattr(self, campo).items()}
+        if self.bocetos is not None:
+            datos['bocetos'] = self.bocetos.to_dict()
+        return datos
+
+    @classmethod
+    def desde_dict(cls, datos):
+        estadisticas = cls(bocetos=False)
+        for campo in _SUMAS:
+            setattr(estadisticas, campo, datos.get(campo, 0))
+        for campo in _CONTADORES:
+            valores = datos.get(campo, {})
+            if campo in ('silabas', 'acentos'):
+                valores = {int(k): v for k, v in valores.items()}
+            setattr(estadisticas, campo, Counter(valores))
+        if datos.get('bocetos'):
+            estadisticas.bocetos = BocetosCorpus.desde_dict(datos['bocetos'])
+        return estadisticas
+
+    def __getstate__(self):
+        return tuple(getattr(self, campo) for campo in self.__slots__)
+
+    def __setstate__(self, estado):
+        for campo, valor in zip(self.__slots__, estado):
+            setattr(self, campo, valor)
+
+    def __eq__(self, otra):
+        if not isinstance(otra, EstadisticasCorpus):
+            return NotImplemented
+        campos = _CONTADORES + _SUMAS
+        if (self.bocetos is None) != (otra.bocetos is None):
+            return False
+        if self.bocetos is not None and self.bocetos.to_dict() != otra.bocetos.to_dict():
+            return False
+        return all(getattr(self, c) == getattr(otra, c) for c in campos)
+
+    # --- Consultas --------------------------------------------------------
+
+    @property
+    def promedio_silabas(self):
+        return self.total_silabas / self.versos if self.versos else 0.0
+
+    @property
+    def desviacion_silabas(self):
+        if not self.versos:
+            return 0.0
+        media = self.promedio_silabas
+        return max(0.0, self.cuadrados_silabas / self.versos - media * media) ** 0.5
+
+    def distribucion(self, campo, relativa=False):
+        """Pares (clave, frecuencia) de un contador, de más a menos frecuente"""
+        contador = getattr(self, campo)
+        total = sum(contador.values())
+        pares = contador.most_common()
+        if relativa and total:
+            return [(clave, n / total) for clave, n in pares]
+        return pares
+
+    def histograma_acentos(self):
+        """Acentos por posición silábica, en orden de posición"""
+        return sorted(self.acentos.items())
+
+    def cuantiles_silabas(self, qs=(0.1, 0.5, 0.9, 0.99)):
+        """Cuantiles de sílabas por verso (aproximados con t-digest en modo bocetos)"""
+        if self.bocetos is not None:
+            return self.bocetos.silabas.cuantiles(qs)
+        return {q: _cuantil_contador(self.silabas, q) for q in qs}
+
+    @property
+    def palabras_distintas(self):
+        if self.bocetos is not None:
+            return self.bocetos.palabras_distintas.estimar()
+        return len(self.vocabulario)
+
+    def mas_frecuentes(self, campo, n):
+        """Las n palabras ('vocabulario') o terminaciones más frecuentes"""
+        if self.bocetos is None:
+            return getattr(self, campo).most_common(n)
+        boceto = self.bocetos.palabras if campo == 'vocabulario' else self.bocetos.terminaciones
+        return boceto.mas_frecuentes(n)
+
+    def resumen(self, top=None):
+        """Informe listo para mostrar o devolver como JSON"""
+        top = top or ANALYTICS_CONFIG.get('top_vocabulary', 20)
+        return {
+            'aproximado': self.aproximado,
+            'poemas': self.poemas,
+            'estrofas': self.estrofas,
+            'versos': self.versos,
+            'palabras': self.palabras,
+            'palabras_distintas': self.palabras_distintas,
+            'promedio_silabas': self.promedio_silabas,
+            'desviacion_silabas': self.desviacion_silabas,
+            'metros': self.distribucion('metros'),
+            'metros_dominantes': self.distribucion('metros_dominantes'),
+            'tipos_rima': self.distribucion('tipos_rima'),
+            'tipos_rima_estrofa': self.distribucion('tipos_rima_estrofa'),
+            'formas': self.distribucion('formas'),
+            'acentos': self.histograma_acentos(),
+            'cuantiles_silabas': self.cuantiles_silabas(),
+            'vocabulario': self.mas_frecuentes('vocabulario', top),
+            'terminaciones': self.mas_frecuentes('terminaciones', top),
+        }
+
+
+def _lotes(elementos, tamano):
+    lote = []
+    for elemento in elementos:
+        lote.append(elemento)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def estadisticas_corpus(textos, ejecutor=None, tamano_lote=None, bocetos=None):
+    """
+    Estadísticas de un corpus de poemas
+
+    Args:
+        textos: iterable de textos (puede ser un generador)
+        ejecutor: concurrent.futures.Executor; cada lote se analiza en un
+            trabajador y se combinan los parciales. Sin ejecutor se
+            analiza todo en este proceso.
+        tamano_lote: poemas por tarea (ANALYTICS_CONFIG['corpus_stats_batch'])
+        bocetos: usar bocetos de memoria fija en lugar de Counter exactos
+            (None = ANALYTICS_CONFIG['sketches']['enabled'])
+    """
+    from functools import partial
+
+    from .tareas import tarea_estadisticas
+
+    if bocetos is None:
+        bocetos = ANALYTICS_CONFIG.get('sketches', {}).get('enabled', False)
+    tamano_lote = tamano_lote or ANALYTICS_CONFIG.get('corpus_stats_batch', 50)
+    lotes = _lotes(textos, tamano_lote)
+    tarea = partial(tarea_estadisticas, bocetos=bocetos)
+    if ejecutor is None:
+        return EstadisticasCorpus.combinar((tarea(lote) for lote in lotes), bocetos)
+    return EstadisticasCorpus.combinar(ejecutor.map(tarea, lotes), bocetos)
@@ -13,6 +13,9 @@ from reportlab.pdfbase.ttfonts import TTFont
 import io
 import base64
 
+from .perfilado import medir
+from .poema import analizar_poema
+
 class ExportadorPoesia:
     def __init__(self):
         self.setup_styles()
@@ -91,6 +94,7 @@ class ExportadorPoesia:
             fontName='Courier'
         ))
     
+    @medir('ExportadorPoesia.exportar_pdf')
     def exportar_pdf(self, texto, titulo="Mi Poema", metadatos=None, incluir_analisis=False):
         """Exporta un poema a PDF con formato elegante"""
         buffer = io.BytesIO()
@@ -125,17 +129,11 @@ class ExportadorPoesia:
                 story.append(Spacer(1, 30))
             
             # Procesar el poema
-            estrofas = [e.strip() for e in texto.split('\n\n') if e.strip()]
-            
-            if not estrofas:
-                estrofas = [texto.strip()]
+            estrofas = analizar_poema(texto).estrofas
             
             for i, estrofa in enumerate(estrofas):
-                versos = [v.strip() for v in estrofa.split('\n') if v.strip()]
-                
-                for verso in versos:
-                    if verso:
-                        story.append(Paragraph(verso, self.styles['VersoPoesia']))
+                for verso in estrofa.textos:
+                    story.append(Paragraph(verso, self.styles['VersoPoesia']))
                 
                 # Separador entre estrofas (excepto la última)
                 if i < len(estrofas) - 1:
@@ -171,6 +169,7 @@ class ExportadorPoesia:
             print(f"Error generando PDF: {e}")
             return None
     
+    @medir('ExportadorPoesia.exportar_txt')
     def exportar_txt(self, texto, titulo="Mi Poema", metadatos=None):
         """Exporta a formato TXT plano"""
         contenido = []
@@ -203,6 +202,7 @@ class ExportadorPoesia:
         
         return "\n".join(contenido)
     
+    @medir('ExportadorPoesia.exportar_html')
     def exportar_html(self, texto, titulo="Mi Poema", metadatos=None, incluir_analisis=False):
         """Exporta a formato HTML con estilos CSS"""
         css_styles = """
@@ -312,18 +312,11 @@ class ExportadorPoesia:
         html_content += "</div>\n<div class=\"poema\">\n"
         
         # Procesar el poema
-        estrofas = [e.strip() for e in texto.split('\n\n') if e.strip()]
-        
-        if not estrofas:
-            estrofas = [texto.strip()]
-        
-        for estrofa in estrofas:
+        for estrofa in analizar_poema(texto).estrofas:
             html_content += '<div class="estrofa">\n'
             
-            versos = [v.strip() for v in estrofa.split('\n') if v.strip()]
-            for verso in versos:
-                if verso:
-                    html_content += f'<div class="verso">{verso}</div>\n'
+            for verso in estrofa.textos:
+                html_content += f'<div class="verso">{verso}</div>\n'
             
             html_content += '</div>\n'
         
@@ -354,20 +347,19 @@ class ExportadorPoesia:
         
         return html_content
     
+    @medir('ExportadorPoesia.exportar_json')
     def exportar_json(self, texto, titulo="Mi Poema", metadatos=None, analisis=None):
         """Exporta a formato JSON estructurado"""
-        versos = [v.strip() for v in texto.split('\n') if v.strip()]
-        estrofas = []
-        
-        estrofas_raw = [e.strip() for e in texto.split('\n\n') if e.strip()]
-        
-        for i, estrofa_raw in enumerate(estrofas_raw):
-            versos_estrofa = [v.strip() for v in estrofa_raw.split('\n') if v.strip()]
-            estrofas.append({
-                'numero': i + 1,
-                'versos': versos_estrofa,
-                'total_versos': len(versos_estrofa)
-            })
+        poema = analizar_poema(texto)
+        versos = poema.textos_versos
+        estrofas = [
+            {
+                'numero': estrofa.numero,
+                'versos': list(estrofa.textos),
+                'total_versos': len(estrofa)
+            }
+            for estrofa in poema.estrofas
+        ]
         
         datos = {
             'poema': {
@@ -377,7 +369,7 @@ class ExportadorPoesia:
                 'estadisticas_basicas': {
                     'total_versos': len(versos),
                     'total_estrofas': len(estrofas),
-                    'total_palabras': sum(len(v.split()) for v in versos),
+                    'total_palabras': sum(len(v.tokens) for v in poema.versos),
                     'total_caracteres': len(texto)
                 }
             },
@@ -392,6 +384,7 @@ class ExportadorPoesia:
         
         return json.dumps(datos, indent=2, ensure_ascii=False)
     
+    @medir('ExportadorPoesia.exportar_csv_analisis')
     def exportar_csv_analisis(self, lista_poemas):
         """Exporta análisis de múltiples poemas a CSV"""
         output = io.StringIO()
@@ -424,6 +417,7 @@ class ExportadorPoesia:
         output.seek(0)
         return output.getvalue()
     
+    @medir('ExportadorPoesia.exportar_markdown')
     def exportar_markdown(self, texto, titulo="Mi Poema", metadatos=None):
         """Exporta a formato Markdown"""
         contenido = []
@@ -446,17 +440,11 @@ class ExportadorPoesia:
         contenido.append("")
         
         # Contenido del poema
-        estrofas = [e.strip() for e in texto.split('\n\n') if e.strip()]
-        
-        if not estrofas:
-            estrofas = [texto.strip()]
+        estrofas = analizar_poema(texto).estrofas
         
         for i, estrofa in enumerate(estrofas):
-            versos = [v.strip() for v in estrofa.split('\n') if v.strip()]
-            
-            for verso in versos:
-                if verso:
-                    contenido.append(f"> {verso}")
+            for verso in estrofa.textos:
+                contenido.append(f"> {verso}")
             
             if i < len(estrofas) - 1:
                 contenido.append(">")
@@ -469,6 +457,7 @@ class ExportadorPoesia:
         
         return "\n".join(contenido)
     
+    @medir('ExportadorPoesia.crear_antologia_pdf')
     def crear_antologia_pdf(self, lista_poemas, titulo_antologia="Mi Antología Poética"):
         """Crea una antología completa en PDF"""
         buffer = io.BytesIO()
@@ -517,17 +506,11 @@ class ExportadorPoesia:
                     story.append(Spacer(1, 10))
                 
                 # Contenido
-                estrofas = [e.strip() for e in contenido_poema.split('\n\n') if e.strip()]
-                
-                if not estrofas:
-                    estrofas = [contenido_poema.strip()]
+                estrofas = analizar_poema(contenido_poema).estrofas
                 
                 for j, estrofa in enumerate(estrofas):
-                    versos = [v.strip() for v in estrofa.split('\n') if v.strip()]
-                    
-                    for verso in versos:
-                        if verso:
-                            story.append(Paragraph(verso, self.styles['VersoPoesia']))
+                    for verso in estrofa.textos:
+                        story.append(Paragraph(verso, self.styles['VersoPoesia']))
                     
                     if j < len(estrofas) - 1:
                         story.append(Spacer(1, 15))
@@ -0,0 +1,452 @@
+"""
+Reconocimiento de formas estróficas con un autómata precompilado
+
+Cada forma (sonetos, redondilla, cuarteto, serventesio, décima, lira,
+romance, silva...) se describe por su esquema de rima, su métrica y sus
+cortes de estrofa. Todas se compilan juntas en un único autómata
+determinista, así que clasificar un poema es una sola pasada sobre sus
+versos, con una consulta a una tabla por verso, sea cual sea el número
+de formas conocidas.
+
+Cada verso se convierte en un símbolo (rima, metro):
+
+- rima: distancia al verso anterior más cercano con la misma letra del
+  esquema (NUEVA si no rima con ninguno anterior, SIN_RIMA si no tiene
+  terminación). Dos esquemas dan la misma secuencia de distancias si y
+  solo si agrupan los versos igual, así que 'ABBA ABBA CDC DCD' casa con
+  el esquema del detector aunque este asigne otras letras, y una serie de
+  redondillas (abba cddc effe...) repite la misma secuencia en cada estrofa.
+- metro: número de sílabas (o "desconocido", que casa con cualquier metro).
+
+Los cortes de estrofa del poema son un símbolo más: pueden faltar (un
+soneto escrito sin líneas en blanco se reconoce igual), pero un corte
+donde la forma no lo admite la descarta.
+"""
+
+from collections import defaultdict, deque
+
+from .perfilado import medir
+
+NUEVA = 0
+SIN_RIMA = -1
+MAX_DISTANCIA = 12
+LEJANA = MAX_DISTANCIA + 1  # rima con un verso a más de MAX_DISTANCIA
+FIN_ESTROFA = 'fin'
+
+_RIMAS = tuple(range(SIN_RIMA, LEJANA + 1))
+_DESCONOCIDO = None  # metro del verso desconocido
+_OTRO = -1           # metro que ninguna forma menciona
+
+# Variantes de los tercetos del soneto
+TERCETOS = ('CDC DCD', 'CDE CDE', 'CDE DCE', 'CDC CDC', 'CDE EDC', 'CDE DEC', 'CDD CEE')
+
+ARTE_MAYOR_SONETO = frozenset({11, 14})  # endecasílabos o alejandrinos
+
+
+def simbolos_rima(esquema):
+    """Distancia de cada verso al anterior con su misma rima (NUEVA, SIN_RIMA...)"""
+    ultimo = {}
+    simbolos = []
+    for i, letra in enumerate(esquema):
+        if letra == '-':
+            simbolos.append(SIN_RIMA)
+            continue
+        letra = letra.upper()
+        previo = ultimo.get(letra)
+        simbolos.append(NUEVA if previo is None else min(i - previo, LEJANA))
+        ultimo[letra] = i
+    return simbolos
+
+
+class Forma:
+    """
+    Definición de una forma estrófica
+
+    Args:
+        nombre: nombre que se devuelve al reconocerla
+        esquemas: esquemas admitidos ('ABBA ABBA CDC DCD'); los espacios
+            marcan dónde puede cortarse la estrofa
+        metros: sílabas admitidas para todos los versos (conjunto) o para
+            cada verso de la unidad (tupla, p. ej. (7, 11, 7, 7, 11))
+        repetible: la unidad puede repetirse con rimas nuevas (una serie de
+            redondillas); si no, el poema debe ser exactamente la unidad
+        solo_esquema: el esquema de rima es propio de la forma y se nombra
+            aunque no se conozca la métrica (sonetos, décima)
+    """
+
+    __slots__ = ('nombre', 'esquemas', 'metros', 'repetible', 'solo_esquema', 'construir')
+
+    def __init__(self, nombre, esquemas=(), metros=None, repetible=False, solo_esquema=False,
+                 construir=None):
+        self.nombre = nombre
+        self.esquemas = tuple(esquemas)
+        self.metros = metros
+        self.repetible = repetible
+        self.solo_esquema = solo_esquema
+        # Formas seriales (romance, silva): función que recibe el constructor
+        self.construir = construir
+
+    def metros_verso(self, i):
+        if isinstance(self.metros, tuple):
+            return frozenset({self.metros[i % len(self.metros)]})
+        return frozenset(self.metros) if self.metros is not None else None
+
+    def __repr__(self):
+        return f"Forma({self.nombre!r})"
+
+
+# --- Construcción del autómata no determinista (Thompson) -------------------
+
+class _Constructor:
+    """Fragmentos (inicio, fin) de un autómata con transiciones vacías"""
+
+    def __init__(self):
+        self.transiciones = []   # por estado: [(átomo, destino)]
+        self.vacias = []         # por estado: [destino]
+
+    def estado(self):
+        self.transiciones.append([])
+        self.vacias.append([])
+        return len(self.vacias) - 1
+
+    def verso(self, rimas=None, metros=None):
+        """Un verso con rima en `rimas` y sílabas en `metros` (None = cualquiera)"""
+        inicio, fin = self.estado(), self.estado()
+        self.transiciones[inicio].append((('verso', rimas, metros), fin))
+        return inicio, fin
+
+    def corte(self):
+        """Corte de estrofa opcional"""
+        inicio, fin = self.estado(), self.estado()
+        self.transiciones[inicio].append((('fin',), fin))
+        self.vacias[inicio].append(fin)
+        return inicio, fin
+
+    def secuencia(self, fragmentos):
+        fragmentos = list(fragmentos)
+        if not fragmentos:
+            estado = self.estado()
+            return estado, estado
+        for (_, fin), (inicio, _) in zip(fragmentos, fragmentos[1:]):
+            self.vacias[fin].append(inicio)
+        return fragmentos[0][0], fragmentos[-1][1]
+
+    def alternativa(self, fragmentos):
+        inicio, fin = self.estado(), self.estado()
+        for a, b in fragmentos:
+            self.vacias[inicio].append(a)
+            self.vacias[b].append(fin)
+        return inicio, fin
+
+    def repetir(self, fragmento, minimo=1):
+        """`fragmento` (una función que crea uno nuevo) `minimo` o más veces"""
+        partes = [fragmento() for _ in range(max(minimo, 1))]
+        inicio, fin = self.secuencia(partes)
+        bucle_inicio, bucle_fin = fragmento()
+        self.vacias[fin].append(bucle_inicio)
+        self.vacias[bucle_fin].append(bucle_inicio)
+        salida = self.estado()
+        self.vacias[fin].append(salida)
+        self.vacias[bucle_fin].append(salida)
+        return inicio, salida
+
+    def cualquiera(self, fragmento):
+        """Cero o más repeticiones"""
+        inicio, fin = self.estado(), self.estado()
+        a, b = fragmento()
+        self.vacias[inicio].extend((a, fin))
+        self.vacias[b].extend((a, fin))
+        return inicio, fin
+
+
+def _unidad(constructor, forma, esquema):
+    """
+    Fragmento de un esquema con cortes opcionales donde hay espacios
+
+    Una rima que el esquema introduce como nueva puede coincidir con la de
+    una estrofa anterior (el detector agrupa también las asonancias, y los
+    tercetos de un soneto a veces repiten la rima de los cuartetos): se
+    admite cualquier distancia que apunte antes de la estrofa en curso.
+    """
+    rimas = simbolos_rima(esquema.replace(' ', ''))
+    partes = []
+    verso = 0
+    inicio_estrofa = 0
+    for caracter in esquema:
+        if caracter == ' ':
+            partes.append(constructor.corte())
+            inicio_estrofa = verso
+            continue
+        admitidas = {rimas[verso]}
+        if rimas[verso] == NUEVA:
+            admitidas.update(range(verso - inicio_estrofa + 1, LEJANA + 1))
+        partes.append(constructor.verso(frozenset(admitidas), forma.metros_verso(verso)))
+        verso += 1
+    return constructor.secuencia(partes)
+
+
+def _fragmento_forma(constructor, forma):
+    if forma.construir is not None:
+        return forma.construir(constructor)
+
+    def unidad():
+        return constructor.alternativa([_unidad(constructor, forma, e) for e in forma.esquemas])
+
+    if not forma.repetible:
+        return unidad()
+    return constructor.repetir(lambda: constructor.secuencia([constructor.corte(), unidad()]))
+
+
+def _romance(metros, minimo_pares=4):
+    """
+    Versos pares con la misma rima, impares libres
+
+    Cada par rima con el par anterior (distancia 2). Si un impar comparte
+    esa rima (distancia 1 al par anterior), el par siguiente rima con él.
+    """
+    metros = frozenset(metros)
+    libres = frozenset(r for r in _RIMAS if r != 1)
+
+    def construir(c):
+        primero = c.secuencia([c.verso(None, metros), c.verso(None, metros)])
+
+        def par():
+            return c.secuencia([c.corte(), c.alternativa([
+                c.secuencia([c.verso(libres, metros), c.verso(frozenset({2}), metros)]),
+                c.secuencia([c.verso(frozenset({1}), metros), c.verso(frozenset({1}), metros)]),
+            ])])
+
+        return c.secuencia([primero, c.repetir(par, minimo_pares - 1)])
+    return construir
+
+
+def _silva(c):
+    """Heptasílabos y endecasílabos libremente combinados (con al menos uno de cada)"""
+    def libre():
+        return c.alternativa([c.verso(None, frozenset({7, 11})), c.corte()])
+
+    def orden(primero, segundo):
+        return c.secuencia([
+            c.verso(None, frozenset({primero})), c.cualquiera(libre),
+            c.verso(None, frozenset({segundo})), c.cualquiera(libre),
+        ])
+
+    inicio = c.cualquiera(libre)
+    return c.secuencia([inicio, c.alternativa([orden(7, 11), orden(11, 7)])])
+
+
+# Por orden de prioridad: si un poema encaja en varias, gana la primera
+FORMAS = (
+    Forma('Soneto petrarquista', ['ABBA ABBA ' + t for t in TERCETOS],
+          ARTE_MAYOR_SONETO, solo_esquema=True),
+    Forma('Soneto francés', ['ABAB ABAB ' + t for t in TERCETOS],
+          ARTE_MAYOR_SONETO, solo_esquema=True),
+    Forma('Soneto shakesperiano', ['ABAB CDCD EFEF GG'], ARTE_MAYOR_SONETO, solo_esquema=True),
+    Forma('Sonetillo', ['abba abba ' + t.lower() for t in TERCETOS], {8}),
+    Forma('Décima', ['abbaaccddc', 'abba accddc'], {8}, repetible=True, solo_esquema=True),
+    Forma('Lira', ['aBabB'], (7, 11, 7, 7, 11), repetible=True),
+    Forma('Redondilla', ['abba'], {8}, repetible=True),
+    Forma('Cuarteta', ['abab'], {8}, repetible=True),
+    Forma('Cuarteto', ['ABBA'], {11}, repetible=True),
+    Forma('Serventesio', ['ABAB'], {11}, repetible=True),
+    Forma('Romance', construir=_romance({8})),
+    Forma('Romance heroico', construir=_romance({11})),
+    Forma('Silva', construir=_silva),
+)
+
+
+# --- Autómata determinista ----------------------------------------------
+
+class ReconocedorFormas:
+    """Todas las formas compiladas en un autómata determinista"""
+
+    def __init__(self, formas=FORMAS):
+        self.formas = tuple(formas)
+
+        constructor = _Constructor()
+        inicio = constructor.estado()
+        finales = {}
+        for prioridad, forma in enumerate(self.formas):
+            a, b = _fragmento_forma(constructor, forma)
+            constructor.vacias[inicio].append(a)
+            finales[b] = prioridad
+
+        # Clases de metro: las sílabas que alguna forma menciona, más "otro"
+        metros = set()
+        for transiciones in constructor.transiciones:
+            for atomo, _ in transiciones:
+                if atomo[0] == 'verso' and atomo[2] is not None:
+                    metros.update(atomo[2])
+        self._metros = frozenset(metros)
+        alfabeto = [FIN_ESTROFA] + [
+            (rima, metro) for rima in _RIMAS
+            for metro in sorted(metros) + [_OTRO, _DESCONOCIDO]
+        ]
+
+        self._compilar(constructor, inicio, finales, alfabeto)
+
+    def _compilar(self, c, inicio, finales, alfabeto):
+        """Construcción por subconjuntos: un estado por conjunto de estados alcanzables"""
+        # Clausura vacía de cada estado, calculada una vez
+        alcanzables = []
+        for estado in range(len(c.vacias)):
+            pila = [estado]
+            visto = {estado}
+            while pila:
+                for siguiente in c.vacias[pila.pop()]:
+                    if siguiente not in visto:
+                        visto.add(siguiente)
+                        pila.append(siguiente)
+            # Solo importan los estados con transiciones de símbolo y los finales
+            alcanzables.append({e for e in visto if c.transiciones[e] or e in finales})
+
+        def clausura(estados):
+            return frozenset().union(*(alcanzables[e] for e in estados))
+
+        def admite(atomo, simbolo):
+            if atomo[0] == 'fin':
+                return simbolo == FIN_ESTROFA
+            if simbolo == FIN_ESTROFA:
+                return False
+            rima, metro = simbolo
+            _, rimas, metros = atomo
+            return ((rimas is None or rima in rimas) and
+                    (metros is None or metro is _DESCONOCIDO or metro in metros))
+
+        # Símbolos que admite cada átomo distinto (hay pocos)
+        admitidos = {}
+        for transiciones in c.transiciones:
+            for atomo, _ in transiciones:
+                if atomo not in admitidos:
+                    admitidos[atomo] = [s for s in alfabeto if admite(atomo, s)]
+
+        primero = clausura({inicio})
+        indices = {primero: 0}
+        pendientes = deque([primero])
+        self._tabla = []
+        self._aceptadas = []
+        while pendientes:
+            conjunto = pendientes.popleft()
+            destinos = defaultdict(set)
+            for estado in conjunto:
+                for atomo, b in c.transiciones[estado]:
+                    for simbolo in admitidos[atomo]:
+                        destinos[simbolo].add(b)
+
+            fila = {}
+            for simbolo, destino in destinos.items():
+                destino = clausura(destino)
+                if destino not in indices:
+                    indices[destino] = len(indices)
+                    pendientes.append(destino)
+                fila[simbolo] = indices[destino]
+            self._tabla.append(fila)
+            self._aceptadas.append(tuple(sorted(finales[e] for e in conjunto if e in finales)))
+
+    @property
+    def estados(self):
+        return len(self._tabla)
+
+    def _metro(self, silabas):
+        if silabas is None:
+            return _DESCONOCIDO
+        return silabas if silabas in self._metros else _OTRO
+
+    def simbolos(self, esquema, silabas=None, longitudes_estrofas=None, medidas=None):
+        """
+        Símbolos de entrada del autómata, uno por verso y uno por corte
+
+        Cada elemento es un conjunto: si se dan medidas alternativas (p. ej.
+        las que admiten licencias métricas) el verso puede leerse con varias.
+        """
+        rimas = simbolos_rima(esquema)
+        cortes = set()
+        if longitudes_estrofas:
+            posicion = 0
+            for longitud in longitudes_estrofas[:-1]:
+                posicion += longitud
+                cortes.add(posicion)
+
+        for i, rima in enumerate(rimas):
+            if i in cortes:
+                yield (FIN_ESTROFA,)
+            lecturas = {silabas[i] if silabas is not None else None}
+            if medidas is not None and medidas[i]:
+                lecturas.update(medidas[i])
+            yield tuple({(rima, self._metro(s)) for s in lecturas})
+
+    @medir('ReconocedorFormas.reconocer')
+    def reconocer(self, esquema, silabas=None, longitudes_estrofas=None, medidas=None):
+        """
+        Formas en que encaja el poema, por orden de prioridad
+
+        Args:
+            esquema: letras de rima por verso (DetectorRimas.detectar_esquema)
+            silabas: sílabas de cada verso (None = métrica desconocida)
+            longitudes_estrofas: versos de cada estrofa, para los cortes
+            medidas: por verso, otras sílabas admisibles (licencias métricas)
+
+        Returns:
+            lista de nombres (vacía si no encaja en ninguna)
+        """
+        if not esquema:
+            return []
+        estados = {0}
+        for lecturas in self.simbolos(esquema, silabas, longitudes_estrofas, medidas):
+            if len(estados) == 1 and len(lecturas) == 1:
+                # Caso habitual: una sola consulta a la tabla
+                siguiente = self._tabla[next(iter(estados))].get(lecturas[0])
+                estados = {siguiente} if siguiente is not None else set()
+            else:
+                estados = {self._tabla[e][s] for e in estados for s in lecturas
+                           if s in self._tabla[e]}
+            if not estados:
+                return []
+
+        prioridades = sorted({p for e in estados for p in self._aceptadas[e]})
+        return [self.formas[p].nombre for p in prioridades]
+
+    def forma(self, esquema, silabas=None, longitudes_estrofas=None, medidas=None):
+        """Forma de mayor prioridad en que encaja el poema, o None"""
+        formas = self.reconocer(esquema, silabas, longitudes_estrofas, medidas)
+        return formas[0] if formas else None
+
+
+_reconocedores = {}
+
+
+def obtener_reconocedor(solo_esquema=False):
+    """
+    Reconocedor compartido del proceso (el autómata se compila una vez)
+
+    Con solo_esquema=True solo incluye las formas con esquema de rima propio
+    y no mira la métrica: DetectorRimas.clasificar_rima lo usa para nombrar
+    el esquema ('Esquema de soneto petrarquista'), no la forma.
+    """
+    reconocedor = _reconocedores.get(solo_esquema)
+    if reconocedor is None:
+        formas = [f for f in FORMAS if f.solo_esquema] if solo_esquema else FORMAS
+        reconocedor = _reconocedores[solo_esquema] = ReconocedorFormas(formas)
+    return reconocedor
+
+
+def reconocer_forma(resultado, esquema, reconocedor=None):
+    """
+    Forma del poema a partir de un análisis de AnalizadorMetrico
+
+    Usa las sílabas de cada verso, las longitudes de las estrofas y, para
+    los versos que alcanzan el metro dominante con licencias, también esa
+    medida.
+    """
+    reconocedor = reconocedor or obtener_reconocedor()
+    silabas = [v.silabas for v in resultado['versos_analizados']]
+    longitudes = [e['total_versos'] for e in resultado.get('estrofas', ())]
+
+    medidas = None
+    escansion = resultado.get('escansion')
+    if escansion and escansion['ajustables']:
+        medidas = [None] * len(silabas)
+        for ajuste in escansion['ajustables']:
+            medidas[ajuste['numero'] - 1] = (escansion['objetivo'],)
+
+    return reconocedor.forma(esquema, silabas, longitudes, medidas)
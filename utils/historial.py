@@ -0,0 +1,220 @@
+"""
+Historial de análisis acotado y comprimido
+
+Guarda por sesión un número máximo de análisis. En memoria solo quedan
+resúmenes compactos; el resultado completo (incluido el texto original)
+se serializa comprimido con zlib y, opcionalmente, se vuelca a disco.
+Mantiene además agregados acumulados (totales y EstadisticasCorpus) para
+que la pestaña de estadísticas no tenga que recorrer el historial en cada
+ejecución, y un índice por huella exacta del texto para reutilizar el
+análisis de un poema que ya está en el historial.
+"""
+
+import pickle
+import shutil
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+from .estadisticas import EstadisticasCorpus
+from .huellas import huella_exacta
+
+try:
+    from config_py import ANALYTICS_CONFIG
+except ImportError:
+    ANALYTICS_CONFIG = {'max_history_entries': 500}
+
+
+class ResumenAnalisis:
+    """Resumen de un análisis que permanece en memoria"""
+
+    __slots__ = ('id', 'fecha', 'total_versos', 'total_palabras', 'total_silabas',
+                 'metro_dominante', 'primer_verso')
+
+    def __init__(self, id, fecha, total_versos, total_palabras, total_silabas,
+                 metro_dominante, primer_verso):
+        self.id = id
+        self.fecha = fecha
+        self.total_versos = total_versos
+        self.total_palabras = total_palabras
+        self.total_silabas = total_silabas
+        self.metro_dominante = metro_dominante
+        self.primer_verso = primer_verso
+
+    def to_dict(self):
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+
+class HistorialAnalisis:
+    """Historial por sesión con límite de entradas y resultados comprimidos"""
+
+    def __init__(self, max_entradas=None, directorio=None, nivel_compresion=None):
+        self.max_entradas = max_entradas or ANALYTICS_CONFIG.get('max_history_entries', 500)
+        self.nivel_compresion = (nivel_compresion if nivel_compresion is not None
+                                 else ANALYTICS_CONFIG.get('history_compression_level', 6))
+
+        # Si hay directorio, los resultados completos se vuelcan a disco
+        directorio = directorio or ANALYTICS_CONFIG.get('history_spill_dir')
+        self.directorio = Path(directorio) / uuid.uuid4().hex if directorio else None
+        if self.directorio:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+
+        self._resumenes = OrderedDict()
+        self._comprimidos = {}
+        self._siguiente_id = 1
+        # Huella exacta del texto original <-> id de la entrada
+        self._por_huella = {}
+        self._huella_de = {}
+
+        # Agregados acumulados de toda la sesión (incluye entradas descartadas)
+        self.total_poemas = 0
+        self.total_versos = 0
+        self.total_palabras = 0
+        self.total_silabas = 0
+        self.estadisticas = EstadisticasCorpus()
+
+    def __len__(self):
+        return len(self._resumenes)
+
+    def __bool__(self):
+        return bool(self._resumenes)
+
+    def __iter__(self):
+        return iter(list(self._resumenes.values()))
+
+    def agregar(self, resultado, texto_original=None, fecha=None):
+        """Añade un resultado de analisis_completo y devuelve su resumen"""
+        estadisticas = resultado.get('estadisticas', {})
+        versos = resultado.get('versos_analizados', [])
+        palabras = estadisticas.get('total_palabras')
+        if palabras is None:
+            palabras = sum(len(v['texto'].split()) for v in versos)
+
+        resumen = ResumenAnalisis(
+            id=self._siguiente_id,
+            fecha=fecha or resultado.get('fecha') or datetime.now(),
+            total_versos=estadisticas.get('total_versos', len(versos)),
+            total_palabras=palabras,
+            total_silabas=estadisticas.get('total_silabas', 0),
+            metro_dominante=resultado.get('metro_dominante', ''),
+            primer_verso=versos[0]['texto'] if versos else ''
+        )
+        self._siguiente_id += 1
+
+        completo = dict(resultado)
+        if texto_original is not None:
+            completo['texto_original'] = texto_original
+            huella = huella_exacta(texto_original)
+            self._por_huella[huella] = resumen.id
+            self._huella_de[resumen.id] = huella
+        self._guardar_completo(resumen.id, completo)
+        self._resumenes[resumen.id] = resumen
+
+        self.total_poemas += 1
+        self.total_versos += resumen.total_versos
+        self.total_palabras += resumen.total_palabras
+        self.total_silabas += resumen.total_silabas
+        self.estadisticas.agregar(resultado)
+
+        while len(self._resumenes) > self.max_entradas:
+            id_antiguo, _ = self._resumenes.popitem(last=False)
+            self._borrar_completo(id_antiguo)
+
+        return resumen
+
+    def buscar_contenido(self, texto):
+        """Id de la entrada con el mismo contenido normalizado, o None"""
+        id_entrada = self._por_huella.get(huella_exacta(texto))
+        return id_entrada if id_entrada in self._resumenes else None
+
+    def reutilizar(self, texto):
+        """
+        Resultado completo de un poema ya analizado, o None
+
+        La entrada pasa a ser la más reciente (con la fecha actual), de modo
+        que no es la siguiente en descartarse.
+        """
+        id_entrada = self.buscar_contenido(texto)
+        if id_entrada is None:
+            return None
+        resultado = self.obtener(id_entrada)
+        self._resumenes[id_entrada].fecha = datetime.now()
+        self._resumenes.move_to_end(id_entrada)
+        return resultado
+
+    def _guardar_completo(self, id_entrada, resultado):
+        datos = zlib.compress(pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL),
+                              self.nivel_compresion)
+        if self.directorio:
+            (self.directorio / f"{id_entrada}.pkl.z").write_bytes(datos)
+        else:
+            self._comprimidos[id_entrada] = datos
+
+    def _borrar_completo(self, id_entrada):
+        huella = self._huella_de.pop(id_entrada, None)
+        if huella is not None and self._por_huella.get(huella) == id_entrada:
+            del self._por_huella[huella]
+        if self.directorio:
+            try:
+                (self.directorio / f"{id_entrada}.pkl.z").unlink()
+            except FileNotFoundError:
+                pass
+        else:
+            self._comprimidos.pop(id_entrada, None)
+
+    def obtener(self, id_entrada):
+        """Devuelve el resultado completo de una entrada (o None si se descartó)"""
+        if id_entrada not in self._resumenes:
+            return None
+        if self.directorio:
+            datos = (self.directorio / f"{id_entrada}.pkl.z").read_bytes()
+        else:
+            datos = self._comprimidos[id_entrada]
+        return pickle.loads(zlib.decompress(datos))
+
+    def resumenes(self):
+        """Lista de resúmenes, del más antiguo al más reciente"""
+        return list(self._resumenes.values())
+
+    def agregados(self):
+        """Totales acumulados de la sesión (coste constante)"""
+        return {
+            'total_poemas': self.total_poemas,
+            'total_versos': self.total_versos,
+            'total_palabras': self.total_palabras,
+            'total_silabas': self.total_silabas,
+            'promedio_versos': self.total_versos / self.total_poemas if self.total_poemas else 0,
+            'entradas_en_historial': len(self._resumenes),
+        }
+
+    def bytes_comprimidos(self):
+        """Tamaño ocupado por los resultados completos comprimidos"""
+        if self.directorio:
+            return sum(f.stat().st_size for f in self.directorio.glob('*.pkl.z'))
+        return sum(len(d) for d in self._comprimidos.values())
+
+    def exportar(self, incluir_completos=False):
+        """Lista serializable del historial (para copias de seguridad)"""
+        from .resultados import a_diccionario
+
+        entradas = []
+        for resumen in self._resumenes.values():
+            entrada = resumen.to_dict()
+            if incluir_completos:
+                entrada['resultado'] = a_diccionario(self.obtener(resumen.id))
+            entradas.append(entrada)
+        return entradas
+
+    def limpiar(self):
+        """Vacía el historial y reinicia los agregados"""
+        self._resumenes.clear()
+        self._comprimidos.clear()
+        self._por_huella.clear()
+        self._huella_de.clear()
+        if self.directorio and self.directorio.exists():
+            shutil.rmtree(self.directorio, ignore_errors=True)
+            self.directorio.mkdir(parents=True, exist_ok=True)
+        self.total_poemas = self.total_versos = self.total_palabras = self.total_silabas = 0
+        self.estadisticas = EstadisticasCorpus()
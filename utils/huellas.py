@@ -0,0 +1,237 @@
+"""
+Huellas de contenido: poemas duplicados y casi duplicados
+
+Dos huellas por poema:
+
+- exacta: hash del texto normalizado (minúsculas, sin puntuación ni
+  espacios sobrantes, con la división en versos y estrofas). Las cifras
+  se conservan ("Capítulo 1" y "Capítulo 22" son textos distintos). El mismo
+  poema pegado con otro título, otra puntuación o mayúsculas tiene la
+  misma huella exacta. Se conservan las tildes porque cambian el acento
+  y, con él, la métrica y la rima: dos textos con la misma huella exacta
+  tienen el mismo análisis.
+- firma MinHash: sobre las "tejas" del poema (grupos de k palabras
+  consecutivas dentro de cada verso) se calculan num_perm mínimos de
+  funciones hash; la fracción de mínimos iguales estima la similitud de
+  Jaccard entre los dos conjuntos de tejas.
+
+Para buscar casi duplicados sin comparar con todos los poemas (LSH), la
+firma se parte en `bandas` grupos de filas y cada grupo se resume en una
+clave: dos poemas son candidatos si coinciden en alguna banda. Con 128
+permutaciones en 16 bandas de 8 filas, un poema con similitud 0.9 es
+candidato con probabilidad > 0.999, con 0.8 ~0.95 y con 0.3 ~0.001; solo
+los candidatos se comparan firma a firma.
+"""
+
+import random
+import re
+from array import array
+from hashlib import blake2b
+
+from .poema import analizar_poema
+
+try:
+    from config_py import DATABASE_CONFIG
+    _CONFIG = DATABASE_CONFIG.get('fingerprints', {})
+except ImportError:
+    _CONFIG = {}
+
+NUM_PERMUTACIONES = _CONFIG.get('num_perm', 128)
+BANDAS = _CONFIG.get('bands', 16)
+TAMANO_TEJA = _CONFIG.get('shingle_words', 3)
+UMBRAL_SIMILITUD = _CONFIG.get('near_duplicate_threshold', 0.8)
+
+# Palabras y números
+_PALABRA = re.compile(r"[^\W_]+")
+
+# Cambia con la normalización del texto: las huellas guardadas dejan de valer
+VERSION_NORMALIZACION = 2
+
+# Primo de Mersenne 2^61 - 1: h(x) = (a·x + b) mod P
+_PRIMO = (1 << 61) - 1
+_VACIO = _PRIMO
+
+
+def _permutaciones(cantidad, semilla=1):
+    # Fijas (semilla constante) para que las firmas guardadas sigan valiendo
+    aleatorio = random.Random(semilla)
+    return [(aleatorio.randrange(1, _PRIMO), aleatorio.randrange(0, _PRIMO))
+            for _ in range(cantidad)]
+
+
+_PERMUTACIONES = _permutaciones(NUM_PERMUTACIONES)
+
+
+def _hash64(texto):
+    return int.from_bytes(blake2b(texto.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def versos_normalizados(texto):
+    """Estrofas como listas de versos normalizados (palabras en minúsculas)"""
+    estrofas = []
+    for estrofa in analizar_poema(texto).estrofas:
+        versos = [' '.join(_PALABRA.findall(v.texto.lower())) for v in estrofa.versos]
+        versos = [v for v in versos if v]
+        if versos:
+            estrofas.append(versos)
+    return estrofas
+
+
+def normalizar_contenido(texto):
+    """Texto canónico: un verso por línea y una línea en blanco entre estrofas"""
+    return '\n\n'.join('\n'.join(versos) for versos in versos_normalizados(texto))
+
+
+def huella_exacta(texto):
+    """Huella (hexadecimal) del contenido normalizado"""
+    return blake2b(normalizar_contenido(texto).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def tejas(texto, tamano=None):
+    """Hashes de los grupos de `tamano` palabras de cada verso (los versos cortos, enteros)"""
+    tamano = tamano or TAMANO_TEJA
+    resultado = set()
+    for versos in versos_normalizados(texto):
+        for verso in versos:
+            palabras = verso.split()
+            if len(palabras) <= tamano:
+                resultado.add(_hash64(verso))
+                continue
+            for i in range(len(palabras) - tamano + 1):
+                resultado.add(_hash64(' '.join(palabras[i:i + tamano])))
+    return resultado
+
+
+def firma_minhash(conjunto, permutaciones=None):
+    """Firma MinHash (tupla de enteros) de un conjunto de hashes"""
+    permutaciones = permutaciones or _PERMUTACIONES
+    if not conjunto:
+        return (_VACIO,) * len(permutaciones)
+    valores = [x % _PRIMO for x in conjunto]
+    return tuple(min((a * x + b) % _PRIMO for x in valores) for a, b in permutaciones)
+
+
+def similitud(firma_a, firma_b):
+    """Similitud de Jaccard estimada entre dos firmas"""
+    if not firma_a or len(firma_a) != len(firma_b):
+        return 0.0
+    return sum(x == y for x, y in zip(firma_a, firma_b)) / len(firma_a)
+
+
+def claves_bandas(firma, bandas=None):
+    """Clave (entero de 64 bits con signo, apto para SQLite) de cada banda"""
+    bandas = bandas or BANDAS
+    filas = len(firma) // bandas
+    return [int.from_bytes(blake2b(array('Q', firma[i * filas:(i + 1) * filas]).tobytes(),
+                                   digest_size=8).digest(), 'little', signed=True)
+            for i in range(bandas)]
+
+
+class HuellaPoema:
+    """Huella exacta y firma MinHash de un poema"""
+
+    __slots__ = ('exacta', 'firma')
+
+    def __init__(self, exacta, firma):
+        self.exacta = exacta
+        self.firma = tuple(firma)
+
+    @classmethod
+    def desde_texto(cls, texto):
+        return cls(huella_exacta(texto), firma_minhash(tejas(texto)))
+
+    @property
+    def bandas(self):
+        return claves_bandas(self.firma)
+
+    def firma_bytes(self):
+        return array('Q', self.firma).tobytes()
+
+    @classmethod
+    def desde_bytes(cls, exacta, datos):
+        firma = array('Q')
+        firma.frombytes(datos)
+        return cls(exacta, firma)
+
+    def similitud(self, otra):
+        return 1.0 if self.exacta == otra.exacta else similitud(self.firma, otra.firma)
+
+    def __getstate__(self):
+        return (self.exacta, self.firma)
+
+    def __setstate__(self, estado):
+        self.exacta, self.firma = estado
+
+    def __repr__(self):
+        return f"HuellaPoema({self.exacta[:12]}...)"
+
+
+class IndiceHuellas:
+    """Índice en memoria de huellas: duplicados exactos y candidatos por LSH"""
+
+    def __init__(self, bandas=None):
+        self.num_bandas = bandas or BANDAS
+        self._exactas = {}
+        self._bandas = [{} for _ in range(self.num_bandas)]
+        self._huellas = {}
+
+    def __len__(self):
+        return len(self._huellas)
+
+    def __contains__(self, clave):
+        return clave in self._huellas
+
+    def agregar(self, clave, huella):
+        """Indexa la huella (HuellaPoema o texto) con la clave dada"""
+        if not isinstance(huella, HuellaPoema):
+            huella = HuellaPoema.desde_texto(huella)
+        if clave in self._huellas:
+            self.eliminar(clave)
+        self._huellas[clave] = huella
+        self._exactas.setdefault(huella.exacta, set()).add(clave)
+        for banda, valor in zip(self._bandas, claves_bandas(huella.firma, self.num_bandas)):
+            banda.setdefault(valor, set()).add(clave)
+        return huella
+
+    def eliminar(self, clave):
+        huella = self._huellas.pop(clave, None)
+        if huella is None:
+            return False
+        self._exactas[huella.exacta].discard(clave)
+        if not self._exactas[huella.exacta]:
+            del self._exactas[huella.exacta]
+        for banda, valor in zip(self._bandas, claves_bandas(huella.firma, self.num_bandas)):
+            banda[valor].discard(clave)
+            if not banda[valor]:
+                del banda[valor]
+        return True
+
+    def duplicados(self, huella):
+        """Claves con la misma huella exacta"""
+        if not isinstance(huella, HuellaPoema):
+            huella = HuellaPoema(huella_exacta(huella), ())
+        return set(self._exactas.get(huella.exacta, ()))
+
+    def similares(self, huella, umbral=None, limite=None):
+        """
+        Claves de los poemas parecidos, con su similitud estimada
+
+        Solo se comparan los candidatos que coinciden en alguna banda.
+
+        Returns:
+            [(clave, similitud)] de más a menos parecido, similitud >= umbral
+        """
+        if not isinstance(huella, HuellaPoema):
+            huella = HuellaPoema.desde_texto(huella)
+        umbral = UMBRAL_SIMILITUD if umbral is None else umbral
+        candidatos = set(self._exactas.get(huella.exacta, ()))
+        for banda, valor in zip(self._bandas, claves_bandas(huella.firma, self.num_bandas)):
+            candidatos.update(banda.get(valor, ()))
+
+        resultado = []
+        for clave in candidatos:
+            valor = huella.similitud(self._huellas[clave])
+            if valor >= umbral:
+                resultado.append((clave, valor))
+        resultado.sort(key=lambda par: (-par[1], str(par[0])))
+        return resultado[:limite] if limite else resultado
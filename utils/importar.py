@@ -0,0 +1,245 @@
+"""
+Importación masiva de poemas desde TXT, Markdown, JSON y archivos ZIP
+
+Se apoya en la tubería de ingesta (utils/ingesta.py): las fuentes pueden
+ser archivos sueltos, directorios o ZIP, y el análisis y la escritura en
+el almacén van en paralelo y por lotes. ImportadorPoemas añade:
+
+- División por formato. TXT y Markdown se recorren línea a línea y un
+  archivo puede contener muchos poemas separados por marcas de título
+  ('# Título', '## Título', '=== Título ===' o 'Título: ...'); lo que
+  precede a la primera marca se titula con el nombre del archivo. En JSON
+  se admiten la copia de seguridad de la aplicación (título -> datos),
+  un diccionario título -> texto y listas de objetos o de textos.
+- Deduplicación por huella exacta del contenido (utils/huellas.py): el
+  mismo poema, aunque cambien la puntuación, las mayúsculas o los espacios,
+  solo se importa una vez, tanto dentro de la importación como frente a
+  los poemas ya guardados.
+- Títulos únicos dentro de la importación y frente a los poemas ya
+  guardados ('Soneto', 'Soneto (2)'...): una importación nunca reemplaza
+  un poema existente.
+
+Uso:
+    python -m utils.importar antologia.zip poemas/ --db data/poems.db
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import re
+import sys
+
+from .huellas import huella_exacta
+from .ingesta import TuberiaIngesta, imprimir_informe, un_poema_por_archivo
+
+logger = logging.getLogger(__name__)
+
+# Marcas de título: encabezado Markdown, '=== Título ===' o 'Título: ...'
+_MARCA_TITULO = re.compile(
+    r'^\s*(?:#{1,6}\s+(?P<md>.+?)\s*#*|={2,}\s*(?P<igual>.+?)\s*={2,}|'
+    r't[íi]tulo\s*:\s*(?P<etiqueta>.+?))\s*$', re.IGNORECASE)
+
+# Claves aceptadas en los objetos JSON
+_CLAVES_TITULO = ('titulo', 'título', 'title', 'nombre')
+_CLAVES_TEXTO = ('contenido', 'texto', 'content', 'text', 'poema')
+
+
+def _titulo_marca(linea):
+    coincidencia = _MARCA_TITULO.match(linea)
+    if coincidencia is None:
+        return None
+    return next(t for t in coincidencia.groups() if t is not None).strip()
+
+
+def dividir_texto(lineas, nombre):
+    """
+    Poemas de un texto con marcas de título, línea a línea
+
+    Args:
+        lineas: iterable de líneas (p. ej. un archivo abierto)
+        nombre: título del texto anterior a la primera marca
+
+    Yields:
+        (titulo, contenido); las marcas sin versos (títulos de sección) se
+        descartan
+    """
+    titulo = nombre
+    versos = []
+
+    def poema():
+        contenido = '\n'.join(versos).strip()
+        return (titulo, contenido) if contenido else None
+
+    for linea in lineas:
+        linea = linea.rstrip('\n')
+        nuevo = _titulo_marca(linea)
+        if nuevo is None:
+            # Saltos de línea forzados de Markdown ('  ' o '\\' al final)
+            versos.append(linea.rstrip().rstrip('\\').rstrip())
+            continue
+        anterior = poema()
+        if anterior:
+            yield anterior
+        titulo, versos = nuevo or nombre, []
+
+    ultimo = poema()
+    if ultimo:
+        yield ultimo
+
+
+def _texto_objeto(objeto):
+    if isinstance(objeto, str):
+        return objeto
+    if isinstance(objeto, dict):
+        for clave in _CLAVES_TEXTO:
+            if isinstance(objeto.get(clave), str):
+                return objeto[clave]
+    return None
+
+
+def dividir_json(texto, nombre):
+    """
+    Poemas de un documento JSON
+
+    Formatos admitidos: la copia de seguridad de la aplicación
+    ({'poemas_guardados': {titulo: {'contenido': ...}}}), {titulo: texto},
+    {titulo: {'contenido': ...}}, [{'titulo': ..., 'contenido': ...}] y
+    listas de textos (titulados 'nombre 1', 'nombre 2'...).
+    """
+    try:
+        datos = json.loads(texto)
+    except json.JSONDecodeError as e:
+        logger.warning(f"JSON no válido en {nombre}: {e}")
+        return
+
+    if isinstance(datos, dict) and isinstance(datos.get('poemas_guardados'), dict):
+        datos = datos['poemas_guardados']
+
+    if isinstance(datos, dict):
+        pares = datos.items()
+    elif isinstance(datos, list):
+        pares = []
+        for i, objeto in enumerate(datos, 1):
+            titulo = None
+            if isinstance(objeto, dict):
+                titulo = next((objeto[c] for c in _CLAVES_TITULO if isinstance(objeto.get(c), str)),
+                              None)
+            pares.append((titulo or f"{nombre} {i}", objeto))
+    else:
+        return
+
+    for titulo, objeto in pares:
+        contenido = _texto_objeto(objeto)
+        if contenido and contenido.strip():
+            yield str(titulo), contenido.strip()
+
+
+class ImportadorPoemas(TuberiaIngesta):
+    """Tubería de ingesta con división por formato, deduplicación y títulos únicos"""
+
+    reemplazar = False
+
+    def __init__(self, almacen, deduplicar=True, **opciones):
+        super().__init__(almacen, **opciones)
+        self.deduplicar = deduplicar
+        self.duplicados = 0
+        self._huellas = set()
+        self._titulos = set()
+
+    def _cargar_huellas(self):
+        """Huellas exactas de los poemas ya guardados (indexadas en el almacén)"""
+        self._huellas.update(self.almacen.huellas_exactas())
+
+    def _cargar_titulos(self):
+        """Títulos ya guardados: los importados que coincidan se renombran"""
+        self._titulos.update(self.almacen.titulos())
+
+    def _titulo_unico(self, titulo):
+        base, n = titulo, 1
+        while titulo in self._titulos:
+            n += 1
+            titulo = f"{base} ({n})"
+        self._titulos.add(titulo)
+        return titulo
+
+    def dividir(self, nombre, texto, extension):
+        if extension == '.json':
+            poemas = dividir_json(texto, nombre)
+        elif extension in ('.txt', '.md'):
+            poemas = dividir_texto(io.StringIO(texto), nombre)
+        else:
+            poemas = un_poema_por_archivo(nombre, texto, extension)
+
+        for titulo, contenido in poemas:
+            if self.deduplicar:
+                huella = huella_exacta(contenido)
+                if huella in self._huellas:
+                    self.duplicados += 1
+                    continue
+                self._huellas.add(huella)
+            yield self._titulo_unico(titulo), contenido
+
+    async def ejecutar(self, rutas):
+        await asyncio.to_thread(self._cargar_titulos)
+        if self.deduplicar:
+            await asyncio.to_thread(self._cargar_huellas)
+        return await super().ejecutar(rutas)
+
+    def informe(self):
+        informe = super().informe()
+        informe['duplicados'] = self.duplicados
+        return informe
+
+
+def importar(rutas, almacen=None, **opciones):
+    """
+    Importa poemas de archivos, directorios o ZIP en el almacén
+
+    Args:
+        rutas: rutas o ArchivoMemoria (archivos subidos)
+        almacen: AlmacenPoemas (si falta se crea el configurado)
+        **opciones: las de ImportadorPoemas y TuberiaIngesta (procesos,
+            deduplicar, al_guardar...)
+
+    Returns:
+        dict: informe de la ingesta más 'duplicados'
+    """
+    if almacen is None:
+        from .almacen import AlmacenPoemas
+        almacen = AlmacenPoemas()
+    return asyncio.run(ImportadorPoemas(almacen, **opciones).ejecutar(rutas))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Importación masiva de poemas')
+    parser.add_argument('rutas', nargs='+', help='Archivos .txt/.md/.json, directorios o ZIP')
+    parser.add_argument('--db', help='Base de datos SQLite (por defecto la de DATABASE_CONFIG)')
+    parser.add_argument('--procesos', type=int, help='Procesos de análisis')
+    parser.add_argument('--propietario', default='',
+                        help='Clave de usuario de los poemas (por defecto, el corpus compartido)')
+    parser.add_argument('--max-poemas', type=int, help='Límite de poemas del propietario')
+    parser.add_argument('--sin-deduplicar', action='store_true',
+                        help='Importa también los poemas repetidos')
+    args = parser.parse_args(argv)
+
+    from .almacen import AlmacenPoemas
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    almacen = AlmacenPoemas(args.db, propietario=args.propietario)
+    if args.max_poemas:
+        almacen.max_poemas = args.max_poemas
+    try:
+        imprimir_informe(importar(args.rutas, almacen, procesos=args.procesos,
+                                  deduplicar=not args.sin_deduplicar))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        almacen.cerrar()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Indicador de sílabas en vivo para el editor
+
+Anota todas las líneas del área de texto en una sola pasada. El recuento
+de cada línea se guarda en una caché LRU indexada por el texto de la línea,
+así que al editar un poema solo se recalculan las líneas que cambiaron; la
+división silábica (más costosa) se calcula solo cuando se pide y también
+queda en la caché.
+
+Todas las líneas se cuentan en la misma pasada: Streamlit solo vuelve a
+ejecutar la página cuando el usuario interactúa, así que una línea que se
+dejara pendiente no se actualizaría hasta la siguiente edición. Con la
+caché, cada pulsación cuenta como mucho la línea que cambió.
+"""
+
+from collections import OrderedDict
+
+try:
+    from config_py import UI_CONFIG
+except ImportError:
+    UI_CONFIG = {}
+
+# Metros que el editor resalta: sílabas -> (color, emoji, etiqueta)
+ESTILOS_METRO = {
+    8: ("#28a745", "✅", "Octosílabo"),
+    11: ("#fd7e14", "🔥", "Endecasílabo"),
+    14: ("#ffc107", "⭐", "Alejandrino"),
+}
+ESTILO_NORMAL = ("#6c757d", "📝", "")
+ESTILO_EXCESO = ("#dc3545", "⚠️", "Exceso")
+
+
+def estilo_silabas(silabas):
+    """(color, emoji, etiqueta) con que se muestra un recuento"""
+    if silabas in ESTILOS_METRO:
+        return ESTILOS_METRO[silabas]
+    if silabas > 14:
+        return ESTILO_EXCESO
+    return ESTILO_NORMAL
+
+
+class LineaAnotada:
+    """Recuento de una línea del editor"""
+
+    __slots__ = ('numero', 'texto', 'silabas')
+
+    def __init__(self, numero, texto, silabas):
+        self.numero = numero
+        self.texto = texto
+        self.silabas = silabas
+
+    @property
+    def estilo(self):
+        return estilo_silabas(self.silabas)
+
+    def to_dict(self):
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+
+class _EntradaCache:
+    __slots__ = ('silabas', 'division')
+
+    def __init__(self, silabas):
+        self.silabas = silabas
+        self.division = None
+
+
+class IndicadorSilabas:
+    """Recuentos por línea con caché"""
+
+    def __init__(self, contador, max_cache=None):
+        """
+        Args:
+            contador: ContadorSilabas con el que se cuentan las líneas nuevas
+            max_cache (int): líneas distintas que se recuerdan
+        """
+        self.contador = contador
+        self.max_cache = max_cache or UI_CONFIG.get('syllable_cache_size', 2000)
+
+        self._cache = OrderedDict()
+        self._ultimo_texto = None
+        self._ultimas_lineas = []
+
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _entrada(self, linea):
+        entrada = self._cache.get(linea)
+        if entrada is not None:
+            self._cache.move_to_end(linea)
+            self.aciertos += 1
+        return entrada
+
+    def _contar(self, linea):
+        entrada = _EntradaCache(self.contador.contar_silabas_verso(linea))
+        self._cache[linea] = entrada
+        if len(self._cache) > self.max_cache:
+            self._cache.popitem(last=False)
+        self.fallos += 1
+        return entrada
+
+    def anotar(self, texto):
+        """
+        Anota todas las líneas no vacías del texto
+
+        Args:
+            texto: contenido completo del área de texto
+
+        Returns:
+            list[LineaAnotada], numeradas según su posición en el texto
+        """
+        if texto == self._ultimo_texto:
+            return self._ultimas_lineas
+
+        lineas = []
+        for numero, linea in enumerate(texto.split('\n'), 1):
+            linea = linea.strip()
+            if not linea:
+                continue
+            entrada = self._entrada(linea) or self._contar(linea)
+            lineas.append(LineaAnotada(numero, linea, entrada.silabas))
+
+        self._ultimo_texto = texto
+        self._ultimas_lineas = lineas
+        return lineas
+
+    def ultima_linea(self, texto):
+        """Anotación de la última línea no vacía (o None)"""
+        lineas = self.anotar(texto)
+        return lineas[-1] if lineas else None
+
+    def division(self, linea):
+        """División silábica de cada palabra de la línea (se cachea con el recuento)"""
+        linea = linea.strip()
+        entrada = self._entrada(linea) or self._contar(linea)
+        if entrada.division is None:
+            entrada.division = tuple(
+                ' - '.join(self.contador.dividir_en_silabas(palabra)) for palabra in linea.split())
+        return entrada.division
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'lineas_en_cache': len(self._cache),
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def limpiar(self):
+        self._cache.clear()
+        self._ultimo_texto = None
+        self._ultimas_lineas = []
@@ -0,0 +1,532 @@
+"""
+Ingesta de corpus en etapas conectadas por colas acotadas
+
+Importar miles de archivos mezcla E/S de disco, decodificación y el
+análisis (CPU). La tubería separa esas fases en etapas que trabajan a la
+vez, cada una con sus propios trabajadores:
+
+    rutas -> leer (hilos, E/S) -> normalizar y dividir -> analizar (pool de
+    procesos, por lotes) -> escribir (transacciones grandes en el almacén)
+
+Las colas entre etapas son acotadas (INGEST_CONFIG['queue_size']): si una
+etapa va más lenta, las anteriores se bloquean al llenar su cola en lugar
+de acumular archivos en memoria. Cada etapa mide sus elementos, su tiempo
+ocupado, el tiempo bloqueada esperando hueco en la cola siguiente y la
+profundidad de su cola de entrada; el informe indica el cuello de botella
+(la etapa con mayor utilización).
+
+Las fuentes pueden ser archivos, directorios (recursivos), archivos ZIP
+(se leen sus miembros sin descomprimir a disco) o archivos en memoria
+(ArchivoMemoria, p. ej. los subidos desde la aplicación).
+
+Uso:
+    python -m utils.ingesta corpus/ --db poemas.db
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import os
+import sys
+import time
+import unicodedata
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
+
+from .tareas import tarea_describir
+
+try:
+    from config_py import INGEST_CONFIG, SECURITY_CONFIG, SERVICE_CONFIG
+except ImportError:
+    INGEST_CONFIG = {}
+    SECURITY_CONFIG = {'allowed_file_types': ['.txt', '.md', '.json'],
+                       'allowed_archive_types': ['.zip'], 'max_file_size_mb': 10}
+    SERVICE_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+# Marca de fin de datos en las colas (una por trabajador de la etapa)
+_FIN = object()
+
+
+class MetricasEtapa:
+    """Rendimiento y profundidad de cola de una etapa"""
+
+    __slots__ = ('nombre', 'trabajadores', 'entradas', 'salidas', 'ocupado', 'bloqueado',
+                 'muestras_cola', 'suma_cola', 'max_cola')
+
+    def __init__(self, nombre, trabajadores):
+        self.nombre = nombre
+        self.trabajadores = trabajadores
+        self.entradas = 0
+        self.salidas = 0
+        self.ocupado = 0.0      # segundos procesando (suma de trabajadores)
+        self.bloqueado = 0.0    # segundos esperando hueco en la cola siguiente
+        self.muestras_cola = 0
+        self.suma_cola = 0
+        self.max_cola = 0
+
+    def medir_cola(self, cola):
+        profundidad = cola.qsize()
+        self.muestras_cola += 1
+        self.suma_cola += profundidad
+        self.max_cola = max(self.max_cola, profundidad)
+
+    def informe(self, duracion):
+        duracion = max(duracion, 1e-9)
+        return {
+            'trabajadores': self.trabajadores,
+            'entradas': self.entradas,
+            'salidas': self.salidas,
+            'por_segundo': self.entradas / duracion,
+            'ocupado_s': round(self.ocupado, 3),
+            'bloqueado_s': round(self.bloqueado, 3),
+            'utilizacion': self.ocupado / (self.trabajadores * duracion),
+            'cola_media': self.suma_cola / self.muestras_cola if self.muestras_cola else 0.0,
+            'cola_max': self.max_cola,
+        }
+
+
+def normalizar_texto(datos):
+    """
+    Bytes de un archivo a texto normalizado
+
+    UTF-8 (con o sin BOM) y, si no decodifica, Latin-1, habitual en
+    corpus antiguos. Saltos de línea Unix y Unicode NFC.
+
+    Returns:
+        (texto, recodificado): recodificado indica que no era UTF-8
+    """
+    try:
+        texto, recodificado = datos.decode('utf-8-sig'), False
+    except UnicodeDecodeError:
+        texto, recodificado = datos.decode('latin-1'), True
+    texto = texto.replace('\r\n', '\n').replace('\r', '\n')
+    return unicodedata.normalize('NFC', texto), recodificado
+
+
+def un_poema_por_archivo(nombre, texto, extension=None):
+    """División por defecto: el archivo entero es un poema titulado con su nombre"""
+    texto = texto.strip()
+    return [(nombre, texto)] if texto else []
+
+
+class ArchivoMemoria:
+    """Archivo cuyo contenido ya está en memoria (subido, recibido por red...)"""
+
+    __slots__ = ('nombre', 'datos')
+
+    def __init__(self, nombre, datos):
+        self.nombre = nombre
+        self.datos = datos
+
+    @property
+    def suffix(self):
+        return PurePosixPath(self.nombre).suffix
+
+    def read_bytes(self):
+        return self.datos
+
+    def __str__(self):
+        return self.nombre
+
+
+class MiembroZip:
+    """Archivo dentro de un ZIP; se descomprime al leerlo"""
+
+    __slots__ = ('archivo', 'info')
+
+    def __init__(self, archivo, info):
+        self.archivo = archivo
+        self.info = info
+
+    @property
+    def suffix(self):
+        return PurePosixPath(self.info.filename).suffix
+
+    def read_bytes(self):
+        # ZipFile admite lecturas desde varios hilos sobre el mismo archivo
+        return self.archivo.read(self.info)
+
+    def __str__(self):
+        return f"{self.archivo.filename or 'zip'}:{self.info.filename}"
+
+
+def _miembros_zip(origen, admitir_tamano, extensiones):
+    datos = origen if isinstance(origen, Path) else io.BytesIO(origen.read_bytes())
+    try:
+        archivo = zipfile.ZipFile(datos)
+    except (OSError, zipfile.BadZipFile) as e:
+        logger.warning(f"No se pudo abrir el ZIP {origen}: {e}")
+        yield origen, None
+        return
+    for info in sorted(archivo.infolist(), key=lambda i: i.filename):
+        if info.is_dir():
+            continue
+        nombre = PurePosixPath(info.filename)
+        # El tamaño descomprimido también se limita (evita bombas ZIP)
+        admitido = (nombre.suffix.lower() in extensiones and admitir_tamano(info.file_size))
+        yield MiembroZip(archivo, info), nombre.with_suffix('').as_posix() if admitido else None
+
+
+def listar_archivos(rutas, extensiones=None, max_bytes=None):
+    """
+    Archivos a ingerir, con el título que recibirán por defecto
+
+    Los directorios se recorren recursivamente y los ZIP (también dentro de
+    un directorio) se abren y se recorren sus miembros; el nombre es la
+    ruta relativa sin extensión, para que archivos homónimos en carpetas
+    distintas no se reemplacen entre sí.
+
+    Args:
+        rutas: rutas (str o Path) o ArchivoMemoria
+
+    Yields:
+        (origen, nombre), donde origen tiene read_bytes() y suffix; nombre
+        es None si el archivo se omite (tipo no permitido o mayor que
+        max_file_size_mb)
+    """
+    extensiones = {e.lower() for e in (extensiones or SECURITY_CONFIG['allowed_file_types'])}
+    contenedores = {e.lower() for e in SECURITY_CONFIG.get('allowed_archive_types', ['.zip'])}
+    if max_bytes is None:
+        max_bytes = SECURITY_CONFIG.get('max_file_size_mb', 10) * 1024 * 1024
+
+    def admitir_tamano(tamano):
+        return tamano <= max_bytes
+
+    def admitir(ruta):
+        try:
+            return ruta.suffix.lower() in extensiones and admitir_tamano(ruta.stat().st_size)
+        except OSError:
+            return False
+
+    def archivo(origen, nombre):
+        if origen.suffix.lower() in contenedores:
+            yield from _miembros_zip(origen, admitir_tamano, extensiones)
+        elif isinstance(origen, ArchivoMemoria):
+            admitido = (origen.suffix.lower() in extensiones
+                        and admitir_tamano(len(origen.datos)))
+            yield origen, nombre if admitido else None
+        else:
+            yield origen, nombre if admitir(origen) else None
+
+    for ruta in rutas:
+        if isinstance(ruta, ArchivoMemoria):
+            yield from archivo(ruta, PurePosixPath(ruta.nombre).stem)
+            continue
+        ruta = Path(ruta)
+        if ruta.is_dir():
+            for directorio, subdirectorios, archivos in os.walk(ruta):
+                subdirectorios.sort()
+                for nombre in sorted(archivos):
+                    completa = Path(directorio, nombre)
+                    yield from archivo(completa,
+                                       completa.relative_to(ruta).with_suffix('').as_posix())
+        else:
+            yield from archivo(ruta, ruta.stem)
+
+
+class TuberiaIngesta:
+    """Ingesta de archivos de poemas en el almacén, por etapas concurrentes"""
+
+    # Un poema con el título de otro ya guardado lo sustituye
+    reemplazar = True
+
+    def __init__(self, almacen, ejecutor=None, procesos=None, lectores=None, tamano_cola=None,
+                 lote_analisis=None, lote_escritura=None, dividir=None, al_guardar=None):
+        """
+        Args:
+            almacen: AlmacenPoemas donde se guardan los poemas
+            ejecutor: pool de procesos para el análisis (si falta se crea uno
+                con `procesos` trabajadores y se cierra al terminar)
+            lectores: lecturas de archivo simultáneas
+            tamano_cola: capacidad de cada cola entre etapas
+            lote_analisis: poemas por tarea enviada al pool
+            lote_escritura: poemas por transacción en el almacén
+            dividir: función (nombre, texto, extension) -> [(titulo, contenido)]
+                que sustituye a self.dividir
+            al_guardar: función llamada con cada lote de filas ya guardado
+                (p. ej. para actualizar otros índices)
+        """
+        self.almacen = almacen
+        self.ejecutor = ejecutor
+        self.procesos = (procesos or INGEST_CONFIG.get('workers') or SERVICE_CONFIG.get('workers')
+                         or os.cpu_count())
+        self.lectores = lectores or INGEST_CONFIG.get('readers', 8)
+        self.tamano_cola = tamano_cola or INGEST_CONFIG.get('queue_size', 64)
+        self.lote_analisis = lote_analisis or INGEST_CONFIG.get('analysis_batch', 32)
+        self.lote_escritura = lote_escritura or INGEST_CONFIG.get('write_batch', 1000)
+        if dividir is not None:
+            self.dividir = dividir
+        self.al_guardar = al_guardar
+        self.intervalo_informe = INGEST_CONFIG.get('report_interval_s', 5.0)
+
+        self.etapas = {}
+        self.archivos = 0
+        self.omitidos = 0
+        self.recodificados = 0
+        self.poemas = 0
+        self.guardados = 0
+        self.excedentes = 0
+        self._inicio = None
+        self._fin = None
+
+    def dividir(self, nombre, texto, extension):
+        """Poemas [(titulo, contenido)] de un archivo ya normalizado"""
+        return un_poema_por_archivo(nombre, texto, extension)
+
+    # --- Etapas ----------------------------------------------------------
+
+    async def _leer(self, elemento):
+        origen, nombre = elemento
+        if nombre is None:
+            self.omitidos += 1
+            return []
+        try:
+            datos = await asyncio.to_thread(origen.read_bytes)
+        except (OSError, zipfile.BadZipFile) as e:
+            logger.warning(f"No se pudo leer {origen}: {e}")
+            self.omitidos += 1
+            return []
+        self.archivos += 1
+        return [(nombre, origen.suffix.lower(), datos)]
+
+    def _crear_normalizar(self):
+        lote = []
+
+        async def normalizar(elemento):
+            nombre, extension, datos = elemento
+            texto, recodificado = normalizar_texto(datos)
+            self.recodificados += recodificado
+            lotes = []
+            for poema in self.dividir(nombre, texto, extension):
+                self.poemas += 1
+                lote.append(poema)
+                if len(lote) >= self.lote_analisis:
+                    lotes.append(lote[:])
+                    lote.clear()
+            return lotes
+
+        def vaciar():
+            resto = [lote[:]] if lote else []
+            lote.clear()
+            return resto
+
+        return normalizar, vaciar
+
+    async def _analizar(self, lote):
+        bucle = asyncio.get_running_loop()
+        return [await bucle.run_in_executor(self.ejecutor, tarea_describir, lote)]
+
+    def _crear_escribir(self):
+        pendientes = []
+
+        def guardar_lote(filas):
+            # Al llegar al límite del almacén se conserva lo guardado y el
+            # resto cuenta como excedente
+            guardados = self.almacen.guardar_lote(filas, reemplazar=self.reemplazar,
+                                                  parar_en_limite=True)
+            if guardados < len(filas):
+                if not self.excedentes:
+                    logger.warning(f"Se alcanzó el máximo de {self.almacen.max_poemas} poemas; "
+                                   f"los siguientes se omiten")
+                self.excedentes += len(filas) - guardados
+            if self.al_guardar is not None and guardados:
+                self.al_guardar(filas[:guardados])
+            return guardados
+
+        async def guardar(filas):
+            self.guardados += await asyncio.to_thread(guardar_lote, filas)
+
+        async def escribir(filas):
+            pendientes.extend(filas)
+            if len(pendientes) >= self.lote_escritura:
+                lote = pendientes[:]
+                pendientes.clear()
+                await guardar(lote)
+            return []
+
+        async def vaciar():
+            if pendientes:
+                lote = pendientes[:]
+                pendientes.clear()
+                await guardar(lote)
+
+        return escribir, vaciar
+
+    async def _etapa(self, metricas, entrada, procesar, salida=None, siguientes=0, vaciar=None):
+        """Corre los trabajadores de una etapa hasta recibir sus marcas de fin"""
+
+        async def emitir(elementos):
+            for elemento in elementos:
+                inicio = time.perf_counter()
+                await salida.put(elemento)
+                metricas.bloqueado += time.perf_counter() - inicio
+                metricas.salidas += 1
+
+        async def trabajador():
+            while True:
+                metricas.medir_cola(entrada)
+                elemento = await entrada.get()
+                if elemento is _FIN:
+                    return
+                inicio = time.perf_counter()
+                resultados = await procesar(elemento)
+                metricas.ocupado += time.perf_counter() - inicio
+                metricas.entradas += 1
+                if salida is not None:
+                    await emitir(resultados)
+
+        await asyncio.gather(*(trabajador() for _ in range(metricas.trabajadores)))
+        if vaciar is not None:
+            resto = vaciar()
+            if asyncio.iscoroutine(resto):
+                resto = await resto
+            if salida is not None and resto:
+                await emitir(resto)
+        for _ in range(siguientes):
+            await salida.put(_FIN)
+
+    async def _producir(self, rutas, salida, siguientes):
+        for elemento in listar_archivos(rutas):
+            await salida.put(elemento)
+        for _ in range(siguientes):
+            await salida.put(_FIN)
+
+    async def _informar(self):
+        while True:
+            await asyncio.sleep(self.intervalo_informe)
+            informe = self.informe()
+            colas = ', '.join(f"{n} {e['cola_media']:.0f}/{self.tamano_cola}"
+                              for n, e in informe['etapas'].items())
+            logger.info(f"Ingesta: {self.archivos} archivos, {self.guardados} poemas guardados "
+                        f"({informe['poemas_por_segundo']:.0f}/s); colas: {colas}")
+
+    # --- Ejecución ------------------------------------------------------
+
+    async def ejecutar(self, rutas):
+        """Ingiere archivos y directorios; devuelve el informe final"""
+        analizadores = 2 * self.procesos  # uno en cola por proceso mientras otro trabaja
+        self.etapas = {
+            'leer': MetricasEtapa('leer', self.lectores),
+            'normalizar': MetricasEtapa('normalizar', 1),
+            'analizar': MetricasEtapa('analizar', analizadores),
+            'escribir': MetricasEtapa('escribir', 1),
+        }
+        colas = [asyncio.Queue(self.tamano_cola) for _ in range(4)]
+        normalizar, vaciar_normalizar = self._crear_normalizar()
+        escribir, vaciar_escribir = self._crear_escribir()
+
+        propio = self.ejecutor is None
+        if propio:
+            self.ejecutor = ProcessPoolExecutor(max_workers=self.procesos)
+
+        self._inicio, self._fin = time.perf_counter(), None
+        tareas = [
+            asyncio.ensure_future(self._producir(rutas, colas[0], self.lectores)),
+            asyncio.ensure_future(self._etapa(self.etapas['leer'], colas[0], self._leer,
+                                              colas[1], 1)),
+            asyncio.ensure_future(self._etapa(self.etapas['normalizar'], colas[1], normalizar,
+                                              colas[2], analizadores, vaciar_normalizar)),
+            asyncio.ensure_future(self._etapa(self.etapas['analizar'], colas[2], self._analizar,
+                                              colas[3], 1)),
+            asyncio.ensure_future(self._etapa(self.etapas['escribir'], colas[3], escribir,
+                                              vaciar=vaciar_escribir)),
+        ]
+        informador = asyncio.ensure_future(self._informar()) if self.intervalo_informe else None
+        try:
+            hechas, pendientes = await asyncio.wait(tareas, return_when=asyncio.FIRST_EXCEPTION)
+            for tarea in pendientes:
+                tarea.cancel()
+            for tarea in hechas:
+                tarea.result()
+        finally:
+            self._fin = time.perf_counter()
+            if informador is not None:
+                informador.cancel()
+            if propio:
+                self.ejecutor.shutdown(wait=True, cancel_futures=True)
+                self.ejecutor = None
+
+        informe = self.informe()
+        logger.info(f"Ingesta completada: {self.guardados} poemas en {informe['segundos']:.1f} s "
+                    f"({informe['poemas_por_segundo']:.0f}/s); "
+                    f"cuello de botella: {informe['cuello_botella']}")
+        return informe
+
+    def informe(self):
+        """Estado actual (o final) de la ingesta y de cada etapa"""
+        if self._inicio is None:
+            duracion = 0.0
+        else:
+            duracion = (self._fin or time.perf_counter()) - self._inicio
+        etapas = {nombre: m.informe(duracion) for nombre, m in self.etapas.items()}
+        return {
+            'archivos': self.archivos,
+            'omitidos': self.omitidos,
+            'recodificados': self.recodificados,
+            'poemas': self.poemas,
+            'guardados': self.guardados,
+            'excedentes': self.excedentes,
+            'segundos': duracion,
+            'poemas_por_segundo': self.guardados / duracion if duracion else 0.0,
+            'etapas': etapas,
+            'cuello_botella': max(etapas, key=lambda n: etapas[n]['utilizacion']) if etapas else None,
+        }
+
+
+def ingerir(rutas, almacen=None, **opciones):
+    """Versión síncrona de TuberiaIngesta.ejecutar (crea el almacén si falta)"""
+    if almacen is None:
+        from .almacen import AlmacenPoemas
+        almacen = AlmacenPoemas()
+    return asyncio.run(TuberiaIngesta(almacen, **opciones).ejecutar(rutas))
+
+
+def imprimir_informe(informe):
+    """Resumen y tabla por etapas de un informe de ingesta"""
+    extra = ''.join(f", {informe[c]} {c}" for c in ('duplicados',) if c in informe)
+    if informe.get('excedentes'):
+        extra += f", {informe['excedentes']} sin guardar por el límite del almacén"
+    print(f"{informe['archivos']} archivos ({informe['omitidos']} omitidos), "
+          f"{informe['guardados']} poemas en {informe['segundos']:.2f} s "
+          f"({informe['poemas_por_segundo']:.1f} poemas/s){extra}")
+    print(f"{'etapa':<12}{'trab.':>6}{'entradas':>10}{'por s':>10}{'utiliz.':>9}"
+          f"{'bloq. s':>9}{'cola media':>12}{'cola máx':>10}")
+    for nombre, etapa in informe['etapas'].items():
+        print(f"{nombre:<12}{etapa['trabajadores']:>6}{etapa['entradas']:>10}"
+              f"{etapa['por_segundo']:>10.1f}{etapa['utilizacion']:>9.0%}"
+              f"{etapa['bloqueado_s']:>9.2f}{etapa['cola_media']:>12.1f}{etapa['cola_max']:>10}")
+    print(f"Cuello de botella: {informe['cuello_botella']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ingesta de archivos de poemas en el almacén')
+    parser.add_argument('rutas', nargs='+', help='Archivos, directorios o ZIP')
+    parser.add_argument('--db', help='Base de datos SQLite (por defecto la de DATABASE_CONFIG)')
+    parser.add_argument('--procesos', type=int, help='Procesos de análisis')
+    parser.add_argument('--propietario', default='',
+                        help='Clave de usuario de los poemas (por defecto, el corpus compartido)')
+    parser.add_argument('--max-poemas', type=int, help='Límite de poemas del propietario')
+    args = parser.parse_args(argv)
+
+    from .almacen import AlmacenPoemas
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    almacen = AlmacenPoemas(args.db, propietario=args.propietario)
+    if args.max_poemas:
+        almacen.max_poemas = args.max_poemas
+    try:
+        imprimir_informe(ingerir(args.rutas, almacen, procesos=args.procesos))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        almacen.cerrar()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
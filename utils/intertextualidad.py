@@ -0,0 +1,244 @@
+"""
+Intertextualidad: versos y hemistiquios reutilizados de poemas conocidos
+
+Cada verso guardado en el almacén se indexa por sus "tejas": pares de
+palabras consecutivas normalizadas con ContadorSilabas.limpiar_palabra
+(minúsculas, sin puntuación, con tildes). Los pares formados solo por
+palabras vacías ('de la', 'y en') no se indexan: aparecerían en casi
+todos los versos y no dicen nada de la fuente. Con cada verso se guardan
+también su número de sílabas y su terminación de rima.
+
+Para buscar, las tejas de cada verso de la consulta se resuelven con una
+sola consulta al índice (tabla tejas_verso del almacén), se cuentan las
+compartidas con cada verso candidato y solo los que comparten al menos
+`min_shared_shingles` se comparan en detalle:
+
+- hemistiquio: el tramo más largo de palabras consecutivas comunes
+  alcanza medio verso (contención) sin cubrir casi todo el verso, y no se
+  comparte nada fuera de ese tramo. Se comprueba primero: "dulces prendas
+  por mi mal" reutiliza medio verso aunque su Jaccard sea alto;
+- verso: Jaccard entre los conjuntos de tejas (similitud);
+- misma rima y mismo número de sílabas refuerzan la puntuación.
+
+El coste depende de cuántos versos comparten tejas con la consulta, no
+del tamaño del almacén.
+"""
+
+from hashlib import blake2b
+
+try:
+    from config_py import METRIC_ANALYSIS_CONFIG
+    _CONFIG = METRIC_ANALYSIS_CONFIG.get('intertextuality', {})
+except ImportError:
+    _CONFIG = {}
+
+TAMANO_TEJA = _CONFIG.get('shingle_words', 2)
+
+# Artículos, preposiciones, conjunciones, pronombres y verbos auxiliares
+PALABRAS_VACIAS = frozenset("""
+a al ante bajo cabe con contra de del desde durante e el en entre hacia hasta mediante
+para por según sin so sobre tras la las lo los un una unas unos y o u ni que pero mas
+sino porque pues si no ya me te se nos os le les mi mis tu tus su sus yo tú él ella
+ello ellos ellas nosotros vosotros mí ti sí conmigo contigo consigo cual cuales quien
+quienes como cuando donde cuanto este esta esto estos estas ese esa eso esos esas es
+son era fue ha he han hay muy más tan
+""".split())
+
+_contador = None
+_detector = None
+
+
+def _obtener_contador(contador=None):
+    global _contador
+    if contador is not None:
+        return contador
+    if _contador is None:
+        from .silabas import ContadorSilabas
+        _contador = ContadorSilabas()
+    return _contador
+
+
+def _obtener_detector(detector=None):
+    global _detector
+    if detector is not None:
+        return detector
+    if _detector is None:
+        from .rimas import DetectorRimas
+        _detector = DetectorRimas()
+    return _detector
+
+
+def _hash_teja(teja):
+    # Entero de 64 bits con signo: cabe en una columna INTEGER de SQLite
+    return int.from_bytes(blake2b(teja.encode('utf-8'), digest_size=8).digest(), 'little',
+                          signed=True)
+
+
+def tokens_verso(verso, contador=None):
+    """Palabras del verso normalizadas con ContadorSilabas.limpiar_palabra"""
+    contador = _obtener_contador(contador)
+    return [t for t in (contador.limpiar_palabra(p) for p in verso.split()) if t]
+
+
+def tejas_verso(tokens, tamano=None):
+    """Hashes de las tejas de un verso (sin las formadas solo por palabras vacías)"""
+    tamano = tamano or TAMANO_TEJA
+    if len(tokens) < tamano:
+        grupos = [tokens] if tokens else []
+    else:
+        grupos = [tokens[i:i + tamano] for i in range(len(tokens) - tamano + 1)]
+    return sorted({_hash_teja(' '.join(g)) for g in grupos
+                   if any(t not in PALABRAS_VACIAS for t in g)})
+
+
+def tramo_comun(tokens1, tokens2):
+    """Longitud del tramo más largo de palabras consecutivas comunes"""
+    mejor = 0
+    anterior = [0] * (len(tokens2) + 1)
+    for t1 in tokens1:
+        actual = [0] * (len(tokens2) + 1)
+        for j, t2 in enumerate(tokens2, 1):
+            if t1 == t2:
+                actual[j] = anterior[j - 1] + 1
+                mejor = max(mejor, actual[j])
+        anterior = actual
+    return mejor
+
+
+def terminacion_verso(verso, detector=None):
+    """Terminación de rima normalizada (sin tildes) de un verso"""
+    detector = _obtener_detector(detector)
+    return detector._normalizar_terminacion(detector.extraer_terminacion_rima(verso))
+
+
+def indice_versos(versos, silabas, contador=None, detector=None):
+    """
+    Filas del índice de versos de un poema
+
+    Args:
+        versos: textos de los versos
+        silabas: sílabas métricas de cada verso (ya calculadas al describir)
+
+    Returns:
+        [(numero, texto, silabas, terminacion, tejas)]
+    """
+    contador, detector = _obtener_contador(contador), _obtener_detector(detector)
+    return [(numero, verso, n, terminacion_verso(verso, detector),
+             tuple(tejas_verso(tokens_verso(verso, contador))))
+            for numero, (verso, n) in enumerate(zip(versos, silabas), 1)]
+
+
+class BuscadorIntertextual:
+    """Busca en el almacén versos que reutilizan los de un poema"""
+
+    def __init__(self, almacen, umbral=None, umbral_hemistiquio=None, min_comunes=None,
+                 max_cobertura=None):
+        """
+        Args:
+            almacen: AlmacenPoemas con el índice de versos
+            umbral: similitud (Jaccard de tejas) mínima de un verso reutilizado
+            umbral_hemistiquio: tramo común mínimo de un hemistiquio, como
+                fracción de medio verso (el más largo de los dos)
+            min_comunes: tejas compartidas mínimas para considerar un candidato
+            max_cobertura: fracción máxima del verso más largo que cubre un
+                hemistiquio (por encima es el verso entero, retocado)
+        """
+        self.almacen = almacen
+        self.umbral = umbral if umbral is not None else _CONFIG.get('verse_threshold', 0.5)
+        self.umbral_hemistiquio = (umbral_hemistiquio if umbral_hemistiquio is not None
+                                   else _CONFIG.get('hemistich_containment', 0.8))
+        self.min_comunes = min_comunes or _CONFIG.get('min_shared_shingles', 2)
+        self.max_cobertura = (max_cobertura if max_cobertura is not None
+                              else _CONFIG.get('hemistich_max_coverage', 0.75))
+
+    def _puntuar(self, consulta, tokens, candidato, comunes):
+        numero, texto, silabas, terminacion, tejas = consulta
+        n_consulta, n_candidato = len(tejas), candidato['tejas']
+        similitud = comunes / (n_consulta + n_candidato - comunes)
+
+        # Tramo común frente a medio verso; las tejas del tramo son las únicas
+        # compartidas si el resto de los versos no se parece
+        tokens_candidato = tokens_verso(candidato['texto'],
+                                        self.almacen.analizador.contador_silabas)
+        tramo = tramo_comun(tokens, tokens_candidato)
+        largo = max(len(tokens), len(tokens_candidato))
+        contencion = min(1.0, tramo / (largo / 2)) if largo else 0.0
+        tejas_tramo = tramo - TAMANO_TEJA + 1
+        if (contencion >= self.umbral_hemistiquio and tramo / largo <= self.max_cobertura
+                and tejas_tramo >= min(self.min_comunes, n_consulta)
+                and comunes <= tejas_tramo):
+            tipo = 'hemistiquio'
+        elif similitud >= self.umbral:
+            tipo = 'verso'
+        else:
+            return None
+        misma_rima = bool(terminacion) and terminacion == candidato['terminacion']
+        mismas_silabas = silabas == candidato['silabas']
+        puntuacion = (0.8 * max(similitud, 0.6 * contencion)
+                      + 0.1 * misma_rima + 0.1 * mismas_silabas)
+        return {
+            'titulo': candidato['titulo'],
+            'verso': candidato['numero'],
+            'texto': candidato['texto'],
+            'tipo': tipo,
+            'similitud': round(similitud, 3),
+            'contencion': round(contencion, 3),
+            'misma_rima': misma_rima,
+            'mismas_silabas': mismas_silabas,
+            'puntuacion': round(puntuacion, 3),
+        }
+
+    def buscar(self, texto, excluir=None, limite=5):
+        """
+        Versos del almacén que coinciden con los del texto
+
+        Args:
+            texto: poema de consulta
+            excluir: título a excluir (el propio poema si ya está guardado)
+            limite: coincidencias por verso, de mayor a menor puntuación
+
+        Returns:
+            [{'verso', 'texto', 'coincidencias': [...]}] solo de los versos
+            de la consulta con alguna coincidencia
+        """
+        from .poema import analizar_poema
+
+        contador = self.almacen.analizador.contador_silabas
+        detector = self.almacen.detector
+        versos = analizar_poema(texto).textos_versos
+        silabas = [contador.contar_silabas_verso(v) for v in versos]
+        consulta = [fila for fila in indice_versos(versos, silabas, contador, detector) if fila[4]]
+        if not consulta:
+            return []
+
+        # Una consulta al índice para todas las tejas; luego recuento por verso
+        publicaciones = self.almacen.versos_con_tejas({t for fila in consulta for t in fila[4]})
+        comunes_por_verso = []
+        necesarios = set()
+        for fila in consulta:
+            comunes = {}
+            for teja in fila[4]:
+                for verso_id in publicaciones.get(teja, ()):
+                    comunes[verso_id] = comunes.get(verso_id, 0) + 1
+            minimo = min(self.min_comunes, len(fila[4]))
+            comunes = {v: n for v, n in comunes.items() if n >= minimo}
+            comunes_por_verso.append(comunes)
+            necesarios.update(comunes)
+
+        candidatos = self.almacen.datos_versos(necesarios)
+        resultado = []
+        for fila, comunes in zip(consulta, comunes_por_verso):
+            tokens = tokens_verso(fila[1], contador)
+            coincidencias = []
+            for verso_id, n in comunes.items():
+                candidato = candidatos.get(verso_id)
+                if candidato is None or candidato['titulo'] == excluir:
+                    continue
+                coincidencia = self._puntuar(fila, tokens, candidato, n)
+                if coincidencia:
+                    coincidencias.append(coincidencia)
+            if coincidencias:
+                coincidencias.sort(key=lambda c: (-c['puntuacion'], c['titulo'], c['verso']))
+                resultado.append({'verso': fila[0], 'texto': fila[1],
+                                  'coincidencias': coincidencias[:limite]})
+        return resultado
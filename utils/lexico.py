@@ -0,0 +1,408 @@
+"""
+Léxico silábico precompilado y mapeado en memoria
+
+Tabla palabra -> (número de sílabas, puntos de corte, sílaba tónica)
+generada offline a partir de la lista de palabras incluida
+(utils/datos/palabras.txt) más unas excepciones anotadas a mano
+(utils/datos/silabas_excepciones.txt). ContadorSilabas la consulta antes
+de aplicar sus reglas heurísticas: una palabra conocida cuesta un hash y
+una comparación.
+
+La tabla se guarda con utils/tabla_binaria.py y se abre con mmap en modo
+solo lectura, de modo que los procesos del pool del servicio HTTP
+comparten las mismas páginas del sistema operativo sin copiarlas. La
+búsqueda usa una tabla hash de direccionamiento abierto (crc32 del texto
+UTF-8, sondeo lineal) almacenada en el propio archivo.
+
+Uso:
+    python -m utils.lexico --construir
+    python -m utils.lexico continúa país había
+"""
+
+import argparse
+import hashlib
+import logging
+import sys
+import time
+import zlib
+from array import array
+from pathlib import Path
+
+from .tabla_binaria import TablaBinaria, escribir_tabla, bloque_textos
+
+try:
+    from config_py import METRIC_ANALYSIS_CONFIG
+    _CONFIG = METRIC_ANALYSIS_CONFIG.get('syllable_counting', {})
+    _CONFIG_RIMAS = METRIC_ANALYSIS_CONFIG.get('rhyme_detection', {})
+except ImportError:
+    _CONFIG = {}
+    _CONFIG_RIMAS = {}
+
+logger = logging.getLogger(__name__)
+
+_RAIZ = Path(__file__).resolve().parent.parent
+RUTA_LISTA = _RAIZ / _CONFIG_RIMAS.get('word_list', 'utils/datos/palabras.txt')
+RUTA_EXCEPCIONES = _RAIZ / 'utils' / 'datos' / 'silabas_excepciones.txt'
+RUTA_LEXICO = _RAIZ / _CONFIG.get('lexicon_file', 'data/lexico.idx')
+
+VERSION_LEXICO = 1
+MAX_LONGITUD = 32  # Los cortes se guardan como máscara de 32 bits
+_VACIO = 0xFFFFFFFF
+
+ACENTUACIONES = ('aguda', 'llana', 'esdrujula')
+
+# --- Silabeo por reglas (solo para construir el léxico) ---------------------
+
+_VOCALES = set('aeiouáéíóúü')
+_FUERTES = set('aeoáéó')
+_CERRADAS_TILDADAS = set('íú')
+_TILDADAS = set('áéíóú')
+_INSEPARABLES = {'pl', 'pr', 'bl', 'br', 'cl', 'cr', 'dr', 'fl', 'fr',
+                 'gl', 'gr', 'tr', 'kl', 'kr'}
+
+
+def _unidades(palabra):
+    """Divide la palabra en unidades (texto, inicio, es_vocal)"""
+    unidades = []
+    n = len(palabra)
+    i = 0
+    while i < n:
+        c = palabra[i]
+        siguiente = palabra[i + 1] if i + 1 < n else ''
+        tras_siguiente = palabra[i + 2] if i + 2 < n else ''
+
+        if c + siguiente in ('ch', 'll', 'rr'):
+            unidades.append((c + siguiente, i, False))
+            i += 2
+        elif c in 'qg' and siguiente == 'u' and tras_siguiente in ('e', 'i', 'é', 'í'):
+            # que, qui, gue, gui: la u no suena
+            unidades.append((c + siguiente, i, False))
+            i += 2
+        elif c == 'y':
+            # y es vocal si no la sigue otra vocal (y, rey, hoy, muy)
+            unidades.append((c, i, siguiente not in _VOCALES))
+            i += 1
+        else:
+            unidades.append((c, i, c in _VOCALES))
+            i += 1
+    return unidades
+
+
+def silabear(palabra):
+    """
+    División silábica ortográfica de una palabra en minúsculas
+
+    Returns:
+        tuple: (lista de posiciones donde empieza cada sílaba salvo la
+        primera, índice de la sílaba tónica)
+    """
+    unidades = _unidades(palabra)
+
+    # Núcleos: secuencias de vocales separadas por hiato
+    nucleos = []  # (índice de la primera unidad, índice de la última)
+    anterior = None
+    for k, (texto, _, es_vocal) in enumerate(unidades):
+        if not es_vocal:
+            anterior = None
+            continue
+        if anterior is None:
+            nucleos.append([k, k])
+        else:
+            previa = unidades[anterior][0]
+            hiato = ((previa in _FUERTES and texto in _FUERTES)
+                     or texto in _CERRADAS_TILDADAS or previa in _CERRADAS_TILDADAS)
+            if hiato:
+                nucleos.append([k, k])
+            else:
+                nucleos[-1][1] = k
+        anterior = k
+
+    if not nucleos:
+        return [], 0
+
+    # Consonantes entre núcleos: una va con la siguiente sílaba; de varias,
+    # la última (o el grupo inseparable final) va con la siguiente
+    cortes = []
+    for (_, fin), (inicio_siguiente, _) in zip(nucleos, nucleos[1:]):
+        consonantes = unidades[fin + 1:inicio_siguiente]
+        if not consonantes:
+            cortes.append(unidades[inicio_siguiente][1])
+        elif len(consonantes) == 1:
+            cortes.append(consonantes[0][1])
+        elif consonantes[-2][0] + consonantes[-1][0] in _INSEPARABLES:
+            cortes.append(consonantes[-2][1])
+        else:
+            cortes.append(consonantes[-1][1])
+
+    # Sílaba tónica: la de la tilde o, si no hay, según la terminación
+    limites = [0] + cortes + [len(palabra)]
+    for i, c in enumerate(palabra):
+        if c in _TILDADAS:
+            for s in range(len(limites) - 1):
+                if limites[s] <= i < limites[s + 1]:
+                    return cortes, s
+    total = len(cortes) + 1
+    if palabra[-1] in 'aeiouns' and total > 1:
+        return cortes, total - 2
+    return cortes, total - 1
+
+
+def _leer_excepciones(ruta):
+    """
+    Excepciones anotadas: una por línea, sílabas separadas por guiones y
+    la tónica precedida de un apóstrofo (cru-'el). Líneas con # se ignoran.
+    """
+    excepciones = {}
+    if not Path(ruta).exists():
+        return excepciones
+    for linea in Path(ruta).read_text(encoding='utf-8').splitlines():
+        linea = linea.split('#', 1)[0].strip()
+        if not linea:
+            continue
+        silabas = linea.lower().split('-')
+        tonica = next((i for i, s in enumerate(silabas) if s.startswith("'")), None)
+        silabas = [s.lstrip("'") for s in silabas]
+        palabra = ''.join(silabas)
+        cortes = []
+        posicion = 0
+        for silaba in silabas[:-1]:
+            posicion += len(silaba)
+            cortes.append(posicion)
+        if tonica is None:
+            tonica = silabear(palabra)[1]
+        excepciones[palabra] = (cortes, tonica)
+    return excepciones
+
+
+# --- Construcción -----------------------------------------------------------
+
+def _huella(*rutas):
+    sha = hashlib.sha1()
+    for ruta in rutas:
+        if Path(ruta).exists():
+            sha.update(Path(ruta).read_bytes())
+    return sha.hexdigest()
+
+
+def _fechas(*rutas):
+    """Tamaño y fecha de las fuentes (comprobación rápida antes de la huella)"""
+    return [[p.stat().st_size, p.stat().st_mtime_ns] if p.exists() else None
+            for p in map(Path, rutas)]
+
+
+def _palabras_especiales():
+    """Palabras de la tabla de ContadorSilabas (siempre incluidas)"""
+    from .silabas import ContadorSilabas
+    return ContadorSilabas(usar_lexico=False).palabras_especiales
+
+
+def construir_lexico(ruta_lista=RUTA_LISTA, ruta_excepciones=RUTA_EXCEPCIONES,
+                     ruta_lexico=RUTA_LEXICO):
+    """Silabea la lista de palabras y escribe el léxico binario"""
+    inicio = time.perf_counter()
+    excepciones = _leer_excepciones(ruta_excepciones)
+
+    palabras = set()
+    if Path(ruta_lista).exists():
+        palabras.update(p.strip().lower() for p in
+                        Path(ruta_lista).read_text(encoding='utf-8').split())
+    palabras.update(_palabras_especiales())
+    palabras.update(excepciones)
+    palabras = sorted(p for p in palabras if p and len(p) <= MAX_LONGITUD)
+
+    silabas = array('B')
+    tonicas = array('B')
+    cortes = array('I')
+    for palabra in palabras:
+        puntos, tonica = excepciones.get(palabra) or silabear(palabra)
+        mascara = 0
+        for posicion in puntos:
+            mascara |= 1 << posicion
+        silabas.append(len(puntos) + 1)
+        tonicas.append(tonica)
+        cortes.append(mascara)
+
+    # Tabla hash (carga <= 0,5) con el identificador de cada palabra
+    capacidad = 1
+    while capacidad < 2 * len(palabras):
+        capacidad <<= 1
+    tabla = array('I', [_VACIO]) * capacidad
+    mascara_tabla = capacidad - 1
+    for id_palabra, palabra in enumerate(palabras):
+        posicion = zlib.crc32(palabra.encode('utf-8')) & mascara_tabla
+        while tabla[posicion] != _VACIO:
+            posicion = (posicion + 1) & mascara_tabla
+        tabla[posicion] = id_palabra
+
+    bloque, desplazamientos = bloque_textos(palabras)
+    escribir_tabla(ruta_lexico, {
+        'palabras': bloque,
+        'desplazamientos': desplazamientos,
+        'silabas': silabas,
+        'tonicas': tonicas,
+        'cortes': cortes,
+        'hash': tabla,
+    }, meta={
+        'version': VERSION_LEXICO,
+        'palabras': len(palabras),
+        'capacidad': capacidad,
+        'huella': _huella(ruta_lista, ruta_excepciones),
+        'fechas': _fechas(ruta_lista, ruta_excepciones),
+    })
+    logger.info(f"Léxico silábico: {len(palabras)} palabras en "
+                f"{time.perf_counter() - inicio:.1f} s -> {ruta_lexico}")
+    return ruta_lexico
+
+
+# --- Consulta ---------------------------------------------------------------
+
+class LexicoSilabico:
+    """Consultas sobre el léxico mapeado en memoria"""
+
+    def __init__(self, ruta_lexico=RUTA_LEXICO, ruta_lista=RUTA_LISTA,
+                 ruta_excepciones=RUTA_EXCEPCIONES, reconstruir=True):
+        self.ruta_lexico = Path(ruta_lexico)
+        self._fuentes = (Path(ruta_lista), Path(ruta_excepciones))
+        if reconstruir and self._necesita_construir():
+            construir_lexico(ruta_lista, ruta_excepciones, self.ruta_lexico)
+
+        self.tabla = TablaBinaria(self.ruta_lexico)
+        self.total_palabras = self.tabla.meta['palabras']
+        self._mascara = self.tabla.meta['capacidad'] - 1
+        self._palabras = self.tabla.seccion('palabras')
+        self._desplazamientos = self.tabla.seccion('desplazamientos')
+        self._silabas = self.tabla.seccion('silabas')
+        self._tonicas = self.tabla.seccion('tonicas')
+        self._cortes = self.tabla.seccion('cortes')
+        self._hash = self.tabla.seccion('hash')
+
+    def _necesita_construir(self):
+        if not self.ruta_lexico.exists():
+            return True
+        try:
+            tabla = TablaBinaria(self.ruta_lexico)
+            meta = tabla.meta
+            tabla.cerrar()
+        except (ValueError, OSError, KeyError):
+            return True
+        if meta.get('version') != VERSION_LEXICO:
+            return True
+        if _fechas(*self._fuentes) == meta.get('fechas'):
+            return False
+        # Fecha distinta (p. ej. tras un checkout): comprobar el contenido
+        return _huella(*self._fuentes) != meta.get('huella')
+
+    def __len__(self):
+        return self.total_palabras
+
+    def __contains__(self, palabra):
+        return self._id(palabra) is not None
+
+    def __iter__(self):
+        """Palabras del léxico, en orden alfabético"""
+        crudo = bytes(self._palabras)
+        desplazamientos = self._desplazamientos
+        for id_palabra in range(self.total_palabras):
+            yield crudo[desplazamientos[id_palabra]:desplazamientos[id_palabra + 1]].decode('utf-8')
+    def _id(self, palabra):
+        codificada = palabra.encode('utf-8')
+        posicion = zlib.crc32(codificada) & self._mascara
+        tabla = self._hash
+        desplazamientos = self._desplazamientos
+        while True:
+            id_palabra = tabla[posicion]
+            if id_palabra == _VACIO:
+                return None
+            inicio = desplazamientos[id_palabra]
+            fin = desplazamientos[id_palabra + 1]
+            if fin - inicio == len(codificada) and self._palabras[inicio:fin] == codificada:
+                return id_palabra
+            posicion = (posicion + 1) & self._mascara
+
+    def silabas(self, palabra):
+        """Número de sílabas o None si la palabra no está en el léxico"""
+        id_palabra = self._id(palabra)
+        return None if id_palabra is None else self._silabas[id_palabra]
+
+    def dividir(self, palabra):
+        """Lista de sílabas o None si la palabra no está en el léxico"""
+        id_palabra = self._id(palabra)
+        if id_palabra is None:
+            return None
+        mascara = self._cortes[id_palabra]
+        silabas = []
+        inicio = 0
+        for posicion in range(1, len(palabra)):
+            if mascara >> posicion & 1:
+                silabas.append(palabra[inicio:posicion])
+                inicio = posicion
+        silabas.append(palabra[inicio:])
+        return silabas
+
+    def tonica(self, palabra):
+        """Índice (desde 0) de la sílaba tónica o None"""
+        id_palabra = self._id(palabra)
+        return None if id_palabra is None else self._tonicas[id_palabra]
+
+    def acentuacion(self, palabra):
+        """'aguda', 'llana' o 'esdrujula' (como ContadorSilabas) o None"""
+        id_palabra = self._id(palabra)
+        if id_palabra is None:
+            return None
+        desde_final = self._silabas[id_palabra] - self._tonicas[id_palabra]
+        return ACENTUACIONES[min(desde_final, 3) - 1]
+
+    def cerrar(self):
+        self._palabras = self._desplazamientos = self._silabas = None
+        self._tonicas = self._cortes = self._hash = None
+        self.tabla.cerrar()
+
+
+_lexico = None
+_lexico_fallido = False
+
+
+def obtener_lexico():
+    """Léxico compartido del proceso (None si no se pudo abrir ni construir)"""
+    global _lexico, _lexico_fallido
+    if _lexico is None and not _lexico_fallido:
+        try:
+            _lexico = LexicoSilabico()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Léxico silábico no disponible: {e}")
+            _lexico_fallido = True
+    return _lexico
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Léxico silábico precompilado')
+    parser.add_argument('palabras', nargs='*')
+    parser.add_argument('--construir', action='store_true', help='Regenera el léxico')
+    args = parser.parse_args(argv)
+
+    if args.construir:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        construir_lexico()
+
+    if args.palabras:
+        inicio = time.perf_counter()
+        lexico = LexicoSilabico()
+        print(f"{len(lexico)} palabras; carga {(time.perf_counter() - inicio) * 1000:.1f} ms")
+        for palabra in args.palabras:
+            palabra = palabra.lower()
+            division = lexico.dividir(palabra)
+            if division is None:
+                cortes, tonica = silabear(palabra)
+                division = [palabra[i:j] for i, j in zip([0] + cortes, cortes + [len(palabra)])]
+                origen = 'reglas'
+            else:
+                tonica = lexico.tonica(palabra)
+                origen = 'léxico'
+            marcada = '-'.join(s.upper() if i == tonica else s for i, s in enumerate(division))
+            print(f"  {palabra}: {marcada} ({len(division)} "
+                  f"{'sílaba' if len(division) == 1 else 'sílabas'}, {origen})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
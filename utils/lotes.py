@@ -0,0 +1,122 @@
+"""
+Micro-lotes para peticiones pequeñas y concurrentes
+
+Agrupa las peticiones que llegan en una ventana de pocos milisegundos y
+las procesa con una sola llamada (por ejemplo, un único viaje al pool de
+procesos para contar las sílabas de muchos versos). Cada llamante recibe
+su propio resultado. Registra el histograma de tamaños de lote.
+"""
+
+import asyncio
+import time
+from collections import Counter
+
+
+class AgrupadorLotes:
+    """Acumula elementos y los procesa en lotes de tamaño/espera acotados"""
+
+    def __init__(self, procesar_lote, max_lote=64, max_espera_ms=5.0):
+        """
+        Args:
+            procesar_lote: corrutina que recibe una lista de elementos y
+                devuelve una lista de resultados en el mismo orden
+            max_lote (int): tamaño máximo de cada lote
+            max_espera_ms (float): espera máxima desde el primer elemento
+        """
+        self.procesar_lote = procesar_lote
+        self.max_lote = max(1, int(max_lote))
+        self.max_espera = max(0.0, max_espera_ms) / 1000
+
+        self._pendientes = []
+        self._temporizador = None
+        # El bucle solo guarda referencias débiles a las tareas: sin esta,
+        # un lote en curso podría recogerse y sus llamantes no responderse
+        self._tareas = set()
+
+        self.histograma = Counter()
+        self.total_lotes = 0
+        self.total_elementos = 0
+        self.tiempo_procesado = 0.0
+
+    async def enviar(self, elemento):
+        """Añade un elemento al lote actual y espera su resultado"""
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendientes.append((elemento, futuro))
+
+        if len(self._pendientes) >= self.max_lote:
+            self._vaciar()
+        elif self._temporizador is None:
+            self._temporizador = asyncio.get_running_loop().call_later(self.max_espera, self._vaciar)
+
+        return await futuro
+
+    def _vaciar(self):
+        """Cierra el lote actual y lanza su procesamiento"""
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+
+        lote, self._pendientes = self._pendientes[:self.max_lote], self._pendientes[self.max_lote:]
+        if lote:
+            tarea = asyncio.ensure_future(self._procesar(lote))
+            self._tareas.add(tarea)
+            tarea.add_done_callback(self._tareas.discard)
+
+        # Si quedaron elementos (ráfaga mayor que max_lote), programar el siguiente lote
+        if self._pendientes:
+            self._temporizador = asyncio.get_running_loop().call_later(self.max_espera, self._vaciar)
+
+    async def cerrar(self):
+        """Procesa lo pendiente y espera a los lotes en curso (al apagar el servicio)"""
+        while self._pendientes:
+            self._vaciar()
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        if self._tareas:
+            await asyncio.gather(*self._tareas, return_exceptions=True)
+
+    async def _procesar(self, lote):
+        elementos = [elemento for elemento, _ in lote]
+        inicio = time.perf_counter()
+        try:
+            resultados = await self.procesar_lote(elementos)
+            if len(resultados) != len(lote):
+                raise RuntimeError(f"El lote devolvió {len(resultados)} resultados para {len(lote)} elementos")
+        except Exception as e:
+            for _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+        finally:
+            self.tiempo_procesado += time.perf_counter() - inicio
+            self.histograma[len(lote)] += 1
+            self.total_lotes += 1
+            self.total_elementos += len(lote)
+
+        for (_, futuro), resultado in zip(lote, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    def histograma_agrupado(self):
+        """Histograma por intervalos de potencias de dos: {'1': n, '2-3': n, '4-7': n...}"""
+        cubetas = Counter()
+        for tamano, veces in self.histograma.items():
+            inferior = 1 << (tamano.bit_length() - 1)
+            superior = (inferior << 1) - 1
+            etiqueta = str(inferior) if inferior == superior else f"{inferior}-{superior}"
+            cubetas[(inferior, etiqueta)] += veces
+        return {etiqueta: veces for (_, etiqueta), veces in sorted(cubetas.items())}
+
+    def estadisticas(self):
+        """Resumen de los lotes procesados"""
+        return {
+            'max_lote': self.max_lote,
+            'max_espera_ms': self.max_espera * 1000,
+            'total_lotes': self.total_lotes,
+            'total_elementos': self.total_elementos,
+            'tamano_medio': self.total_elementos / self.total_lotes if self.total_lotes else 0.0,
+            'pendientes': len(self._pendientes),
+            'tiempo_procesado_s': self.tiempo_procesado,
+            'histograma': self.histograma_agrupado(),
+        }
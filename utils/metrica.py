@@ -1,6 +1,24 @@
 import re
-from collections import Counter
+import sys
+from collections import Counter, OrderedDict
 from .silabas import ContadorSilabas
+from .escansion import MotorEscansion
+from .perfilado import medir
+from .poema import analizar_poema
+from .resultados import AnalisisVerso, AnalisisEstrofa
+
+try:
+    from config_py import METRIC_ANALYSIS_CONFIG
+except ImportError:
+    METRIC_ANALYSIS_CONFIG = {'meter_classification': {}}
+
+# Terminaciones frecuentes de esdrújulas (sustituyen a los re.match por sufijo)
+SUFIJOS_ESDRUJULAS = ('ico', 'ica', 'ulo', 'ula', 'ido', 'ida')
+
+# Vocal acentuada seguida de dos vocales átonas, la última al final
+PATRON_ESDRUJULA_TILDE = re.compile(r'.*[áéíóú].*[aeiou].*[aeiou]$')
+
+PUNTUACION_PALABRA = '.,!?;:"()[]'
 
 class AnalizadorMetrico:
     def __init__(self):
@@ -31,9 +49,40 @@ class AnalizadorMetrico:
             'anapéstico': [3, 6, 9, 12],  # Átona-átona-tónica
             'anfíbraco': [2, 5, 8, 11]    # Átona-tónica-átona
         }
+        
+        # Tabla precalculada: nombre del metro por número de sílabas
+        config_metros = METRIC_ANALYSIS_CONFIG.get('meter_classification', {})
+        self.max_silabas_tabla = config_metros.get('max_table_syllables', 32)
+        self._tabla_metros = [
+            sys.intern(self._nombre_metro(silabas))
+            for silabas in range(self.max_silabas_tabla + 1)
+        ]
+        
+        # Memo por palabra: (sílabas, desplazamiento del acento dentro de la palabra).
+        # Delante, el mismo memo por token tal como aparece en el verso, para
+        # no limpiar (una expresión regular) las palabras ya vistas
+        self.max_cache_acentos = config_metros.get('stress_cache_max', 50000)
+        self._cache_acentos = {}
+        self._cache_acentos_tokens = {}
+        
+        # Escansión con licencias para los versos que no dan el metro dominante
+        self.motor_escansion = None
+        if METRIC_ANALYSIS_CONFIG.get('scansion', {}).get('enabled', True):
+            self.motor_escansion = MotorEscansion(self.contador_silabas)
+        
+        # Análisis por estrofa (LRU por texto de sus versos)
+        self.max_cache_estrofas = METRIC_ANALYSIS_CONFIG.get('stanzas', {}).get('cache_max', 1024)
+        self._cache_estrofas = OrderedDict()
+        self._detector_rimas = None
     
     def clasificar_metro(self, silabas):
         """Clasifica el metro según el número de sílabas"""
+        if 0 <= silabas <= self.max_silabas_tabla:
+            return self._tabla_metros[silabas]
+        return self._nombre_metro(silabas)
+    
+    def _nombre_metro(self, silabas):
+        """Calcula el nombre del metro (usado para construir la tabla)"""
         if silabas in self.metros_clasicos:
             return self.metros_clasicos[silabas]
         elif silabas < 4:
@@ -86,15 +135,7 @@ class AnalizadorMetrico:
         posicion = 0
         
         for palabra in palabras:
-            silabas_palabra = self.contador_silabas.contar_silabas(palabra)
-            
-            # Detectar acento principal de la palabra
-            if self._es_aguda(palabra):
-                acento_palabra = silabas_palabra - 1
-            elif self._es_esdrujula(palabra):
-                acento_palabra = silabas_palabra - 3
-            else:  # Llana
-                acento_palabra = silabas_palabra - 2
+            silabas_palabra, acento_palabra = self._acento_palabra(palabra)
             
             if acento_palabra >= 0:
                 acentos.append(posicion + acento_palabra)
@@ -103,15 +144,19 @@ class AnalizadorMetrico:
         
         return acentos
     
-    def analizar_ritmo(self, versos):
-        """Analiza el patrón rítmico de los versos"""
+    def analizar_ritmo(self, versos, acentos_versos=None):
+        """
+        Analiza el patrón rítmico de los versos
+        
+        acentos_versos: acentos ya detectados de cada verso (p. ej. los del
+        análisis por estrofas); si no se dan se calculan aquí
+        """
         if not versos:
             return {"tipo": "Indeterminado", "regularidad": "Sin datos", "acentos_comunes": []}
         
-        todos_acentos = []
-        for verso in versos:
-            acentos = self.detectar_acentos(verso)
-            todos_acentos.extend(acentos)
+        if acentos_versos is None:
+            acentos_versos = [self.detectar_acentos(verso) for verso in versos]
+        todos_acentos = [acento for acentos in acentos_versos for acento in acentos]
         
         if not todos_acentos:
             return {"tipo": "Indeterminado", "regularidad": "Sin acentos detectados", "acentos_comunes": []}
@@ -125,7 +170,8 @@ class AnalizadorMetrico:
         
         # Calcular regularidad rítmica
         total_versos = len(versos)
-        versos_con_patron = sum(1 for verso in versos if self._verso_sigue_patron(verso, ritmo_detectado))
+        versos_con_patron = sum(1 for acentos in acentos_versos
+                                if self._acentos_siguen_patron(acentos, ritmo_detectado))
         regularidad_ritmica = f"{(versos_con_patron/total_versos)*100:.1f}% de los versos"
         
         return {
@@ -134,11 +180,44 @@ class AnalizadorMetrico:
             "acentos_comunes": acentos_comunes[:3]  # Top 3
         }
     
+    def _acento_palabra(self, palabra):
+        """Sílabas y posición del acento de una palabra (memoizado por palabra limpia)"""
+        entrada = self._cache_acentos_tokens.get(palabra)
+        if entrada is not None:
+            return entrada
+        if len(self._cache_acentos_tokens) >= self.max_cache_acentos:
+            self._cache_acentos_tokens.clear()
+        # 'mar', 'mar,' y 'Mar.' comparten entrada
+        entrada = self._cache_acentos_tokens[palabra] = self._acento_palabra_limpia(
+            self.contador_silabas.limpiar_palabra(palabra))
+        return entrada
+    
+    def _acento_palabra_limpia(self, palabra):
+        entrada = self._cache_acentos.get(palabra)
+        if entrada is not None:
+            return entrada
+        
+        silabas_palabra = self.contador_silabas.contar_silabas(palabra)
+        
+        # Detectar acento principal de la palabra
+        if self._es_aguda(palabra):
+            acento_palabra = silabas_palabra - 1
+        elif self._es_esdrujula(palabra):
+            acento_palabra = silabas_palabra - 3
+        else:  # Llana
+            acento_palabra = silabas_palabra - 2
+        
+        if len(self._cache_acentos) >= self.max_cache_acentos:
+            self._cache_acentos.clear()
+        entrada = (silabas_palabra, acento_palabra)
+        self._cache_acentos[palabra] = entrada
+        return entrada
+    
     def _es_aguda(self, palabra):
         """Determina si una palabra es aguda"""
         # Simplificado: palabras que terminan en vocal, n, s son llanas por defecto
         # Las que terminan en consonante (excepto n,s) son agudas
-        palabra = palabra.lower().strip('.,!?;:"()[]')
+        palabra = palabra.lower().strip(PUNTUACION_PALABRA)
         if not palabra:
             return False
         
@@ -151,19 +230,12 @@ class AnalizadorMetrico:
         """Detecta palabras esdrújulas por patrones comunes"""
         palabra = palabra.lower()
         
-        # Patrones comunes de esdrújulas
-        patrones_esdrujulas = [
-            r'.*[áéíóú].*[aeiou].*[aeiou]$',  # Vocal acentuada seguida de dos átonas
-            r'.*ico$', r'.*ica$',  # -ico, -ica
-            r'.*ulo$', r'.*ula$',  # -ulo, -ula
-            r'.*ido$', r'.*ida$'   # -ido, -ida (algunos casos)
-        ]
+        # -ico, -ica, -ulo, -ula, -ido, -ida (algunos casos)
+        if palabra.endswith(SUFIJOS_ESDRUJULAS):
+            return True
         
-        for patron in patrones_esdrujulas:
-            if re.match(patron, palabra):
-                return True
-        
-        return False
+        # Vocal acentuada seguida de dos átonas
+        return PATRON_ESDRUJULA_TILDE.match(palabra) is not None
     
     def _detectar_patron_ritmico(self, acentos_comunes):
         """Detecta el patrón rítmico basado en acentos comunes"""
@@ -187,11 +259,13 @@ class AnalizadorMetrico:
     
     def _verso_sigue_patron(self, verso, patron):
         """Verifica si un verso sigue un patrón rítmico específico"""
+        return self._acentos_siguen_patron(self.detectar_acentos(verso), patron)
+    
+    def _acentos_siguen_patron(self, acentos_verso, patron):
+        """Como _verso_sigue_patron, con los acentos del verso ya detectados"""
         if "libre" in patron.lower() or "indeterminado" in patron.lower():
             return True  # Todos los versos "siguen" un patrón libre
         
-        acentos_verso = self.detectar_acentos(verso)
-        
         # Simplificado: si tiene al menos 2 acentos en posiciones esperadas
         for nombre_patron, posiciones in self.patrones_ritmo.items():
             if nombre_patron in patron.lower():
@@ -200,46 +274,150 @@ class AnalizadorMetrico:
         
         return False
     
-    def analisis_completo(self, texto):
-        """Realiza un análisis métrico completo del texto"""
-        versos = [v.strip() for v in texto.split('\n') if v.strip()]
+    def ajustar_con_licencias(self, versos, lista_silabas):
+        """Versos fuera del metro más común que lo alcanzan con licencias"""
+        if not lista_silabas or self.motor_escansion is None:
+            return None
         
-        if not versos:
+        objetivo = Counter(lista_silabas).most_common(1)[0][0]
+        ajustables = []
+        irregulares = []
+        for numero, (verso, silabas) in enumerate(zip(versos, lista_silabas), 1):
+            if silabas == objetivo:
+                continue
+            alternativa = self.motor_escansion.escandir(verso, objetivo)
+            if alternativa is None:
+                irregulares.append(numero)
+            else:
+                ajustables.append({
+                    'numero': numero,
+                    'silabas': silabas,
+                    'licencias': [list(l) for l in alternativa.licencias],
+                })
+        
+        return {'objetivo': objetivo, 'ajustables': ajustables, 'irregulares': irregulares}
+    
+    @property
+    def detector_rimas(self):
+        """DetectorRimas para el esquema de cada estrofa (se crea al usarlo)"""
+        if self._detector_rimas is None:
+            from .rimas import DetectorRimas
+            self._detector_rimas = DetectorRimas()
+        return self._detector_rimas
+    
+    def analizar_estrofa(self, versos):
+        """
+        Sílabas, acentos, metro dominante y esquema de rima de una estrofa
+        
+        El resultado se cachea por los textos de los versos, de modo que al
+        reanalizar un poema solo se calculan las estrofas que cambiaron.
+        """
+        clave = tuple(versos)
+        analisis = self._cache_estrofas.get(clave)
+        if analisis is not None:
+            self._cache_estrofas.move_to_end(clave)
+            return analisis
+        
+        silabas = [self.contador_silabas.contar_silabas_verso(v) for v in clave]
+        esquema = self.detector_rimas.detectar_esquema(list(clave))
+        analisis = AnalisisEstrofa(
+            clave,
+            silabas,
+            [self.detectar_acentos(v) for v in clave],
+            self.detectar_metro_dominante(silabas),
+            esquema,
+            self.detector_rimas.clasificar_rima(esquema),
+        )
+        self.recordar_estrofas([analisis])
+        return analisis
+    
+    def recordar_estrofas(self, analisis_estrofas):
+        """Añade a la caché análisis de estrofas calculados en otro proceso"""
+        for analisis in analisis_estrofas:
+            self._cache_estrofas[analisis.versos] = analisis
+            self._cache_estrofas.move_to_end(analisis.versos)
+            if len(self._cache_estrofas) > self.max_cache_estrofas:
+                self._cache_estrofas.popitem(last=False)
+    
+    def analizar_estrofas(self, texto, ejecutor=None):
+        """
+        Analiza cada estrofa del poema por separado
+        
+        Args:
+            texto: texto del poema o Poema ya construido
+            ejecutor: concurrent.futures.Executor opcional; las estrofas que
+                no están en caché se reparten entre sus trabajadores
+        
+        Returns:
+            list[AnalisisEstrofa], en el orden de las estrofas
+        """
+        poema = analizar_poema(texto)
+        claves = [estrofa.textos for estrofa in poema.estrofas]
+        
+        if ejecutor is not None:
+            pendientes = list(dict.fromkeys(c for c in claves if c not in self._cache_estrofas))
+            if len(pendientes) > 1:
+                from .tareas import tarea_analizar_estrofa
+                self.recordar_estrofas(ejecutor.map(tarea_analizar_estrofa, pendientes))
+        
+        return [self.analizar_estrofa(clave) for clave in claves]
+    
+    @medir('AnalizadorMetrico.analisis_completo')
+    def analisis_completo(self, texto, ejecutor=None):
+        """
+        Realiza un análisis métrico completo del texto
+        
+        Args:
+            texto: texto del poema o Poema ya construido
+            ejecutor: Executor opcional para analizar las estrofas en paralelo
+        """
+        poema = analizar_poema(texto)
+        
+        if not poema:
             return {"error": "No se encontraron versos válidos"}
         
-        # Análisis por verso
+        # Análisis por estrofa (cacheado) y, a partir de él, por verso
+        analisis_estrofas = self.analizar_estrofas(poema, ejecutor)
+        versos = poema.textos_versos
         analisis_versos = []
         silabas_total = []
+        acentos_total = []
+        estrofas = []
         
-        for i, verso in enumerate(versos, 1):
-            silabas = self.contador_silabas.contar_silabas_verso(verso)
-            metro = self.clasificar_metro(silabas)
-            acentos = self.detectar_acentos(verso)
+        for estrofa, analisis in zip(poema.estrofas, analisis_estrofas):
+            for verso, silabas, acentos in zip(estrofa.versos, analisis.silabas, analisis.acentos):
+                metro = self.clasificar_metro(silabas)
+                analisis_versos.append(AnalisisVerso(verso.numero, verso.texto, silabas, metro, acentos))
+                silabas_total.append(silabas)
+                acentos_total.append(acentos)
             
-            analisis_versos.append({
-                'numero': i,
-                'texto': verso,
-                'silabas': silabas,
-                'metro': metro,
-                'acentos': acentos
+            estrofas.append({
+                'numero': estrofa.numero,
+                'primer_verso': estrofa.versos[0].numero,
+                'total_versos': len(estrofa),
+                'metro_dominante': analisis.metro_dominante,
+                'esquema_rimas': ''.join(analisis.esquema_rimas),
+                'tipo_rima': analisis.tipo_rima,
             })
-            
-            silabas_total.append(silabas)
         
         # Análisis global
         metro_dominante = self.detectar_metro_dominante(silabas_total)
         regularidad = self.calcular_regularidad(silabas_total)
-        ritmo = self.analizar_ritmo(versos)
+        ritmo = self.analizar_ritmo(versos, acentos_total)
+        escansion = self.ajustar_con_licencias(versos, silabas_total)
         
         return {
             'versos_analizados': analisis_versos,
+            'estrofas': estrofas,
             'metro_dominante': metro_dominante,
             'regularidad_metrica': regularidad,
             'analisis_ritmico': ritmo,
+            'escansion': escansion,
             'estadisticas': {
                 'total_versos': len(versos),
+                'total_estrofas': len(estrofas),
                 'total_silabas': sum(silabas_total),
                 'promedio_silabas': sum(silabas_total) / len(silabas_total),
                 'metro_mas_comun': Counter(silabas_total).most_common(1)[0] if silabas_total else None
             }
-        }
\ No newline at end of file
+        }
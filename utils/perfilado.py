@@ -0,0 +1,232 @@
+"""
+Instrumentación ligera de los caminos críticos
+
+Decoradores y gestores de contexto que registran número de llamadas,
+tiempo acumulado y percentiles (p50/p95/p99) por operación. Cuando el
+perfilado está desactivado (DEBUG_CONFIG['profiling'] = False) el coste
+es una única comprobación booleana por llamada.
+
+Las métricas son del proceso que las registra. Las tareas que se ejecutan
+en un pool de procesos se lanzan con ejecutar_medida(), que devuelve con
+el resultado lo registrado en el trabajador; el proceso principal lo
+suma a las suyas con fusionar().
+"""
+
+import cProfile
+import functools
+import io
+import math
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from config_py import DEBUG_CONFIG, LOGS_DIR
+except ImportError:
+    DEBUG_CONFIG = {'profiling': False}
+    LOGS_DIR = Path(__file__).parent.parent / 'logs'
+
+# Estado global: se lee en cada llamada instrumentada, por eso es un bool simple
+_activo = bool(DEBUG_CONFIG.get('profiling', False))
+_volcar_pstats = bool(DEBUG_CONFIG.get('profiling_dump_pstats', False))
+_max_muestras = int(DEBUG_CONFIG.get('profiling_samples', 2048))
+
+_lock = threading.Lock()
+_metricas = {}
+
+
+class _MetricaOperacion:
+    """Acumulador de tiempos de una operación"""
+
+    __slots__ = ('llamadas', 'total', 'maximo', 'muestras')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.muestras = deque(maxlen=_max_muestras)
+
+    def registrar(self, duracion):
+        self.llamadas += 1
+        self.total += duracion
+        if duracion > self.maximo:
+            self.maximo = duracion
+        self.muestras.append(duracion)
+
+
+def activar(valor=True, volcar_pstats=None):
+    """Activa o desactiva el perfilado en caliente"""
+    global _activo, _volcar_pstats
+    _activo = bool(valor)
+    DEBUG_CONFIG['profiling'] = _activo
+    if volcar_pstats is not None:
+        _volcar_pstats = bool(volcar_pstats)
+        DEBUG_CONFIG['profiling_dump_pstats'] = _volcar_pstats
+
+
+def esta_activo():
+    """Indica si el perfilado está activo"""
+    return _activo
+
+
+def registrar(nombre, duracion):
+    """Registra manualmente una duración (en segundos) para una operación"""
+    with _lock:
+        metrica = _metricas.get(nombre)
+        if metrica is None:
+            metrica = _metricas[nombre] = _MetricaOperacion()
+        metrica.registrar(duracion)
+
+
+def medir(nombre=None):
+    """Decorador que cronometra la función cuando el perfilado está activo"""
+    def decorador(funcion):
+        etiqueta = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar(etiqueta, time.perf_counter() - inicio)
+
+        return envoltura
+
+    return decorador
+
+
+@contextmanager
+def medir_bloque(nombre):
+    """Gestor de contexto equivalente a @medir para bloques de código"""
+    if not _activo:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(nombre, time.perf_counter() - inicio)
+
+
+def percentil(ordenadas, p):
+    """Percentil de una lista ordenada por el método del rango más cercano"""
+    if not ordenadas:
+        return 0.0
+    indice = max(0, min(len(ordenadas) - 1, math.ceil(p / 100 * len(ordenadas)) - 1))
+    return ordenadas[indice]
+
+
+def obtener_metricas():
+    """
+    Devuelve las métricas recogidas por operación
+
+    Returns:
+        dict: {operación: {llamadas, total_s, media_ms, p50_ms, p95_ms, p99_ms, max_ms}}
+    """
+    with _lock:
+        copia = {n: (m.llamadas, m.total, m.maximo, sorted(m.muestras))
+                 for n, m in _metricas.items()}
+
+    resultado = {}
+    for nombre, (llamadas, total, maximo, ordenadas) in sorted(copia.items()):
+        resultado[nombre] = {
+            'llamadas': llamadas,
+            'total_s': total,
+            'media_ms': (total / llamadas) * 1000 if llamadas else 0.0,
+            'p50_ms': percentil(ordenadas, 50) * 1000,
+            'p95_ms': percentil(ordenadas, 95) * 1000,
+            'p99_ms': percentil(ordenadas, 99) * 1000,
+            'max_ms': maximo * 1000,
+        }
+    return resultado
+
+
+def reiniciar():
+    """Borra todas las métricas acumuladas"""
+    with _lock:
+        _metricas.clear()
+
+
+def extraer():
+    """
+    Métricas registradas desde la última extracción, que se borran
+
+    Returns:
+        dict: {operación: (llamadas, total, maximo, muestras)}, serializable
+    """
+    with _lock:
+        delta = {n: (m.llamadas, m.total, m.maximo, list(m.muestras))
+                 for n, m in _metricas.items()}
+        _metricas.clear()
+    return delta
+
+
+def fusionar(delta):
+    """Suma a las métricas de este proceso las extraídas en otro"""
+    with _lock:
+        for nombre, (llamadas, total, maximo, muestras) in delta.items():
+            metrica = _metricas.get(nombre)
+            if metrica is None:
+                metrica = _metricas[nombre] = _MetricaOperacion()
+            metrica.llamadas += llamadas
+            metrica.total += total
+            metrica.maximo = max(metrica.maximo, maximo)
+            metrica.muestras.extend(muestras)
+
+
+def ejecutar_medida(funcion, *args):
+    """
+    Ejecuta una tarea con el perfilado activo (en un proceso trabajador)
+
+    Returns:
+        (resultado, métricas registradas durante la tarea) para fusionar()
+    """
+    global _activo
+    previo, _activo = _activo, True
+    extraer()
+    try:
+        return funcion(*args), extraer()
+    finally:
+        _activo = previo
+
+
+@contextmanager
+def perfilar_peticion(nombre, directorio=None):
+    """
+    Cronometra una petición completa y, si está habilitado el volcado,
+    guarda un perfil cProfile en logs/perfiles/<nombre>_<fecha>.prof
+    """
+    if not _activo:
+        yield None
+        return
+
+    perfil = cProfile.Profile() if _volcar_pstats else None
+    inicio = time.perf_counter()
+    if perfil:
+        perfil.enable()
+    try:
+        yield perfil
+    finally:
+        if perfil:
+            perfil.disable()
+        registrar(f"peticion:{nombre}", time.perf_counter() - inicio)
+
+        if perfil:
+            destino = Path(directorio) if directorio else LOGS_DIR / 'perfiles'
+            destino.mkdir(parents=True, exist_ok=True)
+            marca = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            perfil.dump_stats(str(destino / f"{nombre}_{marca}.prof"))
+
+
+def resumen_pstats(perfil, limite=20, orden='cumulative'):
+    """Texto con las funciones más costosas de un perfil cProfile"""
+    salida = io.StringIO()
+    pstats.Stats(perfil, stream=salida).sort_stats(orden).print_stats(limite)
+    return salida.getvalue()
@@ -0,0 +1,316 @@
+"""
+Planificador de síntesis de voz compartido por todo el proceso
+
+Cada sesión de la aplicación tiene su propio SistemaVoz, pero el motor de
+voz (pyttsx3 reutiliza un motor por driver), los altavoces y la CPU son
+del proceso. Sin control, cada recitado lanzaba su propio hilo y el
+respaldo con espeak bloqueaba la petición de Streamlit mientras hablaba.
+
+PlanificadorVoz ejecuta los trabajos de síntesis con un número limitado
+de hilos (PERFORMANCE_CONFIG['max_concurrent_voice_synthesis']):
+
+- Cola justa entre sesiones: cada sesión tiene su propia cola y los
+  huecos libres se reparten por turnos (round-robin) entre las sesiones
+  con trabajos pendientes; una sesión nunca ocupa más de un hueco.
+- Tiempo máximo en cola (el trabajo caduca sin ejecutarse) y tiempo máximo
+  de síntesis (el trabajo se cancela).
+- Cancelación cooperativa: cancelar() marca el trabajo y llama a su
+  función al_cancelar (p. ej. detener el motor o terminar el proceso).
+- Métricas: longitud de la cola, trabajos en curso y tiempos de espera
+  (media, p95, máximo).
+"""
+
+import itertools
+import logging
+import subprocess
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .perfilado import percentil
+
+try:
+    from config_py import PERFORMANCE_CONFIG
+except ImportError:
+    PERFORMANCE_CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+# Estados de un trabajo
+EN_COLA = 'en_cola'
+EN_CURSO = 'en_curso'
+COMPLETADO = 'completado'
+CANCELADO = 'cancelado'
+CADUCADO = 'caducado'
+ERROR = 'error'
+
+_FINALES = (COMPLETADO, CANCELADO, CADUCADO, ERROR)
+
+
+class ColaVozLlena(RuntimeError):
+    """La cola de síntesis no admite más trabajos"""
+
+
+class TrabajoVoz:
+    """Trabajo de síntesis encolado en el planificador"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, sesion, funcion, args, al_cancelar=None, timeout=None):
+        self.id = next(self._ids)
+        self.sesion = sesion
+        self.funcion = funcion
+        self.args = args
+        self.al_cancelar = al_cancelar
+        self.timeout = timeout
+        self.estado = EN_COLA
+        self.resultado = None
+        self.error = None
+        self.encolado = time.monotonic()
+        self.inicio = None
+        self.fin = None
+        self._cancelado = threading.Event()
+        self._terminado = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def detenido(self):
+        """Para que la función del trabajo compruebe si debe abandonar"""
+        return self._cancelado.is_set()
+
+    @property
+    def espera(self):
+        """Segundos en cola (hasta ahora si aún no ha empezado)"""
+        return (self.inicio or time.monotonic()) - self.encolado
+
+    def cancelar(self):
+        """Cancela el trabajo; si ya se está ejecutando, llama a al_cancelar"""
+        if self._terminado.is_set() or self._cancelado.is_set():
+            return False
+        self._cancelado.set()
+        if self.estado == EN_CURSO and self.al_cancelar:
+            try:
+                self.al_cancelar()
+            except Exception as e:
+                logger.warning(f"Error cancelando síntesis: {e}")
+        return True
+
+    def esperar(self, timeout=None):
+        """Espera a que termine; devuelve si terminó"""
+        return self._terminado.wait(timeout)
+
+    def _terminar(self, estado):
+        self.estado = estado
+        self.fin = time.monotonic()
+        self._terminado.set()
+
+    def __repr__(self):
+        return f"TrabajoVoz({self.id}, sesion={self.sesion!r}, estado={self.estado})"
+
+
+class PlanificadorVoz:
+    """Ejecuta la síntesis de voz con concurrencia limitada y cola justa por sesión"""
+
+    def __init__(self, max_concurrentes=None, timeout_cola=None, timeout_sintesis=None,
+                 max_en_cola=None):
+        """
+        Args:
+            max_concurrentes: síntesis simultáneas (hilos trabajadores)
+            timeout_cola: segundos que un trabajo puede esperar antes de caducar
+            timeout_sintesis: segundos de ejecución antes de cancelarlo (None: sin límite)
+            max_en_cola: trabajos pendientes admitidos en total
+        """
+        self.max_concurrentes = max(1, int(
+            max_concurrentes or PERFORMANCE_CONFIG.get('max_concurrent_voice_synthesis', 1)))
+        self.timeout_cola = (timeout_cola if timeout_cola is not None
+                             else PERFORMANCE_CONFIG.get('voice_queue_timeout_s', 30))
+        self.timeout_sintesis = (timeout_sintesis if timeout_sintesis is not None
+                                 else PERFORMANCE_CONFIG.get('voice_synthesis_timeout_s', 300))
+        self.max_en_cola = max_en_cola or PERFORMANCE_CONFIG.get('voice_queue_max', 64)
+
+        self._condicion = threading.Condition()
+        self._colas = OrderedDict()  # sesión -> deque de trabajos, en orden de turno
+        self._en_curso = {}  # sesión -> trabajo
+        self._pendientes = 0
+        self._esperas = deque(maxlen=1024)
+        self._contadores = dict.fromkeys(_FINALES, 0)
+        self._hilos = [threading.Thread(target=self._trabajar, name=f'sintesis-voz-{i}',
+                                        daemon=True)
+                       for i in range(self.max_concurrentes)]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def enviar(self, sesion, funcion, *args, al_cancelar=None, timeout=None):
+        """
+        Encola funcion(trabajo, *args) para la sesión dada
+
+        La función recibe el TrabajoVoz y debe consultar trabajo.detenido()
+        para abandonar cuanto antes si se cancela.
+
+        Raises:
+            ColaVozLlena: si ya hay max_en_cola trabajos pendientes
+        """
+        trabajo = TrabajoVoz(sesion, funcion, args, al_cancelar,
+                             self.timeout_sintesis if timeout is None else timeout)
+        with self._condicion:
+            if self._pendientes >= self.max_en_cola:
+                raise ColaVozLlena(f"Hay {self._pendientes} síntesis de voz en cola")
+            self._colas.setdefault(sesion, deque()).append(trabajo)
+            self._pendientes += 1
+            self._condicion.notify()
+        return trabajo
+
+    def cancelar_sesion(self, sesion):
+        """Cancela los trabajos pendientes y el que se esté ejecutando de la sesión"""
+        with self._condicion:
+            pendientes = self._colas.pop(sesion, ())
+            self._pendientes -= len(pendientes)
+            for trabajo in pendientes:
+                trabajo.cancelar()
+                self._finalizar(trabajo, CANCELADO)
+            actual = self._en_curso.get(sesion)
+        return len(pendientes) + bool(actual and actual.cancelar())
+
+    def _siguiente(self):
+        """Primer trabajo válido por turnos entre sesiones sin trabajo en curso"""
+        ahora = time.monotonic()
+        for sesion in list(self._colas):
+            if sesion in self._en_curso:
+                continue
+            cola = self._colas[sesion]
+            while cola:
+                trabajo = cola.popleft()
+                self._pendientes -= 1
+                if trabajo.cancelado:
+                    self._finalizar(trabajo, CANCELADO)
+                elif self.timeout_cola and ahora - trabajo.encolado > self.timeout_cola:
+                    self._finalizar(trabajo, CADUCADO)
+                else:
+                    break
+            else:
+                trabajo = None
+            # La sesión pasa al final del turno (o sale si no le quedan trabajos)
+            del self._colas[sesion]
+            if cola:
+                self._colas[sesion] = cola
+            if trabajo is not None:
+                return trabajo
+        return None
+
+    def _finalizar(self, trabajo, estado):
+        # Trabajos que salen de la cola sin ejecutarse
+        trabajo.inicio = time.monotonic()
+        self._contadores[estado] += 1
+        self._esperas.append(trabajo.espera)
+        trabajo._terminar(estado)
+
+    def _trabajar(self):
+        while True:
+            with self._condicion:
+                trabajo = self._siguiente()
+                while trabajo is None:
+                    self._condicion.wait()
+                    trabajo = self._siguiente()
+                trabajo.inicio = time.monotonic()
+                trabajo.estado = EN_CURSO
+                self._en_curso[trabajo.sesion] = trabajo
+                self._esperas.append(trabajo.espera)
+
+            vigilante = None
+            if trabajo.timeout:
+                vigilante = threading.Timer(trabajo.timeout, self._agotar, (trabajo,))
+                vigilante.daemon = True
+                vigilante.start()
+
+            estado = COMPLETADO
+            try:
+                trabajo.resultado = trabajo.funcion(trabajo, *trabajo.args)
+            except Exception as e:
+                trabajo.error = e
+                estado = ERROR
+                logger.error(f"Error en síntesis de voz: {e}")
+            finally:
+                if vigilante:
+                    vigilante.cancel()
+
+            with self._condicion:
+                del self._en_curso[trabajo.sesion]
+                if trabajo.cancelado and estado == COMPLETADO:
+                    estado = CANCELADO
+                self._contadores[estado] += 1
+                trabajo._terminar(estado)
+                # La sesión puede volver a tener turno
+                self._condicion.notify()
+
+    def _agotar(self, trabajo):
+        logger.warning(f"Síntesis de voz cancelada tras {trabajo.timeout} s: {trabajo!r}")
+        trabajo.cancelar()
+
+    def metricas(self):
+        """Longitud de la cola, trabajos en curso, resultados y tiempos de espera"""
+        with self._condicion:
+            esperas = sorted(self._esperas)
+            en_cola = {sesion: len(cola) for sesion, cola in self._colas.items() if cola}
+            en_curso = len(self._en_curso)
+            contadores = dict(self._contadores)
+            espera_actual = max((t.espera for cola in self._colas.values() for t in cola),
+                                default=0.0)
+        return {
+            'max_concurrentes': self.max_concurrentes,
+            'en_curso': en_curso,
+            'en_cola': sum(en_cola.values()),
+            'sesiones_en_cola': len(en_cola),
+            'espera_actual_max_s': round(espera_actual, 3),
+            'espera_media_s': round(sum(esperas) / len(esperas), 3) if esperas else 0.0,
+            'espera_p95_s': round(percentil(esperas, 95), 3),
+            'espera_max_s': round(esperas[-1], 3) if esperas else 0.0,
+            'completados': contadores[COMPLETADO],
+            'cancelados': contadores[CANCELADO],
+            'caducados': contadores[CADUCADO],
+            'errores': contadores[ERROR],
+        }
+
+
+def ejecutar_proceso(orden, trabajo, timeout=30, **opciones):
+    """
+    Ejecuta una orden externa (espeak, PowerShell) dentro de un trabajo
+
+    A diferencia de subprocess.run, comprueba trabajo.detenido() mientras
+    espera y termina el proceso si el trabajo se cancela o se agota el tiempo.
+
+    Returns:
+        int o None: código de salida (None si se detuvo)
+    """
+    proceso = subprocess.Popen(orden, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               **opciones)
+    limite = time.monotonic() + timeout if timeout else None
+    try:
+        while True:
+            try:
+                return proceso.wait(timeout=0.05)
+            except subprocess.TimeoutExpired:
+                if trabajo.detenido() or (limite and time.monotonic() > limite):
+                    proceso.terminate()
+                    return None
+    finally:
+        if proceso.poll() is None:
+            try:
+                proceso.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+                proceso.wait()
+
+
+_planificador = None
+_bloqueo = threading.Lock()
+
+
+def obtener_planificador():
+    """Planificador único del proceso (se crea en el primer uso)"""
+    global _planificador
+    with _bloqueo:
+        if _planificador is None:
+            _planificador = PlanificadorVoz()
+        return _planificador
@@ -0,0 +1,158 @@
+"""
+Modelo de poema: estrofas, versos y palabras con sus posiciones
+
+El texto se recorre una sola vez y se obtiene la estructura completa:
+poema -> estrofas -> versos -> tokens, cada nivel con su desplazamiento
+[inicio, fin) dentro del texto original. Las estrofas se separan por una o
+más líneas en blanco (también las que solo tienen espacios). Análisis, voz
+y exportación comparten este modelo en lugar de volver a partir el texto
+por '\\n\\n' y '\\n' cada uno por su cuenta.
+
+analizar_poema() guarda los últimos textos analizados, así que todas las
+capas que reciben el mismo texto en una ejecución reutilizan el mismo
+objeto (inmutable).
+"""
+
+import re
+from functools import lru_cache
+
+try:
+    from config_py import METRIC_ANALYSIS_CONFIG
+    _CONFIG = METRIC_ANALYSIS_CONFIG.get('stanzas', {})
+except ImportError:
+    _CONFIG = {}
+
+_TOKEN = re.compile(r'\S+')
+
+
+class Token:
+    """Palabra (con su puntuación) y su posición en el texto"""
+
+    __slots__ = ('texto', 'inicio', 'fin')
+
+    def __init__(self, texto, inicio, fin):
+        self.texto = texto
+        self.inicio = inicio
+        self.fin = fin
+
+    def __repr__(self):
+        return f"Token({self.texto!r}, {self.inicio}, {self.fin})"
+
+
+class Verso:
+    """Línea no vacía del poema, sin espacios en los extremos"""
+
+    __slots__ = ('numero', 'estrofa', 'linea', 'texto', 'inicio', 'fin', 'tokens')
+
+    def __init__(self, numero, estrofa, linea, texto, inicio, tokens):
+        self.numero = numero        # posición en el poema (desde 1)
+        self.estrofa = estrofa      # número de su estrofa (desde 1)
+        self.linea = linea          # línea del texto original (desde 1)
+        self.texto = texto
+        self.inicio = inicio
+        self.fin = inicio + len(texto)
+        self.tokens = tokens
+
+    @property
+    def palabras(self):
+        """Textos de los tokens (equivale a texto.split())"""
+        return [t.texto for t in self.tokens]
+
+    def __str__(self):
+        return self.texto
+
+    def __repr__(self):
+        return f"Verso({self.numero}, {self.texto!r})"
+
+
+class Estrofa:
+    """Grupo de versos consecutivos sin líneas en blanco entre ellos"""
+
+    __slots__ = ('numero', 'versos', 'inicio', 'fin')
+
+    def __init__(self, numero, versos):
+        self.numero = numero
+        self.versos = tuple(versos)
+        self.inicio = self.versos[0].inicio
+        self.fin = self.versos[-1].fin
+
+    @property
+    def textos(self):
+        """Textos de los versos, en orden (sirven de clave para las cachés)"""
+        return tuple(v.texto for v in self.versos)
+
+    @property
+    def texto(self):
+        return '\n'.join(self.textos)
+
+    def __len__(self):
+        return len(self.versos)
+
+    def __iter__(self):
+        return iter(self.versos)
+
+    def __repr__(self):
+        return f"Estrofa({self.numero}, {len(self.versos)} versos)"
+
+
+class Poema:
+    """Texto analizado en estrofas, versos y tokens"""
+
+    __slots__ = ('texto', 'estrofas', 'versos')
+
+    def __init__(self, texto, estrofas):
+        self.texto = texto
+        self.estrofas = tuple(estrofas)
+        self.versos = tuple(v for e in self.estrofas for v in e.versos)
+
+    @classmethod
+    def desde_texto(cls, texto):
+        """Construye el modelo recorriendo el texto una sola vez"""
+        estrofas = []
+        actual = []
+        numero = 0
+        posicion = 0
+
+        for linea, contenido in enumerate(texto.split('\n'), 1):
+            inicio_linea = posicion
+            posicion += len(contenido) + 1
+
+            recortado = contenido.strip()
+            if not recortado:
+                if actual:
+                    estrofas.append(Estrofa(len(estrofas) + 1, actual))
+                    actual = []
+                continue
+
+            inicio = inicio_linea + contenido.index(recortado)
+            tokens = tuple(Token(m.group(), inicio + m.start(), inicio + m.end())
+                           for m in _TOKEN.finditer(recortado))
+            numero += 1
+            actual.append(Verso(numero, len(estrofas) + 1, linea, recortado, inicio, tokens))
+
+        if actual:
+            estrofas.append(Estrofa(len(estrofas) + 1, actual))
+        return cls(texto, estrofas)
+
+    @property
+    def textos_versos(self):
+        """Textos de todos los versos, sin las líneas en blanco"""
+        return [v.texto for v in self.versos]
+
+    def __bool__(self):
+        return bool(self.versos)
+
+    def __repr__(self):
+        return f"Poema({len(self.estrofas)} estrofas, {len(self.versos)} versos)"
+
+
+@lru_cache(maxsize=_CONFIG.get('parse_cache_size', 64))
+def _analizar(texto):
+    return Poema.desde_texto(texto)
+
+
+def analizar_poema(texto):
+    """Poema del texto (si ya es un Poema se devuelve tal cual)"""
+    if isinstance(texto, Poema):
+        return texto
+    return _analizar(texto)
@@ -0,0 +1,228 @@
+"""
+Recitado encadenado: síntesis adelantada y reproducción en orden
+
+En el recitado verso a verso, cada verso se sintetiza y se reproduce con
+runAndWait(), así que entre dos versos se suman la pausa configurada y el
+tiempo de síntesis del siguiente. Aquí el recitado tiene dos etapas:
+
+- síntesis: uno o más trabajadores convierten los versos en archivos WAV
+  (engine.save_to_file), hasta `adelanto` versos por delante del que suena;
+- reproducción: consume los audios estrictamente en orden, respeta las
+  pausas de verso y estrofa y borra cada archivo al terminar.
+
+Mientras suena un verso (y durante su pausa) ya se están sintetizando los
+siguientes: la espera entre versos queda en la pausa configurada y el
+primer verso suena en cuanto está listo, sin esperar al resto del poema.
+
+La reproducción usa winsound en Windows, afplay en macOS y el primer
+reproductor disponible (paplay, aplay, play, ffplay) en Linux. Sin
+reproductor, SistemaVoz sigue recitando verso a verso.
+"""
+
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError
+
+from .poema import analizar_poema
+
+try:
+    from config_py import VOICE_CONFIG
+    _CONFIG = VOICE_CONFIG.get('pipeline', {})
+except ImportError:
+    _CONFIG = {}
+
+logger = logging.getLogger(__name__)
+
+# Reproductores de línea de órdenes por orden de preferencia (Linux)
+_REPRODUCTORES = (
+    ('paplay',),
+    ('aplay', '-q'),
+    ('play', '-q'),
+    ('ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet'),
+)
+
+# Intervalo con que las esperas comprueban si hay que detenerse
+_INTERVALO = 0.05
+
+
+def piezas_poema(texto, config):
+    """
+    Versos del poema con la pausa que sigue a cada uno
+
+    Returns:
+        [(verso, pausa)]: pausa_verso dentro de la estrofa, pausa_estrofa al
+        final de cada estrofa y 0 tras el último verso
+    """
+    pausa_verso = config.get('pausa_verso', 0.8)
+    pausa_estrofa = config.get('pausa_estrofa', 1.5)
+    piezas = []
+    for estrofa in analizar_poema(texto).estrofas:
+        versos = [v for v in estrofa.textos if v.strip()]
+        for j, verso in enumerate(versos):
+            piezas.append((verso, pausa_verso if j < len(versos) - 1 else pausa_estrofa))
+    if piezas:
+        piezas[-1] = (piezas[-1][0], 0)
+    return piezas
+
+
+def esperar(segundos, detenido):
+    """Espera `segundos` salvo que detenido() pase a ser verdadero; devuelve si se completó"""
+    limite = time.monotonic() + segundos
+    while not detenido():
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            return True
+        time.sleep(min(_INTERVALO, restante))
+    return False
+
+
+def crear_reproductor():
+    """
+    Función reproducir(ruta, detenido) para archivos WAV, o None si no hay
+    reproductor en el sistema
+
+    La reproducción se interrumpe en cuanto detenido() es verdadero.
+    """
+    sistema = platform.system()
+    if sistema == 'Windows':
+        try:
+            import winsound
+        except ImportError:
+            return None
+
+        def reproducir(ruta, detenido):
+            # Asíncrono para poder cortarlo; la duración se lee del WAV
+            winsound.PlaySound(ruta, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            if not esperar(_duracion_wav(ruta), detenido):
+                winsound.PlaySound(None, winsound.SND_PURGE)
+        return reproducir
+
+    if sistema == 'Darwin':
+        orden = ('afplay',) if shutil.which('afplay') else None
+    else:
+        orden = next((o for o in _REPRODUCTORES if shutil.which(o[0])), None)
+    if orden is None:
+        return None
+
+    def reproducir(ruta, detenido):
+        proceso = subprocess.Popen([*orden, ruta], stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL)
+        try:
+            while proceso.poll() is None:
+                if detenido():
+                    proceso.terminate()
+                    break
+                time.sleep(_INTERVALO)
+        finally:
+            if proceso.poll() is None:
+                proceso.kill()
+            proceso.wait()
+    return reproducir
+
+
+def _duracion_wav(ruta):
+    import wave
+    try:
+        with wave.open(ruta, 'rb') as audio:
+            return audio.getnframes() / float(audio.getframerate() or 1)
+    except (wave.Error, OSError, EOFError):
+        return 0.0
+
+
+class RecitadoEncadenado:
+    """Sintetiza versos por adelantado y los reproduce en orden"""
+
+    def __init__(self, renderizar, reproducir, adelanto=None, trabajadores=None, respaldo=None):
+        """
+        Args:
+            renderizar: función (verso, ruta) que escribe el audio WAV del verso
+            reproducir: función (ruta, detenido) que lo reproduce (crear_reproductor)
+            adelanto: versos sintetizados por delante del que suena
+            trabajadores: hilos de síntesis
+            respaldo: función (verso) para decir un verso cuyo audio falló
+        """
+        self.renderizar = renderizar
+        self.reproducir = reproducir
+        self.adelanto = max(1, adelanto or _CONFIG.get('lookahead', 3))
+        self.trabajadores = max(1, trabajadores or _CONFIG.get('render_workers', 1))
+        self.respaldo = respaldo
+        self.metricas = {}
+
+    def _sintetizar(self, verso, ruta, detenido):
+        if detenido():
+            return None
+        self.renderizar(verso, ruta)
+        return ruta if os.path.exists(ruta) and os.path.getsize(ruta) > 0 else None
+
+    def _esperar_audio(self, futuro, detenido):
+        while not detenido():
+            try:
+                return futuro.result(timeout=_INTERVALO)
+            except TimeoutError:
+                continue
+            except CancelledError:
+                return None
+            except Exception as e:
+                logger.warning(f"Error sintetizando verso: {e}")
+                return None
+        return None
+
+    def recitar(self, piezas, detenido=lambda: False):
+        """
+        Recita las piezas [(verso, pausa)] de piezas_poema()
+
+        Returns:
+            bool: True si se recitaron todas, False si se detuvo antes
+        """
+        inicio = time.perf_counter()
+        self.metricas = {'versos': len(piezas), 'reproducidos': 0,
+                         'primer_audio_s': None, 'espera_sintesis_s': 0.0}
+        if not piezas:
+            return True
+
+        with tempfile.TemporaryDirectory(prefix='recitado_') as directorio, \
+                ThreadPoolExecutor(self.trabajadores, thread_name_prefix='sintesis') as ejecutor:
+            futuros = {}
+
+            def encargar(i):
+                if i < len(piezas) and i not in futuros:
+                    ruta = os.path.join(directorio, f"verso_{i:05d}.wav")
+                    futuros[i] = ejecutor.submit(self._sintetizar, piezas[i][0], ruta, detenido)
+
+            for i in range(self.adelanto):
+                encargar(i)
+
+            try:
+                for i, (verso, pausa) in enumerate(piezas):
+                    espera = time.perf_counter()
+                    ruta = self._esperar_audio(futuros.pop(i), detenido)
+                    if detenido():
+                        return False
+                    # El hueco es lo que se espera al sintetizador, no la pausa
+                    if i:
+                        self.metricas['espera_sintesis_s'] += time.perf_counter() - espera
+                    encargar(i + self.adelanto)
+
+                    if self.metricas['primer_audio_s'] is None:
+                        self.metricas['primer_audio_s'] = time.perf_counter() - inicio
+                    if ruta:
+                        self.reproducir(ruta, detenido)
+                        os.remove(ruta)
+                    elif self.respaldo:
+                        self.respaldo(verso)
+                    self.metricas['reproducidos'] += 1
+
+                    if pausa and not esperar(pausa, detenido):
+                        return False
+                return not detenido()
+            finally:
+                for futuro in futuros.values():
+                    futuro.cancel()
+                # El directorio se borra al salir: espera a las síntesis en curso
+                ejecutor.shutdown(wait=True)
+                logger.debug(f"Recitado encadenado: {self.metricas}")
@@ -0,0 +1,162 @@
+"""
+Objetos de resultado compactos
+
+Sustituyen a los diccionarios por verso y por palabra que se acumulan en
+el historial de la sesión. Usan __slots__ (sin __dict__ por instancia) y
+tuplas inmutables, pero siguen admitiendo el acceso tipo diccionario
+(resultado['silabas'], .get(), 'clave' in resultado) y exponen to_dict()
+para serializar o para el código que espera diccionarios.
+"""
+
+
+class ResultadoCompacto:
+    """Base para resultados con __slots__ y acceso tipo diccionario"""
+
+    __slots__ = ()
+
+    # Campos que se exponen como claves del diccionario equivalente
+    _campos = ()
+
+    def __getitem__(self, clave):
+        if clave in self._campos:
+            valor = getattr(self, clave)
+            if valor is not None or clave not in self._opcionales():
+                return valor
+        raise KeyError(clave)
+
+    def __contains__(self, clave):
+        try:
+            self[clave]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, clave, defecto=None):
+        try:
+            return self[clave]
+        except KeyError:
+            return defecto
+
+    def keys(self):
+        return [c for c in self._campos if c in self]
+
+    def _opcionales(self):
+        return ()
+
+    def to_dict(self):
+        """Diccionario equivalente (se construye solo cuando se pide)"""
+        return {clave: _a_lista(self[clave]) for clave in self.keys()}
+
+    def __eq__(self, otro):
+        if isinstance(otro, ResultadoCompacto):
+            return type(self) is type(otro) and self.to_dict() == otro.to_dict()
+        if isinstance(otro, dict):
+            return self.to_dict() == otro
+        return NotImplemented
+
+    def __repr__(self):
+        campos = ', '.join(f"{c}={getattr(self, c)!r}" for c in self._campos)
+        return f"{type(self).__name__}({campos})"
+
+    def __getstate__(self):
+        return tuple(getattr(self, c) for c in self.__slots__)
+
+    def __setstate__(self, estado):
+        for campo, valor in zip(self.__slots__, estado):
+            setattr(self, campo, valor)
+
+
+def _a_lista(valor):
+    """Convierte tuplas (anidadas) en listas para mantener el formato antiguo"""
+    if isinstance(valor, tuple):
+        return [_a_lista(v) for v in valor]
+    return valor
+
+
+class AnalisisVerso(ResultadoCompacto):
+    """Resultado del análisis métrico de un verso"""
+
+    __slots__ = ('numero', 'texto', 'silabas', 'metro', 'acentos')
+    _campos = __slots__
+
+    def __init__(self, numero, texto, silabas, metro, acentos):
+        self.numero = numero
+        self.texto = texto
+        self.silabas = silabas
+        self.metro = metro
+        self.acentos = tuple(acentos)
+
+
+class AnalisisPalabra(ResultadoCompacto):
+    """Resultado del análisis detallado de una palabra"""
+
+    __slots__ = ('palabra', 'palabra_limpia', 'silabas', 'acentuacion', 'patrones', 'division_silabica')
+    _campos = __slots__
+
+    def __init__(self, palabra, palabra_limpia, silabas, acentuacion, patrones, division_silabica):
+        self.palabra = palabra
+        self.palabra_limpia = palabra_limpia
+        self.silabas = silabas
+        self.acentuacion = acentuacion
+        self.patrones = tuple(tuple(p) for p in patrones)
+        self.division_silabica = tuple(division_silabica)
+
+    def _opcionales(self):
+        # Las palabras vacías no tenían 'palabra_limpia' en el formato antiguo
+        return ('palabra_limpia',)
+
+
+class AnalisisEstrofa(ResultadoCompacto):
+    """
+    Análisis de una estrofa, independiente de su posición en el poema
+
+    Solo depende de los versos de la estrofa, así que se cachea por su
+    texto y se reutiliza aunque la estrofa cambie de sitio.
+    """
+
+    __slots__ = ('versos', 'silabas', 'acentos', 'metro_dominante', 'esquema_rimas', 'tipo_rima')
+    _campos = __slots__
+
+    def __init__(self, versos, silabas, acentos, metro_dominante, esquema_rimas, tipo_rima):
+        self.versos = tuple(versos)
+        self.silabas = tuple(silabas)
+        self.acentos = tuple(tuple(a) for a in acentos)
+        self.metro_dominante = metro_dominante
+        self.esquema_rimas = tuple(esquema_rimas)
+        self.tipo_rima = tipo_rima
+
+
+def columnas_versos(versos_analizados, esquema=None):
+    """
+    Análisis por verso en forma de columnas (una lista por campo)
+
+    Pensado para construir una sola tabla (st.dataframe) en lugar de un
+    widget por verso. Si se pasa el esquema de rimas se añade como columna.
+    """
+    columnas = {
+        'Verso': [v.numero for v in versos_analizados],
+        'Texto': [v.texto for v in versos_analizados],
+        'Sílabas': [v.silabas for v in versos_analizados],
+        'Metro': [v.metro for v in versos_analizados],
+        'Acentos': [', '.join(map(str, v.acentos)) for v in versos_analizados],
+    }
+    if esquema is not None:
+        columnas['Rima'] = list(esquema[:len(versos_analizados)])
+    return columnas
+
+
+def pagina_columnas(columnas, pagina, por_pagina):
+    """Recorta todas las columnas a la ventana de la página (la primera es 1)"""
+    inicio = (pagina - 1) * por_pagina
+    return {nombre: valores[inicio:inicio + por_pagina] for nombre, valores in columnas.items()}
+
+
+def a_diccionario(valor):
+    """Convierte recursivamente resultados compactos en estructuras JSON"""
+    if isinstance(valor, ResultadoCompacto):
+        return valor.to_dict()
+    if isinstance(valor, dict):
+        return {k: a_diccionario(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [a_diccionario(v) for v in valor]
+    return valor
@@ -1,6 +1,15 @@
 import re
 from collections import Counter
 
+from .formas import obtener_reconocedor
+from .perfilado import medir
+
+
+def nombre_esquema(forma):
+    """Tipo de rima de un esquema propio de una forma fija ('Esquema de décima')"""
+    return f"Esquema de {forma[0].lower()}{forma[1:]}"
+
+
 class DetectorRimas:
     def __init__(self):
         self.vocales = 'aeiouáéíóúü'
@@ -11,10 +20,7 @@ class DetectorRimas:
             'AABB': 'Rima pareada',
             'ABBA': 'Rima abrazada',
             'AAAA': 'Rima monorrima',
-            'ABCB': 'Rima asonante en pares',
-            'ABAB CDCD EFEF GG': 'Soneto shakesperiano',
-            'ABBA ABBA CDC DCD': 'Soneto petrarquista',
-            'ABAB ABAB CDC DCD': 'Soneto francés'
+            'ABCB': 'Rima asonante en pares'
         }
         
         # Terminaciones comunes para rimas
@@ -122,6 +128,7 @@ class DetectorRimas:
         
         return resultado
     
+    @medir('DetectorRimas.detectar_esquema')
     def detectar_esquema(self, versos):
         """Detecta el esquema de rimas de una lista de versos"""
         if not versos:
@@ -166,6 +173,13 @@ class DetectorRimas:
         if not esquema:
             return "Sin rima"
         
+        # Esquemas propios de una forma fija (sonetos, décima). Sin métrica no
+        # se sabe si es la forma (un soneto octosílabo es un sonetillo): eso
+        # lo decide formas.reconocer_forma
+        forma = obtener_reconocedor(solo_esquema=True).forma(esquema)
+        if forma:
+            return nombre_esquema(forma)
+        
         esquema_str = ''.join(esquema)
         
         # Verificar patrones clásicos conocidos
@@ -264,32 +278,53 @@ class DetectorRimas:
             }
         }
     
-    def sugerir_rimas(self, palabra):
-        """Sugiere palabras que rimen con la palabra dada"""
+    def sugerir_rimas(self, palabra, tipo='consonante', silabas=None, acentuacion=None, limite=20):
+        """
+        Sugiere palabras que rimen con la palabra dada
+        
+        Consulta el diccionario de rimas indexado (utils/diccionario_rimas.py)
+        y completa con las tablas propias si hay pocas coincidencias.
+        
+        Args:
+            tipo: 'consonante' o 'asonante'
+            silabas (int): filtrar por número de sílabas
+            acentuacion (str): filtrar por 'aguda', 'llana' o 'esdrujula'
+            limite (int): máximo de sugerencias
+        """
         terminacion = self.extraer_terminacion_rima(palabra)
         
         if not terminacion:
             return []
         
-        sugerencias = []
-        
-        # Buscar en terminaciones conocidas
-        for base, rimas in self.terminaciones_comunes.items():
-            if self.son_rimas_consonantes(terminacion, self.extraer_terminacion_rima(base)):
-                sugerencias.extend(rimas[:5])  # Máximo 5 por grupo
-        
-        # Generar rimas automáticas basadas en patrones
-        rimas_automaticas = self._generar_rimas_automaticas(terminacion)
-        sugerencias.extend(rimas_automaticas)
-        
-        # Eliminar duplicados y la palabra original
-        sugerencias = list(set(sugerencias))
         palabra_limpia = re.sub(r'[^\w\sáéíóúüñ]', '', palabra.lower()).strip()
+        sugerencias = []
         
-        if palabra_limpia in sugerencias:
-            sugerencias.remove(palabra_limpia)
+        from .diccionario_rimas import obtener_diccionario
+        diccionario = obtener_diccionario()
+        if diccionario is not None:
+            sugerencias = diccionario.buscar(palabra_limpia, tipo, silabas, acentuacion, limite)
         
-        return sugerencias[:20]  # Máximo 20 sugerencias
+        # Las tablas propias solo conocen rima consonante y no llevan atributos
+        if len(sugerencias) < limite and tipo == 'consonante' and silabas is None and acentuacion is None:
+            adicionales = []
+            
+            # Buscar en terminaciones conocidas
+            for base, rimas in self.terminaciones_comunes.items():
+                if self.son_rimas_consonantes(terminacion, self.extraer_terminacion_rima(base)):
+                    adicionales.extend(rimas[:5])  # Máximo 5 por grupo
+            
+            # Generar rimas automáticas basadas en patrones
+            adicionales.extend(self._generar_rimas_automaticas(terminacion))
+            
+            # Eliminar duplicados y la palabra original
+            vistas = set(sugerencias)
+            vistas.add(palabra_limpia)
+            for candidata in adicionales:
+                if candidata not in vistas:
+                    vistas.add(candidata)
+                    sugerencias.append(candidata)
+        
+        return sugerencias[:limite]
     
     def _generar_rimas_automaticas(self, terminacion):
         """Genera rimas automáticas basadas en patrones comunes"""
@@ -1,7 +1,16 @@
 import re
 
+from .perfilado import medir
+from .resultados import AnalisisPalabra
+
+try:
+    from config_py import METRIC_ANALYSIS_CONFIG
+    _USAR_LEXICO = METRIC_ANALYSIS_CONFIG['syllable_counting'].get('use_lexicon', True)
+except (ImportError, KeyError):
+    _USAR_LEXICO = True
+
 class ContadorSilabas:
-    def __init__(self):
+    def __init__(self, usar_lexico=None):
         # Vocales y consonantes
         self.vocales = 'aeiouáéíóúü'
         self.consonantes = 'bcdfghjklmnñpqrstvwxyz'
@@ -35,6 +44,14 @@ class ContadorSilabas:
             'había': 3, 'tenía': 3, 'quería': 3, 'podía': 3,
             'continúa': 4, 'evalúa': 4, 'actúa': 3
         }
+        
+        # Léxico precompilado (utils/lexico.py): se consulta antes que las reglas
+        if usar_lexico is None:
+            usar_lexico = _USAR_LEXICO
+        self.lexico = None
+        if usar_lexico:
+            from .lexico import obtener_lexico
+            self.lexico = obtener_lexico()
     
     def limpiar_palabra(self, palabra):
         """Limpia la palabra de signos de puntuación manteniendo acentos"""
@@ -61,6 +78,11 @@ class ContadorSilabas:
         """Detecta si la palabra es aguda, llana o esdrújula"""
         palabra_limpia = self.limpiar_palabra(palabra)
         
+        if self.lexico is not None and palabra_limpia:
+            acentuacion = self.lexico.acentuacion(palabra_limpia)
+            if acentuacion is not None:
+                return acentuacion
+        
         # Buscar vocal tónica
         posicion_tonica = -1
         for i, letra in enumerate(palabra_limpia):
@@ -105,21 +127,23 @@ class ContadorSilabas:
             
             # Verificar sinalefa con la siguiente palabra
             if i < len(palabras) - 1:
-                palabra_actual = self.limpiar_palabra(palabras[i])
-                palabra_siguiente = self.limpiar_palabra(palabras[i + 1])
-                
-                if palabra_actual and palabra_siguiente:
-                    ultima_letra = palabra_actual[-1]
-                    primera_letra = palabra_siguiente[0]
-                    
-                    # Sinalefa: vocal final + vocal inicial
-                    if self.es_vocal(ultima_letra) and self.es_vocal(primera_letra):
-                        # Verificar excepciones (vocal tónica + vocal)
-                        if not (self.es_vocal_tonica(ultima_letra) and self.es_vocal_abierta(primera_letra)):
-                            sinalefas += 1
+                if self.hay_sinalefa(self.limpiar_palabra(palabras[i]),
+                                     self.limpiar_palabra(palabras[i + 1])):
+                    sinalefas += 1
         
         return silabas_total - sinalefas
     
+    def hay_sinalefa(self, palabra_actual, palabra_siguiente):
+        """Sinalefa entre dos palabras ya limpias: vocal final + vocal inicial"""
+        if not palabra_actual or not palabra_siguiente:
+            return False
+        ultima_letra = palabra_actual[-1]
+        primera_letra = palabra_siguiente[0]
+        if not (self.es_vocal(ultima_letra) and self.es_vocal(primera_letra)):
+            return False
+        # Excepción: vocal tónica + vocal abierta
+        return not (self.es_vocal_tonica(ultima_letra) and self.es_vocal_abierta(primera_letra))
+    
     def detectar_diptongos_triptongos(self, palabra):
         """Detecta diptongos y triptongos en una palabra"""
         palabra = palabra.lower()
@@ -175,6 +199,12 @@ class ContadorSilabas:
         if not palabra:
             return 0
         
+        # Léxico precompilado: una consulta para las palabras conocidas
+        if self.lexico is not None:
+            silabas = self.lexico.silabas(palabra)
+            if silabas is not None:
+                return silabas
+        
         # Verificar palabras especiales
         if palabra in self.palabras_especiales:
             return self.palabras_especiales[palabra]
@@ -214,6 +244,7 @@ class ContadorSilabas:
         
         return max(1, silabas)
     
+    @medir('ContadorSilabas.contar_silabas_verso')
     def contar_silabas_verso(self, verso):
         """Cuenta las sílabas de un verso aplicando reglas métricas"""
         if not verso:
@@ -240,32 +271,32 @@ class ContadorSilabas:
         
         return max(1, silabas_con_sinalefa)
     
+    def contar_silabas_lote(self, versos):
+        """Cuenta sílabas métricas y acentuación final de varios versos"""
+        resultados = []
+        for verso in versos:
+            palabras = verso.split()
+            silabas = self.contar_silabas_verso(verso)
+            if palabras:
+                acentuacion = self.detectar_acentuacion(palabras[-1])
+            else:
+                acentuacion = 'indefinida'
+            resultados.append((silabas, acentuacion))
+        return resultados
+    
     def analizar_palabra_detallado(self, palabra):
         """Análisis detallado de una palabra"""
         palabra_limpia = self.limpiar_palabra(palabra)
         
         if not palabra_limpia:
-            return {
-                'palabra': palabra,
-                'silabas': 0,
-                'acentuacion': 'indefinida',
-                'patrones': [],
-                'division_silabica': []
-            }
+            return AnalisisPalabra(palabra, None, 0, 'indefinida', [], [])
         
         silabas = self.contar_silabas(palabra_limpia)
         acentuacion = self.detectar_acentuacion(palabra_limpia)
         patrones = self.detectar_diptongos_triptongos(palabra_limpia)
         division = self.dividir_en_silabas(palabra_limpia)
         
-        return {
-            'palabra': palabra,
-            'palabra_limpia': palabra_limpia,
-            'silabas': silabas,
-            'acentuacion': acentuacion,
-            'patrones': patrones,
-            'division_silabica': division
-        }
+        return AnalisisPalabra(palabra, palabra_limpia, silabas, acentuacion, patrones, division)
     
     def dividir_en_silabas(self, palabra):
         """Divide una palabra en sílabas"""
@@ -273,6 +304,12 @@ class ContadorSilabas:
             return []
         
         palabra = self.limpiar_palabra(palabra)
+        
+        if self.lexico is not None and palabra:
+            division = self.lexico.dividir(palabra)
+            if division is not None:
+                return division
+        
         patrones = self.detectar_diptongos_triptongos(palabra)
         
         silabas = []
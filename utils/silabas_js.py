@@ -0,0 +1,382 @@
+"""
+Contador de sílabas para el navegador generado desde las reglas de Python
+
+Compila las tablas de ContadorSilabas (vocales, diptongos, triptongos,
+hiatos, palabras especiales) en un módulo JavaScript que reproduce paso a
+paso contar_silabas, detectar_acentuacion, aplicar_sinalefa y
+contar_silabas_verso, para que el editor coloree cada línea mientras se
+escribe sin ir al servidor.
+
+El léxico precompilado (utils/lexico.py) no cabe en la página, pero no hace
+falta entero: solo se incluyen las palabras en las que el léxico y las
+reglas discrepan. Para el resto, aplicar las reglas da el mismo resultado
+que consultar el léxico, así que el módulo coincide con ContadorSilabas
+también cuando este usa el léxico. tests/test_silabas_js.py lo
+comprueba ejecutando el módulo con node.
+
+El módulo se guarda en data/silabas.js y se regenera cuando cambian las
+tablas o el léxico.
+
+Uso:
+    python -m utils.silabas_js [--salida ruta] [--sin-lexico]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from .silabas import ContadorSilabas, _USAR_LEXICO
+
+logger = logging.getLogger(__name__)
+
+VERSION_MODULO = 1
+RUTA_MODULO = Path(__file__).resolve().parent.parent / 'data' / 'silabas.js'
+
+_MOTOR_JS = r"""
+(function (raiz) {
+  'use strict';
+
+  var T = __TABLAS__;
+
+  var VOCALES = T.vocales;
+  var TONICAS = 'áéíóú';
+  var ABIERTAS = 'aeoáéó';
+  var FINAL_LLANA = 'aeiounsáéíóú';
+  var LIMPIAR = /[^\p{L}\p{N}_\s]/gu;
+  var tiene = Object.prototype.hasOwnProperty;
+
+  // Excepciones del léxico: "silabas,acentuacion" -> palabras separadas por espacios
+  var EXCEPCIONES = Object.create(null);
+  Object.keys(T.excepciones).forEach(function (clave) {
+    var partes = clave.split(',');
+    var dato = [parseInt(partes[0], 10), partes[1]];
+    T.excepciones[clave].split(' ').forEach(function (palabra) {
+      EXCEPCIONES[palabra] = dato;
+    });
+  });
+
+  function limpiarPalabra(palabra) {
+    return palabra.toLowerCase().replace(LIMPIAR, '').trim();
+  }
+
+  function esVocal(letra) {
+    return VOCALES.indexOf(letra.toLowerCase()) !== -1;
+  }
+
+  function esVocalTonica(letra) {
+    return TONICAS.indexOf(letra.toLowerCase()) !== -1;
+  }
+
+  function esVocalAbierta(letra) {
+    return ABIERTAS.indexOf(letra.toLowerCase()) !== -1;
+  }
+
+  function buscar(letras, patron, alEncontrar) {
+    var n = patron.length;
+    var pos = 0;
+    while (pos <= letras.length - n) {
+      if (letras.slice(pos, pos + n).join('') === patron) {
+        alEncontrar(pos);
+        pos += n;
+      } else {
+        pos += 1;
+      }
+    }
+  }
+
+  // Mismo orden y solapamientos que detectar_diptongos_triptongos
+  function detectarPatrones(letras) {
+    var patrones = [];
+    T.triptongos.forEach(function (triptongo) {
+      buscar(letras, triptongo, function (pos) {
+        patrones.push(['triptongo', pos, pos + 2]);
+      });
+    });
+    T.diptongos.forEach(function (diptongo) {
+      buscar(letras, diptongo, function (pos) {
+        var enTriptongo = patrones.some(function (p) {
+          return p[0] === 'triptongo' &&
+            ((p[1] <= pos && pos <= p[2]) || (p[1] <= pos + 1 && pos + 1 <= p[2]));
+        });
+        if (!enTriptongo) {
+          patrones.push(['diptongo', pos, pos + 1]);
+        }
+      });
+    });
+    T.hiatos.forEach(function (hiato) {
+      buscar(letras, hiato, function (pos) {
+        patrones.push(['hiato', pos, pos + 1]);
+      });
+    });
+    return patrones;
+  }
+
+  function contarSilabas(palabra) {
+    if (!palabra) return 0;
+    palabra = limpiarPalabra(palabra);
+    if (!palabra) return 0;
+
+    if (EXCEPCIONES[palabra]) return EXCEPCIONES[palabra][0];
+    if (tiene.call(T.especiales, palabra)) return T.especiales[palabra];
+
+    var letras = Array.from(palabra);
+    var patrones = detectarPatrones(letras);
+    var silabas = 0;
+    var i = 0;
+    while (i < letras.length) {
+      if (esVocal(letras[i])) {
+        var enPatron = false;
+        for (var k = 0; k < patrones.length; k++) {
+          var p = patrones[k];
+          if (p[1] <= i && i <= p[2]) {
+            silabas += 1;
+            i = p[0] === 'hiato' ? i + 1 : p[2] + 1;
+            enPatron = true;
+            break;
+          }
+        }
+        if (!enPatron) {
+          silabas += 1;
+          i += 1;
+        }
+      } else {
+        i += 1;
+      }
+    }
+    return Math.max(1, silabas);
+  }
+
+  function detectarAcentuacion(palabra) {
+    var limpia = limpiarPalabra(palabra);
+    if (limpia && EXCEPCIONES[limpia]) return EXCEPCIONES[limpia][1];
+
+    var letras = Array.from(limpia);
+    var tonica = -1;
+    for (var i = 0; i < letras.length; i++) {
+      if (esVocalTonica(letras[i])) {
+        tonica = i;
+        break;
+      }
+    }
+
+    if (tonica === -1) {
+      var ultima = letras.length ? letras[letras.length - 1] : '';
+      return FINAL_LLANA.indexOf(ultima) !== -1 ? 'llana' : 'aguda';
+    }
+
+    var antes = contarSilabas(letras.slice(0, tonica + 1).join(''));
+    var desdeFinal = contarSilabas(limpia) - antes + 1;
+    if (desdeFinal === 1) return 'aguda';
+    if (desdeFinal === 2) return 'llana';
+    if (desdeFinal >= 3) return 'esdrujula';
+    return 'llana';
+  }
+
+  function aplicarSinalefa(palabras) {
+    var total = 0;
+    var sinalefas = 0;
+    for (var i = 0; i < palabras.length; i++) {
+      total += contarSilabas(palabras[i]);
+      if (i < palabras.length - 1) {
+        var actual = Array.from(limpiarPalabra(palabras[i]));
+        var siguiente = Array.from(limpiarPalabra(palabras[i + 1]));
+        if (actual.length && siguiente.length) {
+          var ultima = actual[actual.length - 1];
+          var primera = siguiente[0];
+          if (esVocal(ultima) && esVocal(primera) &&
+              !(esVocalTonica(ultima) && esVocalAbierta(primera))) {
+            sinalefas += 1;
+          }
+        }
+      }
+    }
+    return total - sinalefas;
+  }
+
+  function contarSilabasVerso(verso) {
+    if (!verso) return 0;
+    var palabras = verso.split(/\s+/).filter(Boolean);
+    if (!palabras.length) return 0;
+
+    var silabas = aplicarSinalefa(palabras);
+    var ultima = limpiarPalabra(palabras[palabras.length - 1]);
+    if (ultima) {
+      var acentuacion = detectarAcentuacion(ultima);
+      if (acentuacion === 'aguda') silabas += 1;
+      else if (acentuacion === 'esdrujula') silabas -= 1;
+    }
+    return Math.max(1, silabas);
+  }
+
+  var api = {
+    version: T.version,
+    huella: T.huella,
+    limpiarPalabra: limpiarPalabra,
+    contarSilabas: contarSilabas,
+    detectarAcentuacion: detectarAcentuacion,
+    aplicarSinalefa: aplicarSinalefa,
+    contarSilabasVerso: contarSilabasVerso
+  };
+
+  raiz.SilabasPoeticas = api;
+  if (typeof module !== 'undefined' && module.exports) {
+    module.exports = api;
+  }
+})(typeof globalThis !== 'undefined' ? globalThis : this);
+"""
+
+
+class _LexicoParcial:
+    """Léxico reducido a las excepciones (lo que verá el módulo JS)"""
+
+    def __init__(self, silabas):
+        self._silabas = silabas
+
+    def silabas(self, palabra):
+        return self._silabas.get(palabra)
+
+    def acentuacion(self, palabra):
+        return None
+
+    def dividir(self, palabra):
+        return None
+
+
+def _tablas_reglas(contador):
+    return {
+        'vocales': contador.vocales,
+        'diptongos': contador.diptongos,
+        'triptongos': contador.triptongos,
+        'hiatos': contador.hiatos_acentuados,
+        'especiales': contador.palabras_especiales,
+    }
+
+
+def calcular_excepciones(lexico, contador=None):
+    """
+    Palabras del léxico cuyo resultado no se obtiene con las reglas
+
+    Primero las que difieren en sílabas; después, con esas ya conocidas
+    (las reglas de acentuación cuentan prefijos de la palabra), las que
+    difieren en acentuación.
+
+    Returns:
+        dict palabra -> (silabas, acentuacion) según el léxico
+    """
+    contador = contador or ContadorSilabas(usar_lexico=False)
+    silabas = {}
+    for palabra in lexico:
+        if contador.contar_silabas(palabra) != lexico.silabas(palabra):
+            silabas[palabra] = lexico.silabas(palabra)
+
+    contador.lexico = _LexicoParcial(silabas)
+    try:
+        excepciones = {p: (s, lexico.acentuacion(p)) for p, s in silabas.items()}
+        for palabra in lexico:
+            if palabra not in excepciones and \
+                    contador.detectar_acentuacion(palabra) != lexico.acentuacion(palabra):
+                excepciones[palabra] = (lexico.silabas(palabra), lexico.acentuacion(palabra))
+    finally:
+        contador.lexico = None
+    return excepciones
+
+
+def _huella(tablas, lexico):
+    datos = json.dumps([VERSION_MODULO, tablas, lexico.tabla.meta.get('huella') if lexico else None],
+                       sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(datos.encode('utf-8')).hexdigest()
+
+
+def _obtener_lexico(incluir_lexico):
+    if not incluir_lexico:
+        return None
+    from .lexico import obtener_lexico
+    return obtener_lexico()
+
+
+def generar_modulo(incluir_lexico=None):
+    """Código fuente del módulo JavaScript"""
+    if incluir_lexico is None:
+        incluir_lexico = _USAR_LEXICO
+    contador = ContadorSilabas(usar_lexico=False)
+    lexico = _obtener_lexico(incluir_lexico)
+    tablas = _tablas_reglas(contador)
+    huella = _huella(tablas, lexico)
+
+    agrupadas = defaultdict(list)
+    if lexico is not None:
+        inicio = time.perf_counter()
+        for palabra, (silabas, acentuacion) in calcular_excepciones(lexico, contador).items():
+            agrupadas[f"{silabas},{acentuacion}"].append(palabra)
+        logger.info(f"Excepciones del léxico para JS: "
+                    f"{sum(map(len, agrupadas.values()))} palabras en "
+                    f"{time.perf_counter() - inicio:.1f} s")
+
+    tablas['excepciones'] = {clave: ' '.join(sorted(palabras))
+                             for clave, palabras in sorted(agrupadas.items())}
+    tablas['version'] = VERSION_MODULO
+    tablas['huella'] = huella
+    cuerpo = _MOTOR_JS.replace('__TABLAS__', json.dumps(tablas, ensure_ascii=False,
+                                                        separators=(',', ':')))
+    return (f"// Generado por utils/silabas_js.py a partir de ContadorSilabas; no editar\n"
+            f"// huella: {huella}\n{cuerpo.lstrip()}")
+
+
+def _huella_archivo(ruta):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            f.readline()
+            linea = f.readline()
+    except OSError:
+        return None
+    return linea.split('huella:', 1)[1].strip() if 'huella:' in linea else None
+
+
+def escribir_modulo(ruta=RUTA_MODULO, incluir_lexico=None):
+    """Genera el módulo y lo escribe de forma atómica"""
+    codigo = generar_modulo(incluir_lexico)
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_suffix(f"{ruta.suffix}.{os.getpid()}.tmp")
+    temporal.write_text(codigo, encoding='utf-8')
+    temporal.replace(ruta)
+    return codigo
+
+
+_modulo = None
+
+
+def obtener_modulo(ruta=RUTA_MODULO):
+    """Módulo JS del proceso, regenerado si las tablas o el léxico cambiaron"""
+    global _modulo
+    if _modulo is None:
+        lexico = _obtener_lexico(_USAR_LEXICO)
+        esperada = _huella(_tablas_reglas(ContadorSilabas(usar_lexico=False)), lexico)
+        if _huella_archivo(ruta) == esperada:
+            _modulo = Path(ruta).read_text(encoding='utf-8')
+        else:
+            _modulo = escribir_modulo(ruta)
+    return _modulo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Genera el contador de sílabas en JavaScript')
+    parser.add_argument('--salida', default=str(RUTA_MODULO))
+    parser.add_argument('--sin-lexico', action='store_true',
+                        help='Solo las reglas (coincide con ContadorSilabas(usar_lexico=False))')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    codigo = escribir_modulo(args.salida, incluir_lexico=False if args.sin_lexico else None)
+    print(f"{args.salida}: {len(codigo.encode('utf-8')) / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
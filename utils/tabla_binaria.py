@@ -0,0 +1,150 @@
+"""
+Tablas binarias de solo lectura mapeadas en memoria
+
+Formato de archivo sencillo para índices precalculados (diccionario de
+rimas, léxico silábico): una cabecera JSON con metadatos y la posición de
+cada sección, seguida de las secciones en bruto (arrays numéricos o
+bloques UTF-8). Al abrir la tabla no se decodifica nada: cada sección se
+expone como un memoryview sobre el mmap, así que la carga cuesta lo mismo
+con 1.000 que con 200.000 entradas.
+
+    <MAGIA 4 bytes> <longitud cabecera uint32> <cabecera JSON> <secciones...>
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+MAGIA = b'APTB'
+_ALINEACION = 8
+
+
+def escribir_tabla(ruta, secciones, meta=None):
+    """
+    Escribe una tabla binaria
+
+    Args:
+        ruta: archivo de destino (se reemplaza de forma atómica)
+        secciones (dict): nombre -> array.array o bytes
+        meta (dict): metadatos serializables en JSON
+    """
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+
+    # Primero calcular posiciones relativas al inicio de los datos
+    indice = {}
+    posicion = 0
+    for nombre, datos in secciones.items():
+        if isinstance(datos, array):
+            codigo, crudo = datos.typecode, datos.tobytes()
+        else:
+            codigo, crudo = 'B', bytes(datos)
+        posicion += -posicion % _ALINEACION
+        indice[nombre] = [posicion, len(crudo), codigo]
+        posicion += len(crudo)
+
+    cabecera = json.dumps({
+        'meta': meta or {},
+        'secciones': indice,
+        'orden_bytes': sys.byteorder,
+    }, ensure_ascii=False).encode('utf-8')
+    inicio_datos = 8 + len(cabecera)
+    relleno_cabecera = -inicio_datos % _ALINEACION
+
+    # Temporal por proceso: varios trabajadores pueden construir a la vez
+    temporal = ruta.with_suffix(f"{ruta.suffix}.{os.getpid()}.tmp")
+    with open(temporal, 'wb') as f:
+        f.write(MAGIA + struct.pack('<I', len(cabecera) + relleno_cabecera))
+        f.write(cabecera + b' ' * relleno_cabecera)
+        escrito = 0
+        for nombre, datos in secciones.items():
+            posicion, _, _ = indice[nombre]
+            f.write(b'\0' * (posicion - escrito))
+            crudo = datos.tobytes() if isinstance(datos, array) else bytes(datos)
+            f.write(crudo)
+            escrito = posicion + len(crudo)
+    temporal.replace(ruta)
+
+
+class TablaBinaria:
+    """Tabla abierta con mmap; las secciones son memoryviews sin copia"""
+
+    def __init__(self, ruta):
+        self.ruta = Path(ruta)
+        with open(self.ruta, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:4] != MAGIA:
+            self._mmap.close()
+            raise ValueError(f"{self.ruta} no es una tabla binaria válida")
+
+        longitud = struct.unpack_from('<I', self._mmap, 4)[0]
+        cabecera = json.loads(bytes(self._mmap[8:8 + longitud]))
+        if cabecera.get('orden_bytes', sys.byteorder) != sys.byteorder:
+            self._mmap.close()
+            raise ValueError(f"{self.ruta} se generó con otro orden de bytes")
+
+        self.meta = cabecera['meta']
+        self._inicio = 8 + longitud
+        self._secciones = cabecera['secciones']
+        self._vista = memoryview(self._mmap)
+        # Vistas entregadas (nombre -> (vista de bytes, vista con tipo)), para
+        # liberarlas al cerrar: el mmap no se puede cerrar mientras existan
+        self._vistas = {}
+
+    def seccion(self, nombre):
+        """memoryview de la sección (con el tipo numérico con el que se escribió)"""
+        if nombre not in self._vistas:
+            posicion, longitud, codigo = self._secciones[nombre]
+            inicio = self._inicio + posicion
+            vista = self._vista[inicio:inicio + longitud]
+            self._vistas[nombre] = (vista, vista if codigo == 'B' else vista.cast(codigo))
+        return self._vistas[nombre][1]
+
+    def __contains__(self, nombre):
+        return nombre in self._secciones
+
+    def cerrar(self):
+        """
+        Libera las vistas y cierra el mmap
+
+        Las secciones devueltas dejan de ser utilizables. Si quedan vistas
+        derivadas de ellas (cortes hechos por el llamante), el mmap se
+        cierra cuando se liberen en lugar de lanzar BufferError.
+        """
+        if self._mmap is None:
+            return
+        for vista, tipada in self._vistas.values():
+            tipada.release()
+            vista.release()
+        self._vistas.clear()
+        self._vista.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._mmap = None
+
+
+def bloque_textos(textos):
+    """Empaqueta cadenas como (bloque UTF-8, desplazamientos uint32 n+1)"""
+    desplazamientos = array('I', [0])
+    partes = []
+    total = 0
+    for texto in textos:
+        codificado = texto.encode('utf-8')
+        partes.append(codificado)
+        total += len(codificado)
+        desplazamientos.append(total)
+    return b''.join(partes), desplazamientos
+
+
+def leer_textos(bloque, desplazamientos):
+    """Decodifica todas las cadenas de un bloque (para tablas de claves pequeñas)"""
+    crudo = bytes(bloque)
+    return [crudo[desplazamientos[i]:desplazamientos[i + 1]].decode('utf-8')
+            for i in range(len(desplazamientos) - 1)]
@@ -0,0 +1,151 @@
+"""
+Tareas de análisis ejecutables en procesos trabajadores
+
+Funciones de nivel de módulo (serializables con pickle) que envuelven
+AnalizadorMetrico, DetectorRimas, ContadorSilabas y ExportadorPoesia.
+Cada proceso crea sus instancias una sola vez y las reutiliza entre
+tareas. Todas devuelven estructuras JSON (o bytes en la exportación PDF).
+"""
+
+from .formas import reconocer_forma
+from .poema import analizar_poema
+from .resultados import a_diccionario
+
+# Instancias por proceso, creadas bajo demanda
+_instancias = {}
+
+
+def _obtener(nombre):
+    """Devuelve (creando si hace falta) el componente de este proceso"""
+    instancia = _instancias.get(nombre)
+    if instancia is None:
+        if nombre == 'analizador':
+            from .metrica import AnalizadorMetrico
+            instancia = AnalizadorMetrico()
+        elif nombre == 'detector_rimas':
+            from .rimas import DetectorRimas
+            instancia = DetectorRimas()
+        elif nombre == 'contador':
+            from .silabas import ContadorSilabas
+            instancia = ContadorSilabas()
+        elif nombre == 'exportador':
+            from .exportar import ExportadorPoesia
+            instancia = ExportadorPoesia()
+        else:
+            raise ValueError(f"Componente desconocido: {nombre}")
+        _instancias[nombre] = instancia
+    return instancia
+
+
+def _versos(texto):
+    return analizar_poema(texto).textos_versos
+
+
+def tarea_analizar_estrofa(versos):
+    """AnalisisEstrofa de una estrofa (tupla con los textos de sus versos)"""
+    return _obtener('analizador').analizar_estrofa(versos)
+
+
+def tarea_analizar(texto, estrofas=None):
+    """
+    Análisis métrico completo más esquema, tipo de rima y forma estrófica
+
+    estrofas: AnalisisEstrofa ya calculados en otros procesos; se añaden a
+    la caché del analizador antes de componer el resultado
+    """
+    analizador = _obtener('analizador')
+    if estrofas:
+        analizador.recordar_estrofas(estrofas)
+    resultado = analizador.analisis_completo(texto)
+    if 'error' in resultado:
+        return resultado
+
+    detector = _obtener('detector_rimas')
+    esquema = detector.detectar_esquema(_versos(texto))
+    resultado['esquema_rimas'] = esquema
+    resultado['tipo_rima'] = detector.clasificar_rima(esquema)
+    resultado['forma'] = reconocer_forma(resultado, esquema)
+    return a_diccionario(resultado)
+
+
+def tarea_estadisticas(textos, bocetos=None):
+    """EstadisticasCorpus parcial de un lote de poemas (se combina en el proceso principal)"""
+    from .estadisticas import EstadisticasCorpus
+
+    estadisticas = EstadisticasCorpus(bocetos)
+    for texto in textos:
+        estadisticas.agregar(tarea_analizar(texto))
+    return estadisticas
+
+
+def tarea_describir(poemas):
+    """
+    Datos del almacén para un lote de poemas [(titulo, contenido)]
+
+    Devuelve las filas listas para AlmacenPoemas.guardar_lote(), con el
+    índice de palabras, el de versos y la huella de contenido ya calculados.
+    """
+    from .almacen import describir_poema, palabras_texto
+    from .huellas import HuellaPoema
+
+    analizador = _obtener('analizador')
+    detector = _obtener('detector_rimas')
+    filas = []
+    for titulo, contenido in poemas:
+        datos = describir_poema(contenido, analizador, detector)
+        datos['titulo'] = titulo
+        datos['contenido'] = contenido
+        datos['palabras_indice'] = dict(palabras_texto(contenido))
+        datos['huella'] = HuellaPoema.desde_texto(contenido)
+        filas.append(datos)
+    return filas
+
+
+def tarea_rimas(texto):
+    """Análisis detallado de rimas"""
+    return a_diccionario(_obtener('detector_rimas').analizar_rimas_detallado(_versos(texto)))
+
+
+def tarea_silabear(texto):
+    """Sílabas métricas por verso y división silábica por palabra"""
+    contador = _obtener('contador')
+    versos = []
+    for verso in _versos(texto):
+        versos.append({
+            'verso': verso,
+            'silabas': contador.contar_silabas_verso(verso),
+            'division': [contador.dividir_en_silabas(p) for p in verso.split()],
+        })
+    return {'versos': versos, 'total_versos': len(versos)}
+
+
+def tarea_silabear_lote(versos):
+    """Sílabas, metro y acentos de muchos versos sueltos en una sola tarea"""
+    analizador = _obtener('analizador')
+    conteos = analizador.contador_silabas.contar_silabas_lote(versos)
+    return [
+        {
+            'verso': verso,
+            'silabas': silabas,
+            'metro': analizador.clasificar_metro(silabas),
+            'acentuacion_final': acentuacion,
+            'acentos': analizador.detectar_acentos(verso),
+        }
+        for verso, (silabas, acentuacion) in zip(versos, conteos)
+    ]
+
+
+def tarea_exportar(texto, formato, titulo="Mi Poema", metadatos=None):
+    """Exporta el poema; devuelve str o bytes según el formato"""
+    exportador = _obtener('exportador')
+    if formato == 'pdf':
+        return exportador.exportar_pdf(texto, titulo, metadatos, incluir_analisis=bool(metadatos))
+    if formato == 'html':
+        return exportador.exportar_html(texto, titulo, metadatos, incluir_analisis=bool(metadatos))
+    if formato == 'json':
+        return exportador.exportar_json(texto, titulo, metadatos)
+    if formato == 'markdown':
+        return exportador.exportar_markdown(texto, titulo, metadatos)
+    if formato == 'txt':
+        return exportador.exportar_txt(texto, titulo, metadatos)
+    raise ValueError(f"Formato no soportado: {formato}")
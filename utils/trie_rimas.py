@@ -0,0 +1,236 @@
+"""
+Trie de terminaciones invertidas para buscar versos que riman
+
+Cada verso se indexa por su terminación de rima (la que devuelve
+DetectorRimas.extraer_terminacion_rima) escrita al revés: la consonante
+normalizada en un trie y su secuencia de vocales en otro. Buscar los versos
+que riman con uno dado es recorrer el trie desde la raíz hasta el nodo de
+su terminación, en vez de comparar con son_rimas_consonantes contra cada
+verso guardado; recorrer el subárbol de ese nodo da además los versos cuya
+terminación acaba igual (rimas parciales, sufijos como "-ado").
+
+El índice se actualiza de forma incremental al añadir o quitar poemas.
+RimasAlmacen mantiene un trie por propietario de un AlmacenPoemas,
+compartido por todo el proceso y al día con lo que se guarda o elimina.
+"""
+
+import threading
+
+from .poema import analizar_poema
+from .rimas import DetectorRimas
+
+TIPOS = ('consonante', 'asonante')
+# Mismo mínimo que son_rimas_consonantes / son_rimas_asonantes
+_LONGITUD_MINIMA = 2
+
+
+class _Nodo:
+    __slots__ = ('hijos', 'versos')
+
+    def __init__(self):
+        self.hijos = {}
+        self.versos = set()
+
+
+class VersoIndexado:
+    """Verso guardado en el índice"""
+
+    __slots__ = ('poema', 'numero', 'texto', 'terminacion')
+
+    def __init__(self, poema, numero, texto, terminacion):
+        self.poema = poema
+        self.numero = numero
+        self.texto = texto
+        self.terminacion = terminacion
+
+    def to_dict(self):
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+
+class TrieRimas:
+    """Índice de versos por terminación de rima, consonante y asonante"""
+
+    def __init__(self, detector=None):
+        self.detector = detector or DetectorRimas()
+        self._raices = {tipo: _Nodo() for tipo in TIPOS}
+        self._versos = {}        # id -> VersoIndexado
+        self._por_poema = {}     # poema -> [ids]
+        self._siguiente_id = 0
+
+    def __len__(self):
+        return len(self._versos)
+
+    def __contains__(self, poema):
+        return poema in self._por_poema
+
+    def claves(self, terminacion):
+        """Claves (consonante, asonante) de una terminación, ya invertidas"""
+        consonante = self.detector._normalizar_terminacion(terminacion)
+        asonante = ''.join(c for c in consonante if c in self.detector.vocales)
+        return {
+            'consonante': consonante[::-1] if len(consonante) >= _LONGITUD_MINIMA else '',
+            'asonante': asonante[::-1] if len(asonante) >= _LONGITUD_MINIMA else '',
+        }
+
+    def agregar_poema(self, poema, texto):
+        """Indexa (o reindexa) los versos de un poema"""
+        if poema in self._por_poema:
+            self.eliminar_poema(poema)
+
+        ids = []
+        for numero, verso in enumerate(analizar_poema(texto).textos_versos, 1):
+            terminacion = self.detector.extraer_terminacion_rima(verso)
+            claves = self.claves(terminacion)
+            if not claves['consonante'] and not claves['asonante']:
+                continue
+
+            id_verso = self._siguiente_id
+            self._siguiente_id += 1
+            self._versos[id_verso] = VersoIndexado(poema, numero, verso, terminacion)
+            for tipo, clave in claves.items():
+                if clave:
+                    self._nodo(tipo, clave, crear=True).versos.add(id_verso)
+            ids.append(id_verso)
+
+        self._por_poema[poema] = ids
+        return len(ids)
+
+    def eliminar_poema(self, poema):
+        """Quita del índice los versos de un poema y poda las ramas vacías"""
+        for id_verso in self._por_poema.pop(poema, ()):
+            verso = self._versos.pop(id_verso)
+            for tipo, clave in self.claves(verso.terminacion).items():
+                if clave:
+                    self._quitar(self._raices[tipo], clave, 0, id_verso)
+
+    def _quitar(self, nodo, clave, posicion, id_verso):
+        """Quita id_verso del nodo de la clave; devuelve True si el nodo quedó vacío"""
+        if posicion == len(clave):
+            nodo.versos.discard(id_verso)
+        else:
+            hijo = nodo.hijos.get(clave[posicion])
+            if hijo is not None and self._quitar(hijo, clave, posicion + 1, id_verso):
+                del nodo.hijos[clave[posicion]]
+        return not nodo.versos and not nodo.hijos
+
+    def _nodo(self, tipo, clave, crear=False):
+        nodo = self._raices[tipo]
+        for letra in clave:
+            hijo = nodo.hijos.get(letra)
+            if hijo is None:
+                if not crear:
+                    return None
+                hijo = nodo.hijos[letra] = _Nodo()
+            nodo = hijo
+        return nodo
+
+    def _recoger(self, nodo):
+        """Ids de todos los versos del subárbol"""
+        ids = []
+        pendientes = [nodo]
+        while pendientes:
+            actual = pendientes.pop()
+            ids.extend(actual.versos)
+            pendientes.extend(actual.hijos.values())
+        return ids
+
+    def _resultados(self, ids, excluir_poema, limite):
+        versos = sorted((self._versos[i] for i in ids), key=lambda v: (v.poema, v.numero))
+        if excluir_poema is not None:
+            versos = [v for v in versos if v.poema != excluir_poema]
+        return versos[:limite] if limite else versos
+
+    def buscar(self, verso, tipo='consonante', excluir_poema=None, limite=None):
+        """
+        Versos indexados que riman con el verso dado
+
+        Args:
+            verso: verso (o palabra) de referencia
+            tipo: 'consonante' o 'asonante'
+            excluir_poema: omite los versos de ese poema
+            limite: número máximo de resultados
+
+        Returns:
+            list[VersoIndexado] ordenada por poema y número de verso
+        """
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de rima no válido: {tipo}")
+        clave = self.claves(self.detector.extraer_terminacion_rima(verso))[tipo]
+        if not clave:
+            return []
+        nodo = self._nodo(tipo, clave)
+        if nodo is None:
+            return []
+        return self._resultados(nodo.versos, excluir_poema, limite)
+
+    def buscar_sufijo(self, sufijo, tipo='consonante', excluir_poema=None, limite=None):
+        """
+        Versos cuya terminación acaba en el sufijo dado (p. ej. 'ado')
+
+        Para 'asonante' el sufijo se reduce a sus vocales.
+        """
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de rima no válido: {tipo}")
+        clave = self.detector._normalizar_terminacion(sufijo.strip())
+        if tipo == 'asonante':
+            clave = ''.join(c for c in clave if c in self.detector.vocales)
+        if not clave:
+            return []
+        nodo = self._nodo(tipo, clave[::-1])
+        if nodo is None:
+            return []
+        return self._resultados(self._recoger(nodo), excluir_poema, limite)
+
+    def grupos(self, tipo='consonante', minimo=2):
+        """Terminaciones compartidas por al menos `minimo` versos"""
+        grupos = {}
+        pendientes = [(self._raices[tipo], '')]
+        while pendientes:
+            nodo, clave = pendientes.pop()
+            if len(nodo.versos) >= minimo:
+                grupos[clave[::-1]] = len(nodo.versos)
+            pendientes.extend((hijo, clave + letra) for letra, hijo in nodo.hijos.items())
+        return dict(sorted(grupos.items(), key=lambda item: (-item[1], item[0])))
+
+
+class RimasAlmacen:
+    """Tries de rimas de los poemas guardados, uno por propietario del almacén"""
+
+    def __init__(self, almacen, detector=None):
+        self.almacen = almacen
+        self.detector = detector or almacen.detector
+        self._tries = {}  # propietario -> TrieRimas
+        # Las sesiones consultan y el almacén avisa desde hilos distintos
+        self._bloqueo = threading.Lock()
+        almacen.suscribir(self._actualizar)
+
+    def _trie(self, propietario):
+        """Trie del propietario (se construye en la primera consulta)"""
+        trie = self._tries.get(propietario)
+        if trie is None:
+            trie = TrieRimas(self.detector)
+            for titulo, contenido in self.almacen.para(propietario).todos():
+                trie.agregar_poema(titulo, contenido)
+            self._tries[propietario] = trie
+        return trie
+
+    def _actualizar(self, evento, propietario, titulo, contenido):
+        with self._bloqueo:
+            trie = self._tries.get(propietario)
+            if trie is None:
+                return
+            if evento == 'eliminar':
+                trie.eliminar_poema(titulo)
+            else:
+                trie.agregar_poema(titulo, contenido)
+
+    def buscar(self, propietario, verso, tipo='consonante', excluir_poema=None, limite=None):
+        """TrieRimas.buscar sobre los poemas del propietario"""
+        with self._bloqueo:
+            return self._trie(propietario).buscar(verso, tipo, excluir_poema, limite)
+
+    def buscar_sufijo(self, propietario, sufijo, tipo='consonante', excluir_poema=None,
+                      limite=None):
+        """TrieRimas.buscar_sufijo sobre los poemas del propietario"""
+        with self._bloqueo:
+            return self._trie(propietario).buscar_sufijo(sufijo, tipo, excluir_poema, limite)
@@ -1,19 +1,35 @@
-import threading
-import time
 import platform
 import logging
-import subprocess
 import os
+import uuid
 from threading import Lock
 
+from .perfilado import medir
+from .poema import analizar_poema
+from .recitado import RecitadoEncadenado, crear_reproductor, esperar, piezas_poema
+from .planificador_voz import ColaVozLlena, ejecutar_proceso, obtener_planificador
+
+try:
+    from config_py import VOICE_CONFIG
+    _CONFIG_RECITADO = VOICE_CONFIG.get('pipeline', {})
+except ImportError:
+    _CONFIG_RECITADO = {}
+
+# pyttsx3 reutiliza un motor por driver en todo el proceso: las sesiones
+# comparten el motor y, con él, su bloqueo
+_BLOQUEO_MOTOR = Lock()
+
 class SistemaVoz:
     def __init__(self):
         self.engine = None
         self.is_speaking = False
         self.stop_speaking = False
-        self.engine_lock = Lock()
+        self.engine_lock = _BLOQUEO_MOTOR
         self.engine_available = False
         
+        # Los recitados de esta sesión pasan por el planificador del proceso
+        self.sesion = uuid.uuid4().hex[:12]
+        
         # Configuración optimizada para poesía
         self.config_default = {
             'velocidad': 150,
@@ -25,8 +41,16 @@ class SistemaVoz:
         
         self.voces_disponibles = []
         self.voces_espanol = []
+        self._config_recitado = self.config_default
+        
+        # Recitado encadenado: síntesis adelantada a WAV + reproducción en orden
+        self.reproductor = None
+        if _CONFIG_RECITADO.get('enabled', True):
+            self.reproductor = crear_reproductor()
         
-        self.inicializar_engine()
+        # Puede estar recitando otra sesión con el mismo motor
+        with self.engine_lock:
+            self.inicializar_engine()
     
     def inicializar_engine(self):
         """Inicialización robusta del motor de voz"""
@@ -198,82 +222,122 @@ class SistemaVoz:
         # Detener síntesis anterior
         self.detener()
         
-        # Configurar
+        # Encolar en el planificador (la configuración se aplica al empezar,
+        # porque el motor puede estar hablando para otra sesión)
         config = configuracion or self.config_default
-        self._aplicar_configuracion(config)
-        
-        # Ejecutar en hilo separado
-        def _ejecutar():
-            try:
-                self.is_speaking = True
-                self.stop_speaking = False
-                self._procesar_texto_poetico(texto, config)
-            except Exception as e:
-                logging.error(f"Error en síntesis: {e}")
-            finally:
-                self.is_speaking = False
-        
-        thread = threading.Thread(target=_ejecutar, daemon=True)
-        thread.start()
+        try:
+            obtener_planificador().enviar(self.sesion, self._ejecutar_recitado, texto, config,
+                                          al_cancelar=self._interrumpir)
+        except ColaVozLlena as e:
+            logging.warning(f"Síntesis rechazada: {e}")
+            return False
         
         return True
     
+    def _ejecutar_recitado(self, trabajo, texto, config):
+        """Trabajo del planificador: recita el texto con la configuración dada"""
+        # La cancelación y el tiempo máximo del planificador se leen del propio
+        # trabajo: stop_speaking (pausa) se reinicia aquí y una cancelación que
+        # llegara justo ahora se perdería si solo se mirara esa bandera
+        self.stop_speaking = False
+        if trabajo.detenido():
+            return
+
+        def detenido():
+            return trabajo.detenido() or self.stop_speaking
+
+        try:
+            self.is_speaking = True
+            self._config_recitado = config
+            self._procesar_texto_poetico(texto, config, detenido)
+        except Exception as e:
+            logging.error(f"Error en síntesis: {e}")
+        finally:
+            self.is_speaking = False
+    
     def _aplicar_configuracion(self, config):
-        """Aplica configuración al engine"""
+        """
+        Aplica la configuración al engine (con engine_lock ya tomado)
+
+        Se aplica antes de cada verso: entre dos versos el motor compartido
+        puede haber hablado para otra sesión con otra configuración.
+        """
         try:
             if not self.engine:
                 return
             
-            with self.engine_lock:
-                self.engine.setProperty('rate', max(50, min(400, config.get('velocidad', 150))))
-                self.engine.setProperty('volume', max(0.0, min(1.0, config.get('volumen', 0.9))))
-                
-                if config.get('voz_seleccionada'):
-                    self.engine.setProperty('voice', config['voz_seleccionada'])
+            self.engine.setProperty('rate', max(50, min(400, config.get('velocidad', 150))))
+            self.engine.setProperty('volume', max(0.0, min(1.0, config.get('volumen', 0.9))))
+            
+            voz = config.get('voz_seleccionada') or self.config_default.get('voz_seleccionada')
+            if voz:
+                self.engine.setProperty('voice', voz)
                     
         except Exception as e:
             logging.warning(f"Error aplicando configuración: {e}")
     
-    def _procesar_texto_poetico(self, texto, config):
+    @medir('SistemaVoz.recitado')
+    def _procesar_texto_poetico(self, texto, config, detenido=None):
         """Procesa texto poético con pausas"""
+        detenido = detenido or (lambda: self.stop_speaking)
+        if self._puede_encadenar():
+            try:
+                recitado = RecitadoEncadenado(
+                    lambda verso, ruta: self._renderizar_verso(verso, ruta, detenido),
+                    self.reproductor,
+                    respaldo=lambda verso: self._hablar_verso(verso, detenido))
+                recitado.recitar(piezas_poema(texto, config), detenido)
+                return
+            except Exception as e:
+                logging.warning(f"Recitado encadenado no disponible, verso a verso: {e}")
+                self.reproductor = None
+        self._recitar_secuencial(texto, config, detenido)
+    
+    def _puede_encadenar(self):
+        return (self.reproductor is not None and self.engine is not None
+                and hasattr(self.engine, 'save_to_file'))
+    
+    def _recitar_secuencial(self, texto, config, detenido=None):
+        """Sintetiza y reproduce cada verso antes de pasar al siguiente"""
+        detenido = detenido or (lambda: self.stop_speaking)
         try:
-            # Dividir en estrofas
-            estrofas = [e.strip() for e in texto.split('\n\n') if e.strip()]
-            if not estrofas:
-                estrofas = [texto.strip()]
+            estrofas = analizar_poema(texto).estrofas
             
             for i, estrofa in enumerate(estrofas):
-                if self.stop_speaking:
+                if detenido():
                     break
                 
-                versos = [v.strip() for v in estrofa.split('\n') if v.strip()]
+                versos = estrofa.textos
                 
                 for j, verso in enumerate(versos):
-                    if self.stop_speaking:
+                    if detenido():
                         break
                     
                     # Síntesis del verso
-                    self._hablar_verso(verso)
+                    self._hablar_verso(verso, detenido)
                     
-                    # Pausa entre versos
-                    if j < len(versos) - 1 and not self.stop_speaking:
-                        time.sleep(config.get('pausa_verso', 0.8))
+                    # Pausa entre versos (se corta al detener)
+                    if j < len(versos) - 1:
+                        esperar(config.get('pausa_verso', 0.8), detenido)
                 
                 # Pausa entre estrofas
-                if i < len(estrofas) - 1 and not self.stop_speaking:
-                    time.sleep(config.get('pausa_estrofa', 1.5))
+                if i < len(estrofas) - 1:
+                    esperar(config.get('pausa_estrofa', 1.5), detenido)
                     
         except Exception as e:
             logging.error(f"Error procesando texto: {e}")
     
-    def _hablar_verso(self, verso):
+    @medir('SistemaVoz.sintesis_verso')
+    def _hablar_verso(self, verso, detenido=None):
         """Habla un verso individual"""
-        if not verso.strip() or self.stop_speaking:
+        detenido = detenido or (lambda: self.stop_speaking)
+        if not verso.strip() or detenido():
             return
         
         try:
             with self.engine_lock:
-                if self.engine and not self.stop_speaking:
+                if self.engine and not detenido():
+                    self._aplicar_configuracion(self._config_recitado)
                     verso_procesado = self._preparar_verso(verso)
                     self.engine.say(verso_procesado)
                     self.engine.runAndWait()
@@ -281,6 +345,19 @@ class SistemaVoz:
         except Exception as e:
             logging.warning(f"Error hablando verso: {e}")
     
+    @medir('SistemaVoz.render_verso')
+    def _renderizar_verso(self, verso, ruta, detenido=None):
+        """Sintetiza un verso a un archivo WAV (sin reproducirlo)"""
+        detenido = detenido or (lambda: self.stop_speaking)
+        if not verso.strip() or detenido():
+            return
+        
+        with self.engine_lock:
+            if self.engine and not detenido():
+                self._aplicar_configuracion(self._config_recitado)
+                self.engine.save_to_file(self._preparar_verso(verso), ruta)
+                self.engine.runAndWait()
+    
     def _preparar_verso(self, verso):
         """Prepara verso para síntesis"""
         # Expandir abreviaciones
@@ -292,7 +369,18 @@ class SistemaVoz:
         return verso
     
     def _hablar_fallback(self, texto):
-        """Sistema de respaldo"""
+        """Sistema de respaldo (encolado en el planificador, no bloquea)"""
+        try:
+            obtener_planificador().enviar(self.sesion, self._ejecutar_fallback, texto)
+            return True
+        except ColaVozLlena as e:
+            logging.warning(f"Síntesis rechazada: {e}")
+            print(f"[VOZ NO DISPONIBLE] {texto}")
+            return False
+    
+    @medir('SistemaVoz.sintesis_fallback')
+    def _ejecutar_fallback(self, trabajo, texto):
+        """Trabajo del planificador: PowerShell en Windows, espeak en Linux/Mac"""
         try:
             if platform.system() == "Windows":
                 # PowerShell para Windows
@@ -300,33 +388,34 @@ class SistemaVoz:
                 
                 command = f'''powershell -Command "Add-Type -AssemblyName System.Speech; $speak = New-Object System.Speech.Synthesis.SpeechSynthesizer; $speak.Rate = 2; $speak.Speak('{texto_limpio}')"'''
                 
-                def _ejecutar_powershell():
-                    try:
-                        subprocess.run(command, shell=True, capture_output=True, timeout=30)
-                    except Exception as e:
-                        logging.warning(f"Error en PowerShell: {e}")
-                
-                thread = threading.Thread(target=_ejecutar_powershell, daemon=True)
-                thread.start()
-                
-                return True
+                try:
+                    ejecutar_proceso(command, trabajo, timeout=30, shell=True)
+                except Exception as e:
+                    logging.warning(f"Error en PowerShell: {e}")
             else:
                 # Para Linux/Mac
                 try:
-                    subprocess.run(['espeak', '-v', 'es', '-s', '150', texto[:200]], 
-                                 capture_output=True, timeout=30)
-                    return True
-                except:
+                    ejecutar_proceso(['espeak', '-v', 'es', '-s', '150', texto[:200]],
+                                     trabajo, timeout=30)
+                except OSError:
                     print(f"[SÍNTESIS FALLBACK] {texto}")
-                    return True
                     
         except Exception as e:
             logging.error(f"Error en fallback: {e}")
             print(f"[VOZ NO DISPONIBLE] {texto}")
-            return False
     
     def detener(self):
-        """Detiene la síntesis"""
+        """
+        Detiene la síntesis de esta sesión y descarta sus recitados en cola
+
+        El motor solo se detiene si esta sesión tiene un recitado en curso
+        (al cancelarlo, el planificador llama a _interrumpir): puede estar
+        hablando para otra sesión.
+        """
+        obtener_planificador().cancelar_sesion(self.sesion)
+    
+    def _interrumpir(self):
+        """Corta el recitado en curso de esta sesión (al_cancelar del trabajo)"""
         self.stop_speaking = True
         self.is_speaking = False
         
@@ -363,7 +452,9 @@ class SistemaVoz:
             'voz_actual': self.config_default.get('voz_seleccionada'),
             'estado': 'Hablando' if self.is_speaking else 'Listo',
             'plataforma': platform.system(),
-            'engine_disponible': self.engine is not None
+            'engine_disponible': self.engine is not None,
+            'recitado_encadenado': self._puede_encadenar(),
+            'cola_sintesis': obtener_planificador().metricas()
         }
     
     def recitar_con_estilo(self, texto, estilo):